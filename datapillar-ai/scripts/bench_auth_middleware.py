@@ -0,0 +1,232 @@
+# @author Sunny
+# @date 2026-01-27
+
+"""
+AuthMiddleware benchmark:BaseHTTPMiddleware(legacy) vs pure ASGI
+
+Drives a FastAPI app in-process over raw ASGI(no server,no sockets) so only the
+middleware stack differs between modes.
+
+- overhead:  --requests authenticated JSON POSTs(--gzip to send gzip bodies),
+             --concurrency in flight;reports requests/s and per-request microseconds
+- streaming: one SSE response of --events events,--interval-ms apart;reports time to
+             first event and the worst gap between consecutive events as seen by send()
+- bomb:      a --bomb-mb gzip body of zeros;reports bytes held by the middleware before
+             the request is rejected(legacy inflates everything,pure ASGI stops at the limit)
+
+Usage:
+    python scripts/bench_auth_middleware.py --requests 5000 --concurrency 32 --gzip
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gzip
+import json
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from fastapi import FastAPI, Request, Response  # noqa: E402
+from fastapi.responses import StreamingResponse  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+import src.shared.auth.middleware as middleware_module  # noqa: E402
+from src.shared.auth.middleware import AuthMiddleware  # noqa: E402
+from src.shared.context import reset_request_scope, set_request_scope  # noqa: E402
+from src.shared.exception import register_exception_handlers  # noqa: E402
+
+_HEADERS = [
+    (b"x-principal-iss", b"gateway"),
+    (b"x-principal-sub", b"alice"),
+    (b"x-tenant-id", b"3"),
+    (b"x-tenant-code", b"acme"),
+    (b"x-user-id", b"7"),
+    (b"x-user-roles", b"admin"),
+    (b"content-type", b"application/json"),
+]
+
+
+class _LegacyAuthMiddleware(BaseHTTPMiddleware):
+    """The previous dispatch():buffered gzip.decompress + call_next."""
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        if request.headers.get("content-encoding", "").lower() == "gzip":
+            body = gzip.decompress(await request.body())
+            sent = False
+
+            async def replay() -> dict[str, Any]:
+                nonlocal sent
+                if not sent:
+                    sent = True
+                    return {"type": "http.request", "body": body, "more_body": False}
+                return {"type": "http.disconnect"}
+
+            request._body = body  # type: ignore[attr-defined]
+            request._receive = replay  # type: ignore[attr-defined]
+        user = AuthMiddleware._authenticate(_AUTH, request.headers, request.url.path)
+        request.state.current_user = user
+        token = set_request_scope(user.tenant_id, user.user_id, user.tenant_code)
+        try:
+            return await call_next(request)
+        finally:
+            reset_request_scope(token)
+
+
+_AUTH = AuthMiddleware(None)  # type: ignore[arg-type]
+
+
+def _build_app(middleware: type, args: argparse.Namespace) -> FastAPI:
+    app = FastAPI()
+    if middleware is AuthMiddleware:
+        app.add_middleware(AuthMiddleware, max_decompressed_bytes=args.max_mb * 1024 * 1024)
+    else:
+        app.add_middleware(middleware)
+    register_exception_handlers(app)
+
+    @app.post("/api/ai/echo")
+    async def echo(payload: dict[str, Any]) -> dict[str, int]:
+        return {"keys": len(payload)}
+
+    @app.get("/api/ai/stream")
+    async def stream() -> StreamingResponse:
+        async def events():
+            for index in range(args.events):
+                await asyncio.sleep(args.interval_ms / 1000)
+                yield f"event: llm\ndata: {index}\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+def _scope(method: str, path: str, headers: list[tuple[bytes, bytes]]) -> dict[str, Any]:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 5000),
+        "server": ("testserver", 80),
+    }
+
+
+async def _call(app: FastAPI, scope: dict[str, Any], body: bytes, on_send=None) -> int:
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    status = 0
+
+    async def receive() -> dict[str, Any]:
+        if messages:
+            return messages.pop(0)
+        await asyncio.sleep(3600)
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        if on_send is not None:
+            on_send(message)
+
+    await app(scope, receive, send)
+    return status
+
+
+async def _overhead(app: FastAPI, args: argparse.Namespace) -> float:
+    raw = json.dumps({f"column_{i}": "x" * 32 for i in range(20)}).encode()
+    body = gzip.compress(raw) if args.gzip else raw
+    headers = _HEADERS + ([(b"content-encoding", b"gzip")] if args.gzip else [])
+    scope = _scope("POST", "/api/ai/echo", headers)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def _one() -> None:
+        async with semaphore:
+            assert await _call(app, dict(scope), body) == 200
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_one() for _ in range(args.requests)))
+    return time.perf_counter() - start
+
+
+async def _streaming(app: FastAPI) -> tuple[float, float]:
+    stamps: list[float] = []
+
+    def _on_send(message: dict[str, Any]) -> None:
+        if message["type"] == "http.response.body" and message.get("body"):
+            stamps.append(time.perf_counter())
+
+    start = time.perf_counter()
+    await _call(app, _scope("GET", "/api/ai/stream", _HEADERS), b"", _on_send)
+    gaps = [later - earlier for earlier, later in zip(stamps, stamps[1:], strict=False)]
+    return (stamps[0] - start) * 1000, max(gaps, default=0.0) * 1000
+
+
+async def _bomb(app: FastAPI, args: argparse.Namespace) -> tuple[int, float]:
+    body = gzip.compress(b"0" * args.bomb_mb * 1024 * 1024)
+    scope = _scope("POST", "/api/ai/echo", _HEADERS + [(b"content-encoding", b"gzip")])
+    tracemalloc.start()
+    try:
+        status = await _call(app, scope, body)
+    except Exception:
+        status = 500
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return status, peak / 1024 / 1024
+
+
+async def _run(args: argparse.Namespace) -> None:
+    runtime = SimpleNamespace(
+        security=SimpleNamespace(trusted_identity=SimpleNamespace(enabled=True))
+    )
+    middleware_module.get_runtime_config = lambda: runtime
+
+    print(
+        f"requests={args.requests} concurrency={args.concurrency} gzip={args.gzip} "
+        f"events={args.events} interval={args.interval_ms}ms bomb={args.bomb_mb}MB"
+    )
+    print(
+        f"{'mode':<8} {'req/s':>9} {'us/req':>8} {'first_event_ms':>15} "
+        f"{'max_gap_ms':>11} {'bomb_status':>12} {'bomb_peak_mb':>13}"
+    )
+    for label, middleware in (("legacy", _LegacyAuthMiddleware), ("asgi", AuthMiddleware)):
+        app = _build_app(middleware, args)
+        await _overhead(app, args)  # warm up routing/validation caches
+        elapsed = await _overhead(app, args)
+        first_event, max_gap = await _streaming(app)
+        bomb_status, bomb_peak = await _bomb(app, args)
+        print(
+            f"{label:<8} {args.requests / elapsed:>9.0f} {elapsed / args.requests * 1e6:>8.1f} "
+            f"{first_event:>15.2f} {max_gap:>11.2f} {bomb_status:>12} {bomb_peak:>13.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("--events", type=int, default=50)
+    parser.add_argument("--interval-ms", type=float, default=5.0)
+    parser.add_argument("--bomb-mb", type=int, default=256)
+    parser.add_argument("--max-mb", type=int, default=32)
+    args = parser.parse_args()
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+# @author Sunny
+# @date 2026-01-27
+
+"""
+EmbeddingProcessor backlog throughput benchmark(fake embedder,fake Redis)
+
+Pushes --tasks metadata embedding tasks through the processor and reports tasks/s.
+The fake provider answers after --base-ms + --per-item-ms per text and rejects calls
+above --max-tokens estimated tokens,like a hosted embedding API.
+
+- legacy:   in-memory queue,fixed batches of 20,sync calls on a 4-thread executor
+- durable:  Redis stream backlog(fakeredis),adaptive batch size,async calls(4 in flight)
+
+Usage:
+    python scripts/bench_embedding_backlog.py --tasks 5000 --base-ms 40 --per-item-ms 0.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import fakeredis  # noqa: E402
+
+from src.shared.embedding.processor import (  # noqa: E402
+    AdaptiveBatchSizer,
+    EmbeddingProcessor,
+    decode_task,
+    encode_task,
+)
+from src.shared.utils.event_queue import (  # noqa: E402
+    AsyncEventQueue,
+    QueueConfig,
+    RedisStreamEventQueue,
+    StreamQueueConfig,
+)
+from src.shared.utils.tokens import estimate_tokens  # noqa: E402
+
+
+class _FakeEmbedder:
+    provider = "fake"
+    model_name = "bench"
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        self._args = args
+
+    def _delay(self, texts: list[str]) -> float:
+        if sum(estimate_tokens(text) for text in texts) > self._args.max_tokens:
+            raise ValueError("request exceeds provider token limit")
+        return (self._args.base_ms + self._args.per_item_ms * len(texts)) / 1000
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        time.sleep(self._delay(texts))
+        return [[0.0] * 8 for _ in texts]
+
+    async def async_embed_batch(self, texts: list[str]) -> list[list[float]]:
+        await asyncio.sleep(self._delay(texts))
+        return [[0.0] * 8 for _ in texts]
+
+
+class _CountingRepo:
+    def __init__(self) -> None:
+        self.written = 0
+
+    async def write_embeddings_batch(self, _session, *, node_label, data, provider) -> None:
+        self.written += len(data)
+
+
+@asynccontextmanager
+async def _session():
+    yield None
+
+
+def _items(count: int) -> list[tuple[str, str, str]]:
+    return [
+        (f"col-{i}", "Column", f"dw.orders_{i % 97}.amount_{i}: order amount in CNY, tax included")
+        for i in range(count)
+    ]
+
+
+async def _legacy(args: argparse.Namespace) -> float:
+    embedder = _FakeEmbedder(args)
+    repo = _CountingRepo()
+    executor = ThreadPoolExecutor(max_workers=4)
+
+    async def _process(tasks) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(executor, embedder.embed_batch, [t.text for t in tasks])
+        await repo.write_embeddings_batch(None, node_label="Column", data=tasks, provider="")
+
+    queue = AsyncEventQueue(QueueConfig(max_size=args.tasks, batch_size=20))
+    processor = EmbeddingProcessor(
+        metadata_repo=repo,
+        queue=queue,
+        embedder_factory=lambda _tenant_id: embedder,
+        session_factory=_session,
+    )
+    queue.set_processor(_process)
+    await processor.put_batch(_items(args.tasks), tenant_id=1)
+    start = time.perf_counter()
+    await processor.start()
+    while repo.written < args.tasks:
+        await asyncio.sleep(0.005)
+    elapsed = time.perf_counter() - start
+    await processor.stop()
+    executor.shutdown()
+    return elapsed
+
+
+async def _durable(args: argparse.Namespace) -> tuple[float, int]:
+    redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+
+    async def _client():
+        return redis
+
+    sizer = AdaptiveBatchSizer(max_tokens=args.max_tokens)
+    repo = _CountingRepo()
+    queue = RedisStreamEventQueue(
+        stream="bench:embedding",
+        group="embedding-processor",
+        encode=encode_task,
+        decode=decode_task,
+        client_factory=_client,
+        config=StreamQueueConfig(batch_size=sizer.max_size * 4, flush_interval_seconds=0.05),
+    )
+    processor = EmbeddingProcessor(
+        metadata_repo=repo,
+        queue=queue,
+        sizer=sizer,
+        embedder_factory=lambda _tenant_id: _FakeEmbedder(args),
+        session_factory=_session,
+    )
+    await processor.put_batch(_items(args.tasks), tenant_id=1)
+    start = time.perf_counter()
+    await processor.start()
+    while repo.written < args.tasks:
+        await asyncio.sleep(0.005)
+    elapsed = time.perf_counter() - start
+    await processor.stop()
+    return elapsed, sizer.size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=5_000)
+    parser.add_argument("--base-ms", type=float, default=40.0)
+    parser.add_argument("--per-item-ms", type=float, default=0.5)
+    parser.add_argument("--max-tokens", type=int, default=8_000)
+    args = parser.parse_args()
+
+    print(
+        f"tasks={args.tasks} base={args.base_ms}ms per_item={args.per_item_ms}ms "
+        f"max_tokens={args.max_tokens}"
+    )
+    print(f"{'mode':<8} {'seconds':>9} {'tasks/s':>10}")
+    legacy = asyncio.run(_legacy(args))
+    print(f"{'legacy':<8} {legacy:>9.2f} {args.tasks / legacy:>10.0f}")
+    durable, batch_size = asyncio.run(_durable(args))
+    print(f"{'durable':<8} {durable:>9.2f} {args.tasks / durable:>10.0f}  batch_size={batch_size}")
+
+
+if __name__ == "__main__":
+    main()
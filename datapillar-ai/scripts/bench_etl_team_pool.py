@@ -0,0 +1,140 @@
+# @author Sunny
+# @date 2026-02-26
+
+"""
+ETL team pool benchmark
+
+Compares one team per session (legacy) with the shared team pool:
+- first-message latency: time until the session has a ready team (before the LLM call)
+- RSS after N sessions
+
+MySQL lookups and key decryption are excluded; in legacy mode they are paid per
+session on top of the numbers shown here.
+
+Usage:
+    python scripts/bench_etl_team_pool.py --sessions 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/statm") as fh:
+        pages = int(fh.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+
+
+def _run(mode: str, sessions: int, tenants: int) -> dict[str, float]:
+    from datapillar_oneagentic import DatapillarConfig
+
+    from src.modules.etl.agents import create_etl_team
+    from src.modules.etl.team_pool import EtlTeamPool, SessionBinding, TeamPoolKey
+
+    logging.disable(logging.CRITICAL)
+    config = DatapillarConfig(
+        llm={"provider": "openai", "api_key": "sk-bench", "model": "gpt-4o"},
+        embedding={
+            "provider": "openai",
+            "api_key": "sk-bench",
+            "model": "text-embedding-3-small",
+            "dimension": 1536,
+        },
+    )
+    pool = EtlTeamPool()
+    legacy_teams: dict[str, object] = {}
+    rss_before = _rss_mb()
+    latencies: list[float] = []
+
+    for index in range(sessions):
+        tenant_id = index % tenants + 1
+        storage_key = f"etl_team_{tenant_id}:u1:s{index}"
+        start = time.perf_counter()
+        if mode == "legacy":
+            legacy_teams[storage_key] = create_etl_team(
+                config=config,
+                namespace=f"etl_team_{tenant_id}",
+                tenant_id=tenant_id,
+            )
+        else:
+            pool_key = TeamPoolKey(
+                tenant_id=tenant_id,
+                ai_model_id=1,
+                provider_model_id="gpt-4o",
+                config_version="v1",
+            )
+            pool.get_or_create(
+                pool_key,
+                lambda tenant_id=tenant_id: create_etl_team(
+                    config=config,
+                    namespace=f"etl_team_{tenant_id}",
+                    tenant_id=tenant_id,
+                ),
+            )
+            pool.bind_session(storage_key, SessionBinding(model=(1, "gpt-4o"), pool_key=pool_key))
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+    return {
+        "mean_ms": statistics.fmean(latencies),
+        "p50_ms": latencies[len(latencies) // 2],
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+        "rss_delta_mb": _rss_mb() - rss_before,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--tenants", type=int, default=4)
+    parser.add_argument("--mode", choices=["both", "legacy", "pool"], default="both")
+    args = parser.parse_args()
+
+    if args.mode != "both":
+        print(json.dumps(_run(args.mode, args.sessions, args.tenants)))
+        return
+
+    # Each mode runs in its own process so RSS is not shared.
+    results = {}
+    for mode in ("legacy", "pool"):
+        output = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--mode",
+                mode,
+                "--sessions",
+                str(args.sessions),
+                "--tenants",
+                str(args.tenants),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        results[mode] = json.loads(output.strip().splitlines()[-1])
+
+    print(f"sessions={args.sessions} tenants={args.tenants}")
+    print(f"{'mode':<8} {'mean ms':>9} {'p50 ms':>9} {'p99 ms':>9} {'RSS +MB':>9}")
+    for mode, row in results.items():
+        print(
+            f"{mode:<8} {row['mean_ms']:>9.2f} {row['p50_ms']:>9.3f} "
+            f"{row['p99_ms']:>9.2f} {row['rss_delta_mb']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
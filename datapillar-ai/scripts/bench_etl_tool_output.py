@@ -0,0 +1,313 @@
+# @author Sunny
+# @date 2026-01-28
+
+"""
+ETL tool output benchmark:prompt tokens and latency of one ETL session's tool calls
+
+Replays the tool calls of a typical session(catalog browsing,analyst and developer both
+reading the same table details,lineage and lineage SQL).Neo4j/MySQL are stubs that sleep
+--db-ms per call and return --columns columns per table(every 4th with a value domain).
+
+- legacy:the previous tools,full node property maps as JSON objects,no cache,the
+  synchronous call in LangChain's default executor
+- compact:the async tools,tables with one header,projection,token budget and the
+  per-session result cache
+
+Tokens are estimated(~1 per 3 UTF-8 bytes,as the embedding batcher does) over every tool
+result of the session,i.e. what the agents append to their prompts.
+
+Usage:
+    python scripts/bench_etl_tool_output.py --columns 40 --db-ms 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from datapillar_oneagentic.log import bind_log_context  # noqa: E402
+
+from src.modules.etl.tools import component as component_module  # noqa: E402
+from src.modules.etl.tools import table as table_module  # noqa: E402
+from src.modules.etl.tools.cache import tool_result_cache  # noqa: E402
+from src.shared.context import reset_request_scope, set_request_scope  # noqa: E402
+from src.shared.utils.tokens import estimate_tokens  # noqa: E402
+
+_TABLES = ["ods.t_order", "ods.t_user", "ods.t_payment", "dwd.order_detail"]
+
+# (tool,args) in call order;the developer re-reads what the analyst already read.
+_SESSION: list[tuple[str, dict[str, Any]]] = [
+    ("list_catalogs", {"limit": 5}),
+    ("list_schemas", {"catalog": "hive_prod", "limit": 20}),
+    ("list_tables", {"catalog": "hive_prod", "schema_name": "ods", "limit": 50}),
+    ("search_tables", {"query": "order payment", "top_k": 10}),
+    ("search_columns", {"query": "order amount", "top_k": 10}),
+    ("get_table_detail", {"path": "hive_prod.ods.t_order"}),
+    ("get_table_detail", {"path": "hive_prod.ods.t_user"}),
+    ("get_table_detail", {"path": "hive_prod.ods.t_payment"}),
+    ("list_component", {}),
+    ("get_table_detail", {"path": "hive_prod.ods.t_order"}),
+    ("get_table_detail", {"path": "hive_prod.ods.t_user"}),
+    ("get_table_detail", {"path": "hive_prod.ods.t_payment"}),
+    ("get_table_detail", {"path": "hive_prod.dwd.order_detail"}),
+    ("get_table_lineage", {"path": "hive_prod.dwd.order_detail", "direction": "upstream"}),
+    ("get_table_lineage", {"path": "hive_prod.ods.t_order", "direction": "downstream"}),
+    (
+        "get_lineage_sql",
+        {
+            "source_tables": ["hive_prod.ods.t_order", "hive_prod.ods.t_user"],
+            "target_table": "hive_prod.dwd.order_detail",
+        },
+    ),
+    ("get_table_detail", {"path": "hive_prod.dwd.order_detail"}),
+]
+
+
+class _Stub:
+    """Repository stand-ins;every call sleeps db_ms like a Neo4j/MySQL round-trip"""
+
+    def __init__(self, db_ms: float, columns: int) -> None:
+        self._db = db_ms / 1000
+        self._columns = columns
+
+    def _wait(self) -> None:
+        time.sleep(self._db)
+
+    def _nodes(self, count: int, prefix: str) -> list[dict[str, Any]]:
+        self._wait()
+        return [
+            {
+                "node_id": f"9f3c2a7e-{prefix}-{i:04d}-b1d2-4c6a8e0f1234",
+                "name": f"{prefix}_{i}",
+                "description": f"{prefix} {i} of the warehouse,maintained by the data team",
+            }
+            for i in range(count)
+        ]
+
+    def list_catalogs(self, limit: int, **_: Any) -> list[dict[str, Any]]:
+        return self._nodes(min(limit, 3), "catalog")
+
+    def list_schemas(self, catalog: str, limit: int, **_: Any) -> list[dict[str, Any]]:
+        return self._nodes(min(limit, 6), "schema")
+
+    def list_tables(self, catalog: str, schema: str, limit: int, **_: Any) -> list[dict]:
+        return self._nodes(min(limit, 40), "table")
+
+    def _hits(self, kind: str, top_k: int) -> list[dict[str, Any]]:
+        depth = 4 if kind == "Column" else 3
+        return [
+            {
+                "type": kind,
+                "path": ".".join(["hive_prod", "ods", f"t_{i}", "amount"][:depth]),
+                "name": f"t_{i}",
+                "description": f"matched {kind.lower()} {i} for the order domain",
+                "dataType": "decimal(18,2)",
+                "table": f"t_{i}",
+                "score": 0.91234567 - i * 0.01,
+            }
+            for i in range(top_k)
+        ]
+
+    def search_tables(self, query: str, top_k: int, **_: Any) -> list[dict[str, Any]]:
+        self._wait()
+        return self._hits("Table", top_k)
+
+    def search_columns(self, query: str, top_k: int, **_: Any) -> list[dict[str, Any]]:
+        self._wait()
+        return self._hits("Column", top_k)
+
+    async def asearch_tables(self, query: str, top_k: int, **_: Any) -> list[dict[str, Any]]:
+        await asyncio.sleep(self._db)
+        return self._hits("Table", top_k)
+
+    async def asearch_columns(self, query: str, top_k: int, **_: Any) -> list[dict[str, Any]]:
+        await asyncio.sleep(self._db)
+        return self._hits("Column", top_k)
+
+    def get_table_detail(self, catalog: str, schema: str, table: str, **_: Any) -> dict:
+        self._wait()
+        columns = []
+        for i in range(self._columns):
+            value_domain = None
+            if i % 4 == 0:
+                value_domain = {
+                    "code": f"DOMAIN_{i}",
+                    "name": f"domain {i}",
+                    "type": "ENUM",
+                    "items": "1:created,2:paid,3:shipped,4:closed",
+                }
+            columns.append(
+                {
+                    "name": f"{table}_column_{i}",
+                    "dataType": "varchar(64)" if i % 3 else "bigint",
+                    "description": f"column {i} of {table}",
+                    "nullable": bool(i % 2),
+                    "valueDomain": value_domain,
+                }
+            )
+        return {"description": f"{table} table", "columns": columns}
+
+    def get_table_lineage(self, schema: str, table: str, direction: str, **_: Any) -> dict:
+        self._wait()
+        names = [name.split(".")[1] for name in _TABLES if name.split(".")[1] != table]
+        edges = [{"source_table": n, "target_table": table, "sql_id": f"sql-{n}"} for n in names]
+        return {"upstream": names, "downstream": [], "edges": edges, "hops": {}}
+
+    def find_lineage_sql(self, sources: list[str], target: str, **_: Any) -> dict:
+        self._wait()
+        return {
+            "sql_id": "sql-1",
+            "content": "INSERT OVERWRITE TABLE dwd.order_detail SELECT o.*,u.name FROM "
+            "ods.t_order o JOIN ods.t_user u ON o.user_id = u.id",
+            "summary": "order detail",
+            "engine": "spark",
+        }
+
+    def list_active(self, tenant_id: int) -> list[dict[str, Any]]:
+        self._wait()
+        return [
+            {
+                "id": i,
+                "component_code": code,
+                "component_name": code.title(),
+                "component_type": "SQL",
+                "description": f"{code} job",
+                "config_schema": {"sql": "", "queue": "default"},
+            }
+            for i, code in enumerate(["HIVE", "SPARK_SQL", "SHELL", "DATAX"])
+        ]
+
+
+def _legacy_result(stub: _Stub, tool: str, args: dict[str, Any]) -> str:
+    """The previous tool output:json.dumps of the full row dicts"""
+    if tool == "list_catalogs":
+        rows = stub.list_catalogs(**args)
+        data: dict[str, Any] = {"catalogs": rows, "count": len(rows)}
+    elif tool == "list_schemas":
+        rows = stub.list_schemas(**args)
+        for row in rows:
+            row.update(path=f"{args['catalog']}.{row['name']}", catalog=args["catalog"])
+        data = {"catalog": args["catalog"], "schemas": rows, "count": len(rows)}
+    elif tool == "list_tables":
+        rows = stub.list_tables(args["catalog"], args["schema_name"], args["limit"])
+        for row in rows:
+            row.update(
+                path=f"{args['catalog']}.{args['schema_name']}.{row['name']}",
+                catalog=args["catalog"],
+                schema=args["schema_name"],
+            )
+        data = {"catalog": args["catalog"], "schema": args["schema_name"], "tables": rows}
+        data["count"] = len(rows)
+    elif tool in ("search_tables", "search_columns"):
+        hits = getattr(stub, tool)(**args)
+        key = "tables" if tool == "search_tables" else "columns"
+        names = ["catalog", "schema", "table", "column"]
+        rows = []
+        for hit in hits:
+            parts = hit["path"].split(".")
+            row = {"path": hit["path"], **dict(zip(names, parts, strict=False))}
+            if key == "columns":
+                row["dataType"] = hit["dataType"]
+            row.update(description=hit["description"], score=hit["score"])
+            rows.append(row)
+        data = {"query": args["query"], key: rows, "count": len(rows)}
+    elif tool == "get_table_detail":
+        catalog, schema, table = args["path"].split(".")
+        detail = stub.get_table_detail(catalog, schema, table)
+        data = {"path": args["path"], "catalog": catalog, "schema": schema, "table": table}
+        data.update(description=detail["description"], columns=detail["columns"])
+    elif tool == "get_table_lineage":
+        catalog, schema, table = args["path"].split(".")
+        lineage = stub.get_table_lineage(schema, table, args["direction"])
+        data = {"path": args["path"], "catalog": catalog, "schema": schema, "table": table}
+        data.update(direction=args["direction"], upstream=lineage["upstream"])
+        data.update(downstream=lineage["downstream"], edges=lineage["edges"])
+    elif tool == "get_lineage_sql":
+        result = stub.find_lineage_sql(args["source_tables"], args["target_table"])
+        data = {**args, "sql_id": result["sql_id"], "sql_content": result["content"]}
+        data.update(summary=result["summary"], engine=result["engine"])
+    else:
+        rows = stub.list_active(1)
+        data = {"total": len(rows), "components": rows, "hint": "type=code,type_id=id"}
+    return json.dumps(data, ensure_ascii=False)
+
+
+def _install(stub: _Stub) -> None:
+    search = table_module.Neo4jTableSearch
+    for name in (
+        "list_catalogs",
+        "list_schemas",
+        "list_tables",
+        "asearch_tables",
+        "get_table_detail",
+        "get_table_lineage",
+        "find_lineage_sql",
+    ):
+        setattr(search, name, getattr(stub, name))
+    table_module.Neo4jColumnSearch.asearch_columns = stub.asearch_columns
+    component_module.Component.list_active = stub.list_active
+
+
+async def _run_legacy(stub: _Stub) -> tuple[list[str], list[float]]:
+    loop = asyncio.get_running_loop()
+    results, latencies = [], []
+    for tool, args in _SESSION:
+        start = time.perf_counter()
+        results.append(await loop.run_in_executor(None, _legacy_result, stub, tool, args))
+        latencies.append(time.perf_counter() - start)
+    return results, latencies
+
+
+async def _run_compact(_stub: _Stub) -> tuple[list[str], list[float]]:
+    tools = {
+        tool.name: tool for tool in [*table_module.TABLE_TOOLS, component_module.list_component]
+    }
+    tool_result_cache.clear()
+    results, latencies = [], []
+    token = set_request_scope(1, 7, "acme")
+    try:
+        with bind_log_context(namespace="etl_team_1", session_id="7:bench"):
+            for tool, args in _SESSION:
+                start = time.perf_counter()
+                results.append(await tools[tool].ainvoke(args))
+                latencies.append(time.perf_counter() - start)
+    finally:
+        reset_request_scope(token)
+    return results, latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--columns", type=int, default=40)
+    parser.add_argument("--db-ms", type=float, default=15.0)
+    args = parser.parse_args()
+
+    stub = _Stub(args.db_ms, args.columns)
+    _install(stub)
+    print(f"calls={len(_SESSION)} columns/table={args.columns} db={args.db_ms}ms")
+    print(
+        f"{'mode':<8} {'tokens':>8} {'detail_tokens':>14} {'bytes':>8} "
+        f"{'total_ms':>9} {'max_call_ms':>12}"
+    )
+    for mode, runner in (("legacy", _run_legacy), ("compact", _run_compact)):
+        results, latencies = asyncio.run(runner(stub))
+        tokens = sum(estimate_tokens(text) for text in results)
+        detail = estimate_tokens(results[5])
+        size = sum(len(text.encode("utf-8")) for text in results)
+        print(
+            f"{mode:<8} {tokens:>8} {detail:>14} {size:>8} "
+            f"{sum(latencies) * 1000:>9.1f} {max(latencies) * 1000:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
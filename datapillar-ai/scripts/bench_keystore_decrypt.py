@@ -0,0 +1,148 @@
+# @author Sunny
+# @date 2026-03-05
+
+"""
+LocalCryptoService decrypt throughput benchmark
+
+Decrypts --calls API keys for --tenants tenants(--keys distinct ciphertexts each)
+against an in-memory key storage and reports decrypts/s per mode.
+
+- legacy:     PEM load + RSA parse per call,sync path through a new thread and event loop
+- key_cache:  cached parsed keys,secret cache disabled(RSA-OAEP decrypt per call)
+- cached:     warm key and secret caches(the steady state of chat/ETL requests)
+- async:      decrypt_key_async on a warm cache,--concurrency calls in flight
+
+Usage:
+    python scripts/bench_keystore_decrypt.py --calls 2000 --tenants 4 --keys 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from cryptography.hazmat.primitives import hashes, serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import padding, rsa  # noqa: E402
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM  # noqa: E402
+
+import src.infrastructure.keystore.crypto_service as crypto_module  # noqa: E402
+from src.infrastructure.keystore.crypto_service import LocalCryptoService  # noqa: E402
+
+
+def _build_ciphertext(private_key: rsa.RSAPrivateKey, plaintext: str) -> str:
+    aes_key = AESGCM.generate_key(bit_length=256)
+    nonce = os.urandom(12)
+    encrypted_payload = AESGCM(aes_key).encrypt(nonce, plaintext.encode("utf-8"), None)
+    encrypted_aes_key = private_key.public_key().encrypt(
+        aes_key,
+        padding.OAEP(
+            mgf=padding.MGF1(algorithm=hashes.SHA256()),
+            algorithm=hashes.SHA256(),
+            label=None,
+        ),
+    )
+    return "ENCv1:" + base64.b64encode(encrypted_aes_key + nonce + encrypted_payload).decode()
+
+
+class _MemoryStorage:
+    def __init__(self, pems: dict[str, bytes]) -> None:
+        self._pems = pems
+
+    def load_private_key(self, tenant_code: str) -> bytes:
+        return self._pems[tenant_code]
+
+
+def _legacy_decrypt(service: LocalCryptoService, tenant_code: str, ciphertext: str) -> str:
+    # The previous sync path:one thread and one event loop per call,nothing cached.
+    result: dict[str, str] = {}
+
+    async def _decrypt() -> str:
+        return service.decrypt_key(tenant_code=tenant_code, ciphertext=ciphertext)
+
+    thread = threading.Thread(target=lambda: result.update(value=asyncio.run(_decrypt())))
+    thread.start()
+    thread.join()
+    return result["value"]
+
+
+def _timed(label: str, calls: int, run) -> None:
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {elapsed:>9.3f} {calls / elapsed:>12.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=2_000)
+    parser.add_argument("--tenants", type=int, default=4)
+    parser.add_argument("--keys", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    pems: dict[str, bytes] = {}
+    pool: list[tuple[str, str]] = []
+    for index in range(args.tenants):
+        tenant_code = f"tenant-{index}"
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        pems[tenant_code] = private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+        pool.extend(
+            (tenant_code, _build_ciphertext(private_key, f"sk-{index}-{key}"))
+            for key in range(args.keys)
+        )
+    crypto_module.get_key_storage = lambda: _MemoryStorage(pems)
+    requests = [pool[i % len(pool)] for i in range(args.calls)]
+
+    print(f"calls={args.calls} tenants={args.tenants} ciphertexts={len(pool)}")
+    print(f"{'mode':<10} {'seconds':>9} {'decrypts/s':>12}")
+
+    uncached = LocalCryptoService(max_secrets=0, key_recheck_seconds=0)
+    _timed("legacy", args.calls, lambda: [_legacy_decrypt(uncached, *r) for r in requests])
+
+    keys_only = LocalCryptoService(max_secrets=0)
+    _timed(
+        "key_cache",
+        args.calls,
+        lambda: [keys_only.decrypt_key(tenant_code=t, ciphertext=c) for t, c in requests],
+    )
+
+    cached = LocalCryptoService()
+    for tenant_code, ciphertext in pool:
+        cached.decrypt_key(tenant_code=tenant_code, ciphertext=ciphertext)
+    _timed(
+        "cached",
+        args.calls,
+        lambda: [cached.decrypt_key(tenant_code=t, ciphertext=c) for t, c in requests],
+    )
+
+    async def _async_run() -> None:
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def _one(tenant_code: str, ciphertext: str) -> None:
+            async with semaphore:
+                await cached.decrypt_key_async(tenant_code=tenant_code, ciphertext=ciphertext)
+
+        await asyncio.gather(*(_one(*r) for r in requests))
+
+    _timed("async", args.calls, lambda: asyncio.run(_async_run()))
+    print(f"stats: {cached.stats()}")
+    for service in (uncached, keys_only, cached):
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
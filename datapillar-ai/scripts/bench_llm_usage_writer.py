@@ -0,0 +1,196 @@
+# @author Sunny
+# @date 2026-01-27
+
+"""
+LLM usage accounting benchmark:per-call upsert vs write-behind multi-row upserts
+
+--calls LLM calls from --threads threads(agent steps of concurrent chats) report their
+usage through LlmUsage.upsert_usage;--replays records per run(replayed/updated usage
+of the same run_id).MySQL is a stub engine that sleeps --rtt-ms per statement plus
+--row-us per row and serialises statements on the same run rows(row locks),so no database
+is needed.
+
+- per-call:     the previous shape,one INSERT ... ON DUPLICATE KEY UPDATE per call
+- write-behind: llm_usage_writer with the memory buffer,flushed every
+                --flush-interval-ms and at close
+- redis-buffer: the same with RedisUsageBuffer on a fakeredis server(skipped when fakeredis
+                is not installed;its caller time measures the in-process emulator)
+
+Reports DB statements and rows per 1,000 calls,and caller-side microseconds per call.
+
+Usage:
+    python scripts/bench_llm_usage_writer.py --calls 10000 --threads 16 --rtt-ms 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import src.infrastructure.repository.system.ai_model as ai_model  # noqa: E402
+from src.infrastructure.repository.system.ai_model import LlmUsage  # noqa: E402
+from src.infrastructure.repository.system.usage_writer import (  # noqa: E402
+    RedisUsageBuffer,
+    UsageWriteBehind,
+)
+
+
+class _StubEngine:
+    def __init__(self, rtt_ms: float, row_us: float) -> None:
+        self._rtt = rtt_ms / 1000
+        self._row = row_us / 1_000_000
+        self._lock = threading.Lock()
+        self._row_locks: dict[str, threading.Lock] = {}
+        self.statements = 0
+        self.rows = 0
+
+    @contextmanager
+    def begin(self):
+        yield self
+
+    def execute(self, _query: Any, params: dict[str, Any]) -> None:
+        run_ids = sorted(value for key, value in params.items() if key.startswith("run_id_"))
+        with self._lock:
+            self.statements += 1
+            self.rows += len(run_ids)
+            locks = [self._row_locks.setdefault(run_id, threading.Lock()) for run_id in run_ids]
+        for lock in locks:
+            lock.acquire()
+        try:
+            time.sleep(self._rtt + self._row * len(run_ids))
+        finally:
+            for lock in locks:
+                lock.release()
+
+
+def _record(call: int, args: argparse.Namespace) -> dict[str, Any]:
+    run = call // args.replays
+    return {
+        "tenant_id": run % 8,
+        "user_id": 7,
+        "session_id": f"s{run % 50}",
+        "module": "etl",
+        "agent_id": "developer",
+        "provider": "openai",
+        "model_name": "gpt-4o",
+        "run_id": f"run-{run}",
+        "parent_run_id": None,
+        "prompt_tokens": 1200 + call,
+        "completion_tokens": 300,
+        "total_tokens": 1500 + call,
+        "estimated": 0,
+        "prompt_cost_usd": 0.003,
+        "completion_cost_usd": 0.003,
+        "total_cost_usd": 0.006,
+        "raw_usage_json": '{"input_tokens":1200,"output_tokens":300}',
+    }
+
+
+def _drive(args: argparse.Namespace) -> float:
+    """Caller-side seconds spent in upsert_usage"""
+    spent = [0.0] * args.threads
+
+    def _worker(index: int) -> None:
+        for call in range(index, args.calls, args.threads):
+            start = time.perf_counter()
+            LlmUsage.upsert_usage(record=_record(call, args))
+            spent[index] += time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        list(pool.map(_worker, range(args.threads)))
+    return sum(spent)
+
+
+def _run_mode(args: argparse.Namespace, writer: UsageWriteBehind | None) -> dict[str, float]:
+    engine = _StubEngine(args.rtt_ms, args.row_us)
+    ai_model.MySQLClient.get_engine = lambda: engine  # type: ignore[method-assign]
+    if writer is not None:
+        ai_model.llm_usage_writer = writer
+        writer.start()
+    start = time.perf_counter()
+    caller = _drive(args)
+    if writer is not None:
+        writer.close()
+    elapsed = time.perf_counter() - start
+    per_thousand = 1000 / args.calls
+    return {
+        "statements": engine.statements * per_thousand,
+        "rows": engine.rows * per_thousand,
+        "caller_us": caller / args.calls * 1e6,
+        "elapsed": elapsed,
+    }
+
+
+def _writer(args: argparse.Namespace, buffer: Any = None) -> UsageWriteBehind:
+    return UsageWriteBehind(
+        write_batch=LlmUsage.upsert_usage_batch,
+        buffer=buffer,
+        flush_interval_seconds=args.flush_interval_ms / 1000,
+        max_batch_rows=args.max_batch_rows,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=10_000)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--replays", type=int, default=2)
+    parser.add_argument("--rtt-ms", type=float, default=1.0)
+    parser.add_argument("--row-us", type=float, default=20.0)
+    parser.add_argument("--flush-interval-ms", type=float, default=200.0)
+    parser.add_argument("--max-batch-rows", type=int, default=500)
+    args = parser.parse_args()
+
+    original_writer = ai_model.llm_usage_writer
+    modes: list[tuple[str, Any]] = [
+        ("per-call", lambda: None),
+        ("write-behind", lambda: _writer(args)),
+    ]
+    try:
+        import fakeredis
+    except ImportError:
+        fakeredis = None
+    if fakeredis is not None:
+        server = fakeredis.FakeServer()
+        modes.append(
+            (
+                "redis-buffer",
+                lambda: _writer(
+                    args,
+                    RedisUsageBuffer(fakeredis.FakeRedis(server=server, decode_responses=True)),
+                ),
+            )
+        )
+
+    print(
+        f"calls={args.calls} threads={args.threads} replays={args.replays} "
+        f"rtt={args.rtt_ms}ms row={args.row_us}us flush={args.flush_interval_ms}ms "
+        f"batch={args.max_batch_rows}"
+    )
+    print(
+        f"{'mode':<13} {'stmts/1k':>9} {'rows/1k':>8} {'caller_us/call':>15} {'elapsed_s':>10}"
+    )
+    try:
+        for label, build in modes:
+            ai_model.llm_usage_writer = original_writer
+            result = _run_mode(args, build())
+            print(
+                f"{label:<13} {result['statements']:>9.1f} {result['rows']:>8.1f} "
+                f"{result['caller_us']:>15.1f} {result['elapsed']:>10.2f}"
+            )
+    finally:
+        ai_model.llm_usage_writer = original_writer
+
+
+if __name__ == "__main__":
+    main()
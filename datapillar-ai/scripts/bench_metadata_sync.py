@@ -0,0 +1,182 @@
+# @author Sunny
+# @date 2026-01-28
+
+"""
+Metadata re-sync benchmark:per-entity upserts vs bulk content-hash diff
+
+Re-syncs --columns Column nodes of which --changed-pct percent have a new description.
+Neo4j is an embedded stub that sleeps --rtt-ms per statement plus --row-us per row it
+reads or writes,and keeps the hashes the bulk writer stores,so no database is needed.
+
+- per-entity:one Metadata.upsert_column_sync per column,every column re-embedded
+  (previous sync shape)
+- bulk-diff:MetadataBulkSync.flush on a graph already holding the previous sync;
+  hash reads in --batch-size batches,UNWIND writes and embeddings for changed rows only
+
+Usage:
+    python scripts/bench_metadata_sync.py --columns 50000 --changed-pct 1 --rtt-ms 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.infrastructure.repository.knowledge import sync_metadata  # noqa: E402
+from src.infrastructure.repository.knowledge.sync_metadata import (  # noqa: E402
+    Metadata,
+    MetadataBulkSync,
+)
+
+
+class _StubResult:
+    def __init__(self, rows: list[dict[str, Any]] | None = None) -> None:
+        self._rows = rows or []
+
+    async def data(self) -> list[dict[str, Any]]:
+        return self._rows
+
+    async def consume(self) -> None:
+        return None
+
+
+class _StubSession:
+    def __init__(self, rtt_ms: float, row_us: float) -> None:
+        self._rtt = rtt_ms / 1000
+        self._row = row_us / 1_000_000
+        self.hashes: dict[str, dict[str, Any]] = {}
+        self.round_trips = 0
+        self.rows_written = 0
+
+    async def run(self, query: str, params: dict[str, Any] | None = None) -> _StubResult:
+        params = params or {}
+        self.round_trips += 1
+        ids = params.get("ids") or []
+        rows = params.get("rows") or []
+        hashes = params.get("hashes") or []
+        await asyncio.sleep(self._rtt + (len(ids) + len(rows) + len(hashes)) * self._row)
+        if rows:
+            for row in rows:
+                node = self.hashes.setdefault(row["id"], {"id": row["id"]})
+                node["contentHash"] = row["contentHash"]
+            self.rows_written += len(rows)
+        elif hashes:
+            for row in hashes:
+                self.hashes[row["id"]]["textHash"] = row["textHash"]
+        elif "MERGE" in query:
+            self.rows_written += 1
+        return _StubResult([self.hashes[i] for i in ids if i in self.hashes])
+
+
+class _CountingProcessor:
+    def __init__(self) -> None:
+        self.enqueued = 0
+
+    async def put_batch(self, items: list[tuple[str, str, str]], **_: Any) -> int:
+        self.enqueued += len(items)
+        return len(items)
+
+
+def _columns(count: int, changed_every: int, *, changed: bool) -> list[dict[str, Any]]:
+    def _description(i: int) -> str:
+        if changed and changed_every and i % changed_every == 0:
+            return f"column {i} v2"
+        return f"column {i}"
+
+    return [
+        {
+            "id": f"col:{i}",
+            "name": f"column_{i}",
+            "data_type": "VARCHAR(64)",
+            "description": _description(i),
+            "nullable": True,
+            "auto_increment": False,
+            "default_value": None,
+        }
+        for i in range(count)
+    ]
+
+
+async def _per_entity(
+    args: argparse.Namespace, _previous: list[dict[str, Any]], columns: list[dict[str, Any]]
+) -> tuple[_StubSession, int, float]:
+    session = _StubSession(args.rtt_ms, args.row_us)
+    processor = _CountingProcessor()
+    start = time.perf_counter()
+    for column in columns:
+        await Metadata.upsert_column_sync(session, **column)
+    await processor.put_batch([(c["id"], "Column", c["name"]) for c in columns])
+    return session, processor.enqueued, time.perf_counter() - start
+
+
+async def _bulk_diff(
+    args: argparse.Namespace, previous: list[dict[str, Any]], columns: list[dict[str, Any]]
+) -> tuple[_StubSession, int, float]:
+    # The previous sync is loaded untimed;only the re-sync is measured.
+    session = _StubSession(0.0, 0.0)
+    seed = MetadataBulkSync(
+        session,
+        batch_size=args.batch_size,
+        tenant_id=1,
+        embedding_processor=_CountingProcessor(),
+        ensure_indexes=False,
+    )
+    for column in previous:
+        seed.add_column(**column)
+    await seed.flush()
+    session.round_trips = session.rows_written = 0
+    session._rtt, session._row = args.rtt_ms / 1000, args.row_us / 1_000_000
+
+    processor = _CountingProcessor()
+    sync = MetadataBulkSync(
+        session,
+        batch_size=args.batch_size,
+        tenant_id=1,
+        embedding_processor=processor,
+        ensure_indexes=False,
+    )
+    start = time.perf_counter()
+    for column in columns:
+        sync.add_column(**column)
+    await sync.flush()
+    return session, processor.enqueued, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--columns", type=int, default=50_000)
+    parser.add_argument("--changed-pct", type=float, default=1.0)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--rtt-ms", type=float, default=1.0)
+    parser.add_argument("--row-us", type=float, default=5.0, help="server cost per row")
+    args = parser.parse_args()
+
+    # Metadata.* reads the tenant from the request context.
+    sync_metadata._require_tenant_id = lambda: 1
+    changed_every = round(100 / args.changed_pct) if args.changed_pct > 0 else 0
+    previous = _columns(args.columns, changed_every, changed=False)
+    columns = _columns(args.columns, changed_every, changed=True)
+
+    print(
+        f"columns={args.columns} changed={args.changed_pct}% batch_size={args.batch_size} "
+        f"rtt={args.rtt_ms}ms row={args.row_us}us"
+    )
+    print(f"{'mode':<11} {'round-trips':>12} {'written':>9} {'embedded':>9} {'seconds':>9}")
+    for mode, runner in (("per-entity", _per_entity), ("bulk-diff", _bulk_diff)):
+        session, embedded, elapsed = asyncio.run(runner(args, previous, columns))
+        print(
+            f"{mode:<11} {session.round_trips:>12} {session.rows_written:>9} "
+            f"{embedded:>9} {elapsed:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+# @author Sunny
+# @date 2026-01-27
+
+"""
+RAG repository load test:sync pool + to_thread vs async pool
+
+Runs --requests namespace/document/job lookups with --concurrency requests in flight and
+reports requests/s and pool stats per mode.
+
+- sync:   NamespaceRepository.get etc. through asyncio.to_thread(the previous handler path)
+- async:  NamespaceRepository.aget etc. on MySQLClient.aconnect()
+
+Defaults to a SQLite stand-in(pysqlite/aiosqlite,schema created on the fly).--rtt-ms
+emulates the MySQL round trip with a sleep on the thread that runs each statement:a
+to_thread worker in sync mode(like pymysql blocking on its socket),the aiosqlite connection
+thread in async mode(the event loop stays free,like aiomysql).Point --sync-url/--async-url
+at a MySQL with the knowledge_* tables for real numbers.
+
+Usage:
+    python scripts/bench_mysql_async.py --requests 5000 --concurrency 64 --rtt-ms 5
+    python scripts/bench_mysql_async.py \\
+        --sync-url mysql+pymysql://u:p@127.0.0.1:3306/datapillar \\
+        --async-url mysql+aiomysql://u:p@127.0.0.1:3306/datapillar
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import create_engine, event, text  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+from sqlalchemy.pool import QueuePool  # noqa: E402
+
+from src.infrastructure.database.mysql import MySQLClient, PoolMetrics  # noqa: E402
+from src.infrastructure.repository.rag import (  # noqa: E402
+    DocumentRepository,
+    JobRepository,
+    NamespaceRepository,
+)
+
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS knowledge_namespace (
+      namespace_id INTEGER PRIMARY KEY AUTOINCREMENT, tenant_id INTEGER, namespace TEXT,
+      description TEXT, status INTEGER, created_by INTEGER, is_deleted INTEGER DEFAULT 0,
+      created_at TEXT DEFAULT CURRENT_TIMESTAMP, updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS knowledge_document (
+      document_id INTEGER PRIMARY KEY AUTOINCREMENT, tenant_id INTEGER, namespace_id INTEGER,
+      doc_uid TEXT, title TEXT, file_type TEXT, size_bytes INTEGER, storage_uri TEXT,
+      storage_type TEXT, storage_key TEXT, status TEXT, chunk_count INTEGER,
+      token_count INTEGER, error_message TEXT, embedding_model_id INTEGER,
+      embedding_dimension INTEGER, chunk_mode TEXT, chunk_config_json TEXT,
+      last_chunked_at TEXT, created_by INTEGER, is_deleted INTEGER DEFAULT 0,
+      created_at TEXT DEFAULT CURRENT_TIMESTAMP, updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS knowledge_document_job (
+      job_id INTEGER PRIMARY KEY AUTOINCREMENT, tenant_id INTEGER, namespace_id INTEGER,
+      document_id INTEGER, job_type TEXT, payload_json TEXT, status TEXT, progress INTEGER,
+      progress_seq INTEGER, total_chunks INTEGER, processed_chunks INTEGER,
+      error_message TEXT, started_at TEXT, finished_at TEXT, created_by INTEGER,
+      created_at TEXT DEFAULT CURRENT_TIMESTAMP, updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+]
+_TENANT_ID = 1
+_USER_ID = 7
+
+
+async def _seed(namespaces: int) -> list[tuple[int, int, int]]:
+    """Create namespace/document/job rows,returns (namespace_id,document_id,job_id)."""
+    targets = []
+    for index in range(namespaces):
+        namespace_id = await NamespaceRepository.acreate(
+            {
+                "tenant_id": _TENANT_ID,
+                "namespace": f"bench_{index}",
+                "description": None,
+                "created_by": _USER_ID,
+                "status": 1,
+            }
+        )
+        document_id = await DocumentRepository.acreate(
+            {
+                "tenant_id": _TENANT_ID,
+                "namespace_id": namespace_id,
+                "doc_uid": f"bench_doc_{index}",
+                "title": f"bench document {index}",
+                "file_type": "md",
+                "size_bytes": 1024,
+                "storage_uri": f"local://bench/{index}",
+                "storage_type": "local",
+                "storage_key": f"bench/{index}",
+                "status": "indexed",
+                "chunk_count": 12,
+                "token_count": 0,
+                "error_message": None,
+                "embedding_model_id": 1,
+                "embedding_dimension": 1024,
+                "chunk_mode": None,
+                "chunk_config_json": None,
+                "last_chunked_at": None,
+                "created_by": _USER_ID,
+            }
+        )
+        job_id = await JobRepository.acreate(
+            {
+                "tenant_id": _TENANT_ID,
+                "namespace_id": namespace_id,
+                "document_id": document_id,
+                "job_type": "chunk",
+                "status": "success",
+                "progress": 100,
+                "progress_seq": 3,
+                "total_chunks": 12,
+                "processed_chunks": 12,
+                "error_message": None,
+                "started_at": None,
+                "finished_at": None,
+                "created_by": _USER_ID,
+            }
+        )
+        targets.append((namespace_id, document_id, job_id))
+    return targets
+
+
+def _sync_request(index: int, target: tuple[int, int, int]) -> None:
+    namespace_id, document_id, job_id = target
+    kind = index % 4
+    if kind == 0:
+        NamespaceRepository.get(namespace_id, _TENANT_ID, _USER_ID)
+    elif kind == 1:
+        DocumentRepository.get(document_id, _TENANT_ID, _USER_ID)
+    elif kind == 2:
+        JobRepository.get(job_id, _TENANT_ID, _USER_ID)
+    else:
+        DocumentRepository.list_by_namespace(
+            namespace_id, _TENANT_ID, _USER_ID, status=None, keyword=None, limit=20, offset=0
+        )
+
+
+async def _async_request(index: int, target: tuple[int, int, int]) -> None:
+    namespace_id, document_id, job_id = target
+    kind = index % 4
+    if kind == 0:
+        await NamespaceRepository.aget(namespace_id, _TENANT_ID, _USER_ID)
+    elif kind == 1:
+        await DocumentRepository.aget(document_id, _TENANT_ID, _USER_ID)
+    elif kind == 2:
+        await JobRepository.aget(job_id, _TENANT_ID, _USER_ID)
+    else:
+        await DocumentRepository.alist_by_namespace(
+            namespace_id, _TENANT_ID, _USER_ID, status=None, keyword=None, limit=20, offset=0
+        )
+
+
+def _emulate_rtt(pool, rtt_ms: float, *, aiosqlite: bool) -> None:
+    def _on_connect(dbapi_connection, _record) -> None:
+        # aiosqlite wraps a sqlite3 connection that lives on its own thread.
+        raw = dbapi_connection.driver_connection._conn if aiosqlite else dbapi_connection
+        raw.set_trace_callback(lambda _sql: time.sleep(rtt_ms / 1000))
+
+    event.listen(pool, "connect", _on_connect)
+
+
+async def _drive(args: argparse.Namespace, targets, request) -> float:
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def _one(index: int) -> None:
+        async with semaphore:
+            await request(index, targets[index % len(targets)])
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_one(index) for index in range(args.requests)))
+    return time.perf_counter() - start
+
+
+async def _run(args: argparse.Namespace, sync_url: str, async_url: str, sqlite: bool) -> None:
+    pool_kwargs = {"pool_size": args.pool_size, "max_overflow": args.max_overflow}
+    connect_args = {"check_same_thread": False} if sqlite else {}
+    async_engine = create_async_engine(async_url, connect_args=connect_args, **pool_kwargs)
+    if sqlite:
+        async with async_engine.begin() as conn:
+            for ddl in _SCHEMA:
+                await conn.execute(text(ddl))
+    MySQLClient.use_async_engine(async_engine)
+    targets = await _seed(args.namespaces)
+
+    sync_engine = create_engine(sync_url, poolclass=QueuePool, **pool_kwargs)
+    if sqlite and args.rtt_ms > 0:
+        _emulate_rtt(sync_engine.pool, args.rtt_ms, aiosqlite=False)
+        _emulate_rtt(async_engine.sync_engine.pool, args.rtt_ms, aiosqlite=True)
+        await async_engine.dispose()
+    MySQLClient._engine = sync_engine
+    MySQLClient._metrics["sync"] = PoolMetrics()
+    MySQLClient._metrics["sync"].attach(sync_engine.pool)
+    # The default executor size of the service process(min(32,cpu+4)).
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(args.threads))
+
+    async def _sync(index: int, target) -> None:
+        await asyncio.to_thread(_sync_request, index, target)
+
+    print(f"{'mode':<6} {'seconds':>9} {'req/s':>10}  pool")
+    for label, request in (("sync", _sync), ("async", _async_request)):
+        elapsed = await _drive(args, targets, request)
+        stats = MySQLClient.pool_stats()[label]
+        print(
+            f"{label:<6} {elapsed:>9.2f} {args.requests / elapsed:>10.0f}  "
+            f"peak={stats['peak_checked_out']}/{args.pool_size + args.max_overflow} "
+            f"timeouts={stats['timeouts']} acquire_ms_max={stats['acquire_ms_max']}"
+        )
+
+    MySQLClient.close()
+    await MySQLClient.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--namespaces", type=int, default=50)
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument("--max-overflow", type=int, default=20)
+    parser.add_argument("--threads", type=int, default=12)
+    parser.add_argument("--rtt-ms", type=float, default=5.0)
+    parser.add_argument("--sync-url")
+    parser.add_argument("--async-url")
+    args = parser.parse_args()
+
+    print(
+        f"requests={args.requests} concurrency={args.concurrency} "
+        f"pool_size={args.pool_size} max_overflow={args.max_overflow} threads={args.threads} "
+        f"rtt={args.rtt_ms}ms"
+    )
+    if args.sync_url and args.async_url:
+        asyncio.run(_run(args, args.sync_url, args.async_url, sqlite=False))
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "rag.db"
+        asyncio.run(_run(args, f"sqlite:///{path}", f"sqlite+aiosqlite:///{path}", sqlite=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+# @author Sunny
+# @date 2026-01-28
+
+"""
+Neo4j metric search latency benchmark
+
+Starts --concurrency metric searches at once on one event loop and reports p50/p99
+latency(measured from the common start),embedding calls and Neo4j round-trips.
+Neo4j and the embedding provider are embedded stubs that sleep(--rtt-ms per query,
+--embed-ms per embedding),so no database or model is needed.
+
+- legacy:the previous search_metrics shape. Called from async code it blocks the
+  loop;each of the 3 indexes embeds the query again in a 3-thread pool
+- async:Neo4jMetricSearch.asearch_metrics(the real code path),one memoized
+  embedding per query,6 legs concurrently on a driver pool of --pool-size
+
+Usage:
+    python scripts/bench_neo4j_search.py --concurrency 50 --rtt-ms 5 --embed-ms 40
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.infrastructure.llm.embeddings import QueryEmbeddingMemo, UnifiedEmbedder  # noqa: E402
+from src.infrastructure.repository.knowledge import Neo4jMetricSearch, search_hybrid  # noqa: E402
+
+_INDEX_COUNT = 3
+
+
+class _Counters:
+    def __init__(self) -> None:
+        self.embeds = 0
+        self.round_trips = 0
+
+
+class _StubEmbeddings:
+    def __init__(self, embed_ms: float, counters: _Counters) -> None:
+        self._delay = embed_ms / 1000
+        self._counters = counters
+
+    def embed_query(self, text: str) -> list[float]:
+        self._counters.embeds += 1
+        time.sleep(self._delay)
+        return [1.0] * 8
+
+    async def aembed_query(self, text: str) -> list[float]:
+        self._counters.embeds += 1
+        await asyncio.sleep(self._delay)
+        return [1.0] * 8
+
+
+class _StubResult:
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        self._rows = rows
+
+    async def data(self) -> list[dict[str, Any]]:
+        return self._rows
+
+
+class _StubSession:
+    def __init__(self, rtt_ms: float, counters: _Counters) -> None:
+        self._rtt = rtt_ms / 1000
+        self._counters = counters
+
+    async def run(self, query: str, params: dict[str, Any]) -> _StubResult:
+        self._counters.round_trips += 1
+        await asyncio.sleep(self._rtt)
+        if "UNWIND $hits" in query:
+            return _StubResult(
+                [
+                    {
+                        "type": "AtomicMetric",
+                        "code": hit["element_id"],
+                        "name": hit["element_id"],
+                        "description": None,
+                        "score": hit["score"],
+                    }
+                    for hit in params["hits"]
+                ]
+            )
+        index_name = params["index_name"]
+        return _StubResult(
+            [{"element_id": f"{index_name}-{i}", "score": 1.0 - i * 0.1} for i in range(3)]
+        )
+
+
+def _install_stubs(args: argparse.Namespace, counters: _Counters) -> None:
+    embedder = object.__new__(UnifiedEmbedder)
+    embedder._initialized = True
+    embedder._tenant_id = 1
+    embedder._embeddings = _StubEmbeddings(args.embed_ms, counters)
+    embedder.query_memo = QueryEmbeddingMemo()
+    UnifiedEmbedder._instances = {1: embedder}
+
+    pool = asyncio.Semaphore(args.pool_size)
+    session = _StubSession(args.rtt_ms, counters)
+
+    @asynccontextmanager
+    async def _session(**_: Any):
+        async with pool:
+            yield session
+
+    search_hybrid.neo4j_async_session = _session
+
+
+def _legacy_search(args: argparse.Namespace, counters: _Counters, query: str) -> None:
+    embeddings = _StubEmbeddings(args.embed_ms, counters)
+
+    def _single_index() -> None:
+        # HybridCypherRetriever.search:embed the query,then one hybrid query.
+        embeddings.embed_query(query)
+        counters.round_trips += 1
+        time.sleep(args.rtt_ms / 1000)
+
+    with ThreadPoolExecutor(max_workers=_INDEX_COUNT) as executor:
+        for future in [executor.submit(_single_index) for _ in range(_INDEX_COUNT)]:
+            future.result()
+
+
+async def _run(args: argparse.Namespace, mode: str) -> tuple[list[float], _Counters, float]:
+    counters = _Counters()
+    _install_stubs(args, counters)
+    latencies: list[float] = []
+    # All requests arrive together:latency includes time spent queued behind others.
+    start = time.perf_counter()
+
+    async def _request(index: int) -> None:
+        query = f"metric query {index % args.unique_queries}"
+        if mode == "legacy":
+            _legacy_search(args, counters, query)
+        else:
+            await Neo4jMetricSearch.asearch_metrics(query, top_k=3, min_score=0, tenant_id=1)
+        latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(_request(i) for i in range(args.concurrency)))
+    return latencies, counters, time.perf_counter() - start
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--unique-queries", type=int, default=50)
+    parser.add_argument("--rtt-ms", type=float, default=5.0)
+    parser.add_argument("--embed-ms", type=float, default=40.0)
+    parser.add_argument("--pool-size", type=int, default=50, help="driver connection pool")
+    args = parser.parse_args()
+
+    print(
+        f"concurrency={args.concurrency} unique_queries={args.unique_queries} "
+        f"rtt={args.rtt_ms}ms embed={args.embed_ms}ms pool={args.pool_size}"
+    )
+    print(
+        f"{'mode':<7} {'p50 ms':>9} {'p99 ms':>9} {'mean ms':>9} "
+        f"{'embeds':>7} {'queries':>8} {'wall s':>7}"
+    )
+    for mode in ("legacy", "async"):
+        latencies, counters, wall = asyncio.run(_run(args, mode))
+        ms = [value * 1000 for value in latencies]
+        print(
+            f"{mode:<7} {_percentile(ms, 50):>9.1f} {_percentile(ms, 99):>9.1f} "
+            f"{statistics.mean(ms):>9.1f} {counters.embeds:>7} {counters.round_trips:>8} "
+            f"{wall:>7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
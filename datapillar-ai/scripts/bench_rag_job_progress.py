@@ -0,0 +1,184 @@
+# @author Sunny
+# @date 2026-01-28
+
+"""
+RAG job progress write benchmark
+
+Compares the per-step "UPDATE + SELECT on the event loop" pattern with
+JobProgressTracker for one document. The job store sleeps for --rtt-ms per
+statement to stand in for a MySQL round-trip (no database needed).
+
+Reported per document:
+- DB round-trips
+- event-loop blocking time (time the loop thread spent inside DB calls)
+- max loop lag seen by a 1 ms ticker running next to the job
+
+Usage:
+    python scripts/bench_rag_job_progress.py --chunks 10000 --progress-step 20 --rtt-ms 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.modules.rag.progress import JobProgressTracker  # noqa: E402
+from src.modules.rag.sse import JobEventHub  # noqa: E402
+
+
+class _SlowJobStore:
+    def __init__(self, rtt_ms: float) -> None:
+        self._rtt = rtt_ms / 1000
+        self._loop_thread = threading.get_ident()
+        self.round_trips = 0
+        self.loop_blocked = 0.0
+        self.row: dict[str, Any] = {
+            "job_id": 1,
+            "tenant_id": 1,
+            "status": "running",
+            "progress": 0,
+            "total_chunks": 0,
+            "processed_chunks": 0,
+            "progress_seq": 1,
+            "lease_owner": "bench",
+        }
+
+    def _round_trip(self) -> None:
+        start = time.perf_counter()
+        time.sleep(self._rtt)
+        self.round_trips += 1
+        if threading.get_ident() == self._loop_thread:
+            self.loop_blocked += time.perf_counter() - start
+
+    def update_progress(
+        self, job_id, tenant_id, *, worker_id=None, progress_seq=None, **fields
+    ) -> None:
+        self._round_trip()
+        self.row.update(fields)
+        self.row["progress_seq"] = (
+            self.row["progress_seq"] + 1
+            if progress_seq is None
+            else max(self.row["progress_seq"], progress_seq)
+        )
+
+    def get(self, job_id, tenant_id, user_id) -> dict[str, Any]:
+        self._round_trip()
+        return dict(self.row)
+
+    def mark_success(
+        self, job_id, tenant_id, *, worker_id=None, progress_seq=None, **fields
+    ) -> None:
+        self._round_trip()
+        self.row.update(fields, status="success", progress=100)
+        self.row["progress_seq"] = (
+            self.row["progress_seq"] + 1
+            if progress_seq is None
+            else max(self.row["progress_seq"], progress_seq)
+        )
+
+
+async def _embed_batches(chunks: int, step: int, batch_ms: float, progress_cb) -> None:
+    for processed in range(step, chunks + step, step):
+        await asyncio.sleep(batch_ms / 1000)
+        await progress_cb(min(processed, chunks), chunks)
+
+
+async def _lag_probe(stop: asyncio.Event, lags: list[float]) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append(time.perf_counter() - start - 0.001)
+
+
+async def _run_legacy(args: argparse.Namespace) -> tuple[_SlowJobStore, list[float], float]:
+    store = _SlowJobStore(args.rtt_ms)
+    hub = JobEventHub()
+
+    async def _on_progress(processed: int, total: int) -> None:
+        progress = int(processed * 100 / total) if total else 0
+        store.update_progress(
+            1,
+            1,
+            processed_chunks=processed,
+            total_chunks=total,
+            progress=progress,
+            worker_id="bench",
+        )
+        snapshot = store.get(1, 1, 1)
+        await hub.publish(1, {"event": "progress", "id": str(snapshot["progress_seq"])})
+
+    return await _measure(store, args, _on_progress, None)
+
+
+async def _run_tracker(args: argparse.Namespace) -> tuple[_SlowJobStore, list[float], float]:
+    store = _SlowJobStore(args.rtt_ms)
+    tracker = JobProgressTracker(
+        store.row,
+        hub=JobEventHub(),
+        store=store,
+        flush_interval_ms=args.flush_interval_ms,
+        flush_steps=args.flush_steps,
+    )
+    return await _measure(store, args, tracker.update, tracker)
+
+
+async def _measure(store, args, progress_cb, tracker) -> tuple[_SlowJobStore, list[float], float]:
+    stop = asyncio.Event()
+    lags: list[float] = []
+    probe = asyncio.create_task(_lag_probe(stop, lags))
+    start = time.perf_counter()
+    await _embed_batches(args.chunks, args.progress_step, args.batch_ms, progress_cb)
+    if tracker is not None:
+        await tracker.succeed(processed_chunks=args.chunks, total_chunks=args.chunks)
+    else:
+        store.mark_success(
+            1, 1, processed_chunks=args.chunks, total_chunks=args.chunks, worker_id="bench"
+        )
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await probe
+    return store, lags, elapsed
+
+
+def _report(name: str, store: _SlowJobStore, lags: list[float], elapsed: float) -> None:
+    lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+    p99 = lags_ms[int(len(lags_ms) * 0.99) - 1] if len(lags_ms) > 1 else lags_ms[0]
+    print(
+        f"{name:<8} {store.round_trips:>12} {store.loop_blocked * 1000:>15.1f} "
+        f"{p99:>12.2f} {lags_ms[-1]:>12.2f} {elapsed:>10.2f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunks", type=int, default=10000)
+    parser.add_argument("--progress-step", type=int, default=20)
+    parser.add_argument("--rtt-ms", type=float, default=2.0)
+    parser.add_argument("--batch-ms", type=float, default=1.0, help="simulated embed time")
+    parser.add_argument("--flush-interval-ms", type=int, default=1000)
+    parser.add_argument("--flush-steps", type=int, default=10)
+    args = parser.parse_args()
+
+    print(
+        f"chunks={args.chunks} progress_step={args.progress_step} rtt={args.rtt_ms}ms "
+        f"flush={args.flush_interval_ms}ms/{args.flush_steps} steps"
+    )
+    print(
+        f"{'mode':<8} {'round-trips':>12} {'loop blocked ms':>15} "
+        f"{'p99 lag ms':>12} {'max lag ms':>12} {'elapsed s':>10}"
+    )
+    _report("legacy", *asyncio.run(_run_legacy(args)))
+    _report("tracker", *asyncio.run(_run_tracker(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# @author Sunny
+# @date 2026-01-28
+
+"""
+RAG upload peak-memory benchmark
+
+Uploads one file through StorageManager in a fresh child process per mode and
+reports the child's peak RSS:
+
+- buffered: read the whole upload into bytes, then save() (previous behaviour)
+- stream:   save_stream() fed with 1 MiB chunks
+
+Backends: local (default) or s3 against moto. moto keeps objects in memory, so
+for s3 the object itself shows up in RSS; compare the delta between modes.
+
+Usage:
+    python scripts/bench_rag_storage_upload.py --size-mb 1024
+    python scripts/bench_rag_storage_upload.py --size-mb 256 --backend s3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+_CHUNK = 1024 * 1024
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def _file_chunks(path: str):
+    with open(path, "rb") as handle:
+        while chunk := await asyncio.to_thread(handle.read, _CHUNK):
+            yield chunk
+
+
+async def _upload(mode: str, backend: str, source: str, target_dir: str) -> None:
+    from src.modules.rag.storage import StorageManager
+
+    if backend == "s3":
+        storage = StorageManager({"type": "s3", "s3": {"bucket": "bench", "region": "us-east-1"}})
+        storage._s3_client.create_bucket(Bucket="bench")
+    else:
+        storage = StorageManager({"type": "local", "local_dir": target_dir})
+
+    baseline = _peak_rss_mb()
+    start = time.perf_counter()
+    if mode == "buffered":
+        with open(source, "rb") as handle:
+            content = handle.read()
+        result = await storage.save(namespace_id=1, filename="bench.bin", content=content)
+    else:
+        result = await storage.save_stream(
+            namespace_id=1, filename="bench.bin", chunks=_file_chunks(source)
+        )
+    elapsed = time.perf_counter() - start
+    print(
+        f"{mode:<9} {backend:<6} {result.size_bytes / _CHUNK:>9.0f} "
+        f"{baseline:>12.1f} {_peak_rss_mb():>12.1f} {_peak_rss_mb() - baseline:>12.1f} "
+        f"{elapsed:>9.2f}"
+    )
+
+
+def _child(args: argparse.Namespace) -> None:
+    if args.backend == "s3":
+        from moto import mock_aws
+
+        os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+        os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+        with mock_aws():
+            asyncio.run(_upload(args.mode, args.backend, args.source, args.target_dir))
+    else:
+        asyncio.run(_upload(args.mode, args.backend, args.source, args.target_dir))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--backend", choices=["local", "s3"], default="local")
+    parser.add_argument("--mode", choices=["buffered", "stream"], help=argparse.SUPPRESS)
+    parser.add_argument("--source", help=argparse.SUPPRESS)
+    parser.add_argument("--target-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        _child(args)
+        return
+
+    with tempfile.TemporaryDirectory() as workdir:
+        source = os.path.join(workdir, "source.bin")
+        block = os.urandom(_CHUNK)
+        with open(source, "wb") as handle:
+            for _ in range(args.size_mb):
+                handle.write(block)
+
+        print(
+            f"{'mode':<9} {'backend':<6} {'size MiB':>9} {'base RSS MB':>12} "
+            f"{'peak RSS MB':>12} {'delta MB':>12} {'elapsed s':>9}"
+        )
+        for mode in ("buffered", "stream"):
+            target_dir = os.path.join(workdir, mode)
+            subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    "--backend",
+                    args.backend,
+                    "--mode",
+                    mode,
+                    "--source",
+                    source,
+                    "--target-dir",
+                    target_dir,
+                ],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
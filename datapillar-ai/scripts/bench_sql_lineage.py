@@ -0,0 +1,140 @@
+# @author Sunny
+# @date 2026-01-28
+
+"""
+SQLLineageAnalyzer throughput benchmark
+
+Analyzes --statements ETL statements grouped into sessions of --session-size and
+reports statements/s per mode.The corpus is generated from typical warehouse job
+shapes(CTAS staging tables,INSERT OVERWRITE with joins/CTEs/aggregations/CASE)over
+--distinct unique statements,so repeats model the same job SQL coming back on
+every metadata sync.
+
+- legacy:  no cache,two parses per statement(the previous table + column passes)
+- single:  no cache,one shared parse per statement
+- cold:    empty in-memory cache(repeats are hits)
+- warm:    second pass over the same corpus
+- pool:    analyze_sessions on an empty cache with a --workers process pool
+
+Usage:
+    python scripts/bench_sql_lineage.py --statements 10000 --distinct 2500 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import sqlglot  # noqa: E402
+
+from src.shared.utils.sql_lineage import SQLLineageAnalyzer, SQLLineageCache  # noqa: E402
+
+_LAYERS = ("ods", "dwd", "dws", "ads")
+_COLUMNS = ("user_id", "order_id", "amount", "status", "region", "channel", "sku", "qty")
+
+
+def _table(rng: random.Random, layer: str) -> str:
+    subject = rng.choice(("order", "user", "sku", "pay", "log"))
+    return f"{layer}.{layer}_{subject}_{rng.randrange(300)}"
+
+
+def _statement(rng: random.Random, index: int) -> str:
+    src, dim = _table(rng, "ods"), _table(rng, "dwd")
+    target = _table(rng, rng.choice(_LAYERS[1:]))
+    cols = rng.sample(_COLUMNS, 4)
+    shape = index % 4
+    if shape == 0:
+        return (
+            f"CREATE TABLE tmp.stage_{index} AS SELECT a.{cols[0]}, a.{cols[1]}, "
+            f"SUM(a.{cols[2]}) AS total_{cols[2]} FROM {src} a "
+            f"WHERE a.dt = '2026-01-01' GROUP BY a.{cols[0]}, a.{cols[1]}"
+        )
+    if shape == 1:
+        return (
+            f"INSERT OVERWRITE TABLE {target} PARTITION (dt='2026-01-01') "
+            f"SELECT a.{cols[0]}, b.{cols[1]}, "
+            f"CASE WHEN a.{cols[2]} > 100 THEN 'high' ELSE 'low' END AS level_{index % 7}, "
+            f"CAST(a.{cols[3]} AS BIGINT) AS {cols[3]}_num "
+            f"FROM {src} a LEFT JOIN {dim} b ON a.{cols[0]} = b.{cols[0]} "
+            f"WHERE a.dt = '2026-01-01' AND b.{cols[1]} IS NOT NULL"
+        )
+    if shape == 2:
+        return (
+            f"WITH base AS (SELECT {cols[0]}, {cols[1]}, {cols[2]} FROM {src} "
+            f"WHERE dt = '2026-01-01'), agg AS (SELECT {cols[0]}, COUNT(*) AS cnt, "
+            f"AVG({cols[2]}) AS avg_{cols[2]} FROM base GROUP BY {cols[0]}) "
+            f"INSERT INTO {target} SELECT agg.{cols[0]}, agg.cnt, agg.avg_{cols[2]} * 1.0 AS score "
+            f"FROM agg JOIN {dim} d ON agg.{cols[0]} = d.{cols[0]}"
+        )
+    return (
+        f"INSERT INTO {target} SELECT x.{cols[0]}, CONCAT(x.{cols[1]}, '-', y.{cols[2]}) AS k, "
+        f"x.{cols[3]} + y.{cols[3]} AS sum_{cols[3]} FROM {src} x "
+        f"JOIN (SELECT {cols[0]}, {cols[2]}, {cols[3]} FROM {dim} WHERE {cols[3]} > 0) y "
+        f"ON x.{cols[0]} = y.{cols[0]} UNION ALL SELECT {cols[0]}, {cols[1]}, {cols[3]} FROM {dim}"
+    )
+
+
+def _corpus(args: argparse.Namespace) -> list[list[str]]:
+    rng = random.Random(7)
+    distinct = [_statement(rng, i) for i in range(args.distinct)]
+    statements = [distinct[i % args.distinct] for i in range(args.statements)]
+    rng.shuffle(statements)
+    return [
+        statements[i : i + args.session_size]
+        for i in range(0, len(statements), args.session_size)
+    ]
+
+
+def _timed(label: str, total: int, run) -> None:
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<8} {elapsed:>9.2f} {total / elapsed:>12.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--statements", type=int, default=10_000)
+    parser.add_argument("--distinct", type=int, default=2_500)
+    parser.add_argument("--session-size", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--dialect", default="hive")
+    args = parser.parse_args()
+
+    sessions = _corpus(args)
+    total = sum(len(session) for session in sessions)
+    print(
+        f"statements={total} distinct={args.distinct} sessions={len(sessions)} "
+        f"workers={args.workers} sqlglot={sqlglot.__version__}"
+    )
+    print(f"{'mode':<8} {'seconds':>9} {'stmts/s':>12}")
+
+    uncached = SQLLineageAnalyzer(args.dialect, use_cache=False)
+
+    def _legacy() -> None:
+        for session in sessions:
+            for sql in session:
+                sqlglot.parse(sql, dialect=args.dialect)
+            uncached.analyze_session(session)
+
+    _timed("legacy", total, _legacy)
+    _timed("single", total, lambda: [uncached.analyze_session(s) for s in sessions])
+
+    cached = SQLLineageAnalyzer(args.dialect, cache=SQLLineageCache(max_entries=args.distinct))
+    _timed("cold", total, lambda: [cached.analyze_session(s) for s in sessions])
+    _timed("warm", total, lambda: [cached.analyze_session(s) for s in sessions])
+
+    pooled = SQLLineageAnalyzer(args.dialect, cache=SQLLineageCache(max_entries=args.distinct))
+    _timed("pool", total, lambda: pooled.analyze_sessions(sessions, max_workers=args.workers))
+
+
+if __name__ == "__main__":
+    main()
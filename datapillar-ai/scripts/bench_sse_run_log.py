@@ -0,0 +1,211 @@
+# @author Sunny
+# @date 2026-01-27
+
+"""
+ETL SSE fan-out/reconnect benchmark:per-subscriber mapping(legacy) vs the run log
+
+One run of --events oneagentic events(tool calls with --payload-kb inputs) is watched by
+--subscribers SSE clients,then --reconnects clients come back with Last-Event-ID at the
+middle of the run.
+
+- legacy:    every subscriber reads the StreamManager and maps through adapt_sse_stream
+             on its own;a reconnect must reach the node running the session
+- memory:    the owner maps once into the in-process run log,subscribers read frames
+- redis:     owner on node A,every subscriber and reconnect on node B(fakeredis server,
+             shared by both nodes;skipped when fakeredis is not installed).The times
+             measure the in-process Redis emulator,map_calls and other_node are the
+             point of this mode
+
+Reports mapper calls,fan-out wall time,reconnect replay time and whether a reconnect on
+another node can resume.
+
+Usage:
+    python scripts/bench_sse_run_log.py --events 400 --subscribers 50 --reconnects 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from datapillar_oneagentic.core.types import SessionKey  # noqa: E402
+from datapillar_oneagentic.sse import StreamManager  # noqa: E402
+
+import src.modules.etl.sse_protocol as sse_protocol  # noqa: E402
+from src.modules.etl.run_log import MemoryRunStore, RunLog  # noqa: E402
+
+_KEY = SessionKey(namespace="etl_team_1", session_id="7:bench")
+_AGENT = {"id": "developer", "name": "Developer"}
+
+
+class _Request:
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+class _Orchestrator:
+    def __init__(self, args: argparse.Namespace) -> None:
+        self._args = args
+
+    async def stream(self, *, query: str | None, key: SessionKey, resume_value: Any = None):
+        blob = "x" * (self._args.payload_kb * 1024)
+        yield {"event": "agent.start", "agent": _AGENT, "data": {}}
+        for index in range(self._args.events - 2):
+            await asyncio.sleep(0)
+            yield {
+                "event": "tool.call",
+                "agent": _AGENT,
+                "data": {"tool": {"name": f"tool_{index}", "input": {"sql": blob}}},
+            }
+        yield {"event": "agent.end", "agent": _AGENT, "data": {"deliverable": {"summary": "ok"}}}
+
+
+class _MapCounter:
+    def __init__(self) -> None:
+        self.calls = 0
+        self._map_payload = sse_protocol._map_payload
+
+    def __call__(self, payload: dict[str, Any], state: Any) -> dict[str, Any] | None:
+        self.calls += 1
+        return self._map_payload(payload, state)
+
+
+async def _drain(frames: Any) -> int:
+    count = 0
+    async for _ in frames:
+        count += 1
+    return count
+
+
+async def _legacy(args: argparse.Namespace) -> dict[str, Any]:
+    manager = StreamManager(buffer_size=args.events * 2, subscriber_queue_size=args.events * 2)
+
+    def _subscriber(last_event_id: int | None = None):
+        return sse_protocol.adapt_sse_stream(
+            source=manager.subscribe(request=_Request(), key=_KEY, last_event_id=last_event_id),
+            run_id="run-bench",
+        )
+
+    start = time.perf_counter()
+    await manager.chat(orchestrator=_Orchestrator(args), query="bench", key=_KEY)
+    counts = await asyncio.gather(*(_drain(_subscriber()) for _ in range(args.subscribers)))
+    fan_out = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(args.reconnects):
+        await _drain(_subscriber(last_event_id=args.events // 2))
+    reconnect = time.perf_counter() - start
+    return {"frames": counts[0], "fan_out": fan_out, "reconnect": reconnect, "other_node": "no"}
+
+
+async def _run_log(args: argparse.Namespace, owner: RunLog, reader: RunLog) -> dict[str, Any]:
+    manager = StreamManager(buffer_size=args.events * 2, subscriber_queue_size=args.events * 2)
+    key = str(_KEY)
+
+    start = time.perf_counter()
+    run_id = await owner.start_run(key)
+    await manager.chat(orchestrator=_Orchestrator(args), query="bench", key=_KEY)
+    owner.publish(
+        key,
+        sse_protocol.adapt_sse_stream(
+            source=manager.subscribe(request=_Request(), key=_KEY, last_event_id=None),
+            run_id=run_id,
+        ),
+    )
+    counts = await asyncio.gather(*(_drain(reader.stream(key)) for _ in range(args.subscribers)))
+    fan_out = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(args.reconnects):
+        await _drain(reader.stream(key, last_event_id=args.events // 2))
+    reconnect = time.perf_counter() - start
+    other_node = "yes" if owner is not reader else "n/a"
+    return {
+        "frames": counts[0],
+        "fan_out": fan_out,
+        "reconnect": reconnect,
+        "other_node": other_node,
+    }
+
+
+async def _not_found(_key: str, _interrupt_id: str | None) -> bool:
+    return False
+
+
+async def _run(args: argparse.Namespace) -> None:
+    modes: list[tuple[str, Any]] = [("legacy", _legacy)]
+
+    async def _memory(args: argparse.Namespace) -> dict[str, Any]:
+        run_log = RunLog(abort_handler=_not_found, store=MemoryRunStore(max_frames=args.events * 2))
+        return await _run_log(args, run_log, run_log)
+
+    modes.append(("memory", _memory))
+    try:
+        import fakeredis
+    except ImportError:
+        fakeredis = None
+    if fakeredis is not None:
+
+        async def _redis(args: argparse.Namespace) -> dict[str, Any]:
+            server = fakeredis.FakeServer()
+            nodes = []
+            for node_id in ("node-a", "node-b"):
+                client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+
+                async def _client(client: Any = client) -> Any:
+                    return client
+
+                node = RunLog(abort_handler=_not_found, node_id=node_id, idle_seconds=0.05)
+                await node.start(client_factory=_client)
+                nodes.append(node)
+            try:
+                return await _run_log(args, nodes[0], nodes[1])
+            finally:
+                for node in nodes:
+                    await node.stop()
+
+        modes.append(("redis", _redis))
+
+    print(
+        f"events={args.events} payload={args.payload_kb}KB subscribers={args.subscribers} "
+        f"reconnects={args.reconnects}(Last-Event-ID={args.events // 2})"
+    )
+    print(
+        f"{'mode':<8} {'frames':>7} {'map_calls':>10} {'fan_out_ms':>11} "
+        f"{'reconnect_ms':>13} {'other_node':>11}"
+    )
+    for label, runner in modes:
+        counter = _MapCounter()
+        sse_protocol._map_payload = counter
+        try:
+            result = await runner(args)
+        finally:
+            sse_protocol._map_payload = counter._map_payload
+        print(
+            f"{label:<8} {result['frames']:>7} {counter.calls:>10} "
+            f"{result['fan_out'] * 1000:>11.1f} "
+            f"{result['reconnect'] / max(1, args.reconnects) * 1000:>13.2f} "
+            f"{result['other_node']:>11}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=400)
+    parser.add_argument("--payload-kb", type=int, default=2)
+    parser.add_argument("--subscribers", type=int, default=50)
+    parser.add_argument("--reconnects", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+# @author Sunny
+# @date 2026-01-28
+
+"""
+RAG ingestion job queue load test
+
+Runs several IngestionJobQueue "nodes" against a SQLite stand-in of
+knowledge_document_job (no MySQL or docker needed). SQLite has no SKIP LOCKED,
+so leasing runs in a BEGIN IMMEDIATE transaction, which gives the same
+"one job, one lease" guarantee by serializing writers.
+
+Scenario:
+- tenant 1 enqueues a large backlog first, other tenants enqueue after it
+- one node is killed mid-run (no lease release); its jobs must be re-leased
+  after lease expiry by the surviving nodes
+
+Usage:
+    python scripts/loadtest_rag_job_queue.py --nodes 3 --workers 4 --backlog 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.modules.rag.job_queue import IngestionJobQueue  # noqa: E402
+
+_SCHEMA = """
+CREATE TABLE knowledge_document_job (
+  job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  tenant_id INTEGER NOT NULL,
+  job_type TEXT NOT NULL DEFAULT 'chunk',
+  status TEXT NOT NULL DEFAULT 'queued',
+  attempts INTEGER NOT NULL DEFAULT 0,
+  lease_owner TEXT NULL,
+  lease_expires_at REAL NULL,
+  created_at REAL NOT NULL,
+  started_at REAL NULL,
+  finished_at REAL NULL,
+  completions INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX idx_job_queue ON knowledge_document_job (status, lease_expires_at, job_id);
+"""
+
+
+class SQLiteJobStore:
+    """SQLite stand-in for JobRepository's queue methods (same selection rules)."""
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._path, isolation_level=None, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, tenant_id: int, count: int) -> None:
+        now = time.time()
+        self._conn().executemany(
+            "INSERT INTO knowledge_document_job (tenant_id, created_at) VALUES (?, ?)",
+            [(tenant_id, now)] * count,
+        )
+
+    def lease_next(self, worker_id, lease_seconds, *, per_tenant_limit, scan_limit=32):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            running = {
+                row["tenant_id"]: row["running"]
+                for row in conn.execute(
+                    """
+                    SELECT tenant_id, COUNT(1) AS running FROM knowledge_document_job
+                    WHERE status = 'running' AND lease_expires_at >= ?
+                    GROUP BY tenant_id
+                    """,
+                    (now,),
+                )
+            }
+            saturated = [tenant for tenant, count in running.items() if count >= per_tenant_limit]
+            placeholders = ",".join("?" * len(saturated))
+            saturated_filter = f"AND tenant_id NOT IN ({placeholders})" if saturated else ""
+            eligible = conn.execute(
+                f"""
+                SELECT job_id, tenant_id FROM knowledge_document_job
+                WHERE (status = 'queued' OR (status = 'running' AND lease_expires_at < ?))
+                  {saturated_filter}
+                ORDER BY job_id LIMIT ?
+                """,
+                (now, *saturated, scan_limit),
+            ).fetchall()
+            if not eligible:
+                conn.execute("COMMIT")
+                return None
+            chosen = min(
+                eligible, key=lambda row: (running.get(row["tenant_id"], 0), row["job_id"])
+            )
+            conn.execute(
+                """
+                UPDATE knowledge_document_job
+                SET status = 'running', lease_owner = ?, lease_expires_at = ?,
+                    attempts = attempts + 1, started_at = COALESCE(started_at, ?)
+                WHERE job_id = ?
+                """,
+                (worker_id, now + lease_seconds, now, chosen["job_id"]),
+            )
+            row = conn.execute(
+                "SELECT * FROM knowledge_document_job WHERE job_id = ?", (chosen["job_id"],)
+            ).fetchone()
+            conn.execute("COMMIT")
+            return dict(row)
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def heartbeat(self, job_id, worker_id, lease_seconds) -> bool:
+        cursor = self._conn().execute(
+            """
+            UPDATE knowledge_document_job SET lease_expires_at = ?
+            WHERE job_id = ? AND status = 'running' AND lease_owner = ?
+            """,
+            (time.time() + lease_seconds, job_id, worker_id),
+        )
+        return cursor.rowcount == 1
+
+    def release(self, job_id, worker_id) -> None:
+        self._conn().execute(
+            """
+            UPDATE knowledge_document_job
+            SET status = 'queued', lease_owner = NULL, lease_expires_at = NULL
+            WHERE job_id = ? AND status = 'running' AND lease_owner = ?
+            """,
+            (job_id, worker_id),
+        )
+
+    def fail(self, job_id, worker_id, message, *, progress_seq=None) -> None:
+        self._conn().execute(
+            """
+            UPDATE knowledge_document_job
+            SET status = 'error', finished_at = ?, lease_owner = NULL
+            WHERE job_id = ? AND status = 'running' AND lease_owner = ?
+            """,
+            (time.time(), job_id, worker_id),
+        )
+
+    def mark_success(self, job_id: int, worker_id: str) -> None:
+        self._conn().execute(
+            """
+            UPDATE knowledge_document_job
+            SET status = 'success', finished_at = ?, lease_owner = NULL,
+                completions = completions + 1
+            WHERE job_id = ? AND lease_owner = ?
+            """,
+            (time.time(), job_id, worker_id),
+        )
+
+    def mark_error(self, job_id, tenant_id, message, *, worker_id, progress_seq=None) -> None:
+        self._conn().execute(
+            """
+            UPDATE knowledge_document_job SET status = 'error', lease_owner = NULL
+            WHERE job_id = ? AND lease_owner = ?
+            """,
+            (job_id, worker_id),
+        )
+
+    def rows(self) -> list[dict[str, Any]]:
+        return [dict(row) for row in self._conn().execute("SELECT * FROM knowledge_document_job")]
+
+
+def _crash(queue: IngestionJobQueue) -> None:
+    """Kill a node without releasing its leases (simulates a process crash)."""
+    queue._stopping = True
+    if queue._loop_task is not None:
+        queue._loop_task.cancel()
+    for task in list(queue._running.values()):
+        task.cancel()
+
+
+async def _run(args: argparse.Namespace) -> None:
+    logging.basicConfig(level=logging.ERROR)
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
+        db_path = tmp.name
+    store = SQLiteJobStore(db_path)
+    store.enqueue(tenant_id=1, count=args.backlog)
+    for tenant_id in range(2, args.tenants + 1):
+        store.enqueue(tenant_id=tenant_id, count=args.per_tenant)
+    total_jobs = args.backlog + args.per_tenant * (args.tenants - 1)
+
+    active = {"total": 0, "peak": 0}
+    tenant_active: dict[int, int] = {}
+    tenant_peak: dict[int, int] = {}
+    queues: list[IngestionJobQueue] = []
+
+    def _make_handler(worker_id_ref: list[str]):
+        async def _handler(job: dict[str, Any]) -> None:
+            tenant_id = job["tenant_id"]
+            active["total"] += 1
+            active["peak"] = max(active["peak"], active["total"])
+            tenant_active[tenant_id] = tenant_active.get(tenant_id, 0) + 1
+            tenant_peak[tenant_id] = max(tenant_peak.get(tenant_id, 0), tenant_active[tenant_id])
+            try:
+                await asyncio.sleep(random.uniform(args.job_ms * 0.5, args.job_ms * 1.5) / 1000)
+                await asyncio.to_thread(store.mark_success, job["job_id"], worker_id_ref[0])
+            finally:
+                active["total"] -= 1
+                tenant_active[tenant_id] -= 1
+
+        return _handler
+
+    for index in range(args.nodes):
+        worker_id_ref: list[str] = []
+        queue = IngestionJobQueue(
+            handler=_make_handler(worker_id_ref),
+            store=store,
+            workers=args.workers,
+            per_tenant_limit=args.per_tenant_limit,
+            lease_seconds=args.lease_seconds,
+            poll_interval_seconds=0.05,
+            worker_id=f"node-{index}",
+        )
+        worker_id_ref.append(queue.worker_id)
+        queues.append(queue)
+
+    start = time.time()
+    for queue in queues:
+        await queue.start()
+
+    crashed = False
+    while True:
+        rows = await asyncio.to_thread(store.rows)
+        done = sum(1 for row in rows if row["status"] in {"success", "error"})
+        if not crashed and done >= total_jobs // 3:
+            _crash(queues[0])
+            crashed = True
+        if done >= total_jobs:
+            break
+        await asyncio.sleep(0.05)
+    elapsed = time.time() - start
+
+    for queue in queues[1:]:
+        await queue.stop()
+
+    rows = store.rows()
+    waits: dict[int, list[float]] = {}
+    for row in rows:
+        waits.setdefault(row["tenant_id"], []).append(row["started_at"] - row["created_at"])
+
+    print(
+        f"nodes={args.nodes} workers/node={args.workers} per_tenant_limit={args.per_tenant_limit} "
+        f"jobs={total_jobs} job_ms~{args.job_ms}"
+    )
+    print(f"elapsed={elapsed:.2f}s throughput={total_jobs / elapsed:.1f} jobs/s")
+    print(
+        f"peak concurrency={active['peak']} (cap {args.nodes * args.workers}), "
+        f"peak per tenant={max(tenant_peak.values())} (cap {args.per_tenant_limit})"
+    )
+    print(
+        f"succeeded={sum(1 for row in rows if row['status'] == 'success')} "
+        f"re-leased after crash={sum(1 for row in rows if row['attempts'] > 1)} "
+        f"double-completed={sum(1 for row in rows if row['completions'] > 1)}"
+    )
+    print(f"{'tenant':<8} {'jobs':>6} {'p50 wait s':>11} {'max wait s':>11}")
+    for tenant_id in sorted(waits):
+        tenant_waits = waits[tenant_id]
+        print(
+            f"{tenant_id:<8} {len(tenant_waits):>6} {statistics.median(tenant_waits):>11.2f} "
+            f"{max(tenant_waits):>11.2f}"
+        )
+    Path(db_path).unlink(missing_ok=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--per-tenant-limit", type=int, default=4)
+    parser.add_argument("--tenants", type=int, default=5)
+    parser.add_argument("--backlog", type=int, default=300, help="tenant 1 backlog")
+    parser.add_argument("--per-tenant", type=int, default=30, help="jobs of other tenants")
+    parser.add_argument("--job-ms", type=float, default=40)
+    parser.add_argument("--lease-seconds", type=float, default=1.0)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,8 @@ from fastapi import APIRouter, Request
 from sqlalchemy import text
 
 from src.infrastructure.database import MySQLClient, Neo4jClient, RedisClient
+from src.infrastructure.llm.config import tenant_config_cache
+from src.infrastructure.llm.provider_pool import llm_provider_pool
 from src.shared.config.nacos_client import NacosRuntime
 
 logger = logging.getLogger(__name__)
@@ -33,8 +35,8 @@ async def health_check(request: Request) -> dict[str, object]:
         logger.warning("Neo4j Health check failed:%s", exc)
 
     try:
-        with MySQLClient.get_engine().connect() as conn:
-            conn.execute(text("SELECT 1"))
+        async with MySQLClient.aconnect() as conn:
+            await conn.execute(text("SELECT 1"))
         mysql_connected = True
     except Exception as exc:
         logger.warning("MySQL Health check failed:%s", exc)
@@ -57,4 +59,6 @@ async def health_check(request: Request) -> dict[str, object]:
             "mysql": mysql_connected,
             "redis": redis_connected,
         },
+        "pools": {"mysql": MySQLClient.pool_stats(), "llm_providers": llm_provider_pool.stats()},
+        "caches": {"llm_config": tenant_config_cache.stats()},
     }
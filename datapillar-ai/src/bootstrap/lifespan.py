@@ -15,7 +15,12 @@ from fastapi import FastAPI
 
 from src.infrastructure.database import AsyncNeo4jClient, MySQLClient, Neo4jClient, RedisClient
 from src.infrastructure.database.gravitino import GravitinoDBClient
-from src.shared.config.nacos_client import NacosRuntime, bootstrap_nacos
+from src.shared.config.nacos_client import (
+    NacosRuntime,
+    add_config_reload_hook,
+    bootstrap_nacos,
+    remove_config_reload_hook,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +42,7 @@ def create_lifespan(*, settings: Any):
             await _startup(app=app, settings=settings, resources=resources, etl_teams=etl_teams)
             yield
         finally:
-            await _shutdown(resources)
+            await _shutdown(app=app, resources=resources)
 
     return lifespan
 
@@ -70,6 +75,7 @@ async def _startup(
 
     logger.info("initialization MySQL connection pool...")
     MySQLClient.get_engine()
+    MySQLClient.get_async_engine()
 
     logger.info("initialization Neo4j connection pool...")
     Neo4jClient.get_driver()
@@ -80,19 +86,55 @@ async def _startup(
         raise RuntimeError("Redis Connection verification failed")
     logger.info("Redis Connection verification passed")
 
+    from src.infrastructure.llm.config import invalidate_llm_config, start_llm_config_listener
+
+    logger.info("initialization LLM config invalidation listener...")
+    await start_llm_config_listener()
+    add_config_reload_hook(invalidate_llm_config)
+
+    from src.modules.etl.api import start_etl_run_log, start_etl_team_pool
+
+    logger.info("initialization ETL run log...")
+    await start_etl_run_log()
+    start_etl_team_pool(app)
+
+    from src.infrastructure.repository.system.ai_model import start_llm_usage_writer
+
+    logger.info("initialization LLM usage writer...")
+    start_llm_usage_writer()
+
     logger.info("initialization Gravitino Database connection...")
     GravitinoDBClient.get_engine()
 
+    from src.modules.rag.job_queue import start_ingestion_queue
+
+    logger.info("initialization RAG ingestion job queue...")
+    await start_ingestion_queue()
+
     logger.info("FastAPI Application startup completed")
 
 
-async def _shutdown(resources: RuntimeResources) -> None:
+async def _shutdown(*, app: FastAPI, resources: RuntimeResources) -> None:
     logger.info("Datapillar AI - Closed...")
 
+    from src.infrastructure.keystore.crypto_service import local_crypto_service
+    from src.infrastructure.llm.config import invalidate_llm_config, stop_llm_config_listener
+    from src.infrastructure.repository.system.ai_model import stop_llm_usage_writer
+    from src.modules.etl.api import stop_etl_run_log, stop_etl_team_pool
+    from src.modules.rag.job_queue import stop_ingestion_queue
+
+    await stop_ingestion_queue()
+    await stop_etl_team_pool(app)
+    await stop_etl_run_log()
+    stop_llm_usage_writer()
+    remove_config_reload_hook(invalidate_llm_config)
+    await stop_llm_config_listener()
+    local_crypto_service.close()
     await RedisClient.close()
     await AsyncNeo4jClient.close()
     Neo4jClient.close()
     MySQLClient.close()
+    await MySQLClient.aclose()
     GravitinoDBClient.close()
     logger.info("All connection pools are closed")
 
@@ -5,44 +5,137 @@
 MySQL Database connection management
 
 provide MySQL connection pool（Based on SQLAlchemy）
+
+- get_engine():sync engine(pymysql),for worker threads and scripts
+- get_async_engine():async engine(aiomysql),request handlers use aconnect()/abegin()
+  so a query waits on the event loop instead of holding a to_thread worker
+
+Pool sizing:both pools report checkout metrics through pool_stats().If peak_checked_out
+reaches capacity and acquire_ms_max grows,raise mysql_pool_size/mysql_max_overflow;
+if peak_checked_out stays well below mysql_pool_size,lower it(MySQL max_connections is
+shared by every replica).
 """
 
+from __future__ import annotations
+
 import logging
+import threading
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
 
-from sqlalchemy import create_engine
-from sqlalchemy.pool import QueuePool
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+from sqlalchemy.pool import Pool, QueuePool
 
 from src.shared.config.exceptions import MySQLError
+from src.shared.config.runtime import get_mysql_pool_config
 from src.shared.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
 
+class PoolMetrics:
+    """Checkout counters of one connection pool(input for pool sizing)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._checked_out = 0
+        self._peak_checked_out = 0
+        self._checkouts = 0
+        self._connects = 0
+        self._acquires = 0
+        self._acquire_seconds_total = 0.0
+        self._acquire_seconds_max = 0.0
+        self._timeouts = 0
+
+    def attach(self, pool: Pool) -> None:
+        event.listen(pool, "connect", self._on_connect)
+        event.listen(pool, "checkout", self._on_checkout)
+        event.listen(pool, "checkin", self._on_checkin)
+
+    def _on_connect(self, *_args: Any) -> None:
+        with self._lock:
+            self._connects += 1
+
+    def _on_checkout(self, *_args: Any) -> None:
+        with self._lock:
+            self._checkouts += 1
+            self._checked_out += 1
+            self._peak_checked_out = max(self._peak_checked_out, self._checked_out)
+
+    def _on_checkin(self, *_args: Any) -> None:
+        with self._lock:
+            self._checked_out = max(self._checked_out - 1, 0)
+
+    def record_acquire(self, seconds: float) -> None:
+        with self._lock:
+            self._acquires += 1
+            self._acquire_seconds_total += seconds
+            self._acquire_seconds_max = max(self._acquire_seconds_max, seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self._timeouts += 1
+
+    def snapshot(self, pool: Pool) -> dict[str, Any]:
+        queue_pool = isinstance(pool, QueuePool)
+        size = int(pool.size()) if queue_pool else 0
+        overflow = max(int(pool.overflow()), 0) if queue_pool else 0
+        max_overflow = max(int(getattr(pool, "_max_overflow", 0)), 0)
+        with self._lock:
+            acquires = self._acquires
+            return {
+                "pool_size": size,
+                "max_overflow": max_overflow,
+                "checked_out": self._checked_out,
+                "peak_checked_out": self._peak_checked_out,
+                "overflow": overflow,
+                "checkouts": self._checkouts,
+                "connects": self._connects,
+                "timeouts": self._timeouts,
+                "acquire_ms_avg": (
+                    round(self._acquire_seconds_total / acquires * 1000, 3) if acquires else 0.0
+                ),
+                "acquire_ms_max": round(self._acquire_seconds_max * 1000, 3),
+            }
+
+
 class MySQLClient:
     """MySQL connection pool manager（use SQLAlchemy）"""
 
     _engine = None
+    _async_engine: AsyncEngine | None = None
+    _metrics: dict[str, PoolMetrics] = {}
+
+    @staticmethod
+    def _url(driver: str) -> str:
+        return (
+            f"mysql+{driver}://{settings.mysql_username}:{settings.mysql_password}"
+            f"@{settings.mysql_host}:{settings.mysql_port}/{settings.mysql_database}"
+            f"?charset=utf8mb4"
+        )
 
     @classmethod
     def get_engine(cls):
         """Get SQLAlchemy Engine（Global singleton connection pool）"""
         if cls._engine is None:
-            db_url = (
-                f"mysql+pymysql://{settings.mysql_username}:{settings.mysql_password}"
-                f"@{settings.mysql_host}:{settings.mysql_port}/{settings.mysql_database}"
-                f"?charset=utf8mb4"
-            )
+            pool_size, max_overflow = get_mysql_pool_config()
             try:
                 cls._engine = create_engine(
-                    db_url,
+                    cls._url("pymysql"),
                     poolclass=QueuePool,
-                    pool_size=10,
-                    max_overflow=20,
+                    pool_size=pool_size,
+                    max_overflow=max_overflow,
                     pool_pre_ping=True,
                     pool_recycle=3600,
                     pool_timeout=30,
                     echo=False,
                 )
+                cls._metrics["sync"] = PoolMetrics()
+                cls._metrics["sync"].attach(cls._engine.pool)
                 logger.info(
                     f"MySQL The connection pool has been initialized: {settings.mysql_host}:{settings.mysql_port}/{settings.mysql_database}"
                 )
@@ -51,10 +144,96 @@ class MySQLClient:
                 raise MySQLError(f"MySQL Connection pool initialization failed: {e}") from e
         return cls._engine
 
+    @classmethod
+    def get_async_engine(cls) -> AsyncEngine:
+        """Get async Engine(aiomysql,global singleton connection pool)"""
+        if cls._async_engine is None:
+            pool_size, max_overflow = get_mysql_pool_config()
+            try:
+                engine = create_async_engine(
+                    cls._url("aiomysql"),
+                    pool_size=pool_size,
+                    max_overflow=max_overflow,
+                    pool_pre_ping=True,
+                    pool_recycle=3600,
+                    pool_timeout=30,
+                    echo=False,
+                )
+            except Exception as e:
+                logger.error(f"MySQL Async connection pool initialization failed: {e}")
+                raise MySQLError(f"MySQL Async connection pool initialization failed: {e}") from e
+            cls.use_async_engine(engine)
+            logger.info(
+                "MySQL Async connection pool has been initialized: pool_size=%s max_overflow=%s",
+                pool_size,
+                max_overflow,
+            )
+        return cls._async_engine
+
+    @classmethod
+    def use_async_engine(cls, engine: AsyncEngine) -> None:
+        """Install the async engine(load tests and tests point it at aiosqlite)."""
+        metrics = PoolMetrics()
+        metrics.attach(engine.sync_engine.pool)
+        cls._async_engine = engine
+        cls._metrics["async"] = metrics
+
+    @classmethod
+    @asynccontextmanager
+    async def aconnect(cls) -> AsyncIterator[AsyncConnection]:
+        """Async connection(read paths),the pool wait is recorded in pool_stats()."""
+        engine = cls.get_async_engine()
+        async with cls._acquire(engine.connect()) as conn:
+            yield conn
+
+    @classmethod
+    @asynccontextmanager
+    async def abegin(cls) -> AsyncIterator[AsyncConnection]:
+        """Async connection in a transaction(commit on exit,rollback on error)."""
+        engine = cls.get_async_engine()
+        async with cls._acquire(engine.begin()) as conn:
+            yield conn
+
+    @classmethod
+    @asynccontextmanager
+    async def _acquire(cls, context) -> AsyncIterator[AsyncConnection]:
+        metrics = cls._metrics["async"]
+        acquired = False
+        start = time.perf_counter()
+        try:
+            async with context as conn:
+                acquired = True
+                metrics.record_acquire(time.perf_counter() - start)
+                yield conn
+        except PoolTimeoutError:
+            if not acquired:
+                metrics.record_timeout()
+            raise
+
+    @classmethod
+    def pool_stats(cls) -> dict[str, dict[str, Any]]:
+        """Checkout metrics of the initialized pools(sync/async)."""
+        stats: dict[str, dict[str, Any]] = {}
+        if cls._engine is not None:
+            stats["sync"] = cls._metrics["sync"].snapshot(cls._engine.pool)
+        if cls._async_engine is not None:
+            stats["async"] = cls._metrics["async"].snapshot(cls._async_engine.sync_engine.pool)
+        return stats
+
     @classmethod
     def close(cls):
         """Close connection pool"""
         if cls._engine:
+            logger.info("MySQL Connection pool stats: %s", cls.pool_stats().get("sync"))
             cls._engine.dispose()
             cls._engine = None
             logger.info("MySQL Connection pool is closed")
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close async connection pool"""
+        if cls._async_engine is not None:
+            logger.info("MySQL Async connection pool stats: %s", cls.pool_stats().get("async"))
+            await cls._async_engine.dispose()
+            cls._async_engine = None
+            logger.info("MySQL Async connection pool is closed")
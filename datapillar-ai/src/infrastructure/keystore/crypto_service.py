@@ -1,15 +1,32 @@
 # @author Sunny
 # @date 2026-03-05
 
-"""Local crypto service based on tenant private keys."""
+"""Local crypto service based on tenant private keys.
+
+Performance:
+- Parsed private keys are cached per tenant.The PEM is re-read every
+  key_recheck_seconds and compared by fingerprint,so a rotated key replaces the
+  cached one(and drops that tenant's secrets)without a restart.A ciphertext the
+  cached key cannot open forces an immediate re-check.
+- Decrypted secrets are cached for secret_ttl_seconds,keyed by sha256(tenant,ciphertext).
+  Values are held only in memory as bytearrays and zeroized on eviction.
+- The async path runs RSA work on one shared thread pool;the sync path decrypts
+  on the calling thread instead of spinning up a thread and event loop per call.
+"""
 
 from __future__ import annotations
 
 import asyncio
 import base64
 import binascii
+import hashlib
 import threading
-from typing import Any
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
 
 from cryptography.exceptions import InvalidTag, UnsupportedAlgorithm
 from cryptography.hazmat.primitives import hashes, serialization
@@ -22,28 +39,167 @@ from src.shared.exception import BadRequestException
 _ENCRYPTED_VALUE_PREFIX = "ENCv1:"
 _GCM_NONCE_BYTES = 12
 
+DEFAULT_SECRET_TTL_SECONDS = 60.0
+DEFAULT_MAX_SECRETS = 1024
+DEFAULT_KEY_RECHECK_SECONDS = 60.0
+DEFAULT_MAX_WORKERS = 4
+
+
+@dataclass
+class _TenantKey:
+    private_key: rsa.RSAPrivateKey
+    fingerprint: bytes
+    checked_at: float
+
+
+@dataclass
+class _CachedSecret:
+    tenant_code: str
+    value: bytearray
+    expires_at: float
+
+
+def _zeroize(buffer: bytearray) -> None:
+    buffer[:] = bytes(len(buffer))
+
 
 class LocalCryptoService:
     """Tenant secret decryption service."""
 
+    def __init__(
+        self,
+        *,
+        secret_ttl_seconds: float = DEFAULT_SECRET_TTL_SECONDS,
+        max_secrets: int = DEFAULT_MAX_SECRETS,
+        key_recheck_seconds: float = DEFAULT_KEY_RECHECK_SECONDS,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._secret_ttl_seconds = secret_ttl_seconds
+        self._max_secrets = max_secrets
+        self._key_recheck_seconds = key_recheck_seconds
+        self._max_workers = max_workers
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._keys: dict[str, _TenantKey] = {}
+        # Insertion order == expiry order(fixed TTL,no reordering on hit).
+        self._secrets: OrderedDict[bytes, _CachedSecret] = OrderedDict()
+        self._executor: ThreadPoolExecutor | None = None
+        self._stats = {
+            "secret_hits": 0,
+            "secret_misses": 0,
+            "key_loads": 0,
+            "key_parses": 0,
+            "rotations": 0,
+        }
+
     async def decrypt_key_async(self, *, tenant_code: str, ciphertext: str) -> str:
-        return self._decrypt_key(tenant_code=tenant_code, ciphertext=ciphertext)
+        normalized_tenant_code, digest, cached = self._lookup(tenant_code, ciphertext)
+        if cached is not None:
+            return cached
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(),
+            partial(self._decrypt_miss, normalized_tenant_code, digest, ciphertext),
+        )
 
     def decrypt_key(self, *, tenant_code: str, ciphertext: str) -> str:
-        coroutine = self.decrypt_key_async(tenant_code=tenant_code, ciphertext=ciphertext)
-        try:
-            asyncio.get_running_loop()
-        except RuntimeError:
-            return asyncio.run(coroutine)
-        return self._run_coroutine_in_thread(coroutine)
+        return self._decrypt_key(tenant_code=tenant_code, ciphertext=ciphertext)
+
+    def invalidate(self, tenant_code: str | None = None) -> None:
+        """Drop cached keys and secrets for one tenant,or for all tenants"""
+        with self._lock:
+            if tenant_code is None:
+                self._keys.clear()
+                self._purge_secrets_locked(None)
+            else:
+                normalized = str(tenant_code).strip()
+                self._keys.pop(normalized, None)
+                self._purge_secrets_locked(normalized)
+
+    def close(self) -> None:
+        self.invalidate()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"tenants": len(self._keys), "secrets": len(self._secrets), **self._stats}
 
     def _decrypt_key(self, *, tenant_code: str, ciphertext: str) -> str:
+        normalized_tenant_code, digest, cached = self._lookup(tenant_code, ciphertext)
+        if cached is not None:
+            return cached
+        return self._decrypt_miss(normalized_tenant_code, digest, ciphertext)
+
+    def _lookup(self, tenant_code: str, ciphertext: str) -> tuple[str, bytes, str | None]:
         normalized_tenant_code = self._validate_tenant_code(tenant_code)
+        digest = hashlib.sha256(
+            f"{normalized_tenant_code}\0{str(ciphertext or '').strip()}".encode()
+        ).digest()
+        now = self._clock()
+        with self._lock:
+            self._expire_secrets_locked(now)
+            entry = self._secrets.get(digest)
+            if entry is None:
+                self._stats["secret_misses"] += 1
+                return normalized_tenant_code, digest, None
+            self._stats["secret_hits"] += 1
+            return normalized_tenant_code, digest, entry.value.decode("utf-8")
+
+    def _decrypt_miss(self, tenant_code: str, digest: bytes, ciphertext: str) -> str:
         payload = self._decode_payload(ciphertext)
+        tenant_key = self._get_tenant_key(tenant_code)
+        try:
+            plaintext = self._decrypt_with_key(tenant_key.private_key, payload)
+        except BadRequestException:
+            # Possibly encrypted with a key rotated since the last re-check.
+            refreshed = self._get_tenant_key(tenant_code, force=True)
+            if refreshed is tenant_key:
+                raise
+            plaintext = self._decrypt_with_key(refreshed.private_key, payload)
+        self._put_secret(digest, tenant_code, plaintext)
+        return plaintext
 
-        private_key_pem = get_key_storage().load_private_key(normalized_tenant_code)
-        private_key = self._load_private_key(private_key_pem)
+    def _get_tenant_key(self, tenant_code: str, *, force: bool = False) -> _TenantKey:
+        now = self._clock()
+        with self._lock:
+            current = self._keys.get(tenant_code)
+            if (
+                current is not None
+                and not force
+                and now - current.checked_at < self._key_recheck_seconds
+            ):
+                return current
 
+        private_key_pem = get_key_storage().load_private_key(tenant_code)
+        fingerprint = hashlib.sha256(private_key_pem).digest()
+        with self._lock:
+            self._stats["key_loads"] += 1
+            current = self._keys.get(tenant_code)
+            if current is not None and current.fingerprint == fingerprint:
+                current.checked_at = now
+                return current
+
+        tenant_key = _TenantKey(
+            private_key=self._load_private_key(private_key_pem),
+            fingerprint=fingerprint,
+            checked_at=now,
+        )
+        with self._lock:
+            self._stats["key_parses"] += 1
+            current = self._keys.get(tenant_code)
+            if current is not None and current.fingerprint == fingerprint:
+                return current
+            if current is not None:
+                self._stats["rotations"] += 1
+                self._purge_secrets_locked(tenant_code)
+            self._keys[tenant_code] = tenant_key
+        return tenant_key
+
+    def _decrypt_with_key(self, private_key: rsa.RSAPrivateKey, payload: bytes) -> str:
         encrypted_key_length = private_key.key_size // 8
         if len(payload) <= encrypted_key_length + _GCM_NONCE_BYTES:
             raise BadRequestException("api_key invalid encryption format")
@@ -60,6 +216,48 @@ class LocalCryptoService:
             raise BadRequestException("api_key invalid encryption format")
         return normalized_plaintext
 
+    def _put_secret(self, digest: bytes, tenant_code: str, plaintext: str) -> None:
+        if self._max_secrets <= 0 or self._secret_ttl_seconds <= 0:
+            return
+        entry = _CachedSecret(
+            tenant_code=tenant_code,
+            value=bytearray(plaintext.encode("utf-8")),
+            expires_at=self._clock() + self._secret_ttl_seconds,
+        )
+        with self._lock:
+            previous = self._secrets.pop(digest, None)
+            if previous is not None:
+                _zeroize(previous.value)
+            self._secrets[digest] = entry
+            while len(self._secrets) > self._max_secrets:
+                _, evicted = self._secrets.popitem(last=False)
+                _zeroize(evicted.value)
+
+    def _expire_secrets_locked(self, now: float) -> None:
+        while self._secrets:
+            digest, entry = next(iter(self._secrets.items()))
+            if entry.expires_at > now:
+                return
+            del self._secrets[digest]
+            _zeroize(entry.value)
+
+    def _purge_secrets_locked(self, tenant_code: str | None) -> None:
+        for digest in [
+            digest
+            for digest, entry in self._secrets.items()
+            if tenant_code is None or entry.tenant_code == tenant_code
+        ]:
+            _zeroize(self._secrets.pop(digest).value)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="keystore-decrypt",
+                )
+            return self._executor
+
     def _decode_payload(self, ciphertext: str) -> bytes:
         normalized_ciphertext = str(ciphertext or "").strip()
         if not normalized_ciphertext:
@@ -111,24 +309,6 @@ class LocalCryptoService:
             raise BadRequestException("tenant_code invalid")
         return normalized
 
-    def _run_coroutine_in_thread(self, coroutine: Any) -> Any:
-        result: dict[str, Any] = {}
-        error: dict[str, BaseException] = {}
-
-        def _runner() -> None:
-            try:
-                result["value"] = asyncio.run(coroutine)
-            except BaseException as exc:  # pragma: no cover - defense branch
-                error["value"] = exc
-
-        thread = threading.Thread(target=_runner, daemon=True)
-        thread.start()
-        thread.join()
-
-        if "value" in error:
-            raise error["value"]
-        return result.get("value")
-
 
 def is_encrypted_ciphertext(value: str | None) -> bool:
     return bool(value and value.startswith(_ENCRYPTED_VALUE_PREFIX))
@@ -6,19 +6,31 @@ OneAgentic Configuration builder
 
 from ai_model Read enabled Chat/Embedding model,and merge the business side llm/agent Configuration.DEPRECATED:- This file is only reserved for historical link compatibility
 - ETL `/chat` New links no longer rely on this file
+
+Tenant configs are cached in tenant_config_cache(see config_cache.py):versioned by the
+tenant's ai_model rows,refreshed stale-while-revalidate and invalidated through Redis
+pub/sub(publish_llm_config_invalidation) or a Nacos config reload(invalidate_llm_config).
 """
 
 from __future__ import annotations
 
 from copy import deepcopy
-from functools import lru_cache
 
 from datapillar_oneagentic import DatapillarConfig
 
+from src.infrastructure.database import RedisClient
 from src.infrastructure.keystore.crypto_service import (
     is_encrypted_ciphertext,
     local_crypto_service,
 )
+from src.infrastructure.llm.config_cache import (
+    ALL_TENANTS,
+    CONFIG_INVALIDATION_CHANNEL,
+    ConfigInvalidationListener,
+    TenantConfigCache,
+    TenantConfigEntry,
+)
+from src.infrastructure.llm.provider_pool import llm_provider_pool
 from src.infrastructure.repository.system.ai_model import Model
 from src.infrastructure.repository.system.tenant import Tenant
 from src.shared.config.runtime import get_agent_config, get_default_tenant_id, get_llm_config
@@ -34,24 +46,83 @@ def _coerce_dict(value: object) -> dict[str, object]:
     return {}
 
 
-@lru_cache(maxsize=128)
 def get_datapillar_config(
     tenant_id: int | None = None, tenant_code: str | None = None
 ) -> DatapillarConfig:
+    return get_datapillar_config_entry(tenant_id, tenant_code).config
+
+
+def get_datapillar_config_entry(
+    tenant_id: int | None = None, tenant_code: str | None = None
+) -> TenantConfigEntry:
+    """Cached config plus its version/revision(for callers that derive objects from it)."""
     resolved_tenant_id = tenant_id or get_default_tenant_id()
-    resolved_tenant_code = _resolve_tenant_code(resolved_tenant_id, tenant_code)
+    return tenant_config_cache.get(resolved_tenant_id, tenant_code)
+
+
+def invalidate_llm_config(tenant_id: int | None = None) -> None:
+    """Drop cached configs and pooled providers of one tenant,or of every tenant."""
+    tenant_config_cache.invalidate(tenant_id)
+    if tenant_id is None:
+        llm_provider_pool.clear()
+    else:
+        llm_provider_pool.invalidate(tenant_id)
+
+
+async def publish_llm_config_invalidation(tenant_id: int | None = None) -> None:
+    """Tell every process to drop the cached config of a tenant(None:all tenants)."""
+    client = (await RedisClient.get_instance()).client
+    message = ALL_TENANTS if tenant_id is None else str(tenant_id)
+    await client.publish(CONFIG_INVALIDATION_CHANNEL, message)
+
+
+async def _redis_client():
+    return (await RedisClient.get_instance()).client
+
+
+_invalidation_listener: ConfigInvalidationListener | None = None
 
-    chat_model = Model.get_chat_default(resolved_tenant_id)
+
+async def start_llm_config_listener() -> ConfigInvalidationListener:
+    global _invalidation_listener
+    if _invalidation_listener is None:
+        _invalidation_listener = ConfigInvalidationListener(
+            client_factory=_redis_client,
+            on_invalidate=invalidate_llm_config,
+        )
+        await _invalidation_listener.start()
+    return _invalidation_listener
+
+
+async def stop_llm_config_listener() -> None:
+    global _invalidation_listener
+    if _invalidation_listener is not None:
+        await _invalidation_listener.stop()
+        _invalidation_listener = None
+    tenant_config_cache.close()
+
+
+def _build_tenant_config(tenant_id: int, tenant_code: str | None) -> DatapillarConfig:
+    resolved_tenant_code = _resolve_tenant_code(tenant_id, tenant_code)
+
+    chat_model = Model.get_chat_default(tenant_id)
     if not chat_model:
         raise ValueError("Enabled not found Chat model,please check ai_model Configuration")
 
     return _build_config_from_models(
-        tenant_id=resolved_tenant_id,
+        tenant_id=tenant_id,
         tenant_code=resolved_tenant_code,
         chat_model=chat_model,
     )
 
 
+def _config_version(tenant_id: int) -> str | None:
+    return Model.get_config_version(tenant_id)
+
+
+tenant_config_cache = TenantConfigCache(build=_build_tenant_config, version_of=_config_version)
+
+
 def get_config_by_model(
     *,
     tenant_id: int,
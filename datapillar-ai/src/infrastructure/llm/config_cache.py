@@ -0,0 +1,289 @@
+# @author Sunny
+# @date 2026-02-21
+
+"""
+Tenant DatapillarConfig cache
+
+Replaces the lru_cache on get_datapillar_config:bounded per tenant,versioned and
+invalidatable without a restart.
+
+- every entry carries the version stamp of the tenant's ai_model rows it was built from
+- fresh_seconds after a build(or a successful check) the entry is served as is
+- after that it is served stale while one background thread re-reads the version
+  stamp:same stamp just marks the entry fresh again,a new stamp rebuilds the config
+  (MySQL lookups + key decryption happen only then)
+- an entry older than max_stale_seconds is revalidated on the calling thread
+- invalidate() drops one tenant(or all of them) right away;a build that was running
+  when the tenant was invalidated is returned to its caller but not cached
+- ConfigInvalidationListener pushes invalidations from Redis pub/sub so every process
+  picks up a model change immediately instead of after fresh_seconds
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from datapillar_oneagentic import DatapillarConfig
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FRESH_SECONDS = 30.0
+DEFAULT_MAX_STALE_SECONDS = 600.0
+DEFAULT_MAX_TENANTS = 1024
+CONFIG_INVALIDATION_CHANNEL = "datapillar:ai_model:invalidate"
+ALL_TENANTS = "*"
+
+ConfigBuilder = Callable[[int, str | None], DatapillarConfig]
+VersionLoader = Callable[[int], str | None]
+
+
+@dataclass(frozen=True, slots=True)
+class TenantConfigEntry:
+    config: DatapillarConfig
+    version: str | None
+    # Unique per build:holders of objects derived from the config(providers) key on it.
+    revision: int
+
+
+@dataclass(slots=True)
+class _CachedConfig:
+    entry: TenantConfigEntry
+    tenant_code: str | None
+    checked_at: float
+
+
+class TenantConfigCache:
+    """Stale-while-revalidate cache of DatapillarConfig per tenant."""
+
+    def __init__(
+        self,
+        *,
+        build: ConfigBuilder,
+        version_of: VersionLoader,
+        fresh_seconds: float = DEFAULT_FRESH_SECONDS,
+        max_stale_seconds: float = DEFAULT_MAX_STALE_SECONDS,
+        max_tenants: int = DEFAULT_MAX_TENANTS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._build = build
+        self._version_of = version_of
+        self._fresh_seconds = fresh_seconds
+        self._max_stale_seconds = max(max_stale_seconds, fresh_seconds)
+        self._max_tenants = max_tenants
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._configs: OrderedDict[int, _CachedConfig] = OrderedDict()
+        self._refreshing: set[int] = set()
+        self._epoch = 0
+        self._generations: dict[int, int] = {}
+        self._revision = 0
+        self._executor: ThreadPoolExecutor | None = None
+        self._stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "revalidations": 0,
+            "rebuilds": 0,
+            "refresh_errors": 0,
+            "invalidations": 0,
+        }
+
+    def get(self, tenant_id: int, tenant_code: str | None = None) -> TenantConfigEntry:
+        now = self._clock()
+        with self._lock:
+            cached = self._configs.get(tenant_id)
+            if cached is not None:
+                age = now - cached.checked_at
+                if age < self._max_stale_seconds:
+                    self._configs.move_to_end(tenant_id)
+                    if age < self._fresh_seconds:
+                        self._stats["hits"] += 1
+                        return cached.entry
+                    self._stats["stale_hits"] += 1
+                    schedule = tenant_id not in self._refreshing
+                    if schedule:
+                        self._refreshing.add(tenant_id)
+                    entry = cached.entry
+                else:
+                    cached.tenant_code = tenant_code or cached.tenant_code
+                    entry = None
+            else:
+                self._stats["misses"] += 1
+                entry = None
+
+        if entry is not None:
+            if schedule:
+                self._get_executor().submit(self._refresh_in_background, tenant_id)
+            return entry
+        return self._refresh(tenant_id, tenant_code, cached)
+
+    def invalidate(self, tenant_id: int | None = None) -> None:
+        """Drop one tenant(or every tenant);the next get() rebuilds on the calling thread."""
+        with self._lock:
+            self._stats["invalidations"] += 1
+            if tenant_id is None:
+                self._epoch += 1
+                self._configs.clear()
+            else:
+                self._generations[tenant_id] = self._generations.get(tenant_id, 0) + 1
+                self._configs.pop(tenant_id, None)
+
+    def clear(self) -> None:
+        self.invalidate()
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            served = self._stats["hits"] + self._stats["stale_hits"]
+            lookups = served + self._stats["misses"]
+            return {
+                "tenants": len(self._configs),
+                **self._stats,
+                "hit_rate": round(served / lookups, 4) if lookups else 0.0,
+            }
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=2, thread_name_prefix="llm-config-refresh"
+                )
+            return self._executor
+
+    def _refresh_in_background(self, tenant_id: int) -> None:
+        try:
+            with self._lock:
+                cached = self._configs.get(tenant_id)
+            if cached is not None:
+                self._refresh(tenant_id, cached.tenant_code, cached)
+        except Exception as exc:
+            with self._lock:
+                self._stats["refresh_errors"] += 1
+            logger.warning("Refresh LLM config failed:tenant=%s err=%s", tenant_id, exc)
+        finally:
+            with self._lock:
+                self._refreshing.discard(tenant_id)
+
+    def _refresh(
+        self, tenant_id: int, tenant_code: str | None, current: _CachedConfig | None
+    ) -> TenantConfigEntry:
+        with self._lock:
+            generation = (self._epoch, self._generations.get(tenant_id, 0))
+
+        version = self._version_of(tenant_id)
+        if current is not None and version is not None and version == current.entry.version:
+            with self._lock:
+                self._stats["revalidations"] += 1
+                if self._configs.get(tenant_id) is current:
+                    current.checked_at = self._clock()
+            return current.entry
+
+        config = self._build(tenant_id, tenant_code)
+        with self._lock:
+            self._stats["rebuilds"] += 1
+            self._revision += 1
+            entry = TenantConfigEntry(config=config, version=version, revision=self._revision)
+            if generation == (self._epoch, self._generations.get(tenant_id, 0)):
+                self._configs[tenant_id] = _CachedConfig(
+                    entry=entry,
+                    tenant_code=tenant_code or (current.tenant_code if current else None),
+                    checked_at=self._clock(),
+                )
+                self._configs.move_to_end(tenant_id)
+                while len(self._configs) > self._max_tenants:
+                    self._configs.popitem(last=False)
+        if current is not None:
+            logger.info(
+                "LLM config rebuilt:tenant=%s version=%s->%s",
+                tenant_id,
+                current.entry.version,
+                version,
+            )
+        return entry
+
+
+class ConfigInvalidationListener:
+    """Redis pub/sub subscriber:a message is a tenant id,or '*' for every tenant.
+
+    After a (re)connect everything is invalidated,since messages published while the
+    subscription was down are lost.
+    """
+
+    def __init__(
+        self,
+        *,
+        client_factory: Callable[[], Awaitable[Any]],
+        on_invalidate: Callable[[int | None], None],
+        channel: str = CONFIG_INVALIDATION_CHANNEL,
+        retry_seconds: float = 5.0,
+    ) -> None:
+        self._client_factory = client_factory
+        self._on_invalidate = on_invalidate
+        self._channel = channel
+        self._retry_seconds = retry_seconds
+        self._task: asyncio.Task[None] | None = None
+        self._subscribed = asyncio.Event()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="llm-config-invalidation")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    async def wait_subscribed(self) -> None:
+        await self._subscribed.wait()
+
+    def handle(self, data: Any) -> None:
+        value = data.decode("utf-8") if isinstance(data, bytes) else str(data)
+        value = value.strip()
+        if value == ALL_TENANTS:
+            self._on_invalidate(None)
+            return
+        try:
+            tenant_id = int(value)
+        except ValueError:
+            logger.warning("Ignore LLM config invalidation message:%r", value)
+            return
+        self._on_invalidate(tenant_id)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                client = await self._client_factory()
+                pubsub = client.pubsub()
+                try:
+                    await pubsub.subscribe(self._channel)
+                    self._on_invalidate(None)
+                    self._subscribed.set()
+                    async for message in pubsub.listen():
+                        if message.get("type") == "message":
+                            self.handle(message.get("data"))
+                finally:
+                    self._subscribed.clear()
+                    with contextlib.suppress(Exception):
+                        await pubsub.unsubscribe(self._channel)
+                        await pubsub.aclose()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("LLM config invalidation subscription lost:%s", exc)
+            await asyncio.sleep(self._retry_seconds)
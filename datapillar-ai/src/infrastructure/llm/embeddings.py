@@ -4,9 +4,18 @@
 """
 Embedding Integration layer
 
-Unify the framework EmbeddingProvider."""
+Unify the framework EmbeddingProvider.
 
+Query embeddings are memoized per tenant (bounded LRU with TTL): one request
+usually searches several indexes with the same text, and concurrent async
+callers asking for the same text share a single provider call."""
+
+import asyncio
 import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
 from functools import lru_cache
 
 from datapillar_oneagentic.providers.llm import EmbeddingProvider
@@ -33,6 +42,93 @@ def _get_embeddings(tenant_id: int):
     return _get_embedding_provider(tenant_id).get_embeddings()
 
 
+_QUERY_MEMO_MAX_SIZE = 1024
+_QUERY_MEMO_TTL_SECONDS = 600.0
+
+
+class QueryEmbeddingMemo:
+    """Bounded TTL memo of query text -> vector, with async in-flight dedupe"""
+
+    def __init__(
+        self,
+        *,
+        max_size: int = _QUERY_MEMO_MAX_SIZE,
+        ttl_seconds: float = _QUERY_MEMO_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_size = max(1, max_size)
+        self._ttl = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, tuple[float, ...]]] = OrderedDict()
+        self._inflight: dict[tuple[int, str], asyncio.Future[tuple[float, ...]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, text: str) -> list[float] | None:
+        with self._lock:
+            entry = self._entries.get(text)
+            if entry is None:
+                return None
+            expires_at, vector = entry
+            if expires_at <= self._clock():
+                del self._entries[text]
+                return None
+            self._entries.move_to_end(text)
+            return list(vector)
+
+    def put(self, text: str, vector: list[float]) -> None:
+        with self._lock:
+            self._entries[text] = (self._clock() + self._ttl, tuple(vector))
+            self._entries.move_to_end(text)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    async def aget_or_compute(
+        self, text: str, compute: Callable[[], Awaitable[list[float]]]
+    ) -> list[float]:
+        """Return the memoized vector, or compute it once for all concurrent callers"""
+        cached = self.get(text)
+        if cached is not None:
+            return cached
+
+        loop = asyncio.get_running_loop()
+        key = (id(loop), text)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            try:
+                return list(await asyncio.shield(pending))
+            except asyncio.CancelledError:
+                # The owner was cancelled, not us: compute it ourselves.
+                if not pending.cancelled():
+                    raise
+
+        future: asyncio.Future[tuple[float, ...]] = loop.create_future()
+        self._inflight[key] = future
+        try:
+            vector = list(await compute())
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Waiters re-raise it; mark it retrieved so an unshared failure is not logged.
+            future.exception()
+            raise
+        else:
+            self.put(text, vector)
+            future.set_result(tuple(vector))
+            return vector
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+
 class UnifiedEmbedder(Embedder):
     """
     unify Embedder(realize neo4j-graphrag of Embedder interface)
@@ -63,6 +159,7 @@ class UnifiedEmbedder(Embedder):
         self.model_name = config.model
         self.dimension = config.dimension
         self._embeddings = _get_embeddings(resolved_tenant_id)
+        self.query_memo = QueryEmbeddingMemo()
         self._initialized = True
         logger.info(
             "UnifiedEmbedder Initialization completed:%s,tenant_id=%s",
@@ -71,8 +168,21 @@ class UnifiedEmbedder(Embedder):
         )
 
     def embed_query(self, text: str) -> list[float]:
-        """Generate vector embeddings for a single query"""
-        return list(self._embeddings.embed_query(text))
+        """Generate vector embeddings for a single query(memoized)"""
+        cached = self.query_memo.get(text)
+        if cached is not None:
+            return cached
+        vector = list(self._embeddings.embed_query(text))
+        self.query_memo.put(text, vector)
+        return vector
+
+    async def async_embed_query(self, text: str) -> list[float]:
+        """Asynchronously embed a single query(memoized,concurrent callers share one call)"""
+
+        async def _compute() -> list[float]:
+            return list(await self._embeddings.aembed_query(text))
+
+        return await self.query_memo.aget_or_compute(text, _compute)
 
     def embed_batch(self, texts: list[str]) -> list[list[float]]:
         """Generate vector embeddings in batches"""
@@ -80,3 +190,10 @@ class UnifiedEmbedder(Embedder):
             return []
         vectors = self._embeddings.embed_documents(texts)
         return [list(vector) for vector in vectors]
+
+    async def async_embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Asynchronously generate vector embeddings in batches"""
+        if not texts:
+            return []
+        vectors = await self._embeddings.aembed_documents(texts)
+        return [list(vector) for vector in vectors]
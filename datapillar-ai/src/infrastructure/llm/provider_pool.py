@@ -0,0 +1,206 @@
+# @author Sunny
+# @date 2026-02-19
+
+"""
+LLMProvider pool
+
+One LLMProvider is shared by every request of the same (tenant, model, config hash).
+A provider owns the LangChain chat models(and through them the HTTP client),the rate
+limiter and the circuit breakers,so rebuilding it per request throws that state away.
+
+- config_hash covers the model row(provider,model,base_url,encrypted api_key,updated_at):
+  a model update or key rotation changes the hash,so the next request builds a new
+  provider and it replaces the providers built from the old row
+- entries expire ttl_seconds after they were built(periodic rebuild picks up anything
+  the hash does not see) and the pool is LRU bounded by max_providers
+- invalidate() drops the providers of a tenant or one of its models right away,clear()
+  drops everything(llm config reload)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from datapillar_oneagentic.providers.llm import LLMProvider
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PROVIDERS = 128
+DEFAULT_PROVIDER_TTL_SECONDS = 1800.0
+
+_MODEL_HASH_FIELDS = (
+    "provider_code",
+    "provider_model_id",
+    "base_url",
+    "api_key",
+    "updated_at",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ProviderPoolKey:
+    tenant_id: int
+    ai_model_id: int
+    config_hash: str
+    thinking_enabled: bool = False
+
+
+@dataclass(slots=True)
+class _PooledProvider:
+    provider: LLMProvider
+    expires_at: float
+
+
+@dataclass(slots=True)
+class _Latency:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def to_dict(self) -> dict[str, float | int]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 1) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 1),
+        }
+
+
+def provider_config_hash(model: dict[str, Any]) -> str:
+    """Fingerprint of the model row a provider is built from(no plaintext key involved)."""
+    payload = {field: model.get(field) for field in _MODEL_HASH_FIELDS}
+    raw = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
+class LLMProviderPool:
+    """TTL + LRU pool of LLMProvider instances with hit-rate and first-token metrics."""
+
+    def __init__(
+        self,
+        *,
+        max_providers: int = DEFAULT_MAX_PROVIDERS,
+        ttl_seconds: float = DEFAULT_PROVIDER_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_providers = max_providers
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._providers: OrderedDict[ProviderPoolKey, _PooledProvider] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._first_token = {"hit": _Latency(), "miss": _Latency()}
+
+    async def acquire(
+        self,
+        key: ProviderPoolKey,
+        build: Callable[[], Awaitable[LLMProvider]],
+    ) -> tuple[LLMProvider, bool]:
+        """Return (provider,pooled);build runs on a miss and is not called under the lock."""
+        with self._lock:
+            provider = self._touch(key)
+            if provider is not None:
+                return provider, True
+
+        provider = await build()
+
+        with self._lock:
+            pooled = self._providers.get(key)
+            if pooled is not None:
+                # Another request built the same provider concurrently;keep the first one.
+                self._providers.move_to_end(key)
+                return pooled.provider, False
+            self._providers[key] = _PooledProvider(
+                provider=provider,
+                expires_at=self._clock() + self._ttl_seconds,
+            )
+            # A newer row of the same model replaces the old entries instead of waiting for LRU.
+            stale = [
+                other
+                for other in self._providers
+                if other.tenant_id == key.tenant_id
+                and other.ai_model_id == key.ai_model_id
+                and other.config_hash != key.config_hash
+            ]
+            for other in stale:
+                del self._providers[other]
+            self._evictions += len(stale)
+            while len(self._providers) > self._max_providers:
+                self._providers.popitem(last=False)
+                self._evictions += 1
+        return provider, False
+
+    def _touch(self, key: ProviderPoolKey) -> LLMProvider | None:
+        pooled = self._providers.get(key)
+        if pooled is None:
+            self._misses += 1
+            return None
+        if pooled.expires_at <= self._clock():
+            del self._providers[key]
+            self._evictions += 1
+            self._misses += 1
+            return None
+        self._providers.move_to_end(key)
+        self._hits += 1
+        return pooled.provider
+
+    def invalidate(self, tenant_id: int, ai_model_id: int | None = None) -> int:
+        """Drop the providers of a tenant(or one of its models);returns the number dropped."""
+        with self._lock:
+            keys = [
+                key
+                for key in self._providers
+                if key.tenant_id == tenant_id
+                and (ai_model_id is None or key.ai_model_id == ai_model_id)
+            ]
+            for key in keys:
+                del self._providers[key]
+            self._evictions += len(keys)
+        if keys:
+            logger.info(
+                "LLM providers invalidated: tenant=%s aiModelId=%s count=%s",
+                tenant_id,
+                ai_model_id,
+                len(keys),
+            )
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._providers.clear()
+
+    def record_first_token(self, seconds: float, *, pooled: bool) -> None:
+        """Record time-to-first-token of a request served by a pooled(or new) provider."""
+        with self._lock:
+            self._first_token["hit" if pooled else "miss"].add(seconds)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "providers": len(self._providers),
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "first_token": {
+                    label: latency.to_dict() for label, latency in self._first_token.items()
+                },
+            }
+
+
+llm_provider_pool = LLMProviderPool()
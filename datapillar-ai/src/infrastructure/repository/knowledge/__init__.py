@@ -13,8 +13,10 @@ Module division:- search_table:Table query(Contains columns,range,Bloodline)
 - search_semantic:Semantic asset query(root,modifier,unit)
 - search_node:Node search(Hybrid search)
 - search_sql:SQL Search
+- search_hybrid:asynchronous hybrid search(Vector + Full text,shared query embedding)
 - sync_metadata:Synchronous metadata writing
 - sync_lineage:Synchronous blood relationship writing
+- lineage_cache:table lineage cache(transitive closure in memory,invalidated by the sync writers)
 - writeback:writeback operation
 - dto:data transfer object
 
@@ -34,7 +36,12 @@ from src.infrastructure.repository.knowledge.search_semantic import Neo4jSemanti
 from src.infrastructure.repository.knowledge.search_sql import Neo4jSQLSearch, SQLHit
 from src.infrastructure.repository.knowledge.search_table import Neo4jTableSearch
 from src.infrastructure.repository.knowledge.sync_lineage import Lineage
-from src.infrastructure.repository.knowledge.sync_metadata import Metadata, TableUpsertPayload
+from src.infrastructure.repository.knowledge.sync_metadata import (
+    Metadata,
+    MetadataBulkSync,
+    MetadataSyncStats,
+    TableUpsertPayload,
+)
 from src.infrastructure.repository.knowledge.writeback import Neo4jKGWritebackRepository
 
 __all__ = [  # Search service
@@ -45,6 +52,8 @@ __all__ = [  # Search service
     "Neo4jNodeSearch",
     "Neo4jSQLSearch",  # metadata/Bloodline
     "Metadata",
+    "MetadataBulkSync",
+    "MetadataSyncStats",
     "TableUpsertPayload",
     "Lineage",  # write back service
     "Neo4jKGWritebackRepository",  # data transfer object
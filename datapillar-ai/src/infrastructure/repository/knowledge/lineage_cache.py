@@ -0,0 +1,628 @@
+# @author Sunny
+# @date 2026-01-28
+
+"""
+Table lineage cache(in-memory transitive closure)
+
+Responsibilities:Serve table lineage and impact analysis without a Neo4j traversal per request
+- One snapshot per tenant:every Table-[:INPUT_OF]->SQL-[:OUTPUT_TO]->Table edge,tables numbered
+- One view per visibility(all / public SQL / public + own SQL),adjacency kept as int bitsets
+- Full upstream/downstream closures are memoized per view;depth-limited impact is a
+  level-by-level bitset walk that stops as soon as the closure is covered
+- Sync writers mark SQL/table ids dirty(mark_lineage_dirty);the next read re-fetches only
+  those edges and drops only the memoized closures they can change
+- A snapshot older than max_staleness_seconds is reloaded(covers writes from other processes)
+
+Metrics:stats() → hits / misses(full loads) / hit_rate / refreshes / pending_dirty /
+oldest_snapshot_age_seconds
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.infrastructure.database import Neo4jClient
+from src.infrastructure.database.cypher import run_cypher
+from src.shared.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_CREATORS: frozenset[str] = frozenset({"OPENLINEAGE", "GRAVITINO_SYNC", "system", "SYSTEM"})
+
+DEFAULT_MAX_STALENESS_SECONDS = 300.0
+# A dirty mark stays pending this long,so a read racing the writer's commit checks again.
+DEFAULT_SETTLE_SECONDS = 2.0
+DEFAULT_MAX_VIEWS = 64
+
+_EDGE_RETURN = """
+WITH source, target, sql
+MATCH (source)<-[:HAS_TABLE]-(source_schema:Schema)
+MATCH (target)<-[:HAS_TABLE]-(target_schema:Schema)
+WHERE ($tenantId IS NULL OR (source_schema.tenantId = $tenantId AND target_schema.tenantId = $tenantId))
+RETURN DISTINCT
+    source.id AS source_id,
+    source_schema.name + '.' + source.name AS source_table,
+    target.id AS target_id,
+    target_schema.name + '.' + target.name AS target_table,
+    sql.id AS sql_id,
+    sql.createdBy AS created_by
+"""
+
+_ALL_EDGES_CYPHER = (
+    """
+MATCH (source:Table)-[:INPUT_OF]->(sql:SQL)-[:OUTPUT_TO]->(target:Table)
+WHERE ($tenantId IS NULL OR (source.tenantId = $tenantId AND sql.tenantId = $tenantId AND target.tenantId = $tenantId))
+"""
+    + _EDGE_RETURN
+)
+
+# Every edge of the dirty SQL nodes and of the SQL nodes touching the dirty tables.
+_DIRTY_EDGES_CYPHER = (
+    """
+CALL {
+    MATCH (sql:SQL) WHERE sql.id IN $sqlIds RETURN sql
+    UNION
+    MATCH (t:Table)-[:INPUT_OF]->(sql:SQL) WHERE t.id IN $tableIds RETURN sql
+    UNION
+    MATCH (sql:SQL)-[:OUTPUT_TO]->(t:Table) WHERE t.id IN $tableIds RETURN sql
+}
+MATCH (source:Table)-[:INPUT_OF]->(sql)-[:OUTPUT_TO]->(target:Table)
+WHERE ($tenantId IS NULL OR (source.tenantId = $tenantId AND sql.tenantId = $tenantId AND target.tenantId = $tenantId))
+"""
+    + _EDGE_RETURN
+)
+
+# (tenant_id, sql_ids, table_ids) -> edge rows;sql_ids/table_ids None means every edge.
+EdgeLoader = Callable[[int | None, Sequence[str] | None, Sequence[str] | None], list[dict]]
+
+# (source index, target index, sql id)
+_EdgeKey = tuple[int, int, str]
+
+_MISSING = object()
+
+
+def load_edges_from_neo4j(
+    tenant_id: int | None,
+    sql_ids: Sequence[str] | None,
+    table_ids: Sequence[str] | None,
+) -> list[dict[str, Any]]:
+    """Default EdgeLoader(sync driver,same edge pattern as the old per-request query)"""
+    params: dict[str, Any] = {"tenantId": tenant_id}
+    if sql_ids is None and table_ids is None:
+        cypher = _ALL_EDGES_CYPHER
+    else:
+        cypher = _DIRTY_EDGES_CYPHER
+        params["sqlIds"] = list(sql_ids or [])
+        params["tableIds"] = list(table_ids or [])
+    driver = Neo4jClient.get_driver()
+    with driver.session(database=settings.neo4j_database) as session:
+        return run_cypher(session, cypher, params).data()
+
+
+def _bits(value: int) -> Iterator[int]:
+    while value:
+        low = value & -value
+        yield low.bit_length() - 1
+        value ^= low
+
+
+def _is_public(created_by: str | None) -> bool:
+    return created_by is None or created_by in SYSTEM_CREATORS
+
+
+@dataclass(frozen=True)
+class LineageImpact:
+    """Tables reachable within max_depth hops,with their hop distance"""
+
+    upstream: dict[str, int]
+    downstream: dict[str, int]
+    edges: list[dict[str, Any]]
+
+
+@dataclass
+class _View:
+    """Edges visible to one visibility class,plus its memoized closures"""
+
+    out_edges: dict[int, set[_EdgeKey]] = field(default_factory=dict)
+    in_edges: dict[int, set[_EdgeKey]] = field(default_factory=dict)
+    down: dict[int, int] = field(default_factory=dict)
+    up: dict[int, int] = field(default_factory=dict)
+    closure_down: dict[int, int] = field(default_factory=dict)
+    closure_up: dict[int, int] = field(default_factory=dict)
+
+    def add(self, key: _EdgeKey) -> None:
+        source, target, _ = key
+        self.out_edges.setdefault(source, set()).add(key)
+        self.in_edges.setdefault(target, set()).add(key)
+        self.down[source] = self.down.get(source, 0) | (1 << target)
+        self.up[target] = self.up.get(target, 0) | (1 << source)
+
+    def remove(self, key: _EdgeKey) -> None:
+        source, target, _ = key
+        self.out_edges.get(source, set()).discard(key)
+        self.in_edges.get(target, set()).discard(key)
+        # Another SQL may still link the same pair of tables.
+        self.down[source] = sum({1 << k[1] for k in self.out_edges.get(source, ())})
+        self.up[target] = sum({1 << k[0] for k in self.in_edges.get(target, ())})
+
+
+def _reach(adjacency: dict[int, int], start: int) -> int:
+    """start plus everything reachable from it"""
+    seen = start
+    frontier = start
+    while frontier:
+        nxt = 0
+        for node in _bits(frontier):
+            nxt |= adjacency.get(node, 0)
+        frontier = nxt & ~seen
+        seen |= frontier
+    return seen
+
+
+class _Snapshot:
+    def __init__(self, loaded_at: float, max_views: int) -> None:
+        self.loaded_at = loaded_at
+        self.max_views = max_views
+        self.names: list[str] = []
+        self.index_by_id: dict[str, int] = {}
+        self.index_by_table: dict[str, list[int]] = {}
+        self.edges: dict[_EdgeKey, str | None] = {}
+        # creator -> number of non-system SQL edges they own
+        self.private_owners: Counter[str] = Counter()
+        self.views: OrderedDict[str | None, _View] = OrderedDict()
+
+    def node(self, table_id: str, qualified_name: str) -> int:
+        index = self.index_by_id.get(table_id)
+        if index is None:
+            index = len(self.names)
+            self.names.append(qualified_name)
+            self.index_by_id[table_id] = index
+            self.index_by_table.setdefault(qualified_name.split(".", 1)[-1], []).append(index)
+        elif self.names[index] != qualified_name:
+            old_table = self.names[index].split(".", 1)[-1]
+            self.index_by_table[old_table].remove(index)
+            self.names[index] = qualified_name
+            self.index_by_table.setdefault(qualified_name.split(".", 1)[-1], []).append(index)
+        return index
+
+    def edge_key(self, row: dict[str, Any]) -> tuple[_EdgeKey, str | None] | None:
+        if not (row.get("source_id") and row.get("target_id") and row.get("sql_id")):
+            return None
+        source = self.node(str(row["source_id"]), str(row["source_table"]))
+        target = self.node(str(row["target_id"]), str(row["target_table"]))
+        created_by = row.get("created_by")
+        return (source, target, str(row["sql_id"])), (
+            None if created_by is None else str(created_by)
+        )
+
+    def set_edge(self, key: _EdgeKey, created_by: str | None) -> None:
+        self.drop_edge(key)
+        self.edges[key] = created_by
+        if not _is_public(created_by):
+            self.private_owners[created_by] += 1
+
+    def drop_edge(self, key: _EdgeKey) -> None:
+        if key not in self.edges:
+            return
+        created_by = self.edges.pop(key)
+        if not _is_public(created_by):
+            self.private_owners[created_by] -= 1
+            if not self.private_owners[created_by]:
+                del self.private_owners[created_by]
+
+    def view_key(self, user_id: int | None) -> str | None:
+        """None sees every edge;users without SQL of their own share the "public" view"""
+        if user_id is None:
+            return None
+        user = str(user_id)
+        return user if user in self.private_owners else "public"
+
+    @staticmethod
+    def visible(view_key: str | None, created_by: str | None) -> bool:
+        if view_key is None or _is_public(created_by):
+            return True
+        return view_key != "public" and created_by == view_key
+
+    def view(self, view_key: str | None) -> _View:
+        view = self.views.get(view_key)
+        if view is not None:
+            self.views.move_to_end(view_key)
+            return view
+        view = _View()
+        for key, created_by in self.edges.items():
+            if self.visible(view_key, created_by):
+                view.add(key)
+        self.views[view_key] = view
+        while len(self.views) > self.max_views:
+            self.views.popitem(last=False)
+        return view
+
+    def patch(
+        self,
+        removed: Iterable[_EdgeKey],
+        added: dict[_EdgeKey, str | None],
+    ) -> None:
+        """Apply an edge delta,dropping only the closures it can change"""
+        previous: dict[_EdgeKey, Any] = {}
+        for key in removed:
+            if key in self.edges and key not in added:
+                previous[key] = self.edges[key]
+                self.drop_edge(key)
+        for key, created_by in added.items():
+            before = self.edges.get(key, _MISSING)
+            if before != created_by:
+                previous[key] = before
+                self.set_edge(key, created_by)
+        if not previous:
+            return
+
+        for view_key, view in self.views.items():
+            toggled: list[tuple[_EdgeKey, bool]] = []
+            for key, before in previous.items():
+                after = self.edges.get(key, _MISSING)
+                was_visible = before is not _MISSING and self.visible(view_key, before)
+                is_visible = after is not _MISSING and self.visible(view_key, after)
+                if was_visible != is_visible:
+                    toggled.append((key, is_visible))
+            if not toggled:
+                continue
+            sources = sum({1 << key[0] for key, _ in toggled})
+            targets = sum({1 << key[1] for key, _ in toggled})
+            # Downstream closures change for the sources and their ancestors,upstream
+            # closures for the targets and their descendants(before and after the change).
+            stale_down = _reach(view.up, sources) if view.closure_down else 0
+            stale_up = _reach(view.down, targets) if view.closure_up else 0
+            for key, is_visible in toggled:
+                if is_visible:
+                    view.add(key)
+                else:
+                    view.remove(key)
+            if view.closure_down:
+                stale_down |= _reach(view.up, sources)
+                for node in _bits(stale_down):
+                    view.closure_down.pop(node, None)
+            if view.closure_up:
+                stale_up |= _reach(view.down, targets)
+                for node in _bits(stale_up):
+                    view.closure_up.pop(node, None)
+
+
+class LineageCache:
+    """
+    Per-tenant lineage snapshots with incremental invalidation
+
+    Usage:cache.impact(tenant_id,user_id,"order_detail","both",max_depth=3).
+    Writers call mark_dirty(tenant_id,sql_ids=...,table_ids=...) after writing edges.
+    """
+
+    def __init__(
+        self,
+        *,
+        loader: EdgeLoader = load_edges_from_neo4j,
+        max_staleness_seconds: float = DEFAULT_MAX_STALENESS_SECONDS,
+        settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+        max_views: int = DEFAULT_MAX_VIEWS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._loader = loader
+        self._max_staleness_seconds = max_staleness_seconds
+        self._settle_seconds = settle_seconds
+        self._max_views = max_views
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._load_locks: dict[int | None, threading.Lock] = {}
+        self._snapshots: dict[int | None, _Snapshot] = {}
+        self._loading: set[int | None] = set()
+        # tenant -> {("sql"|"table", id): marked_at}
+        self._dirty: dict[int | None, dict[tuple[str, str], float]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._refreshes = 0
+        self._stale_reloads = 0
+
+    # ==================== Invalidation ====================
+
+    def mark_dirty(
+        self,
+        tenant_id: int | None,
+        *,
+        sql_ids: Iterable[str] = (),
+        table_ids: Iterable[str] = (),
+    ) -> None:
+        """Record changed SQL/table ids;the next read of the tenant re-fetches their edges"""
+        now = self._clock()
+        with self._lock:
+            if tenant_id not in self._snapshots and tenant_id not in self._loading:
+                return
+            marks = self._dirty.setdefault(tenant_id, {})
+            for sql_id in sql_ids:
+                marks[("sql", str(sql_id))] = now
+            for table_id in table_ids:
+                marks[("table", str(table_id))] = now
+
+    def invalidate(self, tenant_id: int | None = None) -> None:
+        """Drop the tenant's snapshot(all tenants when tenant_id is None)"""
+        with self._lock:
+            if tenant_id is None:
+                self._snapshots.clear()
+                self._dirty.clear()
+            else:
+                self._snapshots.pop(tenant_id, None)
+                self._dirty.pop(tenant_id, None)
+
+    # ==================== Reads ====================
+
+    def impact(
+        self,
+        tenant_id: int | None,
+        user_id: int | None,
+        table: str,
+        direction: str = "both",
+        *,
+        max_depth: int | None = 1,
+    ) -> LineageImpact:
+        """
+        Tables within max_depth hops of every table named `table`(any schema)
+
+        direction:upstream / downstream / both;max_depth None walks the full closure
+        """
+        snapshot = self._snapshot(tenant_id)
+        with self._lock:
+            view = snapshot.view(snapshot.view_key(user_id))
+            roots = sum(1 << index for index in snapshot.index_by_table.get(table, ()))
+            upstream: dict[int, int] = {}
+            downstream: dict[int, int] = {}
+            edge_keys: set[_EdgeKey] = set()
+            if roots and direction in ("upstream", "both"):
+                upstream = self._walk(view, roots, "upstream", max_depth, edge_keys)
+            if roots and direction in ("downstream", "both"):
+                downstream = self._walk(view, roots, "downstream", max_depth, edge_keys)
+            names = snapshot.names
+            return LineageImpact(
+                upstream={names[node]: hops for node, hops in upstream.items()},
+                downstream={names[node]: hops for node, hops in downstream.items()},
+                edges=[
+                    {"source_table": names[s], "target_table": names[t], "sql_id": sql_id}
+                    for s, t, sql_id in sorted(
+                        edge_keys, key=lambda k: (names[k[0]], names[k[1]], k[2])
+                    )
+                ],
+            )
+
+    def reachable(
+        self,
+        tenant_id: int | None,
+        user_id: int | None,
+        table: str,
+        direction: str,
+    ) -> set[str]:
+        """Full upstream or downstream closure(memoized)"""
+        snapshot = self._snapshot(tenant_id)
+        with self._lock:
+            view = snapshot.view(snapshot.view_key(user_id))
+            closure = 0
+            for index in snapshot.index_by_table.get(table, ()):
+                closure |= self._closure(view, index, direction)
+            return {snapshot.names[node] for node in _bits(closure)}
+
+    def stats(self) -> dict[str, Any]:
+        now = self._clock()
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "tenants": len(self._snapshots),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "refreshes": self._refreshes,
+                "stale_reloads": self._stale_reloads,
+                "pending_dirty": sum(len(marks) for marks in self._dirty.values()),
+                "oldest_snapshot_age_seconds": max(
+                    (now - snap.loaded_at for snap in self._snapshots.values()), default=0.0
+                ),
+            }
+
+    # ==================== Internals ====================
+
+    @staticmethod
+    def _closure(view: _View, node: int, direction: str) -> int:
+        memo = view.closure_down if direction == "downstream" else view.closure_up
+        cached = memo.get(node)
+        if cached is not None:
+            return cached
+        adjacency = view.down if direction == "downstream" else view.up
+        result = 0
+        frontier = adjacency.get(node, 0)
+        while frontier:
+            result |= frontier
+            nxt = 0
+            for member in _bits(frontier):
+                known = memo.get(member)
+                if known is not None:
+                    result |= known
+                else:
+                    nxt |= adjacency.get(member, 0)
+            frontier = nxt & ~result
+        memo[node] = result
+        return result
+
+    def _walk(
+        self,
+        view: _View,
+        roots: int,
+        direction: str,
+        max_depth: int | None,
+        edge_keys: set[_EdgeKey],
+    ) -> dict[int, int]:
+        adjacency = view.down if direction == "downstream" else view.up
+        edges_of = view.out_edges if direction == "downstream" else view.in_edges
+        # Early-exit bound:the closure,when memoized(or about to be walked in full anyway).
+        memo = view.closure_down if direction == "downstream" else view.closure_up
+        bound = 0
+        for root in _bits(roots):
+            if max_depth is None or root in memo:
+                bound |= self._closure(view, root, direction)
+            else:
+                bound = -1
+                break
+
+        hops: dict[int, int] = {}
+        visited = 0
+        frontier = roots
+        depth = 0
+        # Expanded nodes are the roots plus every node found below max_depth.
+        expanded = [roots]
+        while frontier and visited != bound and (max_depth is None or depth < max_depth):
+            depth += 1
+            nxt = 0
+            for node in _bits(frontier):
+                nxt |= adjacency.get(node, 0)
+            nxt &= ~visited
+            for node in _bits(nxt):
+                hops[node] = depth
+            visited |= nxt
+            frontier = nxt
+            if max_depth is None or depth < max_depth:
+                expanded.append(nxt)
+        for layer in expanded:
+            for node in _bits(layer):
+                edge_keys.update(edges_of.get(node, ()))
+        return hops
+
+    def _snapshot(self, tenant_id: int | None) -> _Snapshot:
+        with self._lock:
+            load_lock = self._load_locks.setdefault(tenant_id, threading.Lock())
+        with load_lock:
+            now = self._clock()
+            with self._lock:
+                snapshot = self._snapshots.get(tenant_id)
+                expired = (
+                    snapshot is not None
+                    and now - snapshot.loaded_at > self._max_staleness_seconds
+                )
+                marks = dict(self._dirty.get(tenant_id, {}))
+                if snapshot is None or expired:
+                    self._misses += 1
+                    self._stale_reloads += int(expired)
+                    self._loading.add(tenant_id)
+                else:
+                    self._hits += 1
+                    if not marks:
+                        return snapshot
+
+            if snapshot is None or expired:
+                try:
+                    snapshot = self._load(tenant_id, now)
+                finally:
+                    with self._lock:
+                        self._loading.discard(tenant_id)
+                with self._lock:
+                    self._snapshots[tenant_id] = snapshot
+                    self._settle(tenant_id, now)
+                return snapshot
+
+            sql_ids = [value for kind, value in marks if kind == "sql"]
+            table_ids = [value for kind, value in marks if kind == "table"]
+            rows = self._loader(tenant_id, sql_ids, table_ids)
+            with self._lock:
+                self._refresh(snapshot, rows, sql_ids, table_ids)
+                self._refreshes += 1
+                self._settle(tenant_id, now)
+            return snapshot
+
+    def _load(self, tenant_id: int | None, now: float) -> _Snapshot:
+        start = time.perf_counter()
+        rows = self._loader(tenant_id, None, None)
+        snapshot = _Snapshot(loaded_at=now, max_views=self._max_views)
+        for row in rows:
+            entry = snapshot.edge_key(row)
+            if entry is not None:
+                snapshot.set_edge(*entry)
+        logger.info(
+            "[lineage cache] tenant=%s loaded tables=%s edges=%s in %.3fs",
+            tenant_id,
+            len(snapshot.names),
+            len(snapshot.edges),
+            time.perf_counter() - start,
+        )
+        return snapshot
+
+    @staticmethod
+    def _refresh(
+        snapshot: _Snapshot,
+        rows: list[dict[str, Any]],
+        sql_ids: Sequence[str],
+        table_ids: Sequence[str],
+    ) -> None:
+        added: dict[_EdgeKey, str | None] = {}
+        for row in rows:
+            entry = snapshot.edge_key(row)
+            if entry is not None:
+                added[entry[0]] = entry[1]
+        # The fetched SQL nodes come back with all their edges,so every cached edge of
+        # those SQL nodes and of the dirty tables is replaced.
+        replaced_sql = set(sql_ids) | {key[2] for key in added}
+        dirty_tables = {
+            snapshot.index_by_id[table_id]
+            for table_id in table_ids
+            if table_id in snapshot.index_by_id
+        }
+        removed = [
+            key
+            for key in snapshot.edges
+            if key[2] in replaced_sql or key[0] in dirty_tables or key[1] in dirty_tables
+        ]
+        snapshot.patch(removed, added)
+
+    def _settle(self, tenant_id: int | None, started_at: float) -> None:
+        """Drop dirty marks the read covered;marks younger than settle_seconds stay"""
+        marks = self._dirty.get(tenant_id)
+        if not marks:
+            return
+        cutoff = started_at - self._settle_seconds
+        for key in [key for key, marked_at in marks.items() if marked_at <= cutoff]:
+            del marks[key]
+        if not marks:
+            del self._dirty[tenant_id]
+
+
+_lineage_cache: LineageCache | None = None
+_lineage_cache_lock = threading.Lock()
+
+
+def get_lineage_cache() -> LineageCache:
+    global _lineage_cache
+    if _lineage_cache is None:
+        with _lineage_cache_lock:
+            if _lineage_cache is None:
+                from src.shared.config.runtime import get_lineage_cache_max_staleness_seconds
+
+                _lineage_cache = LineageCache(
+                    max_staleness_seconds=get_lineage_cache_max_staleness_seconds()
+                )
+    return _lineage_cache
+
+
+def mark_lineage_dirty(
+    tenant_id: int | None,
+    *,
+    sql_ids: Iterable[str] = (),
+    table_ids: Iterable[str] = (),
+) -> None:
+    """Writer hook;a no-op until this process has served a lineage read"""
+    cache = _lineage_cache
+    if cache is not None:
+        cache.mark_dirty(tenant_id, sql_ids=sql_ids, table_ids=table_ids)
+
+
+def invalidate_lineage(tenant_id: int | None = None) -> None:
+    """Writer hook for changes that rename or drop many tables at once"""
+    cache = _lineage_cache
+    if cache is not None:
+        cache.invalidate(tenant_id)
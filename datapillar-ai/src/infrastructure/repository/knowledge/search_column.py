@@ -5,6 +5,8 @@
 Neo4j column query service
 
 Responsibilities：Provides column-related hybrid retrieval（Vector + Full text）
+- search_columns: synchronous（neo4j-graphrag）
+- asearch_columns: asynchronous（search_hybrid）
 """
 
 from __future__ import annotations
@@ -14,6 +16,7 @@ import time
 from typing import Any
 
 from src.infrastructure.database import Neo4jClient
+from src.infrastructure.repository.knowledge.search_hybrid import HybridIndex, hybrid_search
 from src.shared.config.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -52,6 +55,13 @@ class Neo4jColumnSearch:
         score
     """
 
+    _COLUMN_INDEX = HybridIndex(
+        name="column",
+        vector_index="column_embedding",
+        fulltext_index="column_fulltext",
+        retrieval_query=_COLUMN_RETRIEVAL_QUERY,
+    )
+
     @classmethod
     def search_columns(
         cls,
@@ -114,26 +124,64 @@ class Neo4jColumnSearch:
             )
             items = list(getattr(results, "items", []) or [])
 
-            recommendations: list[dict[str, Any]] = []
-            for item in items:
-                metadata = getattr(item, "metadata", {}) or {}
-                score = float(metadata.get("score", 0) or 0)
-                if score < min_score:
-                    continue
-                recommendations.append(
-                    {
-                        "type": metadata.get("type"),
-                        "path": metadata.get("path"),
-                        "name": metadata.get("name"),
-                        "description": metadata.get("description"),
-                        "dataType": metadata.get("dataType"),
-                        "table": metadata.get("table"),
-                        "score": round(score, 3),
-                    }
-                )
+            recommendations = cls._build_recommendations(
+                [getattr(item, "metadata", {}) or {} for item in items], min_score
+            )
 
             logger.debug(f"[column search] Total time spent: {time.time() - start:.3f}s")
             return recommendations
         except Exception as e:
             logger.error(f"Mixed search columns failed: {e}")
             return []
+
+    @classmethod
+    async def asearch_columns(
+        cls,
+        query: str,
+        top_k: int = 3,
+        min_score: float = 0.55,
+        tenant_id: int | None = None,
+        user_id: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Asynchronous version of search_columns（AsyncNeo4jClient + shared query embedding）"""
+        start = time.time()
+        try:
+            rows = await hybrid_search(
+                query,
+                cls._COLUMN_INDEX,
+                tenant_id=tenant_id,
+                top_k=top_k,
+                params={
+                    "tenantId": tenant_id,
+                    "userId": user_id,
+                    "systemCreators": cls._SYSTEM_CREATORS,
+                },
+            )
+        except Exception as e:
+            logger.error(f"Mixed search columns failed: {e}")
+            return []
+        recommendations = cls._build_recommendations(rows, min_score)
+        logger.debug(f"[column search] Total time spent: {time.time() - start:.3f}s")
+        return recommendations
+
+    @staticmethod
+    def _build_recommendations(
+        rows: list[dict[str, Any]], min_score: float
+    ) -> list[dict[str, Any]]:
+        recommendations: list[dict[str, Any]] = []
+        for row in rows:
+            score = float(row.get("score", 0) or 0)
+            if score < min_score:
+                continue
+            recommendations.append(
+                {
+                    "type": row.get("type"),
+                    "path": row.get("path"),
+                    "name": row.get("name"),
+                    "description": row.get("description"),
+                    "dataType": row.get("dataType"),
+                    "table": row.get("table"),
+                    "score": round(score, 3),
+                }
+            )
+        return recommendations
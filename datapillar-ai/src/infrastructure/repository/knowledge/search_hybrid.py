@@ -0,0 +1,217 @@
+# @author Sunny
+# @date 2026-01-28
+
+"""
+Neo4j Asynchronous hybrid search(Vector + Full text)
+
+Responsibilities:The single async search path used by the knowledge repositories
+- The query is embedded once(UnifiedEmbedder memo),shared by every index of the request
+- Each index runs its vector leg and full-text leg concurrently on AsyncNeo4jClient
+- fuse_linear is the only place where leg scores are combined
+- The repository retrieval_query is applied to the fused top_k only(hydrate)
+
+Scoring matches neo4j-graphrag HybridSearchRanker.LINEAR:each leg is normalized by its
+max score,final = alpha * vector + (1 - alpha) * fulltext,missing legs count as 0.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from src.infrastructure.database.cypher import arun_cypher
+from src.infrastructure.repository.neo4j_uow import neo4j_async_session
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ALPHA = 0.6
+
+_VECTOR_LEG_CYPHER = """
+CALL db.index.vector.queryNodes($index_name, $top_k, $embedding)
+YIELD node, score
+RETURN elementId(node) AS element_id, score
+"""
+
+_FULLTEXT_LEG_CYPHER = """
+CALL db.index.fulltext.queryNodes($index_name, $query, {limit: $top_k})
+YIELD node, score
+RETURN elementId(node) AS element_id, score
+"""
+
+# The retrieval_query sees `node` and `score`,same as a neo4j-graphrag retrieval_query.
+_HYDRATE_PREFIX = """
+UNWIND $hits AS hit
+MATCH (node)
+WHERE elementId(node) = hit.element_id
+WITH node, hit.score AS score
+"""
+
+
+@dataclass(frozen=True)
+class HybridIndex:
+    """One searchable index pair plus the Cypher that turns a hit into a row"""
+
+    name: str
+    vector_index: str
+    fulltext_index: str
+    retrieval_query: str
+
+
+@dataclass(frozen=True)
+class LegHit:
+    element_id: str
+    score: float
+
+
+async def embed_query(query: str, tenant_id: int | None) -> list[float]:
+    """Embed the query text once(memoized per tenant)"""
+    from src.infrastructure.llm.embeddings import UnifiedEmbedder
+
+    return await UnifiedEmbedder(tenant_id).async_embed_query(query)
+
+
+async def _run_leg(cypher: str, params: dict[str, Any]) -> list[LegHit]:
+    async with neo4j_async_session() as session:
+        result = await arun_cypher(session, cypher, params)
+        records = await result.data()
+    return [
+        LegHit(element_id=r["element_id"], score=float(r.get("score") or 0))
+        for r in records
+        if r.get("element_id")
+    ]
+
+
+async def vector_leg(index_name: str, embedding: list[float], top_k: int) -> list[LegHit]:
+    return await _run_leg(
+        _VECTOR_LEG_CYPHER,
+        {"index_name": index_name, "top_k": top_k, "embedding": embedding},
+    )
+
+
+async def fulltext_leg(index_name: str, query: str, top_k: int) -> list[LegHit]:
+    return await _run_leg(
+        _FULLTEXT_LEG_CYPHER,
+        {"index_name": index_name, "query": query, "top_k": top_k},
+    )
+
+
+def fuse_linear(
+    vector_hits: Sequence[LegHit],
+    fulltext_hits: Sequence[LegHit],
+    *,
+    top_k: int,
+    alpha: float = DEFAULT_ALPHA,
+) -> list[LegHit]:
+    """Combine both legs of one index into its top_k(see module docstring)"""
+    fused: dict[str, float] = {}
+    for hits, weight in ((vector_hits, alpha), (fulltext_hits, 1 - alpha)):
+        max_score = max((hit.score for hit in hits), default=0.0)
+        if max_score <= 0:
+            continue
+        for hit in hits:
+            fused[hit.element_id] = fused.get(hit.element_id, 0.0) + (
+                hit.score / max_score * weight
+            )
+    ranked = sorted(fused.items(), key=lambda item: (-item[1], item[0]))
+    return [LegHit(element_id=eid, score=score) for eid, score in ranked[:top_k]]
+
+
+async def hydrate(
+    hits: Sequence[LegHit],
+    retrieval_query: str,
+    params: Mapping[str, Any] | None = None,
+) -> list[dict[str, Any]]:
+    """Run the retrieval_query over fused hits,rows come back ordered by score"""
+    if not hits:
+        return []
+    cypher = _HYDRATE_PREFIX + retrieval_query
+    query_params = dict(params or {})
+    query_params["hits"] = [{"element_id": h.element_id, "score": h.score} for h in hits]
+    async with neo4j_async_session() as session:
+        result = await arun_cypher(session, cypher, query_params)
+        rows = await result.data()
+    rows.sort(key=lambda row: float(row.get("score") or 0), reverse=True)
+    return rows
+
+
+async def _search_index(
+    index: HybridIndex,
+    query: str,
+    embedding: list[float],
+    *,
+    top_k: int,
+    alpha: float,
+    params: Mapping[str, Any] | None,
+) -> list[dict[str, Any]]:
+    vector_hits, fulltext_hits = await asyncio.gather(
+        vector_leg(index.vector_index, embedding, top_k),
+        fulltext_leg(index.fulltext_index, query, top_k),
+    )
+    fused = fuse_linear(vector_hits, fulltext_hits, top_k=top_k, alpha=alpha)
+    return await hydrate(fused, index.retrieval_query, params)
+
+
+async def hybrid_search_many(
+    query: str,
+    indexes: Sequence[HybridIndex],
+    *,
+    tenant_id: int | None,
+    top_k: int,
+    alpha: float = DEFAULT_ALPHA,
+    params: Mapping[str, Any] | None = None,
+) -> dict[str, list[dict[str, Any]]]:
+    """
+    Hybrid search several indexes with one query embedding
+
+    Returns:{index.name:rows};an index that fails is logged and returns []
+    """
+    embedding = await embed_query(query, tenant_id)
+    results = await asyncio.gather(
+        *(
+            _search_index(index, query, embedding, top_k=top_k, alpha=alpha, params=params)
+            for index in indexes
+        ),
+        return_exceptions=True,
+    )
+    rows_by_index: dict[str, list[dict[str, Any]]] = {}
+    for index, result in zip(indexes, results, strict=True):
+        if isinstance(result, BaseException):
+            if not isinstance(result, Exception):
+                raise result
+            logger.warning(f"hybrid search[{index.name}]failed:{result}")
+            rows_by_index[index.name] = []
+        else:
+            rows_by_index[index.name] = result
+    return rows_by_index
+
+
+async def hybrid_search(
+    query: str,
+    index: HybridIndex,
+    *,
+    tenant_id: int | None,
+    top_k: int,
+    alpha: float = DEFAULT_ALPHA,
+    params: Mapping[str, Any] | None = None,
+) -> list[dict[str, Any]]:
+    """Hybrid search a single index(errors propagate to the caller)"""
+    embedding = await embed_query(query, tenant_id)
+    return await _search_index(index, query, embedding, top_k=top_k, alpha=alpha, params=params)
+
+
+async def vector_search(
+    query: str,
+    vector_index: str,
+    retrieval_query: str,
+    *,
+    tenant_id: int | None,
+    top_k: int,
+    params: Mapping[str, Any] | None = None,
+) -> list[dict[str, Any]]:
+    """Vector-only search with raw similarity scores(VectorCypherRetriever semantics)"""
+    embedding = await embed_query(query, tenant_id)
+    hits = await vector_leg(vector_index, embedding, top_k)
+    return await hydrate(hits, retrieval_query, params)
@@ -7,6 +7,7 @@ Neo4j Indicator query service
 Responsibilities：Provide indicator-related query functions
 - get_metric_context: According to indicators code List query indicator details
 - search_metrics: Mixed search metrics（Vector + Full text）
+- asearch_metrics: asynchronous search_metrics，one query embedding for all three indexes
 """
 
 from __future__ import annotations
@@ -18,6 +19,7 @@ from typing import Any
 
 from src.infrastructure.database import Neo4jClient
 from src.infrastructure.database.cypher import run_cypher
+from src.infrastructure.repository.knowledge.search_hybrid import HybridIndex, hybrid_search_many
 from src.shared.config.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -28,6 +30,24 @@ class Neo4jMetricSearch:
 
     _SYSTEM_CREATORS = ["OPENLINEAGE", "GRAVITINO_SYNC", "system", "SYSTEM"]
 
+    _SEARCH_CONFIGS = [
+        {
+            "metric_type": "AtomicMetric",
+            "vector_index": "atomic_metric_embedding",
+            "fulltext_index": "atomic_metric_fulltext",
+        },
+        {
+            "metric_type": "DerivedMetric",
+            "vector_index": "derived_metric_embedding",
+            "fulltext_index": "derived_metric_fulltext",
+        },
+        {
+            "metric_type": "CompositeMetric",
+            "vector_index": "composite_metric_embedding",
+            "fulltext_index": "composite_metric_fulltext",
+        },
+    ]
+
     # Metric contextual query Cypher Template
     _METRIC_CYPHER = """
     UNWIND $element_ids AS eid
@@ -173,23 +193,14 @@ class Neo4jMetricSearch:
 
         start = time.time()
 
-        search_configs = [
-            {
-                "metric_type": "AtomicMetric",
-                "vector_index": "atomic_metric_embedding",
-                "fulltext_index": "atomic_metric_fulltext",
-            },
-            {
-                "metric_type": "DerivedMetric",
-                "vector_index": "derived_metric_embedding",
-                "fulltext_index": "derived_metric_fulltext",
-            },
-            {
-                "metric_type": "CompositeMetric",
-                "vector_index": "composite_metric_embedding",
-                "fulltext_index": "composite_metric_fulltext",
-            },
-        ]
+        search_configs = cls._SEARCH_CONFIGS
+        embedder = UnifiedEmbedder(tenant_id)
+        # Embed once up front: the three retrievers then hit the embedder's query memo.
+        try:
+            embedder.embed_query(query)
+        except Exception as e:
+            logger.warning(f"Indicator search embedding failed: {e}")
+            return []
 
         def metric_result_formatter(record: Any) -> Any:
             return RetrieverResultItem(
@@ -205,22 +216,7 @@ class Neo4jMetricSearch:
 
         def hybrid_search_single(config: dict[str, str]) -> list[dict[str, Any]]:
             results: list[dict[str, Any]] = []
-            retrieval_query = f"""
-            WHERE ($tenantId IS NULL OR node.tenantId = $tenantId)
-              AND (
-                $userId IS NULL
-                OR node.createdBy IS NULL
-                OR toString(node.createdBy) = toString($userId)
-                OR node.createdBy IN $systemCreators
-              )
-            RETURN
-                node.id AS node_id,
-                '{config["metric_type"]}' AS type,
-                node.code AS code,
-                node.name AS name,
-                node.description AS description,
-                score
-            """
+            retrieval_query = cls._retrieval_query(config["metric_type"])
 
             try:
                 retriever = HybridCypherRetriever(
@@ -229,7 +225,7 @@ class Neo4jMetricSearch:
                     fulltext_index_name=config["fulltext_index"],
                     retrieval_query=retrieval_query,
                     result_formatter=metric_result_formatter,
-                    embedder=UnifiedEmbedder(tenant_id),
+                    embedder=embedder,
                     neo4j_database=settings.neo4j_database,
                 )
 
@@ -271,11 +267,86 @@ class Neo4jMetricSearch:
             for future in as_completed(futures):
                 all_results.extend(future.result())
 
-        if not all_results:
+        all_results = cls._rank(all_results, top_k)
+        logger.debug(f"[Indicator search] Total time spent: {time.time() - start:.3f}s")
+        return all_results
+
+    @classmethod
+    async def asearch_metrics(
+        cls,
+        query: str,
+        top_k: int = 3,
+        min_score: float = 0.55,
+        tenant_id: int | None = None,
+        user_id: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Asynchronous version of search_metrics（all indexes searched concurrently）"""
+        start = time.time()
+        indexes = [
+            HybridIndex(
+                name=config["metric_type"],
+                vector_index=config["vector_index"],
+                fulltext_index=config["fulltext_index"],
+                retrieval_query=cls._retrieval_query(config["metric_type"]),
+            )
+            for config in cls._SEARCH_CONFIGS
+        ]
+        try:
+            rows_by_index = await hybrid_search_many(
+                query,
+                indexes,
+                tenant_id=tenant_id,
+                top_k=top_k,
+                params={
+                    "tenantId": tenant_id,
+                    "userId": user_id,
+                    "systemCreators": cls._SYSTEM_CREATORS,
+                },
+            )
+        except Exception as e:
+            logger.error(f"Mixed search metrics failed: {e}")
             return []
 
-        all_results.sort(key=lambda x: x.get("score", 0), reverse=True)
-        all_results = all_results[:top_k]
+        all_results: list[dict[str, Any]] = []
+        for rows in rows_by_index.values():
+            for row in rows:
+                score = float(row.get("score", 0) or 0)
+                if score < min_score:
+                    continue
+                all_results.append(
+                    {
+                        "type": row.get("type"),
+                        "code": row.get("code"),
+                        "name": row.get("name"),
+                        "description": row.get("description"),
+                        "score": round(score, 3),
+                    }
+                )
 
+        all_results = cls._rank(all_results, top_k)
         logger.debug(f"[Indicator search] Total time spent: {time.time() - start:.3f}s")
         return all_results
+
+    @staticmethod
+    def _retrieval_query(metric_type: str) -> str:
+        return f"""
+        WHERE ($tenantId IS NULL OR node.tenantId = $tenantId)
+          AND (
+            $userId IS NULL
+            OR node.createdBy IS NULL
+            OR toString(node.createdBy) = toString($userId)
+            OR node.createdBy IN $systemCreators
+          )
+        RETURN
+            node.id AS node_id,
+            '{metric_type}' AS type,
+            node.code AS code,
+            node.name AS name,
+            node.description AS description,
+            score
+        """
+
+    @staticmethod
+    def _rank(results: list[dict[str, Any]], top_k: int) -> list[dict[str, Any]]:
+        results.sort(key=lambda x: x.get("score", 0), reverse=True)
+        return results[:top_k]
@@ -9,6 +9,7 @@ design principles:- use neo4j-graphrag Official library(HybridCypherRetriever /
 - Unified use of services ID(node.id)
 - Unified return structure SearchHit
 - Pass retrieval_query One query returns all fields,No secondary query
+- avector_search/afulltext_search/ahybrid_search:asynchronous versions(search_hybrid)
 """
 
 from __future__ import annotations
@@ -18,8 +19,11 @@ from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 from src.infrastructure.database import Neo4jClient
-from src.infrastructure.database.cypher import run_cypher
+from src.infrastructure.database.cypher import arun_cypher, run_cypher
 from src.infrastructure.database.neo4j import convert_neo4j_types
+from src.infrastructure.repository.knowledge import search_hybrid
+from src.infrastructure.repository.knowledge.search_hybrid import HybridIndex
+from src.infrastructure.repository.neo4j_uow import neo4j_async_session
 from src.shared.config.settings import settings
 
 if TYPE_CHECKING:
@@ -59,6 +63,19 @@ class Neo4jNodeSearch:
            score
     """
 
+    _FULLTEXT_CYPHER = """
+    CALL db.index.fulltext.queryNodes($index_name, $query)
+    YIELD node, score
+    RETURN
+        node.id AS node_id,
+        labels(node) AS labels,
+        node.name AS name,
+        node.description AS description,
+        score
+    ORDER BY score DESC
+    LIMIT $top_k
+    """
+
     @classmethod
     def get_knowledge_navigation(cls) -> dict[str, int] | None:
         """kg_unified_fulltext_index"""
@@ -137,10 +154,24 @@ class Neo4jNodeSearch:
         exclude_types: list[str] | None = None,
     ) -> list[SearchHit]:
         """score"""
+        return cls._build_hits_from_rows(
+            [getattr(item, "metadata", {}) or {} for item in items],
+            min_score,
+            node_types,
+            exclude_types,
+        )
+
+    @classmethod
+    def _build_hits_from_rows(
+        cls,
+        rows: list[dict[str, Any]],
+        min_score: float,
+        node_types: list[str] | None,
+        exclude_types: list[str] | None = None,
+    ) -> list[SearchHit]:
         hits: list[SearchHit] = []
 
-        for item in items:
-            metadata = getattr(item, "metadata", {}) or {}
+        for metadata in rows:
             score = float(metadata.get("score", 0) or 0)
 
             if score < min_score:
@@ -223,52 +254,42 @@ class Neo4jNodeSearch:
         try:
             driver = Neo4jClient.get_driver()
             with driver.session(database=settings.neo4j_database) as session:
-                cypher = """
-                CALL db.index.fulltext.queryNodes($index_name, $query)
-                YIELD node, score
-                RETURN
-                    node.id AS node_id,
-                    labels(node) AS labels,
-                    node.name AS name,
-                    node.description AS description,
-                    score
-                ORDER BY score DESC
-                LIMIT $top_k
-                """
-
                 result = run_cypher(
                     session,
-                    cypher,
+                    cls._FULLTEXT_CYPHER,
                     {"index_name": index_name, "query": query, "top_k": top_k},
                 )
 
-                hits: list[SearchHit] = []
-                for record in result:
-                    node_id = record.get("node_id")
-                    if not node_id:
-                        continue
+                return cls._fulltext_hits(list(result), node_types)
 
-                    labels = list(record.get("labels") or [])
+        except BaseException:
+            logger.error("name")
+            return []
 
-                    # Exclude by default SQL node
-                    if node_types and not any(t in labels for t in node_types):
-                        continue
+    @staticmethod
+    def _fulltext_hits(records: list[Any], node_types: list[str] | None) -> list[SearchHit]:
+        hits: list[SearchHit] = []
+        for record in records:
+            node_id = record.get("node_id")
+            if not node_id:
+                continue
 
-                    hits.append(
-                        SearchHit(
-                            node_id=node_id,
-                            score=float(record.get("score", 0) or 0),
-                            labels=labels,
-                            name=record.get("name"),
-                            description=record.get("description"),
-                        )
-                    )
+            labels = list(record.get("labels") or [])
 
-                return hits
+            # Exclude by default SQL node
+            if node_types and not any(t in labels for t in node_types):
+                continue
 
-        except BaseException:
-            logger.error("name")
-            return []
+            hits.append(
+                SearchHit(
+                    node_id=node_id,
+                    score=float(record.get("score", 0) or 0),
+                    labels=labels,
+                    name=record.get("name"),
+                    description=record.get("description"),
+                )
+            )
+        return hits
 
     @classmethod
     def hybrid_search(
@@ -318,6 +339,85 @@ class Neo4jNodeSearch:
             logger.error("SQL")
             return []
 
+    @classmethod
+    async def avector_search(
+        cls,
+        query: str,
+        top_k: int = 10,
+        min_score: float = 0.8,
+        node_types: list[str] | None = None,
+        vector_index: str | None = None,
+        tenant_id: int | None = None,
+    ) -> list[SearchHit]:
+        """Asynchronous vector_search"""
+        try:
+            rows = await search_hybrid.vector_search(
+                query,
+                vector_index or cls.DEFAULT_VECTOR_INDEX,
+                cls.RETRIEVAL_QUERY,
+                tenant_id=tenant_id,
+                top_k=top_k,
+            )
+        except Exception:
+            logger.error("Asynchronous vector search failed", exc_info=True)
+            return []
+        return cls._build_hits_from_rows(rows, min_score, node_types)
+
+    @classmethod
+    async def afulltext_search(
+        cls,
+        query: str,
+        top_k: int = 10,
+        node_types: list[str] | None = None,
+        fulltext_index: str | None = None,
+    ) -> list[SearchHit]:
+        """Asynchronous fulltext_search"""
+        try:
+            async with neo4j_async_session() as session:
+                result = await arun_cypher(
+                    session,
+                    cls._FULLTEXT_CYPHER,
+                    {
+                        "index_name": fulltext_index or cls.DEFAULT_FULLTEXT_INDEX,
+                        "query": query,
+                        "top_k": top_k,
+                    },
+                )
+                records = await result.data()
+        except Exception:
+            logger.error("Asynchronous full-text search failed", exc_info=True)
+            return []
+        return cls._fulltext_hits(records, node_types)
+
+    @classmethod
+    async def ahybrid_search(
+        cls,
+        query: str,
+        top_k: int = 10,
+        min_score: float = 0.3,
+        node_types: list[str] | None = None,
+        exclude_sql: bool = True,
+        vector_index: str | None = None,
+        fulltext_index: str | None = None,
+        tenant_id: int | None = None,
+    ) -> list[SearchHit]:
+        """Asynchronous hybrid_search(vector and full-text legs run concurrently)"""
+        index = HybridIndex(
+            name="knowledge",
+            vector_index=vector_index or cls.DEFAULT_VECTOR_INDEX,
+            fulltext_index=fulltext_index or cls.DEFAULT_FULLTEXT_INDEX,
+            retrieval_query=cls.RETRIEVAL_QUERY,
+        )
+        try:
+            rows = await search_hybrid.hybrid_search(
+                query, index, tenant_id=tenant_id, top_k=top_k
+            )
+        except Exception:
+            logger.error("Asynchronous hybrid search failed", exc_info=True)
+            return []
+        exclude_types = ["SQL"] if exclude_sql else None
+        return cls._build_hits_from_rows(rows, min_score, node_types, exclude_types)
+
     @classmethod
     def get_nodes_context(
         cls,
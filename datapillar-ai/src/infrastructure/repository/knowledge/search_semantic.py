@@ -6,6 +6,7 @@ Neo4j Semantic Asset Query Service
 
 Responsibilities:Provide query functions related to semantic assets
 - search_semantic_assets:Mixed search root,modifier,unit
+- asearch_semantic_assets:asynchronous version,one query embedding for all three indexes
 """
 
 from __future__ import annotations
@@ -16,6 +17,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any
 
 from src.infrastructure.database import Neo4jClient
+from src.infrastructure.repository.knowledge.search_hybrid import HybridIndex, hybrid_search_many
 from src.shared.config.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -26,6 +28,68 @@ class Neo4jSemanticSearch:
 
     _SYSTEM_CREATORS = ["OPENLINEAGE", "GRAVITINO_SYNC", "system", "SYSTEM"]
 
+    _SEARCH_CONFIGS = [
+        {
+            "name": "word_roots",
+            "vector_index": "wordroot_embedding",
+            "fulltext_index": "wordroot_fulltext",
+            "retrieval_query": """
+            WHERE ($tenantId IS NULL OR node.tenantId = $tenantId)
+              AND (
+                $userId IS NULL
+                OR node.createdBy IS NULL
+                OR toString(node.createdBy) = toString($userId)
+                OR node.createdBy IN $systemCreators
+              )
+            RETURN
+                node.code AS code,
+                node.name AS name,
+                node.dataType AS dataType,
+                node.description AS description,
+                score
+            """,
+        },
+        {
+            "name": "modifiers",
+            "vector_index": "modifier_embedding",
+            "fulltext_index": "modifier_fulltext",
+            "retrieval_query": """
+            WHERE ($tenantId IS NULL OR node.tenantId = $tenantId)
+              AND (
+                $userId IS NULL
+                OR node.createdBy IS NULL
+                OR toString(node.createdBy) = toString($userId)
+                OR node.createdBy IN $systemCreators
+              )
+            RETURN
+                node.code AS code,
+                node.modifierType AS modifierType,
+                node.description AS description,
+                score
+            """,
+        },
+        {
+            "name": "units",
+            "vector_index": "unit_embedding",
+            "fulltext_index": "unit_fulltext",
+            "retrieval_query": """
+            WHERE ($tenantId IS NULL OR node.tenantId = $tenantId)
+              AND (
+                $userId IS NULL
+                OR node.createdBy IS NULL
+                OR toString(node.createdBy) = toString($userId)
+                OR node.createdBy IN $systemCreators
+              )
+            RETURN
+                node.code AS code,
+                node.name AS name,
+                node.symbol AS symbol,
+                node.description AS description,
+                score
+            """,
+        },
+    ]
+
     @classmethod
     def search_semantic_assets(
         cls,
@@ -53,67 +117,14 @@ class Neo4jSemanticSearch:
 
         start = time.time()
 
-        search_configs = [
-            {
-                "name": "word_roots",
-                "vector_index": "wordroot_embedding",
-                "fulltext_index": "wordroot_fulltext",
-                "retrieval_query": """
-                WHERE ($tenantId IS NULL OR node.tenantId = $tenantId)
-                  AND (
-                    $userId IS NULL
-                    OR node.createdBy IS NULL
-                    OR toString(node.createdBy) = toString($userId)
-                    OR node.createdBy IN $systemCreators
-                  )
-                RETURN
-                    node.code AS code,
-                    node.name AS name,
-                    node.dataType AS dataType,
-                    node.description AS description,
-                    score
-                """,
-            },
-            {
-                "name": "modifiers",
-                "vector_index": "modifier_embedding",
-                "fulltext_index": "modifier_fulltext",
-                "retrieval_query": """
-                WHERE ($tenantId IS NULL OR node.tenantId = $tenantId)
-                  AND (
-                    $userId IS NULL
-                    OR node.createdBy IS NULL
-                    OR toString(node.createdBy) = toString($userId)
-                    OR node.createdBy IN $systemCreators
-                  )
-                RETURN
-                    node.code AS code,
-                    node.modifierType AS modifierType,
-                    node.description AS description,
-                    score
-                """,
-            },
-            {
-                "name": "units",
-                "vector_index": "unit_embedding",
-                "fulltext_index": "unit_fulltext",
-                "retrieval_query": """
-                WHERE ($tenantId IS NULL OR node.tenantId = $tenantId)
-                  AND (
-                    $userId IS NULL
-                    OR node.createdBy IS NULL
-                    OR toString(node.createdBy) = toString($userId)
-                    OR node.createdBy IN $systemCreators
-                  )
-                RETURN
-                    node.code AS code,
-                    node.name AS name,
-                    node.symbol AS symbol,
-                    node.description AS description,
-                    score
-                """,
-            },
-        ]
+        search_configs = cls._SEARCH_CONFIGS
+        embedder = UnifiedEmbedder(tenant_id)
+        # Embed once up front:the three retrievers then hit the embedder's query memo.
+        try:
+            embedder.embed_query(query)
+        except Exception as e:
+            logger.warning(f"Semantic asset search embedding failed:{e}")
+            return {"word_roots": [], "modifiers": [], "units": []}
 
         def semantic_result_formatter(record: Any) -> Any:
             return RetrieverResultItem(
@@ -132,7 +143,7 @@ class Neo4jSemanticSearch:
                     fulltext_index_name=config["fulltext_index"],
                     retrieval_query=config["retrieval_query"],
                     result_formatter=semantic_result_formatter,
-                    embedder=UnifiedEmbedder(tenant_id),
+                    embedder=embedder,
                     neo4j_database=settings.neo4j_database,
                 )
 
@@ -179,3 +190,58 @@ class Neo4jSemanticSearch:
         )
 
         return result
+
+    @classmethod
+    async def asearch_semantic_assets(
+        cls,
+        query: str,
+        top_k: int = 10,
+        min_score: float = 0.55,
+        tenant_id: int | None = None,
+        user_id: int | None = None,
+    ) -> dict[str, list[Any]]:
+        """Asynchronous version of search_semantic_assets(all indexes searched concurrently)"""
+        start = time.time()
+        indexes = [
+            HybridIndex(
+                name=config["name"],
+                vector_index=config["vector_index"],
+                fulltext_index=config["fulltext_index"],
+                retrieval_query=config["retrieval_query"],
+            )
+            for config in cls._SEARCH_CONFIGS
+        ]
+        result: dict[str, list[Any]] = {"word_roots": [], "modifiers": [], "units": []}
+        try:
+            rows_by_index = await hybrid_search_many(
+                query,
+                indexes,
+                tenant_id=tenant_id,
+                top_k=top_k,
+                params={
+                    "tenantId": tenant_id,
+                    "userId": user_id,
+                    "systemCreators": cls._SYSTEM_CREATORS,
+                },
+            )
+        except Exception as e:
+            logger.warning(f"Semantic asset search failed:{e}")
+            return result
+
+        for name, rows in rows_by_index.items():
+            items: list[dict[str, Any]] = []
+            for row in rows:
+                score = float(row.get("score", 0) or 0)
+                if score < min_score:
+                    continue
+                items.append({**row, "score": round(score, 3)})
+            result[name] = items
+
+        logger.info(
+            f"[Semantic asset retrieval] query={query[:20]}..., "
+            f"root={len(result['word_roots'])},"
+            f"modifier={len(result['modifiers'])},"
+            f"unit={len(result['units'])},"
+            f"Time consuming={time.time() - start:.3f}s"
+        )
+        return result
@@ -7,10 +7,11 @@ Neo4j Table query service
 Responsibilities:Provide table-related query functions(Contains columns,range,Bloodline)
 - get_table_info:Get basic table information
 - get_table_detail:Get table details(Contains columns and ranges)
-- get_table_lineage:Get table blood relationship
+- get_table_lineage:Get table blood relationship(lineage_cache,depth-limited)
 - get_column_lineage:Get rank lineage
 - find_lineage_sql:Search based on ancestry SQL
 - search_tables:hybrid search table(Vector + Full text)
+- asearch_tables:asynchronous hybrid search table(search_hybrid)
 """
 
 from __future__ import annotations
@@ -22,6 +23,8 @@ from typing import Any
 from src.infrastructure.database import Neo4jClient
 from src.infrastructure.database.cypher import run_cypher
 from src.infrastructure.database.neo4j import convert_neo4j_types
+from src.infrastructure.repository.knowledge.lineage_cache import get_lineage_cache
+from src.infrastructure.repository.knowledge.search_hybrid import HybridIndex, hybrid_search
 from src.shared.config.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -57,6 +60,13 @@ class Neo4jTableSearch:
         score
     """
 
+    _TABLE_INDEX = HybridIndex(
+        name="table",
+        vector_index="table_embedding",
+        fulltext_index="table_fulltext",
+        retrieval_query=_TABLE_RETRIEVAL_QUERY,
+    )
+
     # =========================================================================
     # Precise query
     # =========================================================================
@@ -366,80 +376,41 @@ class Neo4jTableSearch:
         *,
         tenant_id: int | None = None,
         user_id: int | None = None,
+        max_depth: int | None = 1,
     ) -> dict[str, Any]:
         """
-        Get table blood relationship
+        Get table blood relationship(served from the lineage cache)
 
         parameters:- schema:Schema Name
-        - table:table name
+        - table:table name(matched in every schema,as before)
         - direction:direction(upstream/downstream/both)
+        - max_depth:hops to follow(1 = direct neighbours,None = full closure)
 
-        Return:- {upstream:[],downstream:[],edges:[]}
-        """
-        qualified_name = f"{schema}.{table}"
-
-        cypher = """
-        MATCH (source:Table)-[:INPUT_OF]->(sql:SQL)-[:OUTPUT_TO]->(target:Table)
-        WHERE ($tenantId IS NULL OR (source.tenantId = $tenantId AND sql.tenantId = $tenantId AND target.tenantId = $tenantId))
-          AND (
-            $userId IS NULL
-            OR sql.createdBy IS NULL
-            OR toString(sql.createdBy) = toString($userId)
-            OR sql.createdBy IN $systemCreators
-          )
-        WITH source, target, sql
-        MATCH (source)<-[:HAS_TABLE]-(source_schema:Schema)
-        MATCH (target)<-[:HAS_TABLE]-(target_schema:Schema)
-        WHERE ($tenantId IS NULL OR (source_schema.tenantId = $tenantId AND target_schema.tenantId = $tenantId))
-        RETURN DISTINCT
-            source_schema.name + '.' + source.name AS source_table,
-            target_schema.name + '.' + target.name AS target_table,
-            sql.id AS sql_id
-        ORDER BY source_table, target_table
+        Return:- {upstream:[],downstream:[],edges:[],
+                  hops:{upstream:{table:hops},downstream:{table:hops}}}
+                  (per direction:in a cycle a table is both upstream and downstream)
         """
-
         try:
-            driver = Neo4jClient.get_driver()
-            with driver.session(database=settings.neo4j_database) as session:
-                result = run_cypher(
-                    session,
-                    cypher,
-                    {
-                        "tenantId": tenant_id,
-                        "userId": user_id,
-                        "systemCreators": cls._SYSTEM_CREATORS,
-                    },
-                )
-                records = result.data()
-
-                upstream = []
-                downstream = []
-                edges = []
-
-                for edge in records:
-                    source = edge.get("source_table", "")
-                    target = edge.get("target_table", "")
-
-                    is_source = source == qualified_name or source.endswith(f".{table}")
-                    is_target = target == qualified_name or target.endswith(f".{table}")
-
-                    if direction in ("upstream", "both") and is_target:
-                        upstream.append(source)
-                        edges.append(edge)
-
-                    if direction in ("downstream", "both") and is_source:
-                        downstream.append(target)
-                        if not (direction == "both" and is_target):
-                            edges.append(edge)
-
-                return {
-                    "upstream": list(set(upstream)),
-                    "downstream": list(set(downstream)),
-                    "edges": edges,
-                }
+            impact = get_lineage_cache().impact(
+                tenant_id, user_id, table, direction, max_depth=max_depth
+            )
+            return {
+                "upstream": list(impact.upstream),
+                "downstream": list(impact.downstream),
+                "edges": impact.edges,
+                "hops": {
+                    "upstream": dict(impact.upstream),
+                    "downstream": dict(impact.downstream),
+                },
+            }
         except Exception as e:
-            logger.error(f"Failed to obtain table lineage:{e}")
-            return {"upstream": [], "downstream": [], "edges": []}
+            logger.error(f"Failed to obtain table lineage({schema}.{table}):{e}")
+            return {
+                "upstream": [],
+                "downstream": [],
+                "edges": [],
+                "hops": {"upstream": {}, "downstream": {}},
+            }
 
     @classmethod
     def get_column_lineage(
@@ -643,26 +614,64 @@ class Neo4jTableSearch:
             )
             items = list(getattr(results, "items", []) or [])
 
-            recommendations: list[dict[str, Any]] = []
-            for item in items:
-                metadata = getattr(item, "metadata", {}) or {}
-                score = float(metadata.get("score", 0) or 0)
-                if score < min_score:
-                    continue
-                recommendations.append(
-                    {
-                        "type": metadata.get("type"),
-                        "path": metadata.get("path"),
-                        "name": metadata.get("name"),
-                        "description": metadata.get("description"),
-                        "dataType": metadata.get("dataType"),
-                        "table": metadata.get("table"),
-                        "score": round(score, 3),
-                    }
-                )
+            recommendations = cls._build_recommendations(
+                [getattr(item, "metadata", {}) or {} for item in items], min_score
+            )
 
             logger.debug(f"[table search] Total time spent:{time.time() - start:.3f}s")
             return recommendations
         except Exception as e:
             logger.error(f"Mixed search table failed:{e}")
             return []
+
+    @classmethod
+    async def asearch_tables(
+        cls,
+        query: str,
+        top_k: int = 3,
+        min_score: float = 0.55,
+        tenant_id: int | None = None,
+        user_id: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Asynchronous version of search_tables(AsyncNeo4jClient + shared query embedding)"""
+        start = time.time()
+        try:
+            rows = await hybrid_search(
+                query,
+                cls._TABLE_INDEX,
+                tenant_id=tenant_id,
+                top_k=top_k,
+                params={
+                    "tenantId": tenant_id,
+                    "userId": user_id,
+                    "systemCreators": cls._SYSTEM_CREATORS,
+                },
+            )
+        except Exception as e:
+            logger.error(f"Mixed search table failed:{e}")
+            return []
+        recommendations = cls._build_recommendations(rows, min_score)
+        logger.debug(f"[table search] Total time spent:{time.time() - start:.3f}s")
+        return recommendations
+
+    @staticmethod
+    def _build_recommendations(
+        rows: list[dict[str, Any]], min_score: float
+    ) -> list[dict[str, Any]]:
+        recommendations: list[dict[str, Any]] = []
+        for row in rows:
+            score = float(row.get("score", 0) or 0)
+            if score < min_score:
+                continue
+            recommendations.append(
+                {
+                    "type": row.get("type"),
+                    "path": row.get("path"),
+                    "name": row.get("name"),
+                    "description": row.get("description"),
+                    "dataType": row.get("dataType"),
+                    "table": row.get("table"),
+                    "score": round(score, 3),
+                }
+            )
+        return recommendations
@@ -6,16 +6,32 @@ Knowledge graph synchronizes bloodline data access
 
 constraint:- Direct splicing is prohibited within the module/execute Cypher
 - All related to"blood relationship(SQL/table level/Ranking/indicator column/Column range)"relevant Cypher Statements are managed centrally here
+
+Bulk sync:LineageBulkWriter buffers edges by type and writes each type as
+parameterized `UNWIND $rows AS row ... MERGE` batches(neo4j_write_batch_size rows per
+statement),so a warehouse-wide sync costs rows / batch_size round-trips instead of one
+per edge.MERGE is idempotent:re-sending the same edges only touches updatedAt.
+
+Table-level writers(HAS_TABLE,INPUT_OF,OUTPUT_TO)mark the ids they touched dirty in the
+lineage cache(lineage_cache.mark_lineage_dirty).
 """
 
 from __future__ import annotations
 
-from collections.abc import Mapping, Sequence
+import logging
+import re
+import time
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
 from typing import Any
 
 from src.infrastructure.database.cypher import arun_cypher
+from src.infrastructure.repository.knowledge.lineage_cache import mark_lineage_dirty
+from src.shared.config.runtime import get_neo4j_write_batch_size
 from src.shared.context import get_current_tenant_id
 
+logger = logging.getLogger(__name__)
+
 
 def _require_tenant_id() -> int:
     tenant_id = get_current_tenant_id()
@@ -60,6 +76,7 @@ class Lineage:
         MERGE (s)-[:HAS_TABLE]->(t)
         """
         await _run_with_tenant(session, query, schemaId=schema_id, tableId=table_id)
+        mark_lineage_dirty(_require_tenant_id(), table_ids=[table_id])
 
     @staticmethod
     async def link_table_columns(
@@ -233,6 +250,7 @@ class Lineage:
         ON MATCH SET r.updatedAt = datetime()
         """
         await _run_with_tenant(session, query, tableIds=list(table_ids), sqlId=sql_id)
+        mark_lineage_dirty(_require_tenant_id(), sql_ids=[sql_id])
 
     @staticmethod
     async def link_sql_outputs(
@@ -250,6 +268,7 @@ class Lineage:
         ON MATCH SET r.updatedAt = datetime()
         """
         await _run_with_tenant(session, query, tableIds=list(table_ids), sqlId=sql_id)
+        mark_lineage_dirty(_require_tenant_id(), sql_ids=[sql_id])
 
     @staticmethod
     async def link_column_lineage(
@@ -542,3 +561,279 @@ class Lineage:
             source_id=source_id,
             tag_ids=tag_ids,
         )
+
+
+# ==================== Bulk lineage writer ====================
+
+# (label,property) pairs the bulk MERGE statements look nodes up by.
+LINEAGE_MERGE_KEYS: tuple[tuple[str, str], ...] = (
+    ("Catalog", "id"),
+    ("Schema", "id"),
+    ("Table", "id"),
+    ("Column", "id"),
+    ("SQL", "id"),
+)
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+_SHOW_NODE_INDEXES = """
+SHOW INDEXES YIELD labelsOrTypes, properties, entityType, state
+WHERE entityType = 'NODE'
+RETURN labelsOrTypes, properties, state
+"""
+
+_checked_merge_keys: set[tuple[str, str]] = set()
+
+
+async def ensure_merge_key_indexes(
+    session: Any,
+    keys: Iterable[tuple[str, str]] = LINEAGE_MERGE_KEYS,
+    *,
+    create_missing: bool = True,
+) -> list[tuple[str, str]]:
+    """
+    Make sure every (label,property) used as a MERGE/MATCH key is backed by an index
+
+    Unique constraints count(they own a range index).Checked once per process per key;
+    missing keys get `CREATE INDEX ... IF NOT EXISTS`.Returns the keys that were missing.
+    """
+    pending = [key for key in keys if key not in _checked_merge_keys]
+    if not pending:
+        return []
+    for label, prop in pending:
+        if not (_IDENTIFIER.match(label) and _IDENTIFIER.match(prop)):
+            raise ValueError(f"Invalid index key:{label}.{prop}")
+
+    result = await arun_cypher(session, _SHOW_NODE_INDEXES)
+    indexed: set[tuple[str, str]] = set()
+    for row in await result.data():
+        labels = row.get("labelsOrTypes") or []
+        props = row.get("properties") or []
+        if row.get("state") == "FAILED" or len(labels) != 1 or not props:
+            continue
+        # A composite index serves lookups on its leading property.
+        indexed.add((labels[0], props[0]))
+
+    missing = [key for key in pending if key not in indexed]
+    if missing and create_missing:
+        for label, prop in missing:
+            name = f"kg_{label.lower()}_{prop.lower()}_idx"
+            await arun_cypher(
+                session,
+                f"CREATE INDEX {name} IF NOT EXISTS FOR (n:{label}) ON (n.{prop})",
+            )
+        logger.warning("Created missing MERGE key indexes:%s", missing)
+    if create_missing or not missing:
+        _checked_merge_keys.update(pending)
+    return missing
+
+
+@dataclass(frozen=True)
+class _BulkEdgeSpec:
+    key_fields: tuple[str, ...]
+    query: str
+
+
+_BULK_EDGE_SPECS: dict[str, _BulkEdgeSpec] = {
+    "catalog_schema": _BulkEdgeSpec(
+        ("catalogId", "schemaId"),
+        """
+        UNWIND $rows AS row
+        MATCH (c:Catalog {id: row.catalogId, tenantId: $tenantId})
+        MATCH (s:Schema {id: row.schemaId, tenantId: $tenantId})
+        MERGE (c)-[:HAS_SCHEMA]->(s)
+        """,
+    ),
+    "schema_table": _BulkEdgeSpec(
+        ("schemaId", "tableId"),
+        """
+        UNWIND $rows AS row
+        MATCH (s:Schema {id: row.schemaId, tenantId: $tenantId})
+        MATCH (t:Table {id: row.tableId, tenantId: $tenantId})
+        MERGE (s)-[:HAS_TABLE]->(t)
+        """,
+    ),
+    "table_column": _BulkEdgeSpec(
+        ("tableId", "columnId"),
+        """
+        UNWIND $rows AS row
+        MATCH (t:Table {id: row.tableId, tenantId: $tenantId})
+        MATCH (c:Column {id: row.columnId, tenantId: $tenantId})
+        MERGE (t)-[:HAS_COLUMN]->(c)
+        """,
+    ),
+    "sql_input": _BulkEdgeSpec(
+        ("tableId", "sqlId"),
+        """
+        UNWIND $rows AS row
+        MATCH (t:Table {id: row.tableId, tenantId: $tenantId})
+        MATCH (s:SQL {id: row.sqlId, tenantId: $tenantId})
+        MERGE (t)-[r:INPUT_OF]->(s)
+        ON CREATE SET r.createdAt = datetime()
+        ON MATCH SET r.updatedAt = datetime()
+        """,
+    ),
+    "sql_output": _BulkEdgeSpec(
+        ("sqlId", "tableId"),
+        """
+        UNWIND $rows AS row
+        MATCH (s:SQL {id: row.sqlId, tenantId: $tenantId})
+        MATCH (t:Table {id: row.tableId, tenantId: $tenantId})
+        MERGE (s)-[r:OUTPUT_TO]->(t)
+        ON CREATE SET r.createdAt = datetime()
+        ON MATCH SET r.updatedAt = datetime()
+        """,
+    ),
+    "column_lineage": _BulkEdgeSpec(
+        ("srcId", "dstId"),
+        """
+        UNWIND $rows AS row
+        MATCH (src:Column {id: row.srcId, tenantId: $tenantId})
+        MATCH (dst:Column {id: row.dstId, tenantId: $tenantId})
+        MERGE (dst)-[r:DERIVES_FROM]->(src)
+        ON CREATE SET
+            r.createdAt = datetime(),
+            r.transformationType = row.transformType,
+            r.transformationSubtype = row.transformSubtype
+        ON MATCH SET
+            r.updatedAt = datetime()
+        """,
+    ),
+}
+
+
+@dataclass
+class LineageWriteStats:
+    """Outcome of one LineageBulkWriter.flush"""
+
+    rows: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+    rows_by_type: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+class LineageBulkWriter:
+    """
+    Buffer lineage edges by type,then write them as UNWIND MERGE batches
+
+    Usage:writer = LineageBulkWriter(session);writer.add_column_lineage(...);
+    stats = await writer.flush().Structural edges are written before SQL and column
+    edges(dict order of _BULK_EDGE_SPECS).Duplicate edges in the buffer are dropped.
+    """
+
+    EDGE_TYPES: tuple[str, ...] = tuple(_BULK_EDGE_SPECS)
+
+    def __init__(
+        self,
+        session: Any,
+        *,
+        batch_size: int | None = None,
+        tenant_id: int | None = None,
+        ensure_indexes: bool = True,
+    ) -> None:
+        self._session = session
+        self._batch_size = max(1, batch_size or get_neo4j_write_batch_size())
+        self._tenant_id = int(tenant_id) if tenant_id is not None else _require_tenant_id()
+        self._ensure_indexes = ensure_indexes
+        self._buffers: dict[str, dict[tuple[Any, ...], dict[str, Any]]] = {
+            edge_type: {} for edge_type in self.EDGE_TYPES
+        }
+
+    @property
+    def pending(self) -> int:
+        return sum(len(buffer) for buffer in self._buffers.values())
+
+    def add(self, edge_type: str, row: Mapping[str, Any]) -> None:
+        spec = _BULK_EDGE_SPECS.get(edge_type)
+        if spec is None:
+            raise ValueError(f"Not supported lineage edge type:{edge_type}")
+        key = tuple(row.get(name) for name in spec.key_fields)
+        if any(part is None or part == "" for part in key):
+            raise ValueError(f"lineage edge {edge_type} missing key:{spec.key_fields}")
+        self._buffers[edge_type][key] = dict(row)
+
+    def add_catalog_schema(self, catalog_id: str, schema_id: str) -> None:
+        self.add("catalog_schema", {"catalogId": catalog_id, "schemaId": schema_id})
+
+    def add_schema_table(self, schema_id: str, table_id: str) -> None:
+        self.add("schema_table", {"schemaId": schema_id, "tableId": table_id})
+
+    def add_table_columns(self, table_id: str, column_ids: Sequence[str]) -> None:
+        for column_id in column_ids:
+            self.add("table_column", {"tableId": table_id, "columnId": column_id})
+
+    def add_sql_inputs(self, sql_id: str, table_ids: Sequence[str]) -> None:
+        for table_id in table_ids:
+            self.add("sql_input", {"sqlId": sql_id, "tableId": table_id})
+
+    def add_sql_outputs(self, sql_id: str, table_ids: Sequence[str]) -> None:
+        for table_id in table_ids:
+            self.add("sql_output", {"sqlId": sql_id, "tableId": table_id})
+
+    def add_column_lineage(
+        self,
+        src_id: str,
+        dst_id: str,
+        *,
+        transform_type: str | None = None,
+        transform_subtype: str | None = None,
+    ) -> None:
+        self.add(
+            "column_lineage",
+            {
+                "srcId": src_id,
+                "dstId": dst_id,
+                "transformType": transform_type,
+                "transformSubtype": transform_subtype,
+            },
+        )
+
+    async def flush(self) -> LineageWriteStats:
+        """Write every buffered edge;the buffer is emptied even if a batch fails"""
+        stats = LineageWriteStats()
+        if not self.pending:
+            return stats
+        if self._ensure_indexes:
+            await ensure_merge_key_indexes(self._session)
+
+        buffers = self._buffers
+        self._buffers = {edge_type: {} for edge_type in self.EDGE_TYPES}
+        start = time.perf_counter()
+        for edge_type, buffer in buffers.items():
+            if not buffer:
+                continue
+            rows = list(buffer.values())
+            query = _BULK_EDGE_SPECS[edge_type].query
+            for offset in range(0, len(rows), self._batch_size):
+                batch = rows[offset : offset + self._batch_size]
+                result = await arun_cypher(
+                    self._session, query, rows=batch, tenantId=self._tenant_id
+                )
+                consume = getattr(result, "consume", None)
+                if consume is not None:
+                    await consume()
+                stats.batches += 1
+            stats.rows += len(rows)
+            stats.rows_by_type[edge_type] = len(rows)
+        stats.seconds = time.perf_counter() - start
+
+        sql_edges = [*buffers["sql_input"].values(), *buffers["sql_output"].values()]
+        mark_lineage_dirty(
+            self._tenant_id,
+            sql_ids={row["sqlId"] for row in sql_edges},
+            table_ids={row["tableId"] for row in buffers["schema_table"].values()},
+        )
+
+        logger.info(
+            "[lineage bulk] rows=%s batches=%s seconds=%.3f rows/s=%.0f by_type=%s",
+            stats.rows,
+            stats.batches,
+            stats.seconds,
+            stats.rows_per_second,
+            stats.rows_by_type,
+        )
+        return stats
@@ -8,13 +8,25 @@ constraint:- Direct splicing is prohibited within the module/execute Cypher
 - All related to"metadata node(Catalog/Schema/Table/Column/Metric/Semantic layer)"relevant Cypher Statements are managed centrally here
 - Does not create any relationship(HAS_* / blood relationship);The relationship is unified by Lineage management
 - Transaction boundaries are determined by the caller(AsyncSession)control;This layer only does statement and parameter mapping
+
+Bulk sync:MetadataBulkSync buffers Catalog/Schema/Table/Column rows and stamps each node
+with contentHash(every written property) and textHash(the embedded text:name+description).
+flush() reads the stored hashes back with one `UNWIND $ids` query per batch,writes only
+new or changed rows as `UNWIND $rows AS row ... MERGE` batches,and enqueues embeddings only
+for nodes whose textHash changed.textHash is written only after the embedding is queued,
+so a node that was not queued is offered again.A full re-sync of an unchanged warehouse
+costs rows / batch_size reads and no writes.
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
+import logging
+import time
 from collections.abc import Mapping, Sequence
-from dataclasses import dataclass
-from typing import Any
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
 
 from src.infrastructure.database.cypher import arun_cypher
 from src.infrastructure.repository.knowledge.dto import (
@@ -23,8 +35,19 @@ from src.infrastructure.repository.knowledge.dto import (
     ValueDomainDTO,
     WordRootDTO,
 )
+from src.infrastructure.repository.knowledge.lineage_cache import (
+    invalidate_lineage,
+    mark_lineage_dirty,
+)
+from src.infrastructure.repository.knowledge.sync_lineage import ensure_merge_key_indexes
+from src.shared.config.runtime import get_neo4j_write_batch_size
 from src.shared.context import get_current_tenant_id
 
+if TYPE_CHECKING:
+    from src.shared.embedding import EmbeddingProcessor
+
+logger = logging.getLogger(__name__)
+
 _ALLOWED_NODE_LABELS: set[str] = {
     "Knowledge",
     "Catalog",
@@ -141,14 +164,22 @@ class Metadata:
         provider: str,
     ) -> None:
         """
-        Batch writeback embedding(press label Single group write after grouping).data:[{"id":"...","embedding":[...]},...]
+        Batch writeback embedding(press label Single group write after grouping).data:[{"id":"...","embedding":[...],"version":...},...]
+
+        Idempotent:replaying a batch rewrites the same vectors,and an item whose version
+        (enqueue time in ms,optional)is older than the stored embeddingVersion is skipped,
+        so an at-least-once redelivery never replaces a newer vector.
         """
         Metadata._assert_node_label(node_label)
         query = f"""
         UNWIND $data AS item
         MATCH (n:{node_label} {{id: item.id, tenantId: $tenantId}})
+        WHERE item.version IS NULL
+           OR n.embeddingVersion IS NULL
+           OR n.embeddingVersion <= item.version
         SET n.embedding = item.embedding,
             n.embeddingProvider = $provider,
+            n.embeddingVersion = COALESCE(item.version, n.embeddingVersion),
             n.embeddingUpdatedAt = datetime()
         """
         await _run_with_tenant(session, query, data=list(data), provider=provider)
@@ -589,6 +620,7 @@ class Metadata:
         DETACH DELETE t, c
         """
         await _run_with_tenant(session, query, tableId=table_id)
+        mark_lineage_dirty(_require_tenant_id(), table_ids=[table_id])
 
     @staticmethod
     async def delete_schema_cascade(
@@ -604,6 +636,7 @@ class Metadata:
         DETACH DELETE s, t, c, m
         """
         await _run_with_tenant(session, query, schemaId=schema_id)
+        invalidate_lineage(_require_tenant_id())
 
     @staticmethod
     async def delete_catalog_cascade(
@@ -620,6 +653,7 @@ class Metadata:
         DETACH DELETE cat, s, t, c, m
         """
         await _run_with_tenant(session, query, catalogId=catalog_id)
+        invalidate_lineage(_require_tenant_id())
 
     @staticmethod
     async def delete_column(
@@ -1089,3 +1123,353 @@ class Metadata:
         DETACH DELETE t
         """
         await _run_with_tenant(session, query, tagId=tag_id)
+
+
+# ==================== Bulk sync:content-hash change detection ====================
+
+# Properties MetadataBulkSync may write per label(row keys,camelCase like the Cypher params).
+_BULK_NODE_PROPERTIES: dict[str, tuple[str, ...]] = {
+    "Catalog": ("name", "metalake", "catalogType", "provider", "description", "properties"),
+    "Schema": ("name", "description", "properties"),
+    "Table": (
+        "name",
+        "producer",
+        "description",
+        "properties",
+        "partitions",
+        "distribution",
+        "sortOrders",
+        "indexes",
+        "creator",
+        "createTime",
+        "lastModifier",
+        "lastModifiedTime",
+    ),
+    "Column": ("name", "dataType", "description", "nullable", "autoIncrement", "defaultValue"),
+}
+
+# The text EmbeddingProcessor vectorizes for a node.
+_EMBEDDING_TEXT_PROPERTIES: tuple[str, ...] = ("name", "description")
+
+_BULK_SYNC_CREATED_BY = "GRAVITINO_SYNC"
+
+_BULK_ROW_KEYS: tuple[str, ...] = ("id", "props", "createdBy", "contentHash")
+
+
+def _hash_properties(props: Mapping[str, Any]) -> str:
+    canonical = json.dumps(props, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(canonical.encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
+def _embedding_text(props: Mapping[str, Any]) -> str:
+    parts = [props.get(name) for name in _EMBEDDING_TEXT_PROPERTIES]
+    return ":".join(str(part) for part in parts if part not in (None, ""))
+
+
+def _bulk_read_query(label: str) -> str:
+    return f"""
+    UNWIND $ids AS id
+    MATCH (n:{label} {{id: id, tenantId: $tenantId}})
+    RETURN n.id AS id, n.contentHash AS contentHash, n.textHash AS textHash
+    """
+
+
+def _bulk_write_query(label: str) -> str:
+    # Null properties are dropped from row.props,so(like the COALESCE in the single-node
+    # upserts)a missing value never erases what is stored.
+    return f"""
+    UNWIND $rows AS row
+    MERGE (n:{label}:Knowledge {{id: row.id, tenantId: $tenantId}})
+    ON CREATE SET
+        n.createdBy = row.createdBy,
+        n.createdAt = datetime()
+    ON MATCH SET
+        n.updatedAt = datetime()
+    SET n += row.props,
+        n.contentHash = row.contentHash
+    """
+
+
+def _text_hash_write_query(label: str) -> str:
+    # textHash is only stored once the node's text is queued for embedding,so a node whose
+    # enqueue failed(or that had no processor)is offered again by the next sync.
+    return f"""
+    UNWIND $hashes AS row
+    MATCH (n:{label} {{id: row.id, tenantId: $tenantId}})
+    SET n.textHash = row.textHash
+    """
+
+
+@dataclass
+class MetadataSyncStats:
+    """Outcome of one MetadataBulkSync.flush"""
+
+    received: int = 0
+    unchanged: int = 0
+    written: int = 0
+    embedded: int = 0
+    reads: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+    written_by_label: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def round_trips(self) -> int:
+        return self.reads + self.batches
+
+
+class MetadataBulkSync:
+    """
+    Buffer metadata nodes by label,then write only the ones whose content changed
+
+    Usage:sync = MetadataBulkSync(session,embedding_processor=processor);
+    sync.add_column(...);stats = await sync.flush().Labels are flushed parent first
+    (Catalog,Schema,Table,Column);a duplicate id in the buffer keeps the last row.
+    Relationships are not written here(LineageBulkWriter owns HAS_*).
+    """
+
+    LABELS: tuple[str, ...] = tuple(_BULK_NODE_PROPERTIES)
+
+    def __init__(
+        self,
+        session: Any,
+        *,
+        batch_size: int | None = None,
+        tenant_id: int | None = None,
+        embedding_processor: EmbeddingProcessor | None = None,
+        ensure_indexes: bool = True,
+    ) -> None:
+        self._session = session
+        self._batch_size = max(1, batch_size or get_neo4j_write_batch_size())
+        self._tenant_id = int(tenant_id) if tenant_id is not None else _require_tenant_id()
+        self._embedding_processor = embedding_processor
+        self._ensure_indexes = ensure_indexes
+        self._buffers: dict[str, dict[str, dict[str, Any]]] = {label: {} for label in self.LABELS}
+
+    @property
+    def pending(self) -> int:
+        return sum(len(buffer) for buffer in self._buffers.values())
+
+    def add(
+        self,
+        label: str,
+        row: Mapping[str, Any],
+        *,
+        created_by: str = _BULK_SYNC_CREATED_BY,
+    ) -> None:
+        allowed = _BULK_NODE_PROPERTIES.get(label)
+        if allowed is None:
+            raise ValueError(f"Not supported bulk sync label:{label}")
+        node_id = row.get("id")
+        if not node_id:
+            raise ValueError(f"{label} row missing id")
+        unknown = set(row) - set(allowed) - {"id"}
+        if unknown:
+            raise ValueError(f"Not supported {label} properties:{sorted(unknown)}")
+        props = {name: row[name] for name in allowed if row.get(name) is not None}
+        text = _embedding_text(props)
+        self._buffers[label][str(node_id)] = {
+            "id": str(node_id),
+            "props": props,
+            "createdBy": created_by,
+            "contentHash": _hash_properties(props),
+            "textHash": _hash_properties({"text": text}),
+            "text": text,
+        }
+
+    def add_catalog(
+        self,
+        *,
+        id: str,
+        name: str,
+        metalake: str,
+        catalog_type: str | None = None,
+        provider: str | None = None,
+        description: str | None = None,
+        properties: str | None = None,
+    ) -> None:
+        self.add(
+            "Catalog",
+            {
+                "id": id,
+                "name": name,
+                "metalake": metalake,
+                "catalogType": catalog_type,
+                "provider": provider,
+                "description": description,
+                "properties": properties,
+            },
+        )
+
+    def add_schema(
+        self,
+        *,
+        id: str,
+        name: str,
+        description: str | None = None,
+        properties: str | None = None,
+    ) -> None:
+        self.add(
+            "Schema",
+            {"id": id, "name": name, "description": description, "properties": properties},
+        )
+
+    def add_table(self, *, id: str, name: str, payload: TableUpsertPayload | None = None) -> None:
+        payload = payload or TableUpsertPayload()
+        self.add(
+            "Table",
+            {
+                "id": id,
+                "name": name,
+                "producer": payload.producer,
+                "description": payload.description,
+                "properties": payload.properties,
+                "partitions": payload.partitions,
+                "distribution": payload.distribution,
+                "sortOrders": payload.sort_orders,
+                "indexes": payload.indexes,
+                "creator": payload.creator,
+                "createTime": payload.create_time,
+                "lastModifier": payload.last_modifier,
+                "lastModifiedTime": payload.last_modified_time,
+            },
+        )
+
+    def add_column(
+        self,
+        *,
+        id: str,
+        name: str,
+        data_type: str | None,
+        description: str | None = None,
+        nullable: bool | None = None,
+        auto_increment: bool | None = None,
+        default_value: Any = None,
+    ) -> None:
+        self.add(
+            "Column",
+            {
+                "id": id,
+                "name": name,
+                "dataType": data_type,
+                "description": description,
+                "nullable": nullable,
+                "autoIncrement": auto_increment,
+                "defaultValue": default_value,
+            },
+        )
+
+    async def flush(self) -> MetadataSyncStats:
+        """Diff and write every buffered node;the buffer is emptied even if a batch fails"""
+        stats = MetadataSyncStats()
+        if not self.pending:
+            return stats
+        if self._ensure_indexes:
+            await ensure_merge_key_indexes(self._session, [(label, "id") for label in self.LABELS])
+
+        buffers = self._buffers
+        self._buffers = {label: {} for label in self.LABELS}
+        start = time.perf_counter()
+        to_embed: list[tuple[str, str, str]] = []
+        text_hashes: list[str] = []
+        for label, buffer in buffers.items():
+            if not buffer:
+                continue
+            stats.received += len(buffer)
+            stored = await self._read_hashes(label, list(buffer), stats)
+            changed: list[dict[str, Any]] = []
+            for node_id, row in buffer.items():
+                content_hash, text_hash = stored.get(node_id, (None, None))
+                if content_hash != row["contentHash"]:
+                    changed.append(row)
+                if text_hash != row["textHash"] and row["text"]:
+                    to_embed.append((node_id, label, row["text"]))
+                    text_hashes.append(row["textHash"])
+            stats.unchanged += len(buffer) - len(changed)
+            if not changed:
+                continue
+
+            query = _bulk_write_query(label)
+            for offset in range(0, len(changed), self._batch_size):
+                batch = [
+                    {key: row[key] for key in _BULK_ROW_KEYS}
+                    for row in changed[offset : offset + self._batch_size]
+                ]
+                result = await arun_cypher(
+                    self._session, query, rows=batch, tenantId=self._tenant_id
+                )
+                consume = getattr(result, "consume", None)
+                if consume is not None:
+                    await consume()
+                stats.batches += 1
+            stats.written += len(changed)
+            stats.written_by_label[label] = len(changed)
+
+        if to_embed and self._embedding_processor is not None:
+            await self._enqueue_embeddings(to_embed, text_hashes, stats)
+        stats.seconds = time.perf_counter() - start
+
+        logger.info(
+            "[metadata bulk] received=%s unchanged=%s written=%s embedded=%s "
+            "round_trips=%s seconds=%.3f by_label=%s",
+            stats.received,
+            stats.unchanged,
+            stats.written,
+            stats.embedded,
+            stats.round_trips,
+            stats.seconds,
+            stats.written_by_label,
+        )
+        return stats
+
+    async def _enqueue_embeddings(
+        self,
+        items: list[tuple[str, str, str]],
+        text_hashes: list[str],
+        stats: MetadataSyncStats,
+    ) -> None:
+        """Queue embeddings per batch;textHash is persisted only for fully queued batches"""
+        queued_hashes: dict[str, list[dict[str, str]]] = {}
+        for offset in range(0, len(items), self._batch_size):
+            batch = items[offset : offset + self._batch_size]
+            queued = await self._embedding_processor.put_batch(batch, tenant_id=self._tenant_id)
+            stats.embedded += queued
+            if queued < len(batch):
+                # put_batch only reports a count;without knowing which tasks made it the
+                # previous textHash is kept for the whole batch.
+                continue
+            for (node_id, label, _text), text_hash in zip(
+                batch, text_hashes[offset : offset + self._batch_size], strict=True
+            ):
+                queued_hashes.setdefault(label, []).append({"id": node_id, "textHash": text_hash})
+
+        for label, hashes in queued_hashes.items():
+            query = _text_hash_write_query(label)
+            for offset in range(0, len(hashes), self._batch_size):
+                result = await arun_cypher(
+                    self._session,
+                    query,
+                    hashes=hashes[offset : offset + self._batch_size],
+                    tenantId=self._tenant_id,
+                )
+                consume = getattr(result, "consume", None)
+                if consume is not None:
+                    await consume()
+                stats.batches += 1
+
+    async def _read_hashes(
+        self, label: str, ids: list[str], stats: MetadataSyncStats
+    ) -> dict[str, tuple[str | None, str | None]]:
+        query = _bulk_read_query(label)
+        stored: dict[str, tuple[str | None, str | None]] = {}
+        for offset in range(0, len(ids), self._batch_size):
+            result = await arun_cypher(
+                self._session,
+                query,
+                ids=ids[offset : offset + self._batch_size],
+                tenantId=self._tenant_id,
+            )
+            for record in await result.data():
+                stored[record["id"]] = (record.get("contentHash"), record.get("textHash"))
+            stats.reads += 1
+        return stored
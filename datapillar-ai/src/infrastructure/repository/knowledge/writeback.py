@@ -10,15 +10,85 @@ border(Strong constraints):- Only allowed here"write back/update"Knowledge graph
 from __future__ import annotations
 
 import logging
+import time
+from collections.abc import Callable
 from datetime import UTC, datetime
 from typing import Any
 
 from src.infrastructure.database import AsyncNeo4jClient
 from src.infrastructure.database.cypher import arun_cypher
+from src.infrastructure.repository.knowledge.sync_lineage import ensure_merge_key_indexes
+from src.shared.config.runtime import get_neo4j_write_batch_size
 from src.shared.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Writeback MERGE/MATCH keys(see db/neo4j V3__kg_writeback_indexes.cypher).
+WRITEBACK_MERGE_KEYS: tuple[tuple[str, str], ...] = (
+    ("Table", "name"),
+    ("Column", "name"),
+    ("WorkflowSession", "session_id"),
+)
+
+_UPSERT_QUERIES: dict[str, str] = {
+    "table_role": """
+    UNWIND $rows AS row
+    MERGE (t:Table {name:row.table})
+    MERGE (w:WorkflowSession {session_id:$session_id})
+    SET w.last_seen=$ts, w.user_id=$user_id
+    MERGE (t)-[r:ETL_ROLE {session_id:$session_id}]->(w)
+    SET r.type=row.role, r.by_user=$user_id, r.ts=$ts, r.confidence=row.confidence
+    """,
+    "lineage": """
+    UNWIND $rows AS row
+    MATCH (s:Table {name:row.source_table})
+    MATCH (t:Table {name:row.target_table})
+    MERGE (s)-[r:CONFIRMED_LINEAGE]->(t)
+    SET r.confidence=row.confidence, r.by_user=$user_id, r.ts=$ts
+    """,
+    "col_map": """
+    UNWIND $rows AS row
+    MATCH (s:Table {name:row.source_table})-[:HAS_COLUMN]->(sc:Column {name:row.source_column})
+    MATCH (t:Table {name:row.target_table})-[:HAS_COLUMN]->(tc:Column {name:row.target_column})
+    MERGE (sc)-[r:CONFIRMED_MAP]->(tc)
+    SET r.transform=row.transform, r.confidence=row.confidence, r.by_user=$user_id, r.ts=$ts
+    """,
+    "join": """
+    UNWIND $rows AS row
+    MATCH (l:Table {name:row.left})
+    MATCH (r:Table {name:row.right})
+    MERGE (l)-[j:JOIN_KEY]->(r)
+    SET j.on=row.on, j.confidence=row.confidence, j.by_user=$user_id, j.ts=$ts
+    """,
+}
+
+_ROW_BUILDERS: dict[str, Callable[[dict[str, Any]], dict[str, Any]]] = {
+    "table_role": lambda upd: {
+        "table": upd.get("table"),
+        "role": upd.get("role"),
+        "confidence": float(upd.get("confidence", 0.5)),
+    },
+    "lineage": lambda upd: {
+        "source_table": upd.get("source_table"),
+        "target_table": upd.get("target_table"),
+        "confidence": float(upd.get("confidence", 0.5)),
+    },
+    "col_map": lambda upd: {
+        "source_table": upd.get("source_table"),
+        "target_table": upd.get("target_table"),
+        "source_column": upd.get("source_column"),
+        "target_column": upd.get("target_column"),
+        "transform": upd.get("transform", "direct"),
+        "confidence": float(upd.get("confidence", 0.5)),
+    },
+    "join": lambda upd: {
+        "left": upd.get("left"),
+        "right": upd.get("right"),
+        "on": upd.get("on") or [],
+        "confidence": float(upd.get("confidence", 0.5)),
+    },
+}
+
 
 class Neo4jKGWritebackRepository:
     """Knowledge graph writes back to warehousing(write only,Dont read)"""
@@ -34,104 +104,59 @@ class Neo4jKGWritebackRepository:
         Write back the structured facts confirmed by the user Neo4j(transactional write)
 
         Use explicit transactions to ensure atomicity:Either all succeed,Or roll it all back.Support type:table_role / lineage / col_map / join
+
+        Updates are grouped by type and sent as UNWIND batches(neo4j_write_batch_size rows
+        per statement),in the order the types first appear.
         """
         if not updates:
             return 0
 
-        ts = datetime.now(UTC).isoformat()
-        saved = 0
+        rows_by_type: dict[str, list[dict[str, Any]]] = {}
+        for upd in updates:
+            upd_type = upd.get("type")
+            row_builder = _ROW_BUILDERS.get(upd_type)
+            if row_builder is None:
+                logger.warning("[persist_kg_updates] Ignore unknown types:%s", upd_type)
+                continue
+            rows_by_type.setdefault(upd_type, []).append(row_builder(upd))
+
+        saved = sum(len(rows) for rows in rows_by_type.values())
+        if not saved:
+            return 0
+
+        params = {
+            "user_id": user_id,
+            "session_id": session_id,
+            "ts": datetime.now(UTC).isoformat(),
+        }
+        batch_size = get_neo4j_write_batch_size()
+        start = time.perf_counter()
+        batches = 0
 
         driver = await AsyncNeo4jClient.get_driver()
         async with driver.session(database=settings.neo4j_database) as session:
+            # Index DDL cannot share the write transaction below.
+            await ensure_merge_key_indexes(session, WRITEBACK_MERGE_KEYS)
             tx = await session.begin_transaction()
             try:
-                for upd in updates:
-                    upd_type = upd.get("type")
-                    if upd_type == "table_role":
-                        await arun_cypher(
-                            tx,
-                            """
-                            MERGE (t:Table {name:$table})
-                            MERGE (w:WorkflowSession {session_id:$session_id})
-                            SET w.last_seen=$ts, w.user_id=$user_id
-                            MERGE (t)-[r:ETL_ROLE {session_id:$session_id}]->(w)
-                            SET r.type=$role, r.by_user=$user_id, r.ts=$ts, r.confidence=$confidence
-                            """,
-                            {
-                                "table": upd.get("table"),
-                                "role": upd.get("role"),
-                                "user_id": user_id,
-                                "session_id": session_id,
-                                "ts": ts,
-                                "confidence": float(upd.get("confidence", 0.5)),
-                            },
-                        )
-                        saved += 1
-                    elif upd_type == "lineage":
-                        await arun_cypher(
-                            tx,
-                            """
-                            MATCH (s:Table {name:$source_table})
-                            MATCH (t:Table {name:$target_table})
-                            MERGE (s)-[r:CONFIRMED_LINEAGE]->(t)
-                            SET r.confidence=$confidence, r.by_user=$user_id, r.ts=$ts
-                            """,
-                            {
-                                "source_table": upd.get("source_table"),
-                                "target_table": upd.get("target_table"),
-                                "confidence": float(upd.get("confidence", 0.5)),
-                                "user_id": user_id,
-                                "ts": ts,
-                            },
-                        )
-                        saved += 1
-                    elif upd_type == "col_map":
-                        await arun_cypher(
-                            tx,
-                            """
-                            MATCH (s:Table {name:$source_table})-[:HAS_COLUMN]->(sc:Column {name:$source_column})
-                            MATCH (t:Table {name:$target_table})-[:HAS_COLUMN]->(tc:Column {name:$target_column})
-                            MERGE (sc)-[r:CONFIRMED_MAP]->(tc)
-                            SET r.transform=$transform, r.confidence=$confidence, r.by_user=$user_id, r.ts=$ts
-                            """,
-                            {
-                                "source_table": upd.get("source_table"),
-                                "target_table": upd.get("target_table"),
-                                "source_column": upd.get("source_column"),
-                                "target_column": upd.get("target_column"),
-                                "transform": upd.get("transform", "direct"),
-                                "confidence": float(upd.get("confidence", 0.5)),
-                                "user_id": user_id,
-                                "ts": ts,
-                            },
-                        )
-                        saved += 1
-                    elif upd_type == "join":
+                for upd_type, rows in rows_by_type.items():
+                    for offset in range(0, len(rows), batch_size):
                         await arun_cypher(
                             tx,
-                            """
-                            MATCH (l:Table {name:$left})
-                            MATCH (r:Table {name:$right})
-                            MERGE (l)-[j:JOIN_KEY]->(r)
-                            SET j.on=$on, j.confidence=$confidence, j.by_user=$user_id, j.ts=$ts
-                            """,
-                            {
-                                "left": upd.get("left"),
-                                "right": upd.get("right"),
-                                "on": upd.get("on") or [],
-                                "confidence": float(upd.get("confidence", 0.5)),
-                                "user_id": user_id,
-                                "ts": ts,
-                            },
+                            _UPSERT_QUERIES[upd_type],
+                            params,
+                            rows=rows[offset : offset + batch_size],
                         )
-                        saved += 1
-                    else:
-                        logger.warning("[persist_kg_updates] Ignore unknown types:%s", upd_type)
+                        batches += 1
 
                 await tx.commit()
+                elapsed = time.perf_counter() - start
                 logger.info(
-                    "[persist_kg_updates] Transaction submitted successfully,write %s records",
+                    "[persist_kg_updates] Transaction submitted successfully,write %s records"
+                    " in %s batches(%.0f rows/s)",
                     saved,
+                    batches,
+                    saved / elapsed if elapsed > 0 else 0.0,
                 )
 
             except Exception as exc:
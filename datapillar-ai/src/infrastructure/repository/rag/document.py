@@ -1,16 +1,218 @@
 # @author Sunny
 # @date 2026-01-28
 
-"""RAG knowledge Wiki Document warehousing."""
+"""
+RAG knowledge Wiki Document warehousing.
+
+Every query has a sync method(worker threads) and an `a`-prefixed async method
+(request handlers,async MySQL pool);both share the same SQL.
+"""
 
 from __future__ import annotations
 
 from typing import Any
 
-from sqlalchemy import text
+from sqlalchemy import TextClause, text
 
 from src.infrastructure.database.mysql import MySQLClient
 
+_LIST_COLUMNS = """
+      document_id,
+      namespace_id,
+      doc_uid,
+      title,
+      file_type,
+      size_bytes,
+      status,
+      chunk_count,
+      token_count,
+      error_message,
+      embedding_model_id,
+      embedding_dimension,
+      chunk_mode,
+      chunk_config_json,
+      last_chunked_at,
+      created_by,
+      created_at,
+      updated_at"""
+_DETAIL_COLUMNS = """
+      document_id,
+      namespace_id,
+      doc_uid,
+      title,
+      file_type,
+      size_bytes,
+      storage_uri,
+      storage_type,
+      storage_key,
+      status,
+      chunk_count,
+      token_count,
+      error_message,
+      embedding_model_id,
+      embedding_dimension,
+      chunk_mode,
+      chunk_config_json,
+      last_chunked_at,
+      created_by,
+      created_at,
+      updated_at"""
+_GET_SQL = text(
+    f"""
+    SELECT {_DETAIL_COLUMNS}
+    FROM knowledge_document
+    WHERE document_id = :document_id
+      AND tenant_id = :tenant_id
+      AND created_by = :created_by
+      AND is_deleted = 0
+    """
+)
+_GET_BY_DOC_UID_SQL = text(
+    f"""
+    SELECT {_DETAIL_COLUMNS}
+    FROM knowledge_document
+    WHERE doc_uid = :doc_uid
+      AND tenant_id = :tenant_id
+      AND created_by = :created_by
+      AND is_deleted = 0
+    """
+)
+_NAMESPACE_EMBEDDING_MODELS_SQL = text(
+    """
+    SELECT DISTINCT embedding_model_id
+    FROM knowledge_document
+    WHERE namespace_id = :namespace_id
+      AND tenant_id = :tenant_id
+      AND is_deleted = 0
+      AND embedding_model_id IS NOT NULL
+    """
+)
+_CREATE_SQL = text(
+    """
+    INSERT INTO knowledge_document (
+      tenant_id,
+      namespace_id,
+      doc_uid,
+      title,
+      file_type,
+      size_bytes,
+      storage_uri,
+      storage_type,
+      storage_key,
+      status,
+      chunk_count,
+      token_count,
+      error_message,
+      embedding_model_id,
+      embedding_dimension,
+      chunk_mode,
+      chunk_config_json,
+      last_chunked_at,
+      created_by
+    ) VALUES (
+      :tenant_id,
+      :namespace_id,
+      :doc_uid,
+      :title,
+      :file_type,
+      :size_bytes,
+      :storage_uri,
+      :storage_type,
+      :storage_key,
+      :status,
+      :chunk_count,
+      :token_count,
+      :error_message,
+      :embedding_model_id,
+      :embedding_dimension,
+      :chunk_mode,
+      :chunk_config_json,
+      :last_chunked_at,
+      :created_by
+    )
+    """
+)
+_SOFT_DELETE_SQL = text(
+    """
+    UPDATE knowledge_document
+    SET is_deleted = 1
+    WHERE document_id = :document_id
+      AND tenant_id = :tenant_id
+      AND created_by = :created_by
+      AND is_deleted = 0
+    """
+)
+
+
+def _owner_params(document_id: int, tenant_id: int, user_id: int) -> dict[str, Any]:
+    return {"document_id": document_id, "tenant_id": tenant_id, "created_by": user_id}
+
+
+def _list_queries(
+    namespace_id: int,
+    tenant_id: int,
+    user_id: int,
+    *,
+    status: str | None,
+    keyword: str | None,
+    limit: int,
+    offset: int,
+) -> tuple[TextClause, TextClause, dict[str, Any]]:
+    filters = [
+        "namespace_id = :namespace_id",
+        "tenant_id = :tenant_id",
+        "created_by = :created_by",
+        "is_deleted = 0",
+    ]
+    params: dict[str, Any] = {
+        "namespace_id": namespace_id,
+        "tenant_id": tenant_id,
+        "created_by": user_id,
+    }
+    if status:
+        filters.append("status = :status")
+        params["status"] = status
+    if keyword:
+        filters.append("title LIKE :keyword")
+        params["keyword"] = f"%{keyword}%"
+
+    where_clause = " AND ".join(filters)
+    query = text(
+        f"""
+        SELECT {_LIST_COLUMNS}
+        FROM knowledge_document
+        WHERE {where_clause}
+        ORDER BY updated_at DESC, document_id DESC
+        LIMIT :limit OFFSET :offset
+        """
+    )
+    count_query = text(
+        f"""
+        SELECT COUNT(1) AS total
+        FROM knowledge_document
+        WHERE {where_clause}
+        """
+    )
+    params.update({"limit": limit, "offset": offset})
+    return query, count_query, params
+
+
+def _update_query(
+    document_id: int, tenant_id: int, user_id: int, fields: dict[str, Any]
+) -> tuple[TextClause, dict[str, Any]]:
+    sets = ", ".join([f"{key} = :{key}" for key in fields])
+    query = text(
+        f"""
+        UPDATE knowledge_document
+        SET {sets}
+        WHERE document_id = :document_id
+          AND tenant_id = :tenant_id
+          AND created_by = :created_by
+          AND is_deleted = 0
+        """
+    )
+    return query, {**_owner_params(document_id, tenant_id, user_id), **fields}
+
 
 class DocumentRepository:
     @staticmethod
@@ -24,275 +226,139 @@ class DocumentRepository:
         limit: int,
         offset: int,
     ) -> tuple[list[dict[str, Any]], int]:
-        filters = [
-            "namespace_id = :namespace_id",
-            "tenant_id = :tenant_id",
-            "created_by = :created_by",
-            "is_deleted = 0",
-        ]
-        params: dict[str, Any] = {
-            "namespace_id": namespace_id,
-            "tenant_id": tenant_id,
-            "created_by": user_id,
-        }
-        if status:
-            filters.append("status = :status")
-            params["status"] = status
-        if keyword:
-            filters.append("title LIKE :keyword")
-            params["keyword"] = f"%{keyword}%"
-
-        where_clause = " AND ".join(filters)
-        query = text(
-            f"""
-            SELECT
-              document_id,
-              namespace_id,
-              doc_uid,
-              title,
-              file_type,
-              size_bytes,
-              status,
-              chunk_count,
-              token_count,
-              error_message,
-              embedding_model_id,
-              embedding_dimension,
-              chunk_mode,
-              chunk_config_json,
-              last_chunked_at,
-              created_by,
-              created_at,
-              updated_at
-            FROM knowledge_document
-            WHERE {where_clause}
-            ORDER BY updated_at DESC, document_id DESC
-            LIMIT :limit OFFSET :offset
-            """
-        )
-        count_query = text(
-            f"""
-            SELECT COUNT(1) AS total
-            FROM knowledge_document
-            WHERE {where_clause}
-            """
+        query, count_query, params = _list_queries(
+            namespace_id,
+            tenant_id,
+            user_id,
+            status=status,
+            keyword=keyword,
+            limit=limit,
+            offset=offset,
         )
-        params.update({"limit": limit, "offset": offset})
         with MySQLClient.get_engine().connect() as conn:
             rows = [dict(row) for row in conn.execute(query, params).mappings()]
             total = conn.execute(count_query, params).scalar_one()
         return rows, int(total or 0)
 
     @staticmethod
-    def get(document_id: int, tenant_id: int, user_id: int) -> dict[str, Any] | None:
-        query = text(
-            """
-            SELECT
-              document_id,
-              namespace_id,
-              doc_uid,
-              title,
-              file_type,
-              size_bytes,
-              storage_uri,
-              storage_type,
-              storage_key,
-              status,
-              chunk_count,
-              token_count,
-              error_message,
-              embedding_model_id,
-              embedding_dimension,
-              chunk_mode,
-              chunk_config_json,
-              last_chunked_at,
-              created_by,
-              created_at,
-              updated_at
-            FROM knowledge_document
-            WHERE document_id = :document_id
-              AND tenant_id = :tenant_id
-              AND created_by = :created_by
-              AND is_deleted = 0
-            """
+    async def alist_by_namespace(
+        namespace_id: int,
+        tenant_id: int,
+        user_id: int,
+        *,
+        status: str | None,
+        keyword: str | None,
+        limit: int,
+        offset: int,
+    ) -> tuple[list[dict[str, Any]], int]:
+        query, count_query, params = _list_queries(
+            namespace_id,
+            tenant_id,
+            user_id,
+            status=status,
+            keyword=keyword,
+            limit=limit,
+            offset=offset,
         )
+        async with MySQLClient.aconnect() as conn:
+            rows = [dict(row) for row in (await conn.execute(query, params)).mappings()]
+            total = (await conn.execute(count_query, params)).scalar_one()
+        return rows, int(total or 0)
+
+    @staticmethod
+    def get(document_id: int, tenant_id: int, user_id: int) -> dict[str, Any] | None:
         with MySQLClient.get_engine().connect() as conn:
             row = (
-                conn.execute(
-                    query,
-                    {
-                        "document_id": document_id,
-                        "tenant_id": tenant_id,
-                        "created_by": user_id,
-                    },
-                )
+                conn.execute(_GET_SQL, _owner_params(document_id, tenant_id, user_id))
                 .mappings()
                 .fetchone()
             )
             return dict(row) if row else None
 
+    @staticmethod
+    async def aget(document_id: int, tenant_id: int, user_id: int) -> dict[str, Any] | None:
+        async with MySQLClient.aconnect() as conn:
+            result = await conn.execute(_GET_SQL, _owner_params(document_id, tenant_id, user_id))
+            row = result.mappings().fetchone()
+        return dict(row) if row else None
+
     @staticmethod
     def get_by_doc_uid(doc_uid: str, tenant_id: int, user_id: int) -> dict[str, Any] | None:
-        query = text(
-            """
-            SELECT
-              document_id,
-              namespace_id,
-              doc_uid,
-              title,
-              file_type,
-              size_bytes,
-              storage_uri,
-              storage_type,
-              storage_key,
-              status,
-              chunk_count,
-              token_count,
-              error_message,
-              embedding_model_id,
-              embedding_dimension,
-              chunk_mode,
-              chunk_config_json,
-              last_chunked_at,
-              created_by,
-              created_at,
-              updated_at
-            FROM knowledge_document
-            WHERE doc_uid = :doc_uid
-              AND tenant_id = :tenant_id
-              AND created_by = :created_by
-              AND is_deleted = 0
-            """
-        )
+        params = {"doc_uid": doc_uid, "tenant_id": tenant_id, "created_by": user_id}
         with MySQLClient.get_engine().connect() as conn:
-            row = (
-                conn.execute(
-                    query,
-                    {
-                        "doc_uid": doc_uid,
-                        "tenant_id": tenant_id,
-                        "created_by": user_id,
-                    },
-                )
-                .mappings()
-                .fetchone()
-            )
+            row = conn.execute(_GET_BY_DOC_UID_SQL, params).mappings().fetchone()
             return dict(row) if row else None
 
+    @staticmethod
+    async def aget_by_doc_uid(
+        doc_uid: str, tenant_id: int, user_id: int
+    ) -> dict[str, Any] | None:
+        params = {"doc_uid": doc_uid, "tenant_id": tenant_id, "created_by": user_id}
+        async with MySQLClient.aconnect() as conn:
+            row = (await conn.execute(_GET_BY_DOC_UID_SQL, params)).mappings().fetchone()
+        return dict(row) if row else None
+
     @staticmethod
     def list_namespace_embedding_models(namespace_id: int, tenant_id: int) -> list[int]:
-        query = text(
-            """
-            SELECT DISTINCT embedding_model_id
-            FROM knowledge_document
-            WHERE namespace_id = :namespace_id
-              AND tenant_id = :tenant_id
-              AND is_deleted = 0
-              AND embedding_model_id IS NOT NULL
-            """
-        )
         with MySQLClient.get_engine().connect() as conn:
             rows = conn.execute(
-                query,
+                _NAMESPACE_EMBEDDING_MODELS_SQL,
                 {"namespace_id": namespace_id, "tenant_id": tenant_id},
             ).fetchall()
             return [int(row[0]) for row in rows if row and row[0] is not None]
 
     @staticmethod
-    def create(payload: dict[str, Any]) -> int:
-        query = text(
-            """
-            INSERT INTO knowledge_document (
-              tenant_id,
-              namespace_id,
-              doc_uid,
-              title,
-              file_type,
-              size_bytes,
-              storage_uri,
-              storage_type,
-              storage_key,
-              status,
-              chunk_count,
-              token_count,
-              error_message,
-              embedding_model_id,
-              embedding_dimension,
-              chunk_mode,
-              chunk_config_json,
-              last_chunked_at,
-              created_by
-            ) VALUES (
-              :tenant_id,
-              :namespace_id,
-              :doc_uid,
-              :title,
-              :file_type,
-              :size_bytes,
-              :storage_uri,
-              :storage_type,
-              :storage_key,
-              :status,
-              :chunk_count,
-              :token_count,
-              :error_message,
-              :embedding_model_id,
-              :embedding_dimension,
-              :chunk_mode,
-              :chunk_config_json,
-              :last_chunked_at,
-              :created_by
+    async def alist_namespace_embedding_models(namespace_id: int, tenant_id: int) -> list[int]:
+        async with MySQLClient.aconnect() as conn:
+            result = await conn.execute(
+                _NAMESPACE_EMBEDDING_MODELS_SQL,
+                {"namespace_id": namespace_id, "tenant_id": tenant_id},
             )
-            """
-        )
+            rows = result.fetchall()
+        return [int(row[0]) for row in rows if row and row[0] is not None]
+
+    @staticmethod
+    def create(payload: dict[str, Any]) -> int:
         with MySQLClient.get_engine().begin() as conn:
-            result = conn.execute(query, payload)
+            result = conn.execute(_CREATE_SQL, payload)
+            return int(result.lastrowid)
+
+    @staticmethod
+    async def acreate(payload: dict[str, Any]) -> int:
+        async with MySQLClient.abegin() as conn:
+            result = await conn.execute(_CREATE_SQL, payload)
             return int(result.lastrowid)
 
     @staticmethod
     def update(document_id: int, tenant_id: int, user_id: int, fields: dict[str, Any]) -> int:
         if not fields:
             return 0
-        sets = ", ".join([f"{key} = :{key}" for key in fields])
-        query = text(
-            f"""
-            UPDATE knowledge_document
-            SET {sets}
-            WHERE document_id = :document_id
-              AND tenant_id = :tenant_id
-              AND created_by = :created_by
-              AND is_deleted = 0
-            """
-        )
-        params = {
-            "document_id": document_id,
-            "tenant_id": tenant_id,
-            "created_by": user_id,
-            **fields,
-        }
+        query, params = _update_query(document_id, tenant_id, user_id, fields)
         with MySQLClient.get_engine().begin() as conn:
             result = conn.execute(query, params)
             return int(result.rowcount or 0)
 
+    @staticmethod
+    async def aupdate(
+        document_id: int, tenant_id: int, user_id: int, fields: dict[str, Any]
+    ) -> int:
+        if not fields:
+            return 0
+        query, params = _update_query(document_id, tenant_id, user_id, fields)
+        async with MySQLClient.abegin() as conn:
+            result = await conn.execute(query, params)
+            return int(result.rowcount or 0)
+
     @staticmethod
     def soft_delete(document_id: int, tenant_id: int, user_id: int) -> int:
-        query = text(
-            """
-            UPDATE knowledge_document
-            SET is_deleted = 1
-            WHERE document_id = :document_id
-              AND tenant_id = :tenant_id
-              AND created_by = :created_by
-              AND is_deleted = 0
-            """
-        )
         with MySQLClient.get_engine().begin() as conn:
-            result = conn.execute(
-                query,
-                {
-                    "document_id": document_id,
-                    "tenant_id": tenant_id,
-                    "created_by": user_id,
-                },
+            result = conn.execute(_SOFT_DELETE_SQL, _owner_params(document_id, tenant_id, user_id))
+            return int(result.rowcount or 0)
+
+    @staticmethod
+    async def asoft_delete(document_id: int, tenant_id: int, user_id: int) -> int:
+        async with MySQLClient.abegin() as conn:
+            result = await conn.execute(
+                _SOFT_DELETE_SQL, _owner_params(document_id, tenant_id, user_id)
             )
             return int(result.rowcount or 0)
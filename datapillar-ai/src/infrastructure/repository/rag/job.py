@@ -1,97 +1,140 @@
 # @author Sunny
 # @date 2026-01-28
 
-"""RAG knowledge Wiki Task warehousing."""
+"""
+RAG knowledge Wiki Task warehousing.
+
+create/get/list_by_document also have `a`-prefixed async methods for request handlers;
+the queue and progress methods are called by worker threads and stay sync.
+"""
 
 from __future__ import annotations
 
 from typing import Any
 
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 
 from src.infrastructure.database.mysql import MySQLClient
 
+# Named lock (GET_LOCK) taken per tenant while leasing.
+_TENANT_LOCK_PREFIX = "datapillar:knowledge_job_lease:"
+
+_JOB_COLUMNS = """
+      job_id,
+      namespace_id,
+      document_id,
+      job_type,
+      status,
+      progress,
+      progress_seq,
+      total_chunks,
+      processed_chunks,
+      error_message,
+      started_at,
+      finished_at,
+      created_at,
+      updated_at"""
+_CREATE_SQL = text(
+    """
+    INSERT INTO knowledge_document_job (
+      tenant_id,
+      namespace_id,
+      document_id,
+      job_type,
+      payload_json,
+      status,
+      progress,
+      progress_seq,
+      total_chunks,
+      processed_chunks,
+      error_message,
+      started_at,
+      finished_at,
+      created_by
+    ) VALUES (
+      :tenant_id,
+      :namespace_id,
+      :document_id,
+      :job_type,
+      :payload_json,
+      :status,
+      :progress,
+      :progress_seq,
+      :total_chunks,
+      :processed_chunks,
+      :error_message,
+      :started_at,
+      :finished_at,
+      :created_by
+    )
+    """
+)
+_GET_SQL = text(
+    f"""
+    SELECT {_JOB_COLUMNS}
+    FROM knowledge_document_job
+    WHERE job_id = :job_id
+      AND tenant_id = :tenant_id
+      AND created_by = :created_by
+    """
+)
+_LIST_BY_DOCUMENT_SQL = text(
+    f"""
+    SELECT {_JOB_COLUMNS}
+    FROM knowledge_document_job
+    WHERE document_id = :document_id
+      AND tenant_id = :tenant_id
+      AND created_by = :created_by
+    ORDER BY updated_at DESC, job_id DESC
+    LIMIT :limit OFFSET :offset
+    """
+)
+_COUNT_BY_DOCUMENT_SQL = text(
+    """
+    SELECT COUNT(1) AS total
+    FROM knowledge_document_job
+    WHERE document_id = :document_id
+      AND tenant_id = :tenant_id
+      AND created_by = :created_by
+    """
+)
+
+
+def _seq_expr(progress_seq: int | None) -> str:
+    # Writers that publish progress pass the sequence they published (one source for
+    # SSE ids and the row); the rest bump it.
+    if progress_seq is None:
+        return "progress_seq + 1"
+    return "GREATEST(progress_seq, :progress_seq)"
+
 
 class JobRepository:
     @staticmethod
     def create(payload: dict[str, Any]) -> int:
-        query = text(
-            """
-            INSERT INTO knowledge_document_job (
-              tenant_id,
-              namespace_id,
-              document_id,
-              job_type,
-              status,
-              progress,
-              progress_seq,
-              total_chunks,
-              processed_chunks,
-              error_message,
-              started_at,
-              finished_at,
-              created_by
-            ) VALUES (
-              :tenant_id,
-              :namespace_id,
-              :document_id,
-              :job_type,
-              :status,
-              :progress,
-              :progress_seq,
-              :total_chunks,
-              :processed_chunks,
-              :error_message,
-              :started_at,
-              :finished_at,
-              :created_by
-            )
-            """
-        )
         with MySQLClient.get_engine().begin() as conn:
-            result = conn.execute(query, payload)
+            result = conn.execute(_CREATE_SQL, {"payload_json": None, **payload})
+            return int(result.lastrowid)
+
+    @staticmethod
+    async def acreate(payload: dict[str, Any]) -> int:
+        async with MySQLClient.abegin() as conn:
+            result = await conn.execute(_CREATE_SQL, {"payload_json": None, **payload})
             return int(result.lastrowid)
 
     @staticmethod
     def get(job_id: int, tenant_id: int, user_id: int) -> dict[str, Any] | None:
-        query = text(
-            """
-            SELECT
-              job_id,
-              namespace_id,
-              document_id,
-              job_type,
-              status,
-              progress,
-              progress_seq,
-              total_chunks,
-              processed_chunks,
-              error_message,
-              started_at,
-              finished_at,
-              created_at,
-              updated_at
-            FROM knowledge_document_job
-            WHERE job_id = :job_id
-              AND tenant_id = :tenant_id
-              AND created_by = :created_by
-            """
-        )
+        params = {"job_id": job_id, "tenant_id": tenant_id, "created_by": user_id}
         with MySQLClient.get_engine().connect() as conn:
-            row = (
-                conn.execute(
-                    query,
-                    {
-                        "job_id": job_id,
-                        "tenant_id": tenant_id,
-                        "created_by": user_id,
-                    },
-                )
-                .mappings()
-                .fetchone()
-            )
+            row = conn.execute(_GET_SQL, params).mappings().fetchone()
             return dict(row) if row else None
 
+    @staticmethod
+    async def aget(job_id: int, tenant_id: int, user_id: int) -> dict[str, Any] | None:
+        params = {"job_id": job_id, "tenant_id": tenant_id, "created_by": user_id}
+        async with MySQLClient.aconnect() as conn:
+            row = (await conn.execute(_GET_SQL, params)).mappings().fetchone()
+        return dict(row) if row else None
+
     @staticmethod
     def list_by_document(
         document_id: int,
@@ -101,57 +144,33 @@ class JobRepository:
         limit: int,
         offset: int,
     ) -> tuple[list[dict[str, Any]], int]:
-        query = text(
-            """
-            SELECT
-              job_id,
-              namespace_id,
-              document_id,
-              job_type,
-              status,
-              progress,
-              progress_seq,
-              total_chunks,
-              processed_chunks,
-              error_message,
-              started_at,
-              finished_at,
-              created_at,
-              updated_at
-            FROM knowledge_document_job
-            WHERE document_id = :document_id
-              AND tenant_id = :tenant_id
-              AND created_by = :created_by
-            ORDER BY updated_at DESC, job_id DESC
-            LIMIT :limit OFFSET :offset
-            """
-        )
-        count_query = text(
-            """
-            SELECT COUNT(1) AS total
-            FROM knowledge_document_job
-            WHERE document_id = :document_id
-              AND tenant_id = :tenant_id
-              AND created_by = :created_by
-            """
-        )
-        params = {
-            "document_id": document_id,
-            "tenant_id": tenant_id,
-            "created_by": user_id,
-            "limit": limit,
-            "offset": offset,
-        }
+        params = {"document_id": document_id, "tenant_id": tenant_id, "created_by": user_id}
         with MySQLClient.get_engine().connect() as conn:
-            rows = [dict(row) for row in conn.execute(query, params).mappings()]
-            total = conn.execute(
-                count_query,
-                {
-                    "document_id": document_id,
-                    "tenant_id": tenant_id,
-                    "created_by": user_id,
-                },
-            ).scalar_one()
+            rows = [
+                dict(row)
+                for row in conn.execute(
+                    _LIST_BY_DOCUMENT_SQL, {**params, "limit": limit, "offset": offset}
+                ).mappings()
+            ]
+            total = conn.execute(_COUNT_BY_DOCUMENT_SQL, params).scalar_one()
+        return rows, int(total or 0)
+
+    @staticmethod
+    async def alist_by_document(
+        document_id: int,
+        tenant_id: int,
+        user_id: int,
+        *,
+        limit: int,
+        offset: int,
+    ) -> tuple[list[dict[str, Any]], int]:
+        params = {"document_id": document_id, "tenant_id": tenant_id, "created_by": user_id}
+        async with MySQLClient.aconnect() as conn:
+            result = await conn.execute(
+                _LIST_BY_DOCUMENT_SQL, {**params, "limit": limit, "offset": offset}
+            )
+            rows = [dict(row) for row in result.mappings()]
+            total = (await conn.execute(_COUNT_BY_DOCUMENT_SQL, params)).scalar_one()
         return rows, int(total or 0)
 
     @staticmethod
@@ -176,24 +195,35 @@ class JobRepository:
         processed_chunks: int,
         total_chunks: int,
         progress: int,
+        worker_id: str,
+        progress_seq: int | None = None,
     ) -> None:
+        """
+        Write job progress.
+
+        Without progress_seq the sequence is bumped by one; coalesced writers pass the
+        sequence they already published so the row catches up in a single UPDATE.
+        Like every worker-side write, a no-op once worker_id lost the lease.
+        """
         query = text(
-            """
+            f"""
             UPDATE knowledge_document_job
             SET status = 'running',
                 progress = :progress,
                 total_chunks = :total_chunks,
                 processed_chunks = :processed_chunks,
-                progress_seq = progress_seq + 1
-            WHERE job_id = :job_id AND tenant_id = :tenant_id
+                progress_seq = {_seq_expr(progress_seq)}
+            WHERE job_id = :job_id AND tenant_id = :tenant_id AND lease_owner = :worker_id
             """
         )
         params = {
             "job_id": job_id,
             "tenant_id": tenant_id,
+            "worker_id": worker_id,
             "progress": progress,
             "total_chunks": total_chunks,
             "processed_chunks": processed_chunks,
+            "progress_seq": progress_seq,
         }
         with MySQLClient.get_engine().begin() as conn:
             conn.execute(query, params)
@@ -205,42 +235,285 @@ class JobRepository:
         *,
         processed_chunks: int,
         total_chunks: int,
+        worker_id: str,
+        progress_seq: int | None = None,
     ) -> None:
         query = text(
-            """
+            f"""
             UPDATE knowledge_document_job
             SET status = 'success',
                 progress = 100,
                 total_chunks = :total_chunks,
                 processed_chunks = :processed_chunks,
                 finished_at = NOW(),
-                progress_seq = progress_seq + 1
-            WHERE job_id = :job_id AND tenant_id = :tenant_id
+                lease_owner = NULL,
+                lease_expires_at = NULL,
+                progress_seq = {_seq_expr(progress_seq)}
+            WHERE job_id = :job_id AND tenant_id = :tenant_id AND lease_owner = :worker_id
             """
         )
         params = {
             "job_id": job_id,
             "tenant_id": tenant_id,
+            "worker_id": worker_id,
             "total_chunks": total_chunks,
             "processed_chunks": processed_chunks,
+            "progress_seq": progress_seq,
         }
         with MySQLClient.get_engine().begin() as conn:
             conn.execute(query, params)
 
     @staticmethod
-    def mark_error(job_id: int, tenant_id: int, message: str) -> None:
+    def mark_error(
+        job_id: int,
+        tenant_id: int,
+        message: str,
+        *,
+        worker_id: str,
+        progress_seq: int | None = None,
+    ) -> None:
         query = text(
-            """
+            f"""
             UPDATE knowledge_document_job
             SET status = 'error',
                 error_message = :message,
                 finished_at = NOW(),
+                lease_owner = NULL,
+                lease_expires_at = NULL,
+                progress_seq = {_seq_expr(progress_seq)}
+            WHERE job_id = :job_id AND tenant_id = :tenant_id AND lease_owner = :worker_id
+            """
+        )
+        params = {
+            "job_id": job_id,
+            "tenant_id": tenant_id,
+            "worker_id": worker_id,
+            "message": message,
+            "progress_seq": progress_seq,
+        }
+        with MySQLClient.get_engine().begin() as conn:
+            conn.execute(query, params)
+
+    # ==================== Queue leasing ====================
+
+    @staticmethod
+    def lease_next(
+        worker_id: str,
+        lease_seconds: float,
+        *,
+        per_tenant_limit: int,
+        scan_limit: int = 32,
+    ) -> dict[str, Any] | None:
+        """
+        Lease the next runnable job (queued, or running with an expired lease).
+
+        Candidates are locked with SKIP LOCKED so concurrent workers never pick the
+        same job. Tenants at per_tenant_limit are left out of the scan and among the
+        rest the tenant with the fewest live leases wins, so one tenant's backlog
+        cannot starve others.
+
+        The per-tenant limit holds across nodes: a lease is only taken while holding
+        the tenant's named lock (GET_LOCK, released after commit), and the tenant's
+        live leases are recounted under that lock at READ COMMITTED, so every lease
+        committed by another node is seen. A tenant whose lock is busy is skipped
+        for this round instead of waiting, so leasing never deadlocks.
+        """
+        candidates_sql = """
+            SELECT job_id, tenant_id
+            FROM knowledge_document_job
+            WHERE (status = 'queued'
+               OR (status = 'running' AND lease_expires_at < NOW(3)))
+              {saturated_filter}
+            ORDER BY job_id
+            LIMIT :scan_limit
+            FOR UPDATE SKIP LOCKED
+            """
+        running_query = text(
+            """
+            SELECT tenant_id, COUNT(1) AS running
+            FROM knowledge_document_job
+            WHERE status = 'running' AND lease_expires_at >= NOW(3)
+            GROUP BY tenant_id
+            """
+        )
+        tenant_running_query = text(
+            """
+            SELECT COUNT(1)
+            FROM knowledge_document_job
+            WHERE tenant_id = :tenant_id
+              AND status = 'running'
+              AND lease_expires_at >= NOW(3)
+            """
+        )
+        lock_query = text("SELECT GET_LOCK(:name, 0)")
+        unlock_query = text("SELECT RELEASE_LOCK(:name)")
+        lease_query = text(
+            """
+            UPDATE knowledge_document_job
+            SET status = 'running',
+                lease_owner = :worker_id,
+                lease_expires_at = DATE_ADD(NOW(3), INTERVAL :lease_ms * 1000 MICROSECOND),
+                attempts = attempts + 1,
+                started_at = COALESCE(started_at, NOW()),
                 progress_seq = progress_seq + 1
-            WHERE job_id = :job_id AND tenant_id = :tenant_id
+            WHERE job_id = :job_id
+            """
+        )
+        job_query = text(
+            """
+            SELECT
+              job_id,
+              tenant_id,
+              namespace_id,
+              document_id,
+              job_type,
+              payload_json,
+              status,
+              progress,
+              progress_seq,
+              total_chunks,
+              processed_chunks,
+              attempts,
+              lease_owner,
+              created_by,
+              created_at
+            FROM knowledge_document_job
+            WHERE job_id = :job_id
+            """
+        )
+        held: list[str] = []
+        with MySQLClient.get_engine().connect() as conn:
+            conn = conn.execution_options(isolation_level="READ COMMITTED")
+            try:
+                with conn.begin():
+                    running = {
+                        int(row.tenant_id): int(row.running)
+                        for row in conn.execute(running_query).fetchall()
+                    }
+                    # Saturated tenants are excluded from the scan itself, otherwise a large
+                    # backlog fills the scan window and hides every other tenant's jobs.
+                    saturated = [
+                        tenant for tenant, count in running.items() if count >= per_tenant_limit
+                    ]
+                    params: dict[str, Any] = {"scan_limit": scan_limit}
+                    if saturated:
+                        candidates_query = text(
+                            candidates_sql.format(
+                                saturated_filter="AND tenant_id NOT IN :saturated"
+                            )
+                        ).bindparams(bindparam("saturated", expanding=True))
+                        params["saturated"] = saturated
+                    else:
+                        candidates_query = text(candidates_sql.format(saturated_filter=""))
+                    eligible = sorted(
+                        conn.execute(candidates_query, params).fetchall(),
+                        key=lambda row: (running.get(int(row.tenant_id), 0), int(row.job_id)),
+                    )
+                    chosen = None
+                    tried: set[int] = set()
+                    for row in eligible:
+                        tenant_id = int(row.tenant_id)
+                        if tenant_id in tried:
+                            continue
+                        tried.add(tenant_id)
+                        name = f"{_TENANT_LOCK_PREFIX}{tenant_id}"
+                        if not conn.execute(lock_query, {"name": name}).scalar():
+                            continue
+                        held.append(name)
+                        live = conn.execute(
+                            tenant_running_query, {"tenant_id": tenant_id}
+                        ).scalar_one()
+                        if int(live) < per_tenant_limit:
+                            chosen = row
+                            break
+                    if chosen is None:
+                        return None
+                    conn.execute(
+                        lease_query,
+                        {
+                            "job_id": chosen.job_id,
+                            "worker_id": worker_id,
+                            "lease_ms": int(lease_seconds * 1000),
+                        },
+                    )
+                    row = conn.execute(job_query, {"job_id": chosen.job_id}).mappings().fetchone()
+                    return dict(row) if row else None
+            finally:
+                # Named locks belong to the session, not the transaction: release them
+                # only after the lease is committed.
+                if held:
+                    for name in held:
+                        conn.execute(unlock_query, {"name": name})
+                    conn.rollback()
+
+    @staticmethod
+    def heartbeat(job_id: int, worker_id: str, lease_seconds: float) -> bool:
+        """Extend a lease; False means the lease was lost (expired and taken over)."""
+        query = text(
+            """
+            UPDATE knowledge_document_job
+            SET lease_expires_at = DATE_ADD(NOW(3), INTERVAL :lease_ms * 1000 MICROSECOND)
+            WHERE job_id = :job_id
+              AND status = 'running'
+              AND lease_owner = :worker_id
             """
         )
         with MySQLClient.get_engine().begin() as conn:
-            conn.execute(
+            result = conn.execute(
                 query,
-                {"job_id": job_id, "tenant_id": tenant_id, "message": message},
+                {
+                    "job_id": job_id,
+                    "worker_id": worker_id,
+                    "lease_ms": int(lease_seconds * 1000),
+                },
             )
+            return result.rowcount == 1
+
+    @staticmethod
+    def fail(
+        job_id: int,
+        worker_id: str,
+        message: str,
+        *,
+        progress_seq: int | None = None,
+    ) -> None:
+        """Fail a job whose run crashed; no-op once the run settled it or lost the lease."""
+        query = text(
+            f"""
+            UPDATE knowledge_document_job
+            SET status = 'error',
+                error_message = :message,
+                finished_at = NOW(),
+                lease_owner = NULL,
+                lease_expires_at = NULL,
+                progress_seq = {_seq_expr(progress_seq)}
+            WHERE job_id = :job_id
+              AND status = 'running'
+              AND lease_owner = :worker_id
+            """
+        )
+        params = {
+            "job_id": job_id,
+            "worker_id": worker_id,
+            "message": message[:1024],
+            "progress_seq": progress_seq,
+        }
+        with MySQLClient.get_engine().begin() as conn:
+            conn.execute(query, params)
+
+    @staticmethod
+    def release(job_id: int, worker_id: str) -> None:
+        """Hand an unfinished job back to the queue (graceful shutdown)."""
+        query = text(
+            """
+            UPDATE knowledge_document_job
+            SET status = 'queued',
+                lease_owner = NULL,
+                lease_expires_at = NULL
+            WHERE job_id = :job_id
+              AND status = 'running'
+              AND lease_owner = :worker_id
+            """
+        )
+        with MySQLClient.get_engine().begin() as conn:
+            conn.execute(query, {"job_id": job_id, "worker_id": worker_id})
@@ -1,7 +1,12 @@
 # @author Sunny
 # @date 2026-01-28
 
-"""RAG knowledge Wiki namespace repository."""
+"""
+RAG knowledge Wiki namespace repository.
+
+Every query has a sync method(worker threads) and an `a`-prefixed async method
+(request handlers,async MySQL pool);both share the same SQL.
+"""
 
 from __future__ import annotations
 
@@ -11,6 +16,106 @@ from sqlalchemy import text
 
 from src.infrastructure.database.mysql import MySQLClient
 
+_LIST_BY_USER_SQL = text(
+    """
+    SELECT
+      ns.namespace_id,
+      ns.namespace,
+      ns.description,
+      ns.status,
+      ns.created_by,
+      ns.created_at,
+      ns.updated_at,
+      COALESCE(doc_stats.doc_count, 0) AS doc_count
+    FROM knowledge_namespace AS ns
+    LEFT JOIN (
+      SELECT namespace_id, COUNT(1) AS doc_count
+      FROM knowledge_document
+      WHERE tenant_id = :tenant_id AND created_by = :created_by AND is_deleted = 0
+      GROUP BY namespace_id
+    ) AS doc_stats
+      ON doc_stats.namespace_id = ns.namespace_id
+    WHERE ns.tenant_id = :tenant_id AND ns.created_by = :created_by AND ns.is_deleted = 0
+    ORDER BY ns.updated_at DESC, ns.namespace_id DESC
+    LIMIT :limit OFFSET :offset
+    """
+)
+_COUNT_BY_USER_SQL = text(
+    """
+    SELECT COUNT(1) AS total
+    FROM knowledge_namespace
+    WHERE tenant_id = :tenant_id AND created_by = :created_by AND is_deleted = 0
+    """
+)
+_GET_SQL = text(
+    """
+    SELECT
+      namespace_id,
+      namespace,
+      description,
+      status,
+      created_by,
+      created_at,
+      updated_at
+    FROM knowledge_namespace
+    WHERE namespace_id = :namespace_id
+      AND tenant_id = :tenant_id
+      AND created_by = :created_by
+      AND is_deleted = 0
+    """
+)
+_CREATE_SQL = text(
+    """
+    INSERT INTO knowledge_namespace (
+      tenant_id, namespace, description, created_by, status
+    ) VALUES (
+      :tenant_id, :namespace, :description, :created_by, :status
+    )
+    """
+)
+_UPDATE_SQL = text(
+    """
+    UPDATE knowledge_namespace
+    SET
+      namespace = COALESCE(:namespace, namespace),
+      description = COALESCE(:description, description),
+      status = COALESCE(:status, status)
+    WHERE namespace_id = :namespace_id
+      AND tenant_id = :tenant_id
+      AND created_by = :created_by
+      AND is_deleted = 0
+    """
+)
+_SOFT_DELETE_SQL = text(
+    """
+    UPDATE knowledge_namespace
+    SET is_deleted = 1
+    WHERE namespace_id = :namespace_id
+      AND tenant_id = :tenant_id
+      AND created_by = :created_by
+      AND is_deleted = 0
+    """
+)
+_ALLOWED_UPDATE_FIELDS = {"namespace", "description", "status"}
+
+
+def _owner_params(namespace_id: int, tenant_id: int, user_id: int) -> dict[str, Any]:
+    return {"namespace_id": namespace_id, "tenant_id": tenant_id, "created_by": user_id}
+
+
+def _update_params(
+    namespace_id: int, tenant_id: int, user_id: int, fields: dict[str, Any]
+) -> dict[str, Any] | None:
+    safe_fields = {key: value for key, value in fields.items() if key in _ALLOWED_UPDATE_FIELDS}
+    if not safe_fields:
+        return None
+    return {
+        **_owner_params(namespace_id, tenant_id, user_id),
+        "namespace": safe_fields.get("namespace"),
+        "description": safe_fields.get("description"),
+        "status": safe_fields.get("status"),
+    }
+
 
 class NamespaceRepository:
     @staticmethod
@@ -21,154 +126,95 @@ class NamespaceRepository:
         limit: int,
         offset: int,
     ) -> tuple[list[dict[str, Any]], int]:
-        query = text(
-            """
-            SELECT
-              ns.namespace_id,
-              ns.namespace,
-              ns.description,
-              ns.status,
-              ns.created_by,
-              ns.created_at,
-              ns.updated_at,
-              COALESCE(doc_stats.doc_count, 0) AS doc_count
-            FROM knowledge_namespace AS ns
-            LEFT JOIN (
-              SELECT namespace_id, COUNT(1) AS doc_count
-              FROM knowledge_document
-              WHERE tenant_id = :tenant_id AND created_by = :created_by AND is_deleted = 0
-              GROUP BY namespace_id
-            ) AS doc_stats
-              ON doc_stats.namespace_id = ns.namespace_id
-            WHERE ns.tenant_id = :tenant_id AND ns.created_by = :created_by AND ns.is_deleted = 0
-            ORDER BY ns.updated_at DESC, ns.namespace_id DESC
-            LIMIT :limit OFFSET :offset
-            """
-        )
-        count_query = text(
-            """
-            SELECT COUNT(1) AS total
-            FROM knowledge_namespace
-            WHERE tenant_id = :tenant_id AND created_by = :created_by AND is_deleted = 0
-            """
-        )
-
-        params = {
-            "tenant_id": tenant_id,
-            "created_by": user_id,
-            "limit": limit,
-            "offset": offset,
-        }
+        params = {"tenant_id": tenant_id, "created_by": user_id}
         with MySQLClient.get_engine().connect() as conn:
-            rows = [dict(row) for row in conn.execute(query, params).mappings()]
-            total = conn.execute(
-                count_query,
-                {"tenant_id": tenant_id, "created_by": user_id},
-            ).scalar_one()
+            rows = [
+                dict(row)
+                for row in conn.execute(
+                    _LIST_BY_USER_SQL, {**params, "limit": limit, "offset": offset}
+                ).mappings()
+            ]
+            total = conn.execute(_COUNT_BY_USER_SQL, params).scalar_one()
+        return rows, int(total or 0)
+
+    @staticmethod
+    async def alist_by_user(
+        tenant_id: int,
+        user_id: int,
+        *,
+        limit: int,
+        offset: int,
+    ) -> tuple[list[dict[str, Any]], int]:
+        params = {"tenant_id": tenant_id, "created_by": user_id}
+        async with MySQLClient.aconnect() as conn:
+            result = await conn.execute(
+                _LIST_BY_USER_SQL, {**params, "limit": limit, "offset": offset}
+            )
+            rows = [dict(row) for row in result.mappings()]
+            total = (await conn.execute(_COUNT_BY_USER_SQL, params)).scalar_one()
         return rows, int(total or 0)
 
     @staticmethod
     def get(namespace_id: int, tenant_id: int, user_id: int) -> dict[str, Any] | None:
-        query = text(
-            """
-            SELECT
-              namespace_id,
-              namespace,
-              description,
-              status,
-              created_by,
-              created_at,
-              updated_at
-            FROM knowledge_namespace
-            WHERE namespace_id = :namespace_id
-              AND tenant_id = :tenant_id
-              AND created_by = :created_by
-              AND is_deleted = 0
-            """
-        )
         with MySQLClient.get_engine().connect() as conn:
             row = (
-                conn.execute(
-                    query,
-                    {
-                        "namespace_id": namespace_id,
-                        "tenant_id": tenant_id,
-                        "created_by": user_id,
-                    },
-                )
+                conn.execute(_GET_SQL, _owner_params(namespace_id, tenant_id, user_id))
                 .mappings()
                 .fetchone()
             )
             return dict(row) if row else None
 
+    @staticmethod
+    async def aget(namespace_id: int, tenant_id: int, user_id: int) -> dict[str, Any] | None:
+        async with MySQLClient.aconnect() as conn:
+            result = await conn.execute(_GET_SQL, _owner_params(namespace_id, tenant_id, user_id))
+            row = result.mappings().fetchone()
+        return dict(row) if row else None
+
     @staticmethod
     def create(payload: dict[str, Any]) -> int:
-        query = text(
-            """
-            INSERT INTO knowledge_namespace (
-              tenant_id, namespace, description, created_by, status
-            ) VALUES (
-              :tenant_id, :namespace, :description, :created_by, :status
-            )
-            """
-        )
         with MySQLClient.get_engine().begin() as conn:
-            result = conn.execute(query, payload)
+            result = conn.execute(_CREATE_SQL, payload)
+            return int(result.lastrowid)
+
+    @staticmethod
+    async def acreate(payload: dict[str, Any]) -> int:
+        async with MySQLClient.abegin() as conn:
+            result = await conn.execute(_CREATE_SQL, payload)
             return int(result.lastrowid)
 
     @staticmethod
     def update(namespace_id: int, tenant_id: int, user_id: int, fields: dict[str, Any]) -> int:
-        if not fields:
+        params = _update_params(namespace_id, tenant_id, user_id, fields)
+        if params is None:
             return 0
-        allowed_fields = {"namespace", "description", "status"}
-        safe_fields = {key: value for key, value in fields.items() if key in allowed_fields}
-        if not safe_fields:
-            return 0
-
-        query = text(
-            """
-            UPDATE knowledge_namespace
-            SET
-              namespace = COALESCE(:namespace, namespace),
-              description = COALESCE(:description, description),
-              status = COALESCE(:status, status)
-            WHERE namespace_id = :namespace_id
-              AND tenant_id = :tenant_id
-              AND created_by = :created_by
-              AND is_deleted = 0
-            """
-        )
-        params = {
-            "namespace_id": namespace_id,
-            "tenant_id": tenant_id,
-            "created_by": user_id,
-            "namespace": safe_fields.get("namespace"),
-            "description": safe_fields.get("description"),
-            "status": safe_fields.get("status"),
-        }
         with MySQLClient.get_engine().begin() as conn:
-            result = conn.execute(query, params)
+            result = conn.execute(_UPDATE_SQL, params)
+            return int(result.rowcount or 0)
+
+    @staticmethod
+    async def aupdate(
+        namespace_id: int, tenant_id: int, user_id: int, fields: dict[str, Any]
+    ) -> int:
+        params = _update_params(namespace_id, tenant_id, user_id, fields)
+        if params is None:
+            return 0
+        async with MySQLClient.abegin() as conn:
+            result = await conn.execute(_UPDATE_SQL, params)
             return int(result.rowcount or 0)
 
     @staticmethod
     def soft_delete(namespace_id: int, tenant_id: int, user_id: int) -> int:
-        query = text(
-            """
-            UPDATE knowledge_namespace
-            SET is_deleted = 1
-            WHERE namespace_id = :namespace_id
-              AND tenant_id = :tenant_id
-              AND created_by = :created_by
-              AND is_deleted = 0
-            """
-        )
         with MySQLClient.get_engine().begin() as conn:
             result = conn.execute(
-                query,
-                {
-                    "namespace_id": namespace_id,
-                    "tenant_id": tenant_id,
-                    "created_by": user_id,
-                },
+                _SOFT_DELETE_SQL, _owner_params(namespace_id, tenant_id, user_id)
+            )
+            return int(result.rowcount or 0)
+
+    @staticmethod
+    async def asoft_delete(namespace_id: int, tenant_id: int, user_id: int) -> int:
+        async with MySQLClient.abegin() as conn:
+            result = await conn.execute(
+                _SOFT_DELETE_SQL, _owner_params(namespace_id, tenant_id, user_id)
             )
             return int(result.rowcount or 0)
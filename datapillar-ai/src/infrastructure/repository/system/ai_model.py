@@ -15,9 +15,18 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+import redis
 from sqlalchemy import text
 
 from src.infrastructure.database.mysql import MySQLClient
+from src.infrastructure.repository.system.usage_writer import (
+    DEFAULT_HEARTBEAT_TTL_SECONDS,
+    RedisUsageBuffer,
+    UsageBuffer,
+    UsageWriteBehind,
+)
+from src.shared.config.runtime import get_llm_usage_config
+from src.shared.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
@@ -155,6 +164,74 @@ class Model:
             )
             return None
 
+    @staticmethod
+    def get_config_version(tenant_id: int) -> str | None:
+        """Version stamp of a tenant's ai_model rows(row count + latest updated_at).
+
+        Any insert,update(key rotation,status change) or delete of the tenant's models
+        changes the stamp;None when the lookup fails.
+        """
+        query = text(
+            """
+            SELECT COUNT(1) AS models, MAX(updated_at) AS updated_at
+            FROM ai_model
+            WHERE tenant_id = :tenant_id
+            """
+        )
+        try:
+            with MySQLClient.get_engine().connect() as conn:
+                row = conn.execute(query, {"tenant_id": tenant_id}).mappings().fetchone()
+        except Exception as e:
+            logger.error("Get ai_model version failed:tenant=%s err=%s", tenant_id, e)
+            return None
+        if row is None:
+            return None
+        return f"{int(row['models'] or 0)}:{row['updated_at']}"
+
+
+_USAGE_COLUMNS = (
+    "tenant_id",
+    "user_id",
+    "session_id",
+    "module",
+    "agent_id",
+    "provider",
+    "model_name",
+    "run_id",
+    "parent_run_id",
+    "prompt_tokens",
+    "completion_tokens",
+    "total_tokens",
+    "estimated",
+    "prompt_cost_usd",
+    "completion_cost_usd",
+    "total_cost_usd",
+    "raw_usage_json",
+)
+_USAGE_UPDATE_COLUMNS = (
+    "prompt_tokens",
+    "completion_tokens",
+    "total_tokens",
+    "estimated",
+    "prompt_cost_usd",
+    "completion_cost_usd",
+    "total_cost_usd",
+    "raw_usage_json",
+)
+
+
+def _usage_upsert_sql(rows: int) -> str:
+    values = ",\n".join(
+        "(" + ", ".join(f":{column}_{index}" for column in _USAGE_COLUMNS) + ")"
+        for index in range(rows)
+    )
+    updates = ",\n".join(f"{column} = VALUES({column})" for column in _USAGE_UPDATE_COLUMNS)
+    return (
+        f"INSERT INTO ai_llm_usage ({', '.join(_USAGE_COLUMNS)})\n"
+        f"VALUES\n{values}\n"
+        f"ON DUPLICATE KEY UPDATE\n{updates}"
+    )
+
 
 class LlmUsage:
     """
@@ -162,39 +239,65 @@ class LlmUsage:
 
     constraint:- use run_id The only way to remove duplicates,Support disconnection and reconnection/Duplicate writes caused by event replay
     - DB Exceptions should not affect the main link:The upper layer should catch exceptions and only provide warnings
+    - upsert_usage is write-behind once llm_usage_writer is started(multi-row upserts from a
+      flusher thread),a direct write otherwise
     """
 
     @staticmethod
     def upsert_usage(*, record: dict[str, Any]) -> None:
-        query = text(
-            """
-            INSERT INTO ai_llm_usage (
-              tenant_id, user_id, session_id, module, agent_id,
-              provider, model_name,
-              run_id, parent_run_id,
-              prompt_tokens, completion_tokens, total_tokens, estimated,
-              prompt_cost_usd, completion_cost_usd, total_cost_usd,
-              raw_usage_json
-            )
-            VALUES (
-              :tenant_id, :user_id, :session_id, :module, :agent_id,
-              :provider, :model_name,
-              :run_id, :parent_run_id,
-              :prompt_tokens, :completion_tokens, :total_tokens, :estimated,
-              :prompt_cost_usd, :completion_cost_usd, :total_cost_usd,
-              :raw_usage_json
-            )
-            ON DUPLICATE KEY UPDATE
-              prompt_tokens = VALUES(prompt_tokens),
-              completion_tokens = VALUES(completion_tokens),
-              total_tokens = VALUES(total_tokens),
-              estimated = VALUES(estimated),
-              prompt_cost_usd = VALUES(prompt_cost_usd),
-              completion_cost_usd = VALUES(completion_cost_usd),
-              total_cost_usd = VALUES(total_cost_usd),
-              raw_usage_json = VALUES(raw_usage_json)
-            """
-        )
+        if llm_usage_writer.running:
+            llm_usage_writer.submit(record)
+            return
+        LlmUsage.upsert_usage_batch([record])
 
+    @staticmethod
+    def upsert_usage_batch(records: list[dict[str, Any]]) -> None:
+        """One multi-row upsert(records must have distinct run_id)"""
+        if not records:
+            return
+        params = {
+            f"{column}_{index}": record.get(column)
+            for index, record in enumerate(records)
+            for column in _USAGE_COLUMNS
+        }
         with MySQLClient.get_engine().begin() as conn:
-            conn.execute(query, record)
+            conn.execute(text(_usage_upsert_sql(len(records))), params)
+
+
+llm_usage_writer = UsageWriteBehind(write_batch=LlmUsage.upsert_usage_batch)
+
+
+def start_llm_usage_writer() -> UsageWriteBehind:
+    """Start the write-behind usage writer(llm_usage runtime config)"""
+    config = get_llm_usage_config()
+    if not config["write_behind"]:
+        logger.info("LLM usage is written per call(llm_usage.write_behind is off)")
+        return llm_usage_writer
+    buffer: UsageBuffer | None = None
+    if config["buffer"] == "redis":
+        buffer = RedisUsageBuffer(
+            redis.Redis(
+                host=settings.redis_host,
+                port=settings.redis_port,
+                db=settings.redis_db,
+                password=settings.redis_password or None,
+                decode_responses=True,
+            ),
+            # The flusher refreshes the heartbeat once per flush interval.
+            heartbeat_ttl_seconds=max(
+                DEFAULT_HEARTBEAT_TTL_SECONDS, 3 * config["flush_interval_seconds"]
+            ),
+        )
+    llm_usage_writer.configure(
+        buffer=buffer,
+        flush_interval_seconds=config["flush_interval_seconds"],
+        max_batch_rows=config["max_batch_rows"],
+        max_pending_rows=config["max_pending_rows"],
+    )
+    llm_usage_writer.start()
+    return llm_usage_writer
+
+
+def stop_llm_usage_writer() -> None:
+    """Stop the writer and flush pending usage(shutdown)"""
+    llm_usage_writer.close()
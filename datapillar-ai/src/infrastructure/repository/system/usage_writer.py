@@ -0,0 +1,342 @@
+# @author Sunny
+# @date 2026-01-27
+
+"""
+Write-behind buffer for LLM usage rows(ai_llm_usage)
+
+Every LLM call used to upsert its usage row in its own transaction.Rows are now put in a
+buffer and a flusher thread writes them as multi-row upserts every
+flush_interval_seconds(or as soon as max_batch_rows are waiting):
+- a row is identified by (tenant_id,run_id);the upsert replaces the row,so a newer record
+  of the same run replaces the buffered one(replayed events collapse before the DB)
+- a failed write puts the rows back(a newer record of the same run wins) and is retried
+  with the next flush
+- over max_pending_rows the caller flushes inline(back pressure instead of dropping usage)
+- a buffer that cannot take the row(Redis down) is bypassed:the row is written directly
+- close() flushes what is left(shutdown)
+
+Buffers:MemoryUsageBuffer(one process) and RedisUsageBuffer(one hash shared by every
+worker;a flush renames it to a per-worker key first,so each row is written by one worker.
+Every worker keeps a heartbeat key alive;flushing keys of workers whose heartbeat expired
+(died mid-flush) are folded back at start and then every heartbeat TTL,live workers'
+flushes are left alone.The upsert is idempotent,so writing a row twice is harmless).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Any
+
+from redis.exceptions import ResponseError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL_SECONDS = 5.0
+DEFAULT_MAX_BATCH_ROWS = 500
+DEFAULT_MAX_PENDING_ROWS = 50_000
+DEFAULT_HEARTBEAT_TTL_SECONDS = 60.0
+REDIS_BUFFER_KEY = "datapillar:llm_usage:pending"
+
+UsageRecord = dict[str, Any]
+
+
+def usage_row_key(record: UsageRecord) -> str:
+    run_id = record.get("run_id")
+    if not run_id:
+        # Without a run id the row cannot be matched,it is never collapsed.
+        return f"{record.get('tenant_id')}:~{uuid.uuid4().hex}"
+    return f"{record.get('tenant_id')}:{run_id}"
+
+
+class UsageBuffer(ABC):
+    @abstractmethod
+    def put(self, key: str, record: UsageRecord) -> int:
+        """Buffer a row(replacing the pending row of key);returns the pending row count"""
+
+    @abstractmethod
+    def drain(self) -> dict[str, UsageRecord]:
+        """Take every pending row"""
+
+    def commit(self) -> None:
+        """The drained rows are written(no-op unless the buffer tracks in-flight rows)"""
+        return None
+
+    def heartbeat(self) -> None:
+        """The owning worker is alive(called by the flusher;no-op for a local buffer)"""
+        return None
+
+    def recover(self) -> int:
+        """Fold back rows of flushes that never finished;returns the rows recovered"""
+        return 0
+
+    @abstractmethod
+    def restore(self, rows: dict[str, UsageRecord]) -> None:
+        """Put back drained rows that failed to write;rows buffered since then win"""
+
+    @abstractmethod
+    def pending(self) -> int: ...
+
+
+class MemoryUsageBuffer(UsageBuffer):
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._rows: dict[str, UsageRecord] = {}
+
+    def put(self, key: str, record: UsageRecord) -> int:
+        with self._lock:
+            self._rows[key] = record
+            return len(self._rows)
+
+    def drain(self) -> dict[str, UsageRecord]:
+        with self._lock:
+            rows, self._rows = self._rows, {}
+            return rows
+
+    def restore(self, rows: dict[str, UsageRecord]) -> None:
+        with self._lock:
+            self._rows = {**rows, **self._rows}
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._rows)
+
+
+class RedisUsageBuffer(UsageBuffer):
+    """Pending rows in one Redis hash:field (tenant_id:run_id) -> JSON row"""
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        key: str = REDIS_BUFFER_KEY,
+        worker_id: str | None = None,
+        heartbeat_ttl_seconds: float = DEFAULT_HEARTBEAT_TTL_SECONDS,
+    ) -> None:
+        self._client = client
+        self._key = key
+        self._worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._flushing_key = f"{key}:flushing:{self._worker_id}"
+        self._heartbeat_ttl_ms = int(heartbeat_ttl_seconds * 1000)
+
+    @property
+    def heartbeat_ttl_seconds(self) -> float:
+        return self._heartbeat_ttl_ms / 1000
+
+    def _alive_key(self, worker_id: str) -> str:
+        return f"{self._key}:alive:{worker_id}"
+
+    def put(self, key: str, record: UsageRecord) -> int:
+        pipe = self._client.pipeline(transaction=False)
+        pipe.hset(self._key, key, json.dumps(record, ensure_ascii=False, default=str))
+        pipe.hlen(self._key)
+        return int(pipe.execute()[1])
+
+    def drain(self) -> dict[str, UsageRecord]:
+        self.heartbeat()
+        # A flush of this worker that did not finish is drained again first.
+        if not self._client.exists(self._flushing_key):
+            try:
+                self._client.rename(self._key, self._flushing_key)
+            except ResponseError:
+                return {}
+        raw = self._client.hgetall(self._flushing_key)
+        return {field: json.loads(value) for field, value in raw.items()}
+
+    def commit(self) -> None:
+        self._client.delete(self._flushing_key)
+
+    def restore(self, rows: dict[str, UsageRecord]) -> None:
+        self._merge(rows)
+        self._client.delete(self._flushing_key)
+
+    def pending(self) -> int:
+        return int(self._client.hlen(self._key))
+
+    def heartbeat(self) -> None:
+        self._client.set(self._alive_key(self._worker_id), "1", px=self._heartbeat_ttl_ms)
+
+    def recover(self) -> int:
+        """Fold rows of flushes of dead workers(heartbeat expired) back into the buffer"""
+        recovered = 0
+        prefix = f"{self._key}:flushing:"
+        for flushing_key in self._client.scan_iter(match=f"{prefix}*"):
+            if flushing_key == self._flushing_key:
+                continue
+            if self._client.exists(self._alive_key(flushing_key[len(prefix) :])):
+                continue
+            raw = self._client.hgetall(flushing_key)
+            self._merge({field: json.loads(value) for field, value in raw.items()})
+            self._client.delete(flushing_key)
+            recovered += len(raw)
+        return recovered
+
+    def _merge(self, rows: dict[str, UsageRecord]) -> None:
+        if not rows:
+            return
+        pipe = self._client.pipeline(transaction=False)
+        for field, record in rows.items():
+            pipe.hsetnx(self._key, field, json.dumps(record, ensure_ascii=False, default=str))
+        pipe.execute()
+
+
+class UsageWriteBehind:
+    """Buffers usage rows and writes them in batches from a flusher thread"""
+
+    def __init__(
+        self,
+        *,
+        write_batch: Callable[[list[UsageRecord]], None],
+        buffer: UsageBuffer | None = None,
+        flush_interval_seconds: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+        max_batch_rows: int = DEFAULT_MAX_BATCH_ROWS,
+        max_pending_rows: int = DEFAULT_MAX_PENDING_ROWS,
+    ) -> None:
+        self._write_batch = write_batch
+        self._buffer = buffer or MemoryUsageBuffer()
+        self._flush_interval_seconds = flush_interval_seconds
+        self._max_batch_rows = max_batch_rows
+        self._max_pending_rows = max_pending_rows
+        self._flush_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._stats = {
+            "submitted": 0,
+            "written": 0,
+            "statements": 0,
+            "failures": 0,
+            "direct_writes": 0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def configure(
+        self,
+        *,
+        buffer: UsageBuffer | None = None,
+        flush_interval_seconds: float | None = None,
+        max_batch_rows: int | None = None,
+        max_pending_rows: int | None = None,
+    ) -> None:
+        """Change the buffer/limits(before start)"""
+        if self.running:
+            raise RuntimeError("Usage writer is running,stop it before configuring")
+        if buffer is not None:
+            self._buffer = buffer
+        if flush_interval_seconds is not None:
+            self._flush_interval_seconds = flush_interval_seconds
+        if max_batch_rows is not None:
+            self._max_batch_rows = max_batch_rows
+        if max_pending_rows is not None:
+            self._max_pending_rows = max_pending_rows
+
+    def submit(self, record: UsageRecord) -> None:
+        try:
+            pending = self._buffer.put(usage_row_key(record), record)
+        except Exception as exc:
+            # The buffer is unreachable(e.g. Redis down):write the row instead of dropping it.
+            logger.warning("LLM usage buffer unavailable,writing the row directly:%s", exc)
+            self._write_batch([record])
+            with self._stats_lock:
+                self._stats["submitted"] += 1
+                self._stats["direct_writes"] += 1
+                self._stats["statements"] += 1
+                self._stats["written"] += 1
+            return
+        with self._stats_lock:
+            self._stats["submitted"] += 1
+        if pending >= self._max_pending_rows:
+            # The flusher cannot keep up(or the DB is down):write on the caller.
+            self.flush(raise_errors=True)
+        elif pending >= self._max_batch_rows:
+            self._wakeup.set()
+
+    def flush(self, *, raise_errors: bool = False) -> int:
+        """Write every pending row;returns the number of rows written"""
+        with self._flush_lock:
+            rows = self._buffer.drain()
+            keys = list(rows)
+            written = 0
+            try:
+                for start in range(0, len(keys), self._max_batch_rows):
+                    chunk = keys[start : start + self._max_batch_rows]
+                    self._write_batch([rows[key] for key in chunk])
+                    written += len(chunk)
+                    with self._stats_lock:
+                        self._stats["statements"] += 1
+                        self._stats["written"] += len(chunk)
+                self._buffer.commit()
+            except Exception as exc:
+                self._buffer.restore({key: rows[key] for key in keys[written:]})
+                with self._stats_lock:
+                    self._stats["failures"] += 1
+                if raise_errors:
+                    raise
+                logger.warning(
+                    "LLM usage flush failed,%s rows kept for retry:%s", len(keys) - written, exc
+                )
+            return written
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        try:
+            self._buffer.heartbeat()
+            self._recover()
+        except Exception as exc:
+            logger.warning("LLM usage buffer recovery failed:%s", exc)
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="llm-usage-writer", daemon=True)
+        self._thread.start()
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Stop the flusher and write what is pending"""
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stopping.set()
+            self._wakeup.set()
+            thread.join(timeout=timeout)
+        self.flush()
+
+    def stats(self) -> dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["pending"] = self._buffer.pending()
+        stats["buffer"] = type(self._buffer).__name__
+        return stats
+
+    def _recover(self) -> None:
+        recovered = self._buffer.recover()
+        if recovered:
+            logger.info("Recovered %s unflushed LLM usage rows", recovered)
+
+    def _run(self) -> None:
+        # Dead workers are looked for once per heartbeat TTL(a flushing key can only be
+        # recovered after its worker's heartbeat expired).
+        recover_every = getattr(self._buffer, "heartbeat_ttl_seconds", None)
+        next_recover = time.monotonic() + recover_every if recover_every else None
+        while not self._stopping.is_set():
+            self._wakeup.wait(self._flush_interval_seconds)
+            self._wakeup.clear()
+            if self._stopping.is_set():
+                return
+            try:
+                self._buffer.heartbeat()
+                if next_recover is not None and time.monotonic() >= next_recover:
+                    next_recover = time.monotonic() + recover_every
+                    self._recover()
+                self.flush()
+            except Exception as exc:  # e.g. the Redis buffer is unreachable
+                logger.warning("LLM usage flusher error:%s", exc)
+                time.sleep(min(self._flush_interval_seconds, 1.0))
@@ -20,6 +20,7 @@ from datapillar_oneagentic import Datapillar, DatapillarConfig, Process
 
 from src.infrastructure.llm.config import get_datapillar_config
 from src.modules.etl import tools as _tools  # noqa: F401
+from src.modules.etl.usage_sink import EtlUsageSink
 from src.shared.config.runtime import get_default_tenant_id
 
 # Explicitly import all agent module,trigger @agent Decorator registration
@@ -73,6 +74,7 @@ def create_etl_team(
             ReviewerAgent,  # code review],process=Process.DYNAMIC,)
         ],
         process=Process.DYNAMIC,
+        usage_sink=EtlUsageSink(tenant_id=resolved_tenant_id, provider=config.llm.provider),
     )
 
 
@@ -5,6 +5,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
@@ -15,9 +16,13 @@ from fastapi import APIRouter, Query, Request
 from pydantic import BaseModel, ConfigDict, Field
 from sse_starlette.sse import EventSourceResponse
 
+from src.infrastructure.database import RedisClient
 from src.modules.etl.agents import create_etl_team
-from src.modules.etl.model_runtime import build_etl_datapillar_config
-from src.modules.etl.sse_protocol import RunRegistry, adapt_sse_stream
+from src.modules.etl.model_runtime import build_etl_config_from_models, resolve_etl_models
+from src.modules.etl.run_log import RunLog
+from src.modules.etl.sse_protocol import adapt_sse_stream
+from src.modules.etl.team_pool import EtlTeamPool, SessionBinding, TeamPoolKey
+from src.modules.etl.tools.cache import tool_result_cache
 from src.shared.exception import BadRequestException, ConflictException, InternalException
 from src.shared.web import ApiResponse, ApiSuccessResponseSchema
 
@@ -26,7 +31,48 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 etl_stream_manager = StreamManager()
-etl_run_registry = RunRegistry()
+
+
+async def _abort_local_run(storage_key: str, interrupt_id: str | None) -> bool:
+    key = SessionKey.parse(storage_key)
+    if interrupt_id:
+        return await etl_stream_manager.abort_interrupt(key=key, interrupt_id=interrupt_id)
+    return await etl_stream_manager.abort(key=key)
+
+
+etl_run_log = RunLog(abort_handler=_abort_local_run)
+
+
+async def _redis_client():
+    return (await RedisClient.get_instance()).client
+
+
+async def start_etl_run_log() -> RunLog:
+    """Share ETL runs across nodes through Redis(memory store until then)"""
+    await etl_run_log.start(client_factory=_redis_client)
+    return etl_run_log
+
+
+async def stop_etl_run_log() -> None:
+    await etl_run_log.stop()
+
+
+def start_etl_team_pool(app: Any) -> None:
+    # Created on the event loop, so teams evicted on worker threads are closed on it.
+    app.state.etl_team_pool = EtlTeamPool()
+
+
+async def stop_etl_team_pool(app: Any) -> None:
+    pool: EtlTeamPool | None = getattr(app.state, "etl_team_pool", None)
+    if pool is not None:
+        await pool.aclose()
+
+
+class _DetachedRequest:
+    """Request stand-in for the run log publisher:it never disconnects"""
+
+    async def is_disconnected(self) -> bool:
+        return False
 
 
 class WorkflowChatModel(BaseModel):
@@ -52,22 +98,12 @@ class WorkflowRequest(BaseModel):
     model: WorkflowChatModel | None = Field(None, alias="model", description="This session model")
 
 
-def _get_session_teams(request: Request) -> dict[str, Datapillar]:
-    teams: dict[str, Datapillar] | None = getattr(request.app.state, "etl_session_teams", None)
-    if teams is None:
-        teams = {}
-        request.app.state.etl_session_teams = teams
-    return teams
-
-
-def _get_session_models(request: Request) -> dict[str, tuple[int, str]]:
-    models: dict[str, tuple[int, str]] | None = getattr(
-        request.app.state, "etl_session_models", None
-    )
-    if models is None:
-        models = {}
-        request.app.state.etl_session_models = models
-    return models
+def _get_team_pool(request: Request) -> EtlTeamPool:
+    pool: EtlTeamPool | None = getattr(request.app.state, "etl_team_pool", None)
+    if pool is None:
+        pool = EtlTeamPool()
+        request.app.state.etl_team_pool = pool
+    return pool
 
 
 def _build_namespace(tenant_id: int) -> str:
@@ -88,8 +124,35 @@ def _normalize_provider_model_id(provider_model_id: str) -> str:
     return normalized
 
 
-def _get_bound_team(request: Request, storage_key: str) -> Datapillar | None:
-    return _get_session_teams(request).get(storage_key)
+def _acquire_team(
+    *,
+    pool: EtlTeamPool,
+    tenant_id: int,
+    tenant_code: str,
+    user_id: int,
+    namespace: str,
+    model: tuple[int, str],
+) -> tuple[Datapillar, TeamPoolKey]:
+    # The model lookup is per user (grant check), so it runs for every new session;
+    # key decryption and graph compilation are shared through the pool.
+    selection = resolve_etl_models(
+        tenant_id=tenant_id,
+        user_id=user_id,
+        ai_model_id=model[0],
+        provider_model_id=model[1],
+    )
+    pool_key = TeamPoolKey(
+        tenant_id=tenant_id,
+        ai_model_id=model[0],
+        provider_model_id=model[1],
+        config_version=selection.config_version,
+    )
+
+    def _build() -> Datapillar:
+        config = build_etl_config_from_models(tenant_code=tenant_code, selection=selection)
+        return create_etl_team(config=config, namespace=namespace, tenant_id=tenant_id)
+
+    return pool.get_or_create(pool_key, _build), pool_key
 
 
 def _resolve_session_team(
@@ -101,35 +164,49 @@ def _resolve_session_team(
     key: SessionKey,
     requested_model: tuple[int, str],
 ) -> Datapillar:
+    pool = _get_team_pool(request)
     storage_key = str(key)
-    session_models = _get_session_models(request)
-    bound_model = session_models.get(storage_key)
-    if bound_model and bound_model != requested_model:
-        raise ConflictException("same sessionId Switch not allowed model")
-
-    team = _get_bound_team(request, storage_key)
-    if team is not None:
-        if not bound_model:
-            session_models[storage_key] = requested_model
-        return team
-
-    config = build_etl_datapillar_config(
+    binding = pool.get_binding(storage_key)
+    if binding is not None:
+        if binding.model != requested_model:
+            raise ConflictException("same sessionId Switch not allowed model")
+        team = pool.get(binding.pool_key)
+        if team is not None:
+            return team
+
+    team, pool_key = _acquire_team(
+        pool=pool,
         tenant_id=tenant_id,
-        user_id=user_id,
         tenant_code=tenant_code,
-        ai_model_id=requested_model[0],
-        provider_model_id=requested_model[1],
-    )
-    team = create_etl_team(
-        config=config,
+        user_id=user_id,
         namespace=key.namespace,
-        tenant_id=tenant_id,
+        model=requested_model,
     )
-    _get_session_teams(request)[storage_key] = team
-    session_models[storage_key] = requested_model
+    pool.bind_session(storage_key, SessionBinding(model=requested_model, pool_key=pool_key))
     return team
 
 
+def _get_bound_team(request: Request, key: SessionKey) -> Datapillar | None:
+    binding = _get_team_pool(request).get_binding(str(key))
+    if binding is None:
+        return None
+    current_user = request.state.current_user
+    return _resolve_session_team(
+        request=request,
+        tenant_id=current_user.tenant_id,
+        tenant_code=current_user.tenant_code,
+        user_id=current_user.user_id,
+        key=key,
+        requested_model=binding.model,
+    )
+
+
+async def _aget_bound_team(request: Request, key: SessionKey) -> Datapillar | None:
+    # A pool miss rebuilds the team (MySQL lookup, key decryption, graph compile).
+    _get_team_pool(request)  # create it on the loop, not on a worker thread
+    return await asyncio.to_thread(_get_bound_team, request, key)
+
+
 class _TeamOrchestratorAdapter:
     def __init__(self, team: Datapillar) -> None:
         self._team = team
@@ -170,7 +247,10 @@ async def chat(payload: WorkflowRequest, request: Request) -> dict[str, Any]:
         session_id=payload.session_id,
         user_id=user_id_str,
     )
-    team = _resolve_session_team(
+    # Model lookup, key decryption and team compilation block:keep them off the event loop.
+    _get_team_pool(request)
+    team = await asyncio.to_thread(
+        _resolve_session_team,
         request=request,
         tenant_id=current_user.tenant_id,
         tenant_code=current_user.tenant_code,
@@ -181,7 +261,7 @@ async def chat(payload: WorkflowRequest, request: Request) -> dict[str, Any]:
     orchestrator = _TeamOrchestratorAdapter(team)
 
     if payload.resume_value is not None:
-        etl_run_registry.start_run(str(key))
+        run_id = await etl_run_log.start_run(str(key))
         logger.info(
             "[ETL Resume] user=%s, userId=%s, sessionId=%s, aiModelId=%s, providerModelId=%s",
             current_user.username,
@@ -200,7 +280,7 @@ async def chat(payload: WorkflowRequest, request: Request) -> dict[str, Any]:
         if not payload.user_input:
             raise BadRequestException("userInput cannot be empty")
 
-        etl_run_registry.start_run(str(key))
+        run_id = await etl_run_log.start_run(str(key))
         logger.info(
             "[ETL Chat] user=%s, userId=%s, sessionId=%s, aiModelId=%s, providerModelId=%s",
             current_user.username,
@@ -216,6 +296,19 @@ async def chat(payload: WorkflowRequest, request: Request) -> dict[str, Any]:
             resume_value=None,
         )
 
+    # Map the run once here;/sse on any node reads the mapped frames from the run log.
+    etl_run_log.publish(
+        str(key),
+        adapt_sse_stream(
+            source=etl_stream_manager.subscribe(
+                request=_DetachedRequest(),
+                key=key,
+                last_event_id=None,
+            ),
+            run_id=run_id,
+        ),
+    )
+
     return ApiResponse.success(
         data={
             "success": True,
@@ -261,23 +354,18 @@ async def workflow_sse(
         user_id=str(current_user.user_id),
     )
     storage_key = str(key)
-    if storage_key not in _get_session_models(request):
+    # The run may have been started on another node:its run record counts as initialized.
+    if (
+        _get_team_pool(request).get_binding(storage_key) is None
+        and await etl_run_log.get_run(storage_key) is None
+    ):
         raise BadRequestException("Session not initialized,Please call first /chat")
 
-    run_id = etl_run_registry.get_run(storage_key) or etl_run_registry.start_run(storage_key)
-
-    def _finish_run() -> None:
-        etl_run_registry.finish_run(storage_key)
-
     return EventSourceResponse(
-        adapt_sse_stream(
-            source=etl_stream_manager.subscribe(
-                request=request,
-                key=key,
-                last_event_id=last_event_id,
-            ),
-            run_id=run_id,
-            on_run_complete=_finish_run,
+        etl_run_log.stream(
+            storage_key,
+            last_event_id=last_event_id,
+            is_disconnected=request.is_disconnected,
         ),
         ping=15,
         media_type="text/event-stream; charset=utf-8",
@@ -310,7 +398,7 @@ async def clear_session(payload: WorkflowRequest, request: Request) -> dict[str,
         user_id=str(current_user.user_id),
     )
     storage_key = str(key)
-    team = _get_bound_team(request, storage_key)
+    team = await _aget_bound_team(request, key)
 
     if team is not None:
         try:
@@ -320,9 +408,9 @@ async def clear_session(payload: WorkflowRequest, request: Request) -> dict[str,
             raise InternalException("Cleaning session failed", cause=exc) from exc
 
     etl_stream_manager.clear_session(key=key)
-    etl_run_registry.finish_run(storage_key)
-    _get_session_teams(request).pop(storage_key, None)
-    _get_session_models(request).pop(storage_key, None)
+    await etl_run_log.clear(storage_key)
+    tool_result_cache.clear_session(key.namespace, key.session_id)
+    _get_team_pool(request).unbind_session(storage_key)
 
     return ApiResponse.success(
         data={
@@ -354,21 +442,13 @@ async def abort_workflow(payload: WorkflowRequest, request: Request) -> dict[str
         payload.session_id,
     )
 
+    # Relayed to the node running the session when it is not this one.
+    aborted = await etl_run_log.abort(str(key), interrupt_id=payload.interrupt_id)
     if payload.interrupt_id:
-        aborted = await etl_stream_manager.abort_interrupt(
-            key=key,
-            interrupt_id=payload.interrupt_id,
-        )
         message = "interrupt terminated" if aborted else "nothing waiting interrupt"
     else:
-        aborted = await etl_stream_manager.abort(
-            key=key,
-        )
         message = "Stopped" if aborted else "No tasks running"
 
-    if aborted:
-        etl_run_registry.finish_run(str(key))
-
     return ApiResponse.success(
         data={
             "success": True,
@@ -392,7 +472,7 @@ async def compact_session(payload: WorkflowRequest, request: Request) -> dict[st
         session_id=payload.session_id,
         user_id=user_id,
     )
-    team = _get_bound_team(request, str(key))
+    team = await _aget_bound_team(request, key)
     if team is None:
         raise BadRequestException("The session does not exist or has expired")
 
@@ -424,7 +504,7 @@ async def get_session_stats(
         session_id=session_id,
         user_id=str(current_user.user_id),
     )
-    team = _get_bound_team(request, str(key))
+    team = await _aget_bound_team(request, key)
     if team is None:
         raise BadRequestException("The session does not exist or has expired")
 
@@ -5,7 +5,11 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 from copy import deepcopy
+from dataclasses import dataclass
+from typing import Any
 
 from datapillar_oneagentic import DatapillarConfig
 
@@ -23,14 +27,40 @@ def _coerce_dict(value: object) -> dict[str, object]:
     return {}
 
 
-def build_etl_datapillar_config(
+_VERSION_FIELDS = ("id", "provider_code", "provider_model_id", "base_url", "api_key", "updated_at")
+
+
+@dataclass(frozen=True, slots=True)
+class EtlModelSelection:
+    """Authorized chat model and tenant default embedding model rows."""
+
+    chat_model: dict[str, Any]
+    embedding_model: dict[str, Any]
+
+    @property
+    def config_version(self) -> str:
+        """Fingerprint of everything the team config is built from."""
+        payload = {
+            "chat": {field: self.chat_model.get(field) for field in _VERSION_FIELDS},
+            "embedding": {
+                **{field: self.embedding_model.get(field) for field in _VERSION_FIELDS},
+                "embedding_dimension": self.embedding_model.get("embedding_dimension"),
+            },
+            "llm": _coerce_dict(get_llm_config()),
+            "agent": _coerce_dict(get_agent_config()),
+        }
+        raw = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
+def resolve_etl_models(
     *,
     tenant_id: int,
     user_id: int,
-    tenant_code: str,
     ai_model_id: int,
     provider_model_id: str,
-) -> DatapillarConfig:
+) -> EtlModelSelection:
+    """Look up and authorize the models of an ETL session (no key decryption)."""
     normalized_provider_model_id = provider_model_id.strip()
     if ai_model_id <= 0:
         raise BadRequestException("model.aiModelId Invalid")
@@ -55,10 +85,21 @@ def build_etl_datapillar_config(
     if not embedding_model:
         raise BadRequestException("Enabled not found Embedding model")
 
-    dimension = embedding_model.get("embedding_dimension")
-    if not dimension:
+    if not embedding_model.get("embedding_dimension"):
         raise BadRequestException("Embedding Model must be configured embedding_dimension")
 
+    return EtlModelSelection(chat_model=chat_model, embedding_model=embedding_model)
+
+
+def build_etl_config_from_models(
+    *,
+    tenant_code: str,
+    selection: EtlModelSelection,
+) -> DatapillarConfig:
+    """Decrypt keys and build the team config for resolved models."""
+    chat_model = selection.chat_model
+    embedding_model = selection.embedding_model
+
     chat_api_key = ModelNew.decrypt_key(
         tenant_code=tenant_code,
         encrypted_value=chat_model.get("api_key"),
@@ -82,7 +123,7 @@ def build_etl_datapillar_config(
         "api_key": embedding_api_key,
         "model": embedding_model.get("provider_model_id"),
         "base_url": embedding_model.get("base_url"),
-        "dimension": int(dimension),
+        "dimension": int(embedding_model["embedding_dimension"]),
     }
 
     return DatapillarConfig(
@@ -90,3 +131,20 @@ def build_etl_datapillar_config(
         embedding=embedding_config,
         agent=_coerce_dict(get_agent_config()),
     )
+
+
+def build_etl_datapillar_config(
+    *,
+    tenant_id: int,
+    user_id: int,
+    tenant_code: str,
+    ai_model_id: int,
+    provider_model_id: str,
+) -> DatapillarConfig:
+    selection = resolve_etl_models(
+        tenant_id=tenant_id,
+        user_id=user_id,
+        ai_model_id=ai_model_id,
+        provider_model_id=provider_model_id,
+    )
+    return build_etl_config_from_models(tenant_code=tenant_code, selection=selection)
@@ -0,0 +1,485 @@
+# @author Sunny
+# @date 2026-01-27
+
+"""
+ETL run log:shared run registry + mapped SSE frame log
+
+A workflow run executes on the node that received /chat(the team and the StreamManager
+run live there),while /sse reconnects and /abort may land on any node behind the load
+balancer:
+- the owning node maps the StreamManager events through adapt_sse_stream once and
+  appends the resulting SSE frames({"id","data"}) to the session's log
+- /sse on any node replays the log after Last-Event-ID,then tails it until the run ends
+  (an interrupted run keeps the stream open,as before)
+- /abort on another node is relayed to the owner over its node channel and waits for
+  the owner's answer
+- a new run of the session resets the log;run records and logs expire after ttl_seconds
+
+Stores:MemoryRunStore(one process,the default) and RedisRunStore(run record hash +
+frame stream per session),switched on at startup by start_etl_run_log.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from datapillar_oneagentic.utils.time import now_ms
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 60 * 60
+DEFAULT_MAX_FRAMES = 2000
+DEFAULT_IDLE_SECONDS = 5.0
+DEFAULT_ABORT_TIMEOUT_SECONDS = 5.0
+REDIS_KEY_PREFIX = "datapillar:etl:run"
+
+Frame = dict[str, str]
+AbortHandler = Callable[[str, str | None], Awaitable[bool]]
+
+
+@dataclass
+class RunInfo:
+    run_id: str
+    owner: str
+    started_ms: int
+    finished: bool = False
+
+
+class RunStore(ABC):
+    """Run record + frame log per session storage key"""
+
+    @abstractmethod
+    async def start_run(self, key: str, info: RunInfo) -> None:
+        """Record a new run and reset the session's log"""
+
+    @abstractmethod
+    async def get_run(self, key: str) -> RunInfo | None: ...
+
+    @abstractmethod
+    async def append(self, key: str, frame: Frame) -> None: ...
+
+    @abstractmethod
+    async def end(self, key: str) -> None:
+        """Mark the run finished and close the log(tailing readers stop)"""
+
+    @abstractmethod
+    async def clear(self, key: str) -> None:
+        """Drop the run record and the log(tailing readers stop)"""
+
+    @abstractmethod
+    def read(self, key: str, *, idle_seconds: float) -> AsyncIterator[Frame | None]:
+        """Frames from the start of the log,then new ones until the log is closed;None
+        after idle_seconds without a frame"""
+
+
+class _MemoryLog:
+    __slots__ = ("info", "frames", "next_position", "changed", "touched_at")
+
+    def __init__(self, touched_at: float) -> None:
+        self.info: RunInfo | None = None
+        # (position,frame),None frame:end of log;positions keep growing across resets
+        self.frames: list[tuple[int, Frame | None]] = []
+        self.next_position = 0
+        self.changed = asyncio.Event()
+        self.touched_at = touched_at
+
+    def push(self, frame: Frame | None, max_frames: int) -> None:
+        self.frames.append((self.next_position, frame))
+        self.next_position += 1
+        if len(self.frames) > max_frames:
+            del self.frames[: len(self.frames) - max_frames]
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+
+class MemoryRunStore(RunStore):
+    """Single process store(tests,local runs,no Redis)"""
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_frames: int = DEFAULT_MAX_FRAMES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_frames = max_frames
+        self._clock = clock
+        self._logs: dict[str, _MemoryLog] = {}
+
+    async def start_run(self, key: str, info: RunInfo) -> None:
+        self._cleanup_expired()
+        log = self._log(key)
+        log.frames.clear()
+        log.info = info
+
+    async def get_run(self, key: str) -> RunInfo | None:
+        self._cleanup_expired()
+        log = self._logs.get(key)
+        return log.info if log is not None else None
+
+    async def append(self, key: str, frame: Frame) -> None:
+        self._log(key).push(frame, self._max_frames)
+
+    async def end(self, key: str) -> None:
+        log = self._log(key)
+        if log.info is not None:
+            log.info.finished = True
+        log.push(None, self._max_frames)
+
+    async def clear(self, key: str) -> None:
+        log = self._logs.pop(key, None)
+        if log is not None:
+            log.push(None, self._max_frames)
+
+    async def read(self, key: str, *, idle_seconds: float) -> AsyncIterator[Frame | None]:
+        log = self._log(key)
+        position = 0
+        while True:
+            changed = log.changed
+            first = log.frames[0][0] if log.frames else log.next_position
+            batch = log.frames[max(0, position - first) :]
+            for _, frame in batch:
+                if frame is None:
+                    return
+                yield frame
+            if batch:
+                position = batch[-1][0] + 1
+                continue
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=idle_seconds)
+            except TimeoutError:
+                yield None
+
+    def _log(self, key: str) -> _MemoryLog:
+        log = self._logs.get(key)
+        if log is None:
+            log = self._logs[key] = _MemoryLog(self._clock())
+        log.touched_at = self._clock()
+        return log
+
+    def _cleanup_expired(self) -> None:
+        expire_before = self._clock() - self._ttl_seconds
+        for key in [key for key, log in self._logs.items() if log.touched_at < expire_before]:
+            self._logs.pop(key).push(None, self._max_frames)
+
+
+class RedisRunStore(RunStore):
+    """
+    Shared store:{prefix}:{key}:meta hash(run record),{prefix}:{key}:frames stream
+
+    A reset trims the stream instead of deleting it,so entry ids keep growing and
+    readers tailing with XREAD never miss the next run's frames.
+    """
+
+    def __init__(
+        self,
+        *,
+        client_factory: Callable[[], Awaitable[Any]],
+        prefix: str = REDIS_KEY_PREFIX,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        max_frames: int = DEFAULT_MAX_FRAMES,
+        read_count: int = 256,
+    ) -> None:
+        self._client_factory = client_factory
+        self._prefix = prefix
+        self._ttl_seconds = ttl_seconds
+        self._max_frames = max_frames
+        self._read_count = read_count
+
+    def _meta_key(self, key: str) -> str:
+        return f"{self._prefix}:{key}:meta"
+
+    def _frames_key(self, key: str) -> str:
+        return f"{self._prefix}:{key}:frames"
+
+    async def start_run(self, key: str, info: RunInfo) -> None:
+        client = await self._client_factory()
+        meta_key = self._meta_key(key)
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.delete(meta_key)
+            pipe.hset(
+                meta_key,
+                mapping={
+                    "run_id": info.run_id,
+                    "owner": info.owner,
+                    "started_ms": info.started_ms,
+                    "finished": int(info.finished),
+                },
+            )
+            pipe.expire(meta_key, self._ttl_seconds)
+            pipe.xtrim(self._frames_key(key), maxlen=0)
+            await pipe.execute()
+
+    async def get_run(self, key: str) -> RunInfo | None:
+        client = await self._client_factory()
+        meta = await client.hgetall(self._meta_key(key))
+        if not meta or "run_id" not in meta:
+            return None
+        return RunInfo(
+            run_id=meta["run_id"],
+            owner=meta.get("owner", ""),
+            started_ms=int(meta.get("started_ms") or 0),
+            finished=meta.get("finished") == "1",
+        )
+
+    async def append(self, key: str, frame: Frame) -> None:
+        await self._add(key, {"id": frame["id"], "data": frame["data"]})
+
+    async def end(self, key: str) -> None:
+        client = await self._client_factory()
+        meta_key = self._meta_key(key)
+        if await client.exists(meta_key):
+            await client.hset(meta_key, "finished", 1)
+        await self._add(key, {"end": "1"})
+
+    async def clear(self, key: str) -> None:
+        client = await self._client_factory()
+        frames_key = self._frames_key(key)
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.delete(self._meta_key(key))
+            pipe.xtrim(frames_key, maxlen=0)
+            pipe.xadd(frames_key, {"end": "1"})
+            pipe.expire(frames_key, self._ttl_seconds)
+            await pipe.execute()
+
+    async def read(self, key: str, *, idle_seconds: float) -> AsyncIterator[Frame | None]:
+        frames_key = self._frames_key(key)
+        last_id = "0-0"
+        while True:
+            client = await self._client_factory()
+            response = await client.xread(
+                {frames_key: last_id},
+                count=self._read_count,
+                block=max(1, int(idle_seconds * 1000)),
+            )
+            if not response:
+                yield None
+                continue
+            for entry_id, fields in response[0][1]:
+                last_id = entry_id
+                if "end" in fields:
+                    return
+                yield {"id": fields["id"], "data": fields["data"]}
+
+    async def _add(self, key: str, fields: dict[str, str]) -> None:
+        client = await self._client_factory()
+        frames_key = self._frames_key(key)
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.xadd(frames_key, fields, maxlen=self._max_frames, approximate=True)
+            pipe.expire(frames_key, self._ttl_seconds)
+            await pipe.execute()
+
+
+class RunLog:
+    """
+    Run registry of the ETL module
+
+    The node owning a run publishes its mapped frames(publish);any node streams them
+    (stream) and aborts the run(abort,relayed to the owner when it is another node).
+    """
+
+    def __init__(
+        self,
+        *,
+        abort_handler: AbortHandler,
+        store: RunStore | None = None,
+        node_id: str | None = None,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        idle_seconds: float = DEFAULT_IDLE_SECONDS,
+        abort_timeout_seconds: float = DEFAULT_ABORT_TIMEOUT_SECONDS,
+        prefix: str = REDIS_KEY_PREFIX,
+        retry_seconds: float = 5.0,
+    ) -> None:
+        self.node_id = node_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._abort_handler = abort_handler
+        self._store: RunStore = store or MemoryRunStore(ttl_seconds=ttl_seconds)
+        self._ttl_seconds = ttl_seconds
+        self._idle_seconds = idle_seconds
+        self._abort_timeout_seconds = abort_timeout_seconds
+        self._prefix = prefix
+        self._retry_seconds = retry_seconds
+        self._client_factory: Callable[[], Awaitable[Any]] | None = None
+        self._publishers: dict[str, asyncio.Task[None]] = {}
+        self._listener: asyncio.Task[None] | None = None
+        self._subscribed = asyncio.Event()
+
+    @property
+    def store(self) -> RunStore:
+        return self._store
+
+    async def start(self, *, client_factory: Callable[[], Awaitable[Any]]) -> None:
+        """Share runs through Redis:switch to RedisRunStore,listen for relayed aborts"""
+        self._client_factory = client_factory
+        self._store = RedisRunStore(
+            client_factory=client_factory,
+            prefix=self._prefix,
+            ttl_seconds=self._ttl_seconds,
+        )
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen(), name="etl-run-log-commands")
+
+    async def stop(self) -> None:
+        listener, self._listener = self._listener, None
+        tasks = [task for task in (listener, *self._publishers.values()) if task is not None]
+        self._publishers.clear()
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    async def wait_subscribed(self) -> None:
+        await self._subscribed.wait()
+
+    async def start_run(self, key: str) -> str:
+        """New run of the session owned by this node;stops the previous publisher"""
+        await self._cancel_publisher(key)
+        run_id = f"run-{now_ms()}"
+        await self._store.start_run(
+            key, RunInfo(run_id=run_id, owner=self.node_id, started_ms=now_ms())
+        )
+        return run_id
+
+    async def get_run(self, key: str) -> RunInfo | None:
+        return await self._store.get_run(key)
+
+    def publish(self, key: str, frames: AsyncIterator[Frame]) -> asyncio.Task[None]:
+        """Append the run's mapped frames to the log in the background"""
+        task = asyncio.create_task(self._drain(key, frames), name=f"etl-run-log:{key}")
+        self._publishers[key] = task
+        return task
+
+    async def stream(
+        self,
+        key: str,
+        *,
+        last_event_id: int | None = None,
+        is_disconnected: Callable[[], Awaitable[bool]] | None = None,
+    ) -> AsyncIterator[Frame]:
+        """SSE frames of the session:replay after last_event_id,then live"""
+        after = last_event_id or 0
+        reader = self._store.read(key, idle_seconds=self._idle_seconds)
+        try:
+            async for frame in reader:
+                if frame is None:
+                    if is_disconnected is not None and await is_disconnected():
+                        return
+                    continue
+                if after:
+                    # Skip what the client already has;once past it,everything is new.
+                    if _event_id(frame) <= after:
+                        continue
+                    after = 0
+                yield frame
+        finally:
+            await reader.aclose()
+
+    async def abort(self, key: str, *, interrupt_id: str | None = None) -> bool:
+        """Abort the run(or a pending interrupt) wherever it runs"""
+        info = await self._store.get_run(key)
+        if info is None or info.owner == self.node_id or self._client_factory is None:
+            return await self._abort_handler(key, interrupt_id)
+
+        client = await self._client_factory()
+        reply_key = f"{self._prefix}:reply:{uuid.uuid4().hex}"
+        command = json.dumps({"key": key, "interrupt_id": interrupt_id, "reply": reply_key})
+        if not await client.publish(self._node_channel(info.owner), command):
+            logger.warning("ETL run owner is gone:key=%s, owner=%s", key, info.owner)
+            return False
+        answer = await client.blpop([reply_key], timeout=self._abort_timeout_seconds)
+        return bool(answer) and answer[1] == "1"
+
+    async def clear(self, key: str) -> None:
+        await self._cancel_publisher(key)
+        await self._store.clear(key)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "node_id": self.node_id,
+            "store": type(self._store).__name__,
+            "publishers": len(self._publishers),
+        }
+
+    async def _drain(self, key: str, frames: AsyncIterator[Frame]) -> None:
+        try:
+            async with asyncio.timeout(self._ttl_seconds):
+                async for frame in frames:
+                    await self._store.append(key, frame)
+        except asyncio.CancelledError:
+            raise
+        except TimeoutError:
+            logger.warning("ETL run log publisher expired:key=%s", key)
+        except Exception as exc:
+            logger.error("ETL run log publisher failed:key=%s, error=%s", key, exc, exc_info=True)
+        finally:
+            if self._publishers.get(key) is asyncio.current_task():
+                del self._publishers[key]
+        await self._store.end(key)
+
+    async def _cancel_publisher(self, key: str) -> None:
+        task = self._publishers.pop(key, None)
+        if task is not None and not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    def _node_channel(self, node_id: str) -> str:
+        return f"{self._prefix}:node:{node_id}"
+
+    async def _handle_command(self, client: Any, data: Any) -> None:
+        try:
+            command = json.loads(data)
+            aborted = await self._abort_handler(command["key"], command.get("interrupt_id"))
+        except Exception as exc:
+            logger.warning("Ignore ETL run command:%r, error=%s", data, exc)
+            return
+        reply_key = command.get("reply")
+        if reply_key:
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.rpush(reply_key, "1" if aborted else "0")
+                pipe.expire(reply_key, max(1, int(self._abort_timeout_seconds * 2)))
+                await pipe.execute()
+
+    async def _listen(self) -> None:
+        if self._client_factory is None:
+            return
+        channel = self._node_channel(self.node_id)
+        while True:
+            try:
+                client = await self._client_factory()
+                pubsub = client.pubsub()
+                try:
+                    await pubsub.subscribe(channel)
+                    self._subscribed.set()
+                    async for message in pubsub.listen():
+                        if message.get("type") == "message":
+                            await self._handle_command(client, message.get("data"))
+                finally:
+                    self._subscribed.clear()
+                    with contextlib.suppress(Exception):
+                        await pubsub.unsubscribe(channel)
+                        await pubsub.aclose()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("ETL run command subscription lost:%s", exc)
+            await asyncio.sleep(self._retry_seconds)
+
+
+def _event_id(frame: Frame) -> int:
+    try:
+        return int(frame.get("id") or 0)
+    except (TypeError, ValueError):
+        return 0
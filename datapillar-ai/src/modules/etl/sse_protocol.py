@@ -6,6 +6,7 @@ ETL SSE protocol adapter(v3)
 
 Responsibilities:- Place the bottom layer SSE Events are converted to front-end protocol events(stable field)
 - Tool calls are output as independent events
+- Runs are mapped once on the owning node,the frames are shared through run_log.py
 """
 
 from __future__ import annotations
@@ -35,30 +36,6 @@ class SseRunState:
     workflow_payload: dict[str, Any] | None = None
 
 
-class RunRegistry:
-    def __init__(self, *, ttl_seconds: int = 60 * 60) -> None:
-        self._ttl_seconds = ttl_seconds
-        self._runs: dict[str, tuple[str, int]] = {}
-
-    def start_run(self, key: str) -> str:
-        run_id = f"run-{now_ms()}"
-        self._runs[key] = (run_id, now_ms())
-        return run_id
-
-    def get_run(self, key: str) -> str | None:
-        data = self._runs.get(key)
-        if not data:
-            return None
-        run_id, created_at = data
-        if now_ms() - created_at > self._ttl_seconds * 1000:
-            self._runs.pop(key, None)
-            return None
-        return run_id
-
-    def finish_run(self, key: str) -> None:
-        self._runs.pop(key, None)
-
-
 def _parse_event_id(raw_id: Any) -> int:
     if raw_id is None:
         return 0
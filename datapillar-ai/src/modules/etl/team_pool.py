@@ -0,0 +1,214 @@
+# @author Sunny
+# @date 2026-02-26
+
+"""
+ETL team pool
+
+One compiled Datapillar team is shared by every session of the same
+(tenant, model, config version). Session state lives in the checkpointer keyed
+by SessionKey, so a team holds no per-session data that would need isolation.
+
+Responsibilities:
+- Pool compiled teams with LRU and idle eviction
+- Bind sessions to their model (a session may not switch model)
+- Rebuild a team transparently when a bound session outlives its pooled team
+- Bound sessions reuse their pooled team without any MySQL lookup
+- Close evicted teams (flushes their token usage ledger) and every team on shutdown
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from datapillar_oneagentic import Datapillar
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_TEAMS = 64
+DEFAULT_IDLE_TTL_SECONDS = 1800.0
+DEFAULT_MAX_SESSIONS = 100_000
+
+
+@dataclass(frozen=True, slots=True)
+class TeamPoolKey:
+    tenant_id: int
+    ai_model_id: int
+    provider_model_id: str
+    config_version: str
+
+
+@dataclass(frozen=True, slots=True)
+class SessionBinding:
+    """Model a session is bound to, and the pool entry that last served it."""
+
+    model: tuple[int, str]
+    pool_key: TeamPoolKey
+
+
+@dataclass(slots=True)
+class _PooledTeam:
+    team: Datapillar
+    last_used: float
+
+
+class EtlTeamPool:
+    """LRU + idle-evicting pool of compiled ETL teams, plus session→model bindings."""
+
+    def __init__(
+        self,
+        *,
+        max_teams: int = DEFAULT_MAX_TEAMS,
+        idle_ttl_seconds: float | None = DEFAULT_IDLE_TTL_SECONDS,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        clock: Callable[[], float] = time.monotonic,
+        loop: asyncio.AbstractEventLoop | None = None,
+    ) -> None:
+        self._max_teams = max_teams
+        self._idle_ttl_seconds = idle_ttl_seconds
+        self._max_sessions = max_sessions
+        self._clock = clock
+        # Evictions may happen on worker threads; team.close() is scheduled on this loop.
+        self._loop = loop or _running_loop()
+        self._teams: OrderedDict[TeamPoolKey, _PooledTeam] = OrderedDict()
+        self._sessions: OrderedDict[str, SessionBinding] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    # ==================== Teams ====================
+
+    def get(self, key: TeamPoolKey) -> Datapillar | None:
+        """Return the pooled team for key (None if absent or evicted)."""
+        with self._lock:
+            return self._touch(key)
+
+    def get_or_create(self, key: TeamPoolKey, build: Callable[[], Datapillar]) -> Datapillar:
+        """Return the pooled team for key, building it on a miss."""
+        with self._lock:
+            team = self._touch(key)
+            if team is not None:
+                return team
+
+        # Build outside the lock: compiling a team is slow and must not block other tenants.
+        team = build()
+
+        with self._lock:
+            pooled = self._teams.get(key)
+            if pooled is not None:
+                # Another request built the same team concurrently; keep the first one.
+                pooled.last_used = self._clock()
+                self._teams.move_to_end(key)
+                return pooled.team
+            self._teams[key] = _PooledTeam(team=team, last_used=self._clock())
+            while len(self._teams) > self._max_teams:
+                evicted_key, evicted = self._teams.popitem(last=False)
+                self._evictions += 1
+                self._retire(evicted_key, evicted.team)
+                logger.info("ETL team evicted (LRU): %s", evicted_key)
+        return team
+
+    def _touch(self, key: TeamPoolKey) -> Datapillar | None:
+        self._evict_idle()
+        pooled = self._teams.get(key)
+        if pooled is None:
+            self._misses += 1
+            return None
+        pooled.last_used = self._clock()
+        self._teams.move_to_end(key)
+        self._hits += 1
+        return pooled.team
+
+    def evict_idle(self) -> int:
+        """Drop teams idle for longer than idle_ttl_seconds; returns the number dropped."""
+        with self._lock:
+            return self._evict_idle()
+
+    def _evict_idle(self) -> int:
+        if self._idle_ttl_seconds is None:
+            return 0
+        deadline = self._clock() - self._idle_ttl_seconds
+        evicted = 0
+        # Ordered by last use, so idle teams are at the front.
+        while self._teams:
+            key, pooled = next(iter(self._teams.items()))
+            if pooled.last_used > deadline:
+                break
+            self._teams.popitem(last=False)
+            self._retire(key, pooled.team)
+            evicted += 1
+            logger.info("ETL team evicted (idle): %s", key)
+        self._evictions += evicted
+        return evicted
+
+    def _retire(self, key: TeamPoolKey, team: Datapillar) -> None:
+        close = getattr(team, "close", None)
+        if close is None or self._loop is None or self._loop.is_closed():
+            return
+        future = asyncio.run_coroutine_threadsafe(close(), self._loop)
+        future.add_done_callback(lambda done: _log_close_error(key, done))
+
+    async def aclose(self) -> None:
+        """Close every pooled team and empty the pool (shutdown)."""
+        with self._lock:
+            teams = list(self._teams.items())
+            self._teams.clear()
+            self._sessions.clear()
+        for key, pooled in teams:
+            close = getattr(pooled.team, "close", None)
+            if close is None:
+                continue
+            try:
+                await close()
+            except Exception as exc:
+                logger.warning("ETL team close failed: %s: %s", key, exc)
+
+    # ==================== Session bindings ====================
+
+    def get_binding(self, storage_key: str) -> SessionBinding | None:
+        with self._lock:
+            binding = self._sessions.get(storage_key)
+            if binding is not None:
+                self._sessions.move_to_end(storage_key)
+            return binding
+
+    def bind_session(self, storage_key: str, binding: SessionBinding) -> None:
+        with self._lock:
+            self._sessions[storage_key] = binding
+            self._sessions.move_to_end(storage_key)
+            while len(self._sessions) > self._max_sessions:
+                self._sessions.popitem(last=False)
+
+    def unbind_session(self, storage_key: str) -> None:
+        with self._lock:
+            self._sessions.pop(storage_key, None)
+
+    # ==================== Stats ====================
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "teams": len(self._teams),
+                "sessions": len(self._sessions),
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _log_close_error(key: TeamPoolKey, future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.warning("ETL team close failed: %s: %s", key, future.exception())
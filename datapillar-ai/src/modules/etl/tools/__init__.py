@@ -10,6 +10,8 @@ Module structure:- node.py:Knowledge navigation tools(get_knowledge_navigation)
 - component.py:Component tools(list_component)
 - recommend.py:Recommended boot tools(recommend_guidance)
 - doc.py:Document Pointer Tool(resolve_doc_pointer)
+- output.py:compact tool output(tables,field projection,token budget)
+- cache.py:per-session tool result cache(@cached_tool)
 
 Tool usage AI project side @etl_tool The decorator is registered to ToolRegistry.Knowledge Navigation Tool Pass build_knowledge_navigation_tool generate(press agent Permission filtering).Agent Referenced by tool name:tools=["search_tables","get_table_detail"]
 """
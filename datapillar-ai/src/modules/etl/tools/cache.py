@@ -0,0 +1,153 @@
+# @author Sunny
+# @date 2026-01-27
+
+"""
+Per-session ETL tool result cache
+
+Agents of one ETL session ask for the same table detail/lineage several times(analyst,
+developer and reviewer each look the tables up).Results are cached per session under
+(tool name,canonical JSON of the arguments):
+- the session is the (namespace,session_id) the team binds to the log context while it
+  streams;a call outside a session is not cached
+- error results are not cached
+- entries expire after ttl_seconds,sessions and entries per session are LRU-bounded
+- clear_session drops a session(api /session/clear)
+
+Tools opt in with @cached_tool under @etl_tool;the cache key is the function name plus
+its bound arguments(defaults applied).
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any
+
+from datapillar_oneagentic.log import get_log_context
+
+from src.modules.etl.tools.output import is_tool_error
+
+DEFAULT_TTL_SECONDS = 600.0
+DEFAULT_MAX_SESSIONS = 512
+DEFAULT_MAX_ENTRIES_PER_SESSION = 256
+
+SessionId = tuple[str, str]
+
+
+def current_tool_session() -> SessionId | None:
+    context = get_log_context()
+    namespace = context.get("namespace")
+    session_id = context.get("session_id")
+    if not namespace or not session_id:
+        return None
+    return str(namespace), str(session_id)
+
+
+class ToolResultCache:
+    """LRU of sessions,each an LRU of (tool,args) -> (result,stored_at)"""
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        max_entries_per_session: int = DEFAULT_MAX_ENTRIES_PER_SESSION,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_sessions = max_sessions
+        self._max_entries = max_entries_per_session
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._sessions: OrderedDict[SessionId, OrderedDict[tuple[str, str], tuple[str, float]]]
+        self._sessions = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "uncached": 0}
+
+    async def run(
+        self,
+        tool_name: str,
+        args: Mapping[str, Any],
+        compute: Callable[[], Awaitable[str]],
+    ) -> str:
+        session = current_tool_session()
+        if session is None:
+            with self._lock:
+                self._stats["uncached"] += 1
+            return await compute()
+
+        key = (tool_name, json.dumps(args, sort_keys=True, ensure_ascii=False, default=str))
+        cached = self._get(session, key)
+        if cached is not None:
+            return cached
+        result = await compute()
+        if not is_tool_error(result):
+            self._put(session, key, result)
+        return result
+
+    def clear_session(self, namespace: str, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop((namespace, session_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                "sessions": len(self._sessions),
+                "entries": sum(len(entries) for entries in self._sessions.values()),
+                **self._stats,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+            }
+
+    def _get(self, session: SessionId, key: tuple[str, str]) -> str | None:
+        now = self._clock()
+        with self._lock:
+            entries = self._sessions.get(session)
+            hit = entries.get(key) if entries is not None else None
+            if hit is not None and now - hit[1] < self._ttl_seconds:
+                self._sessions.move_to_end(session)
+                entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return hit[0]
+            if hit is not None:
+                del entries[key]
+            self._stats["misses"] += 1
+            return None
+
+    def _put(self, session: SessionId, key: tuple[str, str], result: str) -> None:
+        with self._lock:
+            entries = self._sessions.get(session)
+            if entries is None:
+                entries = self._sessions[session] = OrderedDict()
+                while len(self._sessions) > self._max_sessions:
+                    self._sessions.popitem(last=False)
+            self._sessions.move_to_end(session)
+            entries[key] = (result, self._clock())
+            entries.move_to_end(key)
+            while len(entries) > self._max_entries:
+                entries.popitem(last=False)
+
+
+tool_result_cache = ToolResultCache()
+
+
+def cached_tool(func: Callable[..., Awaitable[str]]) -> Callable[..., Awaitable[str]]:
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    async def _wrapper(*args: Any, **kwargs: Any) -> str:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return await tool_result_cache.run(
+            func.__name__, bound.arguments, lambda: func(*args, **kwargs)
+        )
+
+    return _wrapper
@@ -7,17 +7,22 @@ Component tools
 Tool list:- list_component:Get a list of all enterprise-supported big data components
 """
 
+import asyncio
 import json
 import logging
 
 from pydantic import BaseModel
 
 from src.infrastructure.repository import Component
+from src.modules.etl.tools.cache import cached_tool
+from src.modules.etl.tools.output import encode_tool_result, tool_error
 from src.modules.etl.tools.registry import etl_tool
 from src.shared.context import get_current_tenant_id
 
 logger = logging.getLogger(__name__)
 
+_COMPONENT_FIELDS = ("id", "code", "name", "type", "description", "config_schema")
+
 
 class ListComponentInput(BaseModel):
     """Get the parameters of the component list(no parameters)"""
@@ -29,7 +34,8 @@ class ListComponentInput(BaseModel):
     desc="List available components",
     args_schema=ListComponentInput,
 )
-def list_component() -> str:
+@cached_tool
+async def list_component() -> str:
     """
     Get a list of all enterprise-supported big data components
 
@@ -40,30 +46,20 @@ def list_component() -> str:
     - description:Component description
     - config_schema:Configuration template
 
+    Output:{"total":n,"components":{"fields":[...above...],"rows":[[...],...]},"hint":"..."}
+
     Input example(JSON):- {}
     """
     logger.info("list_component()")
     tenant_id = get_current_tenant_id()
     if tenant_id is None:
-        return json.dumps(
-            {
-                "error": "Missing tenant context",
-                "components": [],
-            },
-            ensure_ascii=False,
-        )
+        return tool_error("Missing tenant context")
 
     try:
-        results = Component.list_active(tenant_id=tenant_id)
+        results = await asyncio.to_thread(Component.list_active, tenant_id=tenant_id)
 
         if not results:
-            return json.dumps(
-                {
-                    "error": "No available components found",
-                    "components": [],
-                },
-                ensure_ascii=False,
-            )
+            return tool_error("No available components found")
 
         components = []
         for row in results:
@@ -88,24 +84,18 @@ def list_component() -> str:
                 }
             )
 
-        return json.dumps(
+        return encode_tool_result(
             {
                 "total": len(components),
                 "components": components,
                 "hint": "design Job time,type Fill in components code,type_id Fill in components id",
             },
-            ensure_ascii=False,
+            tables={"components": _COMPONENT_FIELDS},
         )
 
     except Exception as e:
         logger.error(f"list_component Execution failed:{e}", exc_info=True)
-        return json.dumps(
-            {
-                "error": "Query failed",
-                "components": [],
-            },
-            ensure_ascii=False,
-        )
+        return tool_error("Query failed")
 
 
 COMPONENT_TOOLS = [
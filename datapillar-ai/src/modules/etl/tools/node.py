@@ -7,12 +7,13 @@ Knowledge navigation tools
 Provide data warehouse knowledge navigation（summary + Type tool list）
 """
 
-import json
+import asyncio
 import logging
 
 from pydantic import BaseModel
 
 from src.infrastructure.repository.knowledge import Neo4jNodeSearch
+from src.modules.etl.tools.output import encode_tool_result, tool_error
 from src.modules.etl.tools.registry import REGISTRY, etl_tool
 
 logger = logging.getLogger(__name__)
@@ -33,14 +34,7 @@ class KnowledgeNavigationInput(BaseModel):
     """Get the parameters of data warehouse knowledge navigation（no parameters）"""
 
 
-def _tool_error(message: str) -> str:
-    """Constructor error response"""
-    return json.dumps({"error": message}, ensure_ascii=False)
-
-
-def _tool_success(data: dict) -> str:
-    """Constructor responds successfully"""
-    return json.dumps(data, ensure_ascii=False)
+_NAV_TOOL_FIELDS = ("name", "desc")
 
 
 def _build_nav_types() -> list[dict[str, object]]:
@@ -64,24 +58,26 @@ def build_knowledge_navigation_tool(allowed_tools: list[str]):
         desc="Data warehouse knowledge navigation",
         args_schema=KnowledgeNavigationInput,
     )
-    def get_knowledge_navigation() -> str:
+    # Not session-cached:every agent builds its own tool with its own allowed tools.
+    async def get_knowledge_navigation() -> str:
         """
         Get data warehouse knowledge navigation（summary + Type tool list）
 
         Return fields：
         - summary: Total number of assets of each type
         - navigation: Type hierarchy and list of available tools（Not bound to specific objects）
+        - tool_fields: field names of each navigation tools row（["name","desc"]）
         """
         logger.info("get_knowledge_navigation()")
 
-        summary = Neo4jNodeSearch.get_knowledge_navigation()
+        summary = await asyncio.to_thread(Neo4jNodeSearch.get_knowledge_navigation)
         if summary is None:
-            return _tool_error("Failed to obtain data warehouse knowledge navigation")
+            return tool_error("Failed to obtain data warehouse knowledge navigation")
 
         navigation = []
         for item in _build_nav_types():
             tools = [
-                {"name": tool.name, "desc": tool.desc}
+                [tool.name, tool.desc]
                 for tool in REGISTRY.list_by_type(item["type"])
                 if tool.name in allowed_set
             ]
@@ -93,7 +89,9 @@ def build_knowledge_navigation_tool(allowed_tools: list[str]):
                 }
             )
 
-        return _tool_success({"summary": summary, "navigation": navigation})
+        return encode_tool_result(
+            {"summary": summary, "tool_fields": list(_NAV_TOOL_FIELDS), "navigation": navigation}
+        )
 
     return get_knowledge_navigation
 
@@ -0,0 +1,110 @@
+# @author Sunny
+# @date 2026-01-27
+
+"""
+ETL tool output encoding
+
+Tool results are the largest share of prompt tokens in an ETL session,so every tool
+answers through encode_tool_result:
+- compact JSON(no whitespace,non-ASCII kept as is)
+- list sections become tables:{"fields":[...],"rows":[[...],...]},field names are sent
+  once instead of once per row(projection:only the listed fields are kept)
+- long strings in table cells are cut at MAX_CELL_CHARS(top-level values,e.g. SQL text,
+  are sent whole)
+- a per-call token budget:when the result is over it,rows are dropped round-robin over
+  the tables until it fits,and "truncated":{table:total_rows} tells the agent to narrow
+  the query(smaller limit,more specific keyword)
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from src.shared.utils.tokens import estimate_tokens
+
+DEFAULT_TOOL_TOKEN_BUDGET = 2000
+MAX_CELL_CHARS = 400
+
+_ERROR_PREFIX = '{"error":'
+
+
+def _dumps(data: Any) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _cell(value: Any) -> Any:
+    if isinstance(value, str) and len(value) > MAX_CELL_CHARS:
+        return value[:MAX_CELL_CHARS] + "..."
+    if isinstance(value, float):
+        return round(value, 4)
+    return value
+
+
+def tool_error(message: str) -> str:
+    return _dumps({"error": message})
+
+
+def is_tool_error(text: str) -> bool:
+    return text.startswith(_ERROR_PREFIX)
+
+
+def project(items: Sequence[Mapping[str, Any]], fields: Sequence[str]) -> list[list[Any]]:
+    """Rows of the given fields(missing field:null)"""
+    return [[_cell(item.get(name)) for name in fields] for item in items]
+
+
+def encode_tool_result(
+    data: Mapping[str, Any],
+    *,
+    tables: Mapping[str, Sequence[str]] | None = None,
+    budget: int = DEFAULT_TOOL_TOKEN_BUDGET,
+) -> str:
+    """
+    Encode a successful tool result
+
+    tables:{key:fields} for every list of dicts in data that is sent as a table;the
+    table order is also the order rows are kept in when the budget is tight.
+    """
+    tables = tables or {}
+    payload: dict[str, Any] = {}
+    rows: dict[str, list[list[Any]]] = {}
+    for key, value in data.items():
+        if key in tables:
+            rows[key] = project(value or [], tables[key])
+            payload[key] = {"fields": list(tables[key]), "rows": rows[key]}
+        else:
+            payload[key] = value
+
+    text = _dumps(payload)
+    if estimate_tokens(text) <= budget or not any(rows.values()):
+        return text
+
+    # Keep rows round-robin over the tables while the estimate stays under the budget.
+    for key in rows:
+        payload[key] = {"fields": list(tables[key]), "rows": []}
+    payload["truncated"] = {key: len(table_rows) for key, table_rows in rows.items()}
+    used = estimate_tokens(_dumps(payload))
+    kept: dict[str, int] = dict.fromkeys(rows, 0)
+    open_tables = [key for key, table_rows in rows.items() if table_rows]
+    while open_tables:
+        for key in list(open_tables):
+            row = rows[key][kept[key]]
+            cost = estimate_tokens(_dumps(row)) + 1
+            if used + cost > budget:
+                open_tables.remove(key)
+                continue
+            payload[key]["rows"].append(row)
+            used += cost
+            kept[key] += 1
+            if kept[key] == len(rows[key]):
+                open_tables.remove(key)
+    truncated = {
+        key: len(table_rows) for key, table_rows in rows.items() if kept[key] < len(table_rows)
+    }
+    if truncated:
+        payload["truncated"] = truncated
+    else:
+        del payload["truncated"]
+    return _dumps(payload)
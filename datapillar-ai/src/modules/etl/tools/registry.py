@@ -7,6 +7,9 @@ Tool Registration Management Center（AI Project side）
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import inspect
 from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Any
@@ -55,6 +58,16 @@ class ToolRegistry:
 REGISTRY = ToolRegistry()
 
 
+def _sync_bridge(coroutine: Callable) -> Callable:
+    """Sync entry of an async tool(tool.invoke in scripts/tests);agents use ainvoke"""
+
+    @functools.wraps(coroutine)
+    def _run(*args: Any, **kwargs: Any) -> Any:
+        return asyncio.run(coroutine(*args, **kwargs))
+
+    return _run
+
+
 def etl_tool(
     name_or_func: str | Callable | None = None,
     *,
@@ -73,6 +86,8 @@ def etl_tool(
             return_direct=return_direct,
             infer_schema=infer_schema,
         )(func)
+        if inspect.iscoroutinefunction(func):
+            tool_instance.func = _sync_bridge(func)
         REGISTRY.register(tool_instance.name, tool_type, desc)
         return tool_instance
 
@@ -11,14 +11,20 @@ Tool layered design:- list:List query(list_catalogs,list_schemas,list_tables),De
 design principles:- Use the full path when entering parameters in the details tool(path),Such as "catalog.schema.table"
 - All tool output parameters always contain complete path information.(catalog,schema,table)
 - Search tool returns candidate list,Each candidate with full path
+
+Output:compact JSON(tools/output.py),lists are tables {"fields":[...],"rows":[[...]]}
+cut to the per-call token budget;results are cached per ETL session(tools/cache.py).
+Neo4j calls run in a worker thread(asyncio.to_thread),hybrid search is natively async.
 """
 
-import json
+import asyncio
 import logging
 
 from pydantic import BaseModel, Field
 
 from src.infrastructure.repository.knowledge import Neo4jColumnSearch, Neo4jTableSearch
+from src.modules.etl.tools.cache import cached_tool
+from src.modules.etl.tools.output import encode_tool_result, tool_error
 from src.modules.etl.tools.registry import etl_tool
 from src.shared.context import get_current_tenant_id, get_current_user_id
 
@@ -78,6 +84,12 @@ class GetTableLineageInput(BaseModel):
         default="both",
         description="bloodline direction:upstream(upstream),downstream(downstream),both(Two-way)",
     )
+    depth: int = Field(
+        default=1,
+        ge=1,
+        le=10,
+        description="Number of hops to follow,Default 1(direct upstream/downstream only)",
+    )
 
 
 class GetLineageSqlInput(BaseModel):
@@ -96,14 +108,14 @@ class GetLineageSqlInput(BaseModel):
 # ==================== Internal helper function ====================
 
 
-def _tool_error(message: str) -> str:
-    """Constructor error response"""
-    return json.dumps({"error": message}, ensure_ascii=False)
-
-
-def _tool_success(data: dict) -> str:
-    """Constructor responds successfully"""
-    return json.dumps(data, ensure_ascii=False)
+# Projected fields of each table section
+_CATALOG_FIELDS = ("name", "description")
+_SCHEMA_FIELDS = ("path", "description")
+_TABLE_FIELDS = ("path", "description")
+_SEARCH_TABLE_FIELDS = ("path", "description", "score")
+_SEARCH_COLUMN_FIELDS = ("path", "dataType", "description", "score")
+_COLUMN_FIELDS = ("name", "dataType", "description", "nullable", "valueDomain")
+_EDGE_FIELDS = ("source_table", "target_table", "sql_id")
 
 
 def _resolve_scope() -> tuple[int | None, int | None]:
@@ -136,33 +148,40 @@ def _parse_table_path(path: str) -> tuple[str, str, str] | None:
 @etl_tool(
     "list_catalogs", tool_type="Catalog", desc="list directory", args_schema=ListCatalogsInput
 )
-def list_catalogs(limit: int = 5) -> str:
+@cached_tool
+async def list_catalogs(limit: int = 5) -> str:
     """
     list Catalog list
 
     ⚠️ important:By default,only the previous 5 a(Collapse display),not all!- To see more,Please pass in a larger limit parameters(maximum 100)
 
     Output example:{
-    "catalogs":[{"name":"hive_prod","description":"production environment Hive"},{"name":"mysql_prod","description":"production environment MySQL"}],"count":2
+    "catalogs":{"fields":["name","description"],"rows":[["hive_prod","production environment Hive"],["mysql_prod","production environment MySQL"]]},"count":2
     }
     """
     logger.info(f"list_catalogs(limit={limit})")
     tenant_id, _ = _resolve_scope()
     if tenant_id is None:
-        return _tool_error("Missing tenant context")
+        return tool_error("Missing tenant context")
 
     try:
-        catalogs = Neo4jTableSearch.list_catalogs(limit=limit, tenant_id=tenant_id)
-        return _tool_success({"catalogs": catalogs, "count": len(catalogs)})
+        catalogs = await asyncio.to_thread(
+            Neo4jTableSearch.list_catalogs, limit=limit, tenant_id=tenant_id
+        )
+        return encode_tool_result(
+            {"catalogs": catalogs, "count": len(catalogs)},
+            tables={"catalogs": _CATALOG_FIELDS},
+        )
     except Exception as e:
         logger.error(f"list_catalogs Execution failed:{e}", exc_info=True)
-        return _tool_error("Query failed")
+        return tool_error("Query failed")
 
 
 @etl_tool(
     "list_schemas", tool_type="Schema", desc="List directory schema", args_schema=ListSchemasInput
 )
-def list_schemas(catalog: str, limit: int = 5) -> str:
+@cached_tool
+async def list_schemas(catalog: str, limit: int = 5) -> str:
     """
     list specified Catalog down Schema list
 
@@ -171,43 +190,47 @@ def list_schemas(catalog: str, limit: int = 5) -> str:
     Input example:{"catalog":"hive_prod"}
 
     Output example:{
-    "catalog":"hive_prod","schemas":[{"name":"ods","path":"hive_prod.ods","description":"raw data layer"},{"name":"dwd","path":"hive_prod.dwd","description":"Detailed data layer"}],"count":2
+    "catalog":"hive_prod","schemas":{"fields":["path","description"],"rows":[["hive_prod.ods","raw data layer"],["hive_prod.dwd","Detailed data layer"]]},"count":2
     }
     """
     logger.info(f"list_schemas(catalog='{catalog}', limit={limit})")
 
     if not (isinstance(catalog, str) and catalog.strip()):
-        return _tool_error("catalog cannot be empty")
+        return tool_error("catalog cannot be empty")
 
     catalog = catalog.strip()
     tenant_id, _ = _resolve_scope()
     if tenant_id is None:
-        return _tool_error("Missing tenant context")
+        return tool_error("Missing tenant context")
 
     try:
-        schemas = Neo4jTableSearch.list_schemas(catalog=catalog, limit=limit, tenant_id=tenant_id)
+        schemas = await asyncio.to_thread(
+            Neo4jTableSearch.list_schemas, catalog=catalog, limit=limit, tenant_id=tenant_id
+        )
         if not schemas:
-            return _tool_error("not found any Schema")
+            return tool_error("not found any Schema")
 
         # add full path
         for s in schemas:
             s["path"] = f"{catalog}.{s['name']}"
             s["catalog"] = catalog
 
-        return _tool_success(
+        return encode_tool_result(
             {
                 "catalog": catalog,
                 "schemas": schemas,
                 "count": len(schemas),
-            }
+            },
+            tables={"schemas": _SCHEMA_FIELDS},
         )
     except Exception as e:
         logger.error(f"list_schemas Execution failed:{e}", exc_info=True)
-        return _tool_error("Query failed")
+        return tool_error("Query failed")
 
 
 @etl_tool("list_tables", tool_type="Table", desc="list table", args_schema=ListTablesInput)
-def list_tables(
+@cached_tool
+async def list_tables(
     catalog: str,
     schema_name: str,
     keyword: str | None = None,
@@ -222,7 +245,7 @@ def list_tables(
     Input example:{"catalog":"hive_prod","schema_name":"ods"}
 
     Output example:{
-    "catalog":"hive_prod","schema":"ods","tables":[{"name":"t_order","path":"hive_prod.ods.t_order","description":"order form"},{"name":"t_user","path":"hive_prod.ods.t_user","description":"User table"}],"count":2
+    "catalog":"hive_prod","schema":"ods","tables":{"fields":["path","description"],"rows":[["hive_prod.ods.t_order","order form"],["hive_prod.ods.t_user","User table"]]},"count":2
     }
     """
     logger.info(
@@ -230,18 +253,19 @@ def list_tables(
     )
 
     if not (isinstance(catalog, str) and catalog.strip()):
-        return _tool_error("catalog cannot be empty")
+        return tool_error("catalog cannot be empty")
     if not (isinstance(schema_name, str) and schema_name.strip()):
-        return _tool_error("schema_name cannot be empty")
+        return tool_error("schema_name cannot be empty")
 
     catalog = catalog.strip()
     schema_name = schema_name.strip()
     tenant_id, _ = _resolve_scope()
     if tenant_id is None:
-        return _tool_error("Missing tenant context")
+        return tool_error("Missing tenant context")
 
     try:
-        tables = Neo4jTableSearch.list_tables(
+        tables = await asyncio.to_thread(
+            Neo4jTableSearch.list_tables,
             catalog=catalog,
             schema=schema_name,
             keyword=keyword,
@@ -252,7 +276,7 @@ def list_tables(
             hint = f"{catalog}.{schema_name}"
             if keyword and str(keyword).strip():
                 hint = f"{hint} (keyword={keyword})"
-            return _tool_error("No table found")
+            return tool_error("No table found")
 
         # add full path
         for t in tables:
@@ -260,17 +284,18 @@ def list_tables(
             t["catalog"] = catalog
             t["schema"] = schema_name
 
-        return _tool_success(
+        return encode_tool_result(
             {
                 "catalog": catalog,
                 "schema": schema_name,
                 "tables": tables,
                 "count": len(tables),
-            }
+            },
+            tables={"tables": _TABLE_FIELDS},
         )
     except Exception as e:
         logger.error(f"list_tables Execution failed:{e}", exc_info=True)
-        return _tool_error("Query failed")
+        return tool_error("Query failed")
 
 
 # ==================== Search Tools(Semantic search) ====================
@@ -279,7 +304,8 @@ def list_tables(
 @etl_tool(
     "search_tables", tool_type="Table", desc="Semantic search table", args_schema=SearchTablesInput
 )
-def search_tables(query: str, top_k: int = 10) -> str:
+@cached_tool
+async def search_tables(query: str, top_k: int = 10) -> str:
     """
     search table(Semantic search)
 
@@ -292,22 +318,20 @@ def search_tables(query: str, top_k: int = 10) -> str:
     Input example:{"query":"Order"}
 
     Output example:{
-    "query":"Order","tables":[{
-    "path":"hive_prod.ods.t_order","catalog":"hive_prod","schema":"ods","table":"t_order","description":"Order master table","score":0.95
-    }],"count":1
+    "query":"Order","tables":{"fields":["path","description","score"],"rows":[["hive_prod.ods.t_order","Order master table",0.95]]},"count":1
     }
     """
     logger.info(f"search_tables(query='{query}', top_k={top_k})")
 
     if not (isinstance(query, str) and query.strip()):
-        return _tool_error("query cannot be empty")
+        return tool_error("query cannot be empty")
     tenant_id, user_id = _resolve_scope()
     if tenant_id is None:
-        return _tool_error("Missing tenant context")
+        return tool_error("Missing tenant context")
 
     try:
         # Use vector search
-        results = Neo4jTableSearch.search_tables(
+        results = await Neo4jTableSearch.asearch_tables(
             query=query.strip(),
             top_k=top_k,
             tenant_id=tenant_id,
@@ -332,16 +356,17 @@ def search_tables(query: str, top_k: int = 10) -> str:
                         }
                     )
 
-        return _tool_success(
+        return encode_tool_result(
             {
                 "query": query.strip(),
                 "tables": tables,
                 "count": len(tables),
-            }
+            },
+            tables={"tables": _SEARCH_TABLE_FIELDS},
         )
     except Exception as e:
         logger.error(f"search_tables Execution failed:{e}", exc_info=True)
-        return _tool_error("Query failed")
+        return tool_error("Query failed")
 
 
 @etl_tool(
@@ -350,7 +375,8 @@ def search_tables(query: str, top_k: int = 10) -> str:
     desc="Semantic search fields",
     args_schema=SearchColumnsInput,
 )
-def search_columns(query: str, top_k: int = 10) -> str:
+@cached_tool
+async def search_columns(query: str, top_k: int = 10) -> str:
     """
     search column(Semantic search)
 
@@ -361,22 +387,20 @@ def search_columns(query: str, top_k: int = 10) -> str:
     Input example:{"query":"Order status"}
 
     Output example:{
-    "query":"Order status","columns":[{
-    "path":"hive_prod.ods.t_order.order_status","catalog":"hive_prod","schema":"ods","table":"t_order","column":"order_status","dataType":"varchar","description":"Order status","score":0.92
-    }],"count":1
+    "query":"Order status","columns":{"fields":["path","dataType","description","score"],"rows":[["hive_prod.ods.t_order.order_status","varchar","Order status",0.92]]},"count":1
     }
     """
     logger.info(f"search_columns(query='{query}', top_k={top_k})")
 
     if not (isinstance(query, str) and query.strip()):
-        return _tool_error("query cannot be empty")
+        return tool_error("query cannot be empty")
     tenant_id, user_id = _resolve_scope()
     if tenant_id is None:
-        return _tool_error("Missing tenant context")
+        return tool_error("Missing tenant context")
 
     try:
         # Use vector search
-        results = Neo4jColumnSearch.search_columns(
+        results = await Neo4jColumnSearch.asearch_columns(
             query=query.strip(),
             top_k=top_k,
             tenant_id=tenant_id,
@@ -403,16 +427,17 @@ def search_columns(query: str, top_k: int = 10) -> str:
                         }
                     )
 
-        return _tool_success(
+        return encode_tool_result(
             {
                 "query": query.strip(),
                 "columns": columns,
                 "count": len(columns),
-            }
+            },
+            tables={"columns": _SEARCH_COLUMN_FIELDS},
         )
     except Exception as e:
         logger.error(f"search_columns Execution failed:{e}", exc_info=True)
-        return _tool_error("Query failed")
+        return tool_error("Query failed")
 
 
 # ==================== Detail Tools(third floor) ====================
@@ -424,7 +449,8 @@ def search_columns(query: str, top_k: int = 10) -> str:
     desc="Get table details(Field/Description)",
     args_schema=GetTableDetailInput,
 )
-def get_table_detail(path: str) -> str:
+@cached_tool
+async def get_table_detail(path: str) -> str:
     """
     Get table details(Contains columns and ranges)
 
@@ -436,23 +462,24 @@ def get_table_detail(path: str) -> str:
 
     Input example:{"path":"hive_prod.ods.t_order"}
 
-    Output example:{
-    "path":"hive_prod.ods.t_order","catalog":"hive_prod","schema":"ods","table":"t_order","description":"Order master table","columns":[{"name":"order_id","dataType":"bigint","description":"OrderID"},{"name":"order_status","dataType":"varchar","description":"Order status"}]
+    Output example(valueDomain:{code,name,type,items} or null):{
+    "path":"hive_prod.ods.t_order","catalog":"hive_prod","schema":"ods","table":"t_order","description":"Order master table","columns":{"fields":["name","dataType","description","nullable","valueDomain"],"rows":[["order_id","bigint","OrderID",false,null],["order_status","varchar","Order status",true,{"code":"ORDER_STATUS","type":"ENUM","items":"1:paid,2:shipped"}]]}
     }
     """
     logger.info(f"get_table_detail(path='{path}')")
 
     parsed = _parse_table_path(path)
     if not parsed:
-        return _tool_error("Path format error,should be catalog.schema.table")
+        return tool_error("Path format error,should be catalog.schema.table")
 
     catalog, schema, table = parsed
     tenant_id, user_id = _resolve_scope()
     if tenant_id is None:
-        return _tool_error("Missing tenant context")
+        return tool_error("Missing tenant context")
 
     try:
-        detail = Neo4jTableSearch.get_table_detail(
+        detail = await asyncio.to_thread(
+            Neo4jTableSearch.get_table_detail,
             catalog,
             schema,
             table,
@@ -461,9 +488,9 @@ def get_table_detail(path: str) -> str:
         )
 
         if not detail:
-            return _tool_error("table not found")
+            return tool_error("table not found")
 
-        return _tool_success(
+        return encode_tool_result(
             {
                 "path": path,
                 "catalog": catalog,
@@ -471,12 +498,13 @@ def get_table_detail(path: str) -> str:
                 "table": table,
                 "description": detail.get("description") or "",
                 "columns": detail.get("columns") or [],
-            }
+            },
+            tables={"columns": _COLUMN_FIELDS},
         )
 
     except Exception as e:
         logger.error(f"get_table_detail Execution failed:{e}", exc_info=True)
-        return _tool_error("Query failed")
+        return tool_error("Query failed")
 
 
 @etl_tool(
@@ -485,62 +513,68 @@ def get_table_detail(path: str) -> str:
     desc="Get table ancestry",
     args_schema=GetTableLineageInput,
 )
-def get_table_lineage(path: str, direction: str = "both") -> str:
+@cached_tool
+async def get_table_lineage(path: str, direction: str = "both", depth: int = 1) -> str:
     """
     Get table blood relationship
 
     Usage scenarios:- User asked"What is the upstream of this table?","Where does the data come from?" → direction="upstream"
     - User asked"What is downstream of this table?","Where does the data flow?" → direction="downstream"
     - User asked"blood relationship" → direction="both"
+    - User asked"What is affected if this table changes?" → direction="downstream",depth=3
 
     ⚠️ path format:Must be full path catalog.schema.table
     ⚠️ direction parameters:upstream(upstream),downstream(downstream),both(Two-way,Default)
+    ⚠️ depth parameters:hops to follow(1-10,Default 1);when depth>1 the output adds hops:{upstream:{table:hops},downstream:{table:hops}}
 
     Input example:{"path":"hive_prod.dwd.order_detail","direction":"upstream"}
 
     Output example:{
-    "path":"hive_prod.dwd.order_detail","catalog":"hive_prod","schema":"dwd","table":"order_detail","direction":"upstream","upstream":["hive_prod.ods.t_order","hive_prod.ods.t_user"],"downstream":[]
+    "path":"hive_prod.dwd.order_detail","catalog":"hive_prod","schema":"dwd","table":"order_detail","direction":"upstream","upstream":["t_order","t_user"],"downstream":[],"edges":{"fields":["source_table","target_table","sql_id"],"rows":[["t_order","order_detail","sql-1"]]}
     }
     """
-    logger.info(f"get_table_lineage(path='{path}', direction='{direction}')")
+    logger.info(f"get_table_lineage(path='{path}', direction='{direction}', depth={depth})")
 
     parsed = _parse_table_path(path)
     if not parsed:
-        return _tool_error("Path format error,should be catalog.schema.table")
+        return tool_error("Path format error,should be catalog.schema.table")
 
     catalog, schema, table = parsed
     tenant_id, user_id = _resolve_scope()
     if tenant_id is None:
-        return _tool_error("Missing tenant context")
+        return tool_error("Missing tenant context")
 
     try:
-        lineage = Neo4jTableSearch.get_table_lineage(
+        lineage = await asyncio.to_thread(
+            Neo4jTableSearch.get_table_lineage,
             schema,
             table,
             direction,
             tenant_id=tenant_id,
             user_id=user_id,
+            max_depth=depth,
         )
 
         if not lineage.get("upstream") and not lineage.get("downstream"):
-            return _tool_error("No blood relationship found for table")
-
-        return _tool_success(
-            {
-                "path": path,
-                "catalog": catalog,
-                "schema": schema,
-                "table": table,
-                "direction": direction,
-                "upstream": lineage.get("upstream") or [],
-                "downstream": lineage.get("downstream") or [],
-                "edges": lineage.get("edges") or [],
-            }
-        )
+            return tool_error("No blood relationship found for table")
+
+        data = {
+            "path": path,
+            "catalog": catalog,
+            "schema": schema,
+            "table": table,
+            "direction": direction,
+            "upstream": lineage.get("upstream") or [],
+            "downstream": lineage.get("downstream") or [],
+            "edges": lineage.get("edges") or [],
+        }
+        if depth > 1:
+            data["hops"] = lineage.get("hops") or {}
+        return encode_tool_result(data, tables={"edges": _EDGE_FIELDS})
 
     except Exception as e:
         logger.error(f"get_table_lineage Execution failed:{e}", exc_info=True)
-        return _tool_error("Query failed")
+        return tool_error("Query failed")
 
 
 @etl_tool(
@@ -549,7 +583,8 @@ def get_table_lineage(path: str, direction: str = "both") -> str:
     desc="Find history based on ancestry SQL",
     args_schema=GetLineageSqlInput,
 )
-def get_lineage_sql(source_tables: list[str], target_table: str) -> str:
+@cached_tool
+async def get_lineage_sql(source_tables: list[str], target_table: str) -> str:
     """
     Accurately search history based on blood relationships SQL
 
@@ -572,7 +607,7 @@ def get_lineage_sql(source_tables: list[str], target_table: str) -> str:
     # Verify target table path
     target_parsed = _parse_table_path(target_table)
     if not target_parsed:
-        return _tool_error("Target table path format is wrong,should be catalog.schema.table")
+        return tool_error("Target table path format is wrong,should be catalog.schema.table")
 
     # Extract schema.table Format(Neo4j Query usage)
     source_schema_tables = []
@@ -583,16 +618,17 @@ def get_lineage_sql(source_tables: list[str], target_table: str) -> str:
             source_schema_tables.append(f"{schema}.{table}")
 
     if not source_schema_tables:
-        return _tool_error("Source table path list is empty or malformed")
+        return tool_error("Source table path list is empty or malformed")
 
     _target_catalog, target_schema, target_table_name = target_parsed
     target_schema_table = f"{target_schema}.{target_table_name}"
     tenant_id, user_id = _resolve_scope()
     if tenant_id is None:
-        return _tool_error("Missing tenant context")
+        return tool_error("Missing tenant context")
 
     try:
-        result = Neo4jTableSearch.find_lineage_sql(
+        result = await asyncio.to_thread(
+            Neo4jTableSearch.find_lineage_sql,
             source_schema_tables,
             target_schema_table,
             tenant_id=tenant_id,
@@ -600,9 +636,9 @@ def get_lineage_sql(source_tables: list[str], target_table: str) -> str:
         )
 
         if not result:
-            return _tool_error("No bloodline found SQL")
+            return tool_error("No bloodline found SQL")
 
-        return _tool_success(
+        return encode_tool_result(
             {
                 "source_tables": source_tables,
                 "target_table": target_table,
@@ -615,7 +651,7 @@ def get_lineage_sql(source_tables: list[str], target_table: str) -> str:
 
     except Exception as e:
         logger.error(f"get_lineage_sql Execution failed:{e}", exc_info=True)
-        return _tool_error("Query failed")
+        return tool_error("Query failed")
 
 
 # ==================== Tool list ====================
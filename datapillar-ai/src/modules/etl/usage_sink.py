@@ -0,0 +1,66 @@
+# @author Sunny
+# @date 2026-01-27
+
+"""
+ETL team usage sink
+
+Persists the team usage ledger's batches to ai_llm_usage through LlmUsage.upsert_usage
+(write-behind once llm_usage_writer is started):
+- an entry is the usage delta of one (session, agent, model) since the previous flush,
+  so every entry gets its own run_id row instead of replacing an earlier one
+- ETL session ids are "<user_id>:<session_id>",the user is split back out
+- writes run off the event loop;a failure is raised so the ledger keeps the batch for retry
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import uuid
+from typing import Any
+
+from datapillar_oneagentic.providers.llm import UsageEntry, UsageSink
+
+from src.infrastructure.repository.system.ai_model import LlmUsage
+
+ETL_USAGE_MODULE = "etl"
+
+
+class EtlUsageSink(UsageSink):
+    def __init__(self, *, tenant_id: int, provider: str | None = None) -> None:
+        self._tenant_id = tenant_id
+        self._provider = provider
+
+    async def write(self, entries: list[UsageEntry]) -> None:
+        records = [self.to_record(entry) for entry in entries]
+        await asyncio.to_thread(_upsert_records, records)
+
+    def to_record(self, entry: UsageEntry) -> dict[str, Any]:
+        user_part, _, session_id = entry.session_id.partition(":")
+        if not session_id:
+            user_part, session_id = "", entry.session_id
+        totals = entry.totals
+        return {
+            "tenant_id": self._tenant_id,
+            "user_id": int(user_part) if user_part.isdigit() else None,
+            "session_id": session_id,
+            "module": ETL_USAGE_MODULE,
+            "agent_id": entry.agent_id,
+            "provider": self._provider,
+            "model_name": entry.model,
+            "run_id": uuid.uuid4().hex,
+            "parent_run_id": None,
+            "prompt_tokens": totals.input_tokens,
+            "completion_tokens": totals.output_tokens,
+            "total_tokens": totals.total_tokens,
+            "estimated": 0,
+            "prompt_cost_usd": None,
+            "completion_cost_usd": None,
+            "total_cost_usd": totals.cost,
+            "raw_usage_json": json.dumps(entry.to_dict(), ensure_ascii=False),
+        }
+
+
+def _upsert_records(records: list[dict[str, Any]]) -> None:
+    for record in records:
+        LlmUsage.upsert_usage(record=record)
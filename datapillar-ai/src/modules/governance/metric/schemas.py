@@ -6,6 +6,7 @@ indicator AI Governance data model
 """
 
 from enum import Enum
+from typing import Any
 
 from pydantic import BaseModel, Field
 
@@ -224,6 +225,8 @@ class AIFillResponse(BaseModel):
     comment: str | None = None
     measure_columns: list[str] = Field(alias="measureColumns", default_factory=list)
     filter_columns: list[str] = Field(alias="filterColumns", default_factory=list)
+    # Fill metadata：per-stage timings(ms)，context cache hit，degraded context sources
+    metadata: dict[str, Any] = Field(default_factory=dict)
 
     class Config:
         populate_by_name = True
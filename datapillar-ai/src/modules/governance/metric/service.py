@@ -8,17 +8,29 @@ Architecture:simple LLM call
 1.Get all context beforehand(table details,Recommended)
 2.once LLM call,use structured output Guaranteed output format
 3.use ainvoke Go cache
+
+Context stage:
+- semantic assets,table context,metric context and recommendations are gathered
+  concurrently(sync Neo4j lookups run in threads),each under its own timeout;a failed
+  or timed-out source falls back to its empty value instead of failing the fill
+- complete bundles are cached for a short TTL by (tenant,user,metric type,normalized
+  input,referenced table/metrics)
+- per-stage timings are returned in AIFillResponse.metadata
 """
 
+import asyncio
 import json
 import logging
 import time
-from functools import lru_cache
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
 
 from datapillar_oneagentic.messages import Message, Messages
 from datapillar_oneagentic.providers.llm import LLMProvider
 
-from src.infrastructure.llm.config import get_datapillar_config
+from src.infrastructure.llm.config import get_datapillar_config_entry
 from src.infrastructure.repository.knowledge import (
     Neo4jMetricSearch,
     Neo4jSemanticSearch,
@@ -34,11 +46,32 @@ from src.shared.config.runtime import get_default_tenant_id
 
 logger = logging.getLogger(__name__)
 
+NO_SEMANTIC_ASSETS = "No semantic assets available."
+NO_TABLE_CONTEXT = "No table information"
+NO_METRIC_CONTEXT = "No indicator information"
+
+DEFAULT_SOURCE_TIMEOUTS: dict[str, float] = {
+    "semantic_assets": 3.0,
+    "table_context": 2.0,
+    "metric_context": 2.0,
+    "recommendations": 3.0,
+}
+DEFAULT_CONTEXT_CACHE_TTL_SECONDS = 60.0
+DEFAULT_CONTEXT_CACHE_MAX_SIZE = 256
+
+
+# tenant_id -> (config revision,provider):a rebuilt tenant config gets a new provider.
+_llm_providers: dict[int, tuple[int, LLMProvider]] = {}
+
 
-@lru_cache(maxsize=128)
 def _get_llm_provider(tenant_id: int) -> LLMProvider:
-    config = get_datapillar_config(tenant_id)
-    return LLMProvider(config.llm)
+    entry = get_datapillar_config_entry(tenant_id)
+    cached = _llm_providers.get(tenant_id)
+    if cached is not None and cached[0] == entry.revision:
+        return cached[1]
+    provider = LLMProvider(entry.config.llm)
+    _llm_providers[tenant_id] = (entry.revision, provider)
+    return provider
 
 
 # ============================================================================
@@ -126,9 +159,73 @@ on failure:Return success=false and failure reasons message(Use a arrogant tone)
 # ============================================================================
 
 
+@dataclass(frozen=True)
+class ContextBundle:
+    """Context bundle fed into the fill prompt"""
+
+    semantic_assets: str = NO_SEMANTIC_ASSETS
+    table_context: str = NO_TABLE_CONTEXT
+    metric_context: str = NO_METRIC_CONTEXT
+    recommendations: tuple[dict, ...] = ()
+
+
+class ContextBundleCache:
+    """Bounded TTL cache of context key -> ContextBundle"""
+
+    def __init__(
+        self,
+        *,
+        max_size: int = DEFAULT_CONTEXT_CACHE_MAX_SIZE,
+        ttl_seconds: float = DEFAULT_CONTEXT_CACHE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_size = max(1, max_size)
+        self._ttl = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[tuple, tuple[float, ContextBundle]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> ContextBundle | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, context = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return context
+
+    def put(self, key: tuple, context: ContextBundle) -> None:
+        if self._ttl <= 0:
+            return
+        self._entries[key] = (self._clock() + self._ttl, context)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
 class MetricAIService:
     """indicator AI Governance services"""
 
+    def __init__(
+        self,
+        *,
+        source_timeouts: dict[str, float] | None = None,
+        context_cache: ContextBundleCache | None = None,
+    ) -> None:
+        self._source_timeouts = {**DEFAULT_SOURCE_TIMEOUTS, **(source_timeouts or {})}
+        self._context_cache = context_cache if context_cache is not None else ContextBundleCache()
+
     async def fill(
         self,
         request: AIFillRequest,
@@ -143,41 +240,34 @@ class MetricAIService:
         2.once LLM call(use structured output)
         3.Return results(success=false appended by program recommendations)
         """
-        total_start = time.time()
+        total_start = time.perf_counter()
+        timings: dict[str, float] = {}
 
         resolved_tenant_id = tenant_id or get_default_tenant_id()
 
         # # prohibited(If it is violated,failure will be returned directly.)
-        semantic_assets = self._search_semantic_assets(
-            request.user_input,
-            tenant_id=resolved_tenant_id,
-            user_id=user_id,
-        )
-
-        # # Available semantic assets
-        table_context = self._get_table_context(
-            request,
-            tenant_id=resolved_tenant_id,
-            user_id=user_id,
-        )
-
-        # # Basic indicator context
-        metric_context = self._get_metric_context(
-            request,
-            tenant_id=resolved_tenant_id,
-            user_id=user_id,
-        )
-
-        # # table context
-        _, recommendations_list = self._get_recommendations(
-            request,
-            tenant_id=resolved_tenant_id,
-            user_id=user_id,
-        )
+        stage_start = time.perf_counter()
+        cache_key = self._context_cache_key(request, tenant_id=resolved_tenant_id, user_id=user_id)
+        context = self._context_cache.get(cache_key)
+        context_cached = context is not None
+        degraded: list[str] = []
+        if context is None:
+            context, degraded = await self._gather_context(
+                request,
+                tenant_id=resolved_tenant_id,
+                user_id=user_id,
+                timings=timings,
+            )
+            if not degraded:
+                self._context_cache.put(cache_key, context)
+        timings["context"] = _elapsed_ms(stage_start)
 
         # # Verification process(must be strictly enforced)
         system_prompt = self._build_system_prompt(
-            request.context.metric_type, semantic_assets, table_context, metric_context
+            request.context.metric_type,
+            context.semantic_assets,
+            context.table_context,
+            context.metric_context,
         )
         user_message = self._build_user_message(request)
 
@@ -197,37 +287,142 @@ class MetricAIService:
         )
 
         # # Available semantic assets
+        stage_start = time.perf_counter()
         output: AIFillOutput = await llm.ainvoke(messages)
+        timings["llm"] = _elapsed_ms(stage_start)
+        timings["total"] = _elapsed_ms(total_start)
 
-        total_elapsed = time.time() - total_start
-        logger.info(f"[fill] Total time spent:{total_elapsed:.2f}s,success={output.success}")
+        logger.info(
+            f"[fill] Total time spent:{timings['total'] / 1000:.2f}s,success={output.success},"
+            f"context={timings['context']:.0f}ms,llm={timings['llm']:.0f}ms"
+        )
 
         # # Indicator context involved in the operation
-        recs = recommendations_list if not output.success else []
-        return AIFillResponse.from_output(output, recs)
+        recs = list(context.recommendations) if not output.success else []
+        response = AIFillResponse.from_output(output, recs)
+        response.metadata = {
+            "timingsMs": timings,
+            "contextCached": context_cached,
+            "degradedSources": degraded,
+        }
+        return response
+
+    async def _gather_context(
+        self,
+        request: AIFillRequest,
+        *,
+        tenant_id: int | None,
+        user_id: int | None,
+        timings: dict[str, float],
+    ) -> tuple[ContextBundle, list[str]]:
+        """Gather all prompt context concurrently;return (bundle,names of degraded sources)"""
+        degraded: list[str] = []
+
+        async def _source(name: str, awaitable: Any, fallback: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return await asyncio.wait_for(awaitable, timeout=self._source_timeouts[name])
+            except TimeoutError:
+                logger.warning(f"[context] {name} timed out after {self._source_timeouts[name]}s")
+            except Exception as e:
+                logger.warning(f"[context] {name} failed:{e}")
+            finally:
+                timings[name] = _elapsed_ms(start)
+            degraded.append(name)
+            return fallback
+
+        semantic_assets, table_context, metric_context, (_, recommendations) = (
+            await asyncio.gather(
+                _source(
+                    "semantic_assets",
+                    self._search_semantic_assets(
+                        request.user_input, tenant_id=tenant_id, user_id=user_id
+                    ),
+                    NO_SEMANTIC_ASSETS,
+                ),
+                _source(
+                    "table_context",
+                    asyncio.to_thread(
+                        self._get_table_context, request, tenant_id=tenant_id, user_id=user_id
+                    ),
+                    NO_TABLE_CONTEXT,
+                ),
+                _source(
+                    "metric_context",
+                    asyncio.to_thread(
+                        self._get_metric_context, request, tenant_id=tenant_id, user_id=user_id
+                    ),
+                    NO_METRIC_CONTEXT,
+                ),
+                _source(
+                    "recommendations",
+                    self._get_recommendations(request, tenant_id=tenant_id, user_id=user_id),
+                    ("", []),
+                ),
+            )
+        )
+        context = ContextBundle(
+            semantic_assets=semantic_assets,
+            table_context=table_context,
+            metric_context=metric_context,
+            recommendations=tuple(recommendations),
+        )
+        return context, degraded
 
-    def _get_table_context(
+    def _context_cache_key(
         self,
         request: AIFillRequest,
         *,
-        tenant_id: int | None = None,
-        user_id: int | None = None,
-    ) -> str:
-        """Get table context"""
-        ctx = request.context
-        catalog, schema, table = None, None, None
+        tenant_id: int | None,
+        user_id: int | None,
+    ) -> tuple:
+        # user_id is part of the key:private assets are only visible to their creator.
+        normalized_input = " ".join(request.user_input.split()).casefold()
+        return (
+            tenant_id,
+            user_id,
+            request.context.metric_type,
+            normalized_input,
+            self._table_ref(request),
+            tuple(self._metric_codes(request)),
+        )
 
+    def _table_ref(self, request: AIFillRequest) -> tuple[str, str, str] | None:
+        """Referenced table(atomic/derived indicators)"""
+        ctx = request.context
+        payload = None
         if ctx.metric_type == MetricType.ATOMIC:
             payload = ctx.get_atomic_payload()
-            if payload:
-                catalog, schema, table = payload.ref_catalog, payload.ref_schema, payload.ref_table
-
         elif ctx.metric_type == MetricType.DERIVED:
             payload = ctx.get_derived_payload()
-            if payload:
-                catalog, schema, table = payload.ref_catalog, payload.ref_schema, payload.ref_table
+        if payload and payload.ref_catalog and payload.ref_schema and payload.ref_table:
+            return payload.ref_catalog, payload.ref_schema, payload.ref_table
+        return None
+
+    def _metric_codes(self, request: AIFillRequest) -> list[str]:
+        """Referenced indicator codes(derived/composite indicators)"""
+        ctx = request.context
+        if ctx.metric_type == MetricType.DERIVED:
+            payload = ctx.get_derived_payload()
+            if payload and payload.base_metric:
+                return [payload.base_metric.code]
+        elif ctx.metric_type == MetricType.COMPOSITE:
+            payload = ctx.get_composite_payload()
+            if payload and payload.metrics:
+                return [m.code for m in payload.metrics]
+        return []
 
-        if catalog and schema and table:
+    def _get_table_context(
+        self,
+        request: AIFillRequest,
+        *,
+        tenant_id: int | None = None,
+        user_id: int | None = None,
+    ) -> str:
+        """Get table context"""
+        table_ref = self._table_ref(request)
+        if table_ref:
+            catalog, schema, table = table_ref
             result = Neo4jTableSearch.get_table_detail(
                 catalog,
                 schema,
@@ -249,7 +444,7 @@ class MetricAIService:
                     indent=2,
                 )
 
-        return "No table information"
+        return NO_TABLE_CONTEXT
 
     def _get_metric_context(
         self,
@@ -259,21 +454,9 @@ class MetricAIService:
         user_id: int | None = None,
     ) -> str:
         """Get indicator context(derived/For composite indicators)"""
-        ctx = request.context
-        codes: list[str] = []
-
-        if ctx.metric_type == MetricType.DERIVED:
-            payload = ctx.get_derived_payload()
-            if payload and payload.base_metric:
-                codes = [payload.base_metric.code]
-
-        elif ctx.metric_type == MetricType.COMPOSITE:
-            payload = ctx.get_composite_payload()
-            if payload and payload.metrics:
-                codes = [m.code for m in payload.metrics]
-
+        codes = self._metric_codes(request)
         if not codes:
-            return "No indicator information"
+            return NO_METRIC_CONTEXT
 
         metrics = Neo4jMetricSearch.get_metric_context(
             codes,
@@ -282,7 +465,7 @@ class MetricAIService:
         )
         if not metrics:
             logger.warning(f"[context] Indicator not found:{codes}")
-            return "No indicator information"
+            return NO_METRIC_CONTEXT
 
         logger.info(f"[context] Get {len(metrics)} indicator context")
 
@@ -303,7 +486,7 @@ class MetricAIService:
 
         return json.dumps(result, ensure_ascii=False, indent=2)
 
-    def _get_recommendations(
+    async def _get_recommendations(
         self,
         request: AIFillRequest,
         *,
@@ -312,22 +495,24 @@ class MetricAIService:
     ) -> tuple[str, list]:
         """Get recommended results,Return (Format string,original list)"""
         if request.context.metric_type == MetricType.ATOMIC:
-            return self._recommend_tables(
+            return await self._recommend_tables(
                 request.user_input,
                 tenant_id=tenant_id,
                 user_id=user_id,
             )
         elif request.context.metric_type == MetricType.DERIVED:
             # # Verification process(must be strictly enforced)
-            _, metrics_list = self._recommend_metrics(
-                request.user_input,
-                tenant_id=tenant_id,
-                user_id=user_id,
-            )
-            _, tables_list = self._recommend_tables(
-                request.user_input,
-                tenant_id=tenant_id,
-                user_id=user_id,
+            (_, metrics_list), (_, tables_list) = await asyncio.gather(
+                self._recommend_metrics(
+                    request.user_input,
+                    tenant_id=tenant_id,
+                    user_id=user_id,
+                ),
+                self._recommend_tables(
+                    request.user_input,
+                    tenant_id=tenant_id,
+                    user_id=user_id,
+                ),
             )
             combined = metrics_list + tables_list
             # # prohibited(If it is violated,failure will be returned directly.)
@@ -337,13 +522,13 @@ class MetricAIService:
                 combined,
             )
         else:
-            return self._recommend_metrics(
+            return await self._recommend_metrics(
                 request.user_input,
                 tenant_id=tenant_id,
                 user_id=user_id,
             )
 
-    def _recommend_tables(
+    async def _recommend_tables(
         self,
         user_input: str,
         *,
@@ -352,7 +537,7 @@ class MetricAIService:
     ) -> tuple[str, list]:
         """Recommended tables and columns,Return (Format string,original list)"""
         start = time.time()
-        raw_results = Neo4jTableSearch.search_tables(
+        raw_results = await Neo4jTableSearch.asearch_tables(
             query=user_input,
             tenant_id=tenant_id,
             user_id=user_id,
@@ -455,7 +640,7 @@ class MetricAIService:
             recommendations,
         )
 
-    def _recommend_metrics(
+    async def _recommend_metrics(
         self,
         user_input: str,
         *,
@@ -463,7 +648,7 @@ class MetricAIService:
         user_id: int | None = None,
     ) -> tuple[str, list]:
         """recommendations"""
-        raw_results = Neo4jMetricSearch.search_metrics(
+        raw_results = await Neo4jMetricSearch.asearch_metrics(
             query=user_input,
             tenant_id=tenant_id,
             user_id=user_id,
@@ -523,7 +708,7 @@ class MetricAIService:
                 semantic_assets=semantic_assets, metric_context=metric_context
             )
 
-    def _search_semantic_assets(
+    async def _search_semantic_assets(
         self,
         user_input: str,
         *,
@@ -531,7 +716,7 @@ class MetricAIService:
         user_id: int | None = None,
     ) -> str:
         """recommendations"""
-        assets = Neo4jSemanticSearch.search_semantic_assets(
+        assets = await Neo4jSemanticSearch.asearch_semantic_assets(
             query=user_input,
             top_k=15,
             tenant_id=tenant_id,
@@ -565,7 +750,7 @@ class MetricAIService:
                 lines.append(", ".join(items))
 
         if not lines:
-            return "No semantic assets available."
+            return NO_SEMANTIC_ASSETS
 
         return "\n".join(lines)
 
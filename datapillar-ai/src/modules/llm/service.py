@@ -7,7 +7,9 @@ LLM Playground service.DEPRECATED:- This module is reserved for historical link
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from collections.abc import AsyncGenerator
 from dataclasses import dataclass
 from typing import Any
@@ -21,6 +23,12 @@ from src.infrastructure.keystore.crypto_service import (
     is_encrypted_ciphertext,
     local_crypto_service,
 )
+from src.infrastructure.llm.provider_pool import (
+    LLMProviderPool,
+    ProviderPoolKey,
+    llm_provider_pool,
+    provider_config_hash,
+)
 from src.infrastructure.repository.system.ai_model import Model
 from src.modules.llm.schemas import PlaygroundChatRequest
 from src.shared.config.runtime import get_llm_config
@@ -40,6 +48,9 @@ class PlaygroundStreamDelta:
 class LlmPlaygroundService:
     """Playground chat service(No session memory)."""
 
+    def __init__(self, *, provider_pool: LLMProviderPool | None = None) -> None:
+        self._provider_pool = provider_pool if provider_pool is not None else llm_provider_pool
+
     async def stream_chat(
         self,
         *,
@@ -51,24 +62,37 @@ class LlmPlaygroundService:
         if ai_model_id <= 0:
             raise BadRequestException("aiModelId Invalid")
         message = self._normalize_required(payload.message, "message cannot be empty")
+        started = time.perf_counter()
 
-        model = Model.get_active_chat_model(
+        model = await asyncio.to_thread(
+            Model.get_active_chat_model,
             tenant_id=tenant_id,
             ai_model_id=ai_model_id,
         )
         if not model:
             raise BadRequestException("Model does not exist,Not enabled or not connected")
 
-        decrypted_api_key = await self._decrypt_key(
-            tenant_code=tenant_code,
-            encrypted_value=model.get("api_key"),
+        thinking_enabled = payload.model_options.thinking_enabled
+        pool_key = ProviderPoolKey(
+            tenant_id=tenant_id,
+            ai_model_id=ai_model_id,
+            config_hash=provider_config_hash(model),
+            thinking_enabled=thinking_enabled,
         )
 
-        llm_provider = self._build_llm_provider(
-            model=model,
-            api_key=decrypted_api_key,
-            thinking_enabled=payload.model_options.thinking_enabled,
-        )
+        async def _build() -> LLMProvider:
+            # Only a pool miss decrypts the key and builds the chat model.
+            decrypted_api_key = await self._decrypt_key(
+                tenant_code=tenant_code,
+                encrypted_value=model.get("api_key"),
+            )
+            return self._build_llm_provider(
+                model=model,
+                api_key=decrypted_api_key,
+                thinking_enabled=thinking_enabled,
+            )
+
+        llm_provider, pooled = await self._provider_pool.acquire(pool_key, _build)
 
         llm = llm_provider(
             temperature=payload.model_options.temperature,
@@ -82,8 +106,14 @@ class LlmPlaygroundService:
 
         text_buffer = ""
         thinking_buffer = ""
+        first_token_recorded = False
 
         async for chunk in llm.astream(messages):
+            if not first_token_recorded:
+                first_token_recorded = True
+                self._provider_pool.record_first_token(
+                    time.perf_counter() - started, pooled=pooled
+                )
             thinking_chunk = self._extract_chunk_thinking(chunk)
             thinking_delta = self._resolve_stream_delta(
                 current_chunk=thinking_chunk,
@@ -5,7 +5,6 @@
 
 from __future__ import annotations
 
-import json
 from typing import Annotated
 
 from fastapi import APIRouter, File, Form, Request, UploadFile
@@ -20,11 +19,17 @@ from src.modules.rag.schemas import (
     RetrieveRequest,
 )
 from src.modules.rag.service import KnowledgeWikiService
-from src.modules.rag.sse import job_event_hub
+from src.modules.rag.sse import (
+    TERMINAL_JOB_STATUSES,
+    job_done_event,
+    job_event_hub,
+    job_progress_event,
+)
 from src.shared.exception import BadRequestException, NotFoundException
 from src.shared.web import ApiResponse
 
 router = APIRouter()
+_UPLOAD_CHUNK_SIZE = 1024 * 1024
 _service: KnowledgeWikiService | None = None
 
 
@@ -45,7 +50,7 @@ def _pagination(limit: int | None, offset: int | None) -> tuple[int, int]:
 async def list_namespaces(request: Request, limit: int = 20, offset: int = 0):
     current_user = request.state.current_user
     limit, offset = _pagination(limit, offset)
-    rows, total = _get_service().list_namespaces(
+    rows, total = await _get_service().list_namespaces(
         current_user.tenant_id,
         current_user.user_id,
         limit=limit,
@@ -57,7 +62,7 @@ async def list_namespaces(request: Request, limit: int = 20, offset: int = 0):
 @router.post("/namespaces")
 async def create_namespace(request: Request, payload: NamespaceCreateRequest):
     current_user = request.state.current_user
-    namespace_id = _get_service().create_namespace(
+    namespace_id = await _get_service().create_namespace(
         current_user.tenant_id,
         current_user.user_id,
         payload.model_dump(),
@@ -72,7 +77,7 @@ async def update_namespace(request: Request, namespace_id: int, payload: Namespa
     if not fields:
         raise BadRequestException("No fields to update")
 
-    updated = _get_service().update_namespace(
+    updated = await _get_service().update_namespace(
         current_user.tenant_id,
         current_user.user_id,
         namespace_id,
@@ -87,7 +92,7 @@ async def update_namespace(request: Request, namespace_id: int, payload: Namespa
 @router.delete("/namespaces/{namespace_id}")
 async def delete_namespace(request: Request, namespace_id: int):
     current_user = request.state.current_user
-    deleted = _get_service().delete_namespace(
+    deleted = await _get_service().delete_namespace(
         current_user.tenant_id,
         current_user.user_id,
         namespace_id,
@@ -108,7 +113,7 @@ async def list_documents(
 ):
     current_user = request.state.current_user
     limit, offset = _pagination(limit, offset)
-    rows, total = _get_service().list_documents(
+    rows, total = await _get_service().list_documents(
         current_user.tenant_id,
         current_user.user_id,
         namespace_id,
@@ -131,16 +136,23 @@ async def upload_document(
     if not file:
         raise BadRequestException("file cannot be empty")
 
-    content = await file.read()
-    if not content:
+    # Starlette spools the upload to a temp file; stream it on in bounded chunks.
+    first_chunk = await file.read(_UPLOAD_CHUNK_SIZE)
+    if not first_chunk:
         raise BadRequestException("The uploaded file is empty")
 
+    async def _chunks():
+        chunk = first_chunk
+        while chunk:
+            yield chunk
+            chunk = await file.read(_UPLOAD_CHUNK_SIZE)
+
     result = await _get_service().upload_document(
         tenant_id=current_user.tenant_id,
         user_id=current_user.user_id,
         namespace_id=namespace_id,
         filename=file.filename or "document",
-        content=content,
+        chunks=_chunks(),
         title=title,
     )
     return ApiResponse.success(data=result)
@@ -149,7 +161,9 @@ async def upload_document(
 @router.get("/documents/{document_id}")
 async def get_document(request: Request, document_id: int):
     current_user = request.state.current_user
-    doc = _get_service().get_document(current_user.tenant_id, current_user.user_id, document_id)
+    doc = await _get_service().get_document(
+        current_user.tenant_id, current_user.user_id, document_id
+    )
     if not doc:
         raise NotFoundException("document does not exist")
     return ApiResponse.success(data=doc)
@@ -162,7 +176,7 @@ async def update_document(request: Request, document_id: int, payload: DocumentU
     if not fields:
         raise BadRequestException("No fields to update")
 
-    updated = _get_service().update_document(
+    updated = await _get_service().update_document(
         current_user.tenant_id,
         current_user.user_id,
         document_id,
@@ -202,7 +216,7 @@ async def start_chunk_job(request: Request, document_id: int, payload: ChunkJobR
 async def list_document_jobs(request: Request, document_id: int, limit: int = 20, offset: int = 0):
     current_user = request.state.current_user
     limit, offset = _pagination(limit, offset)
-    rows, total = _get_service().list_jobs(
+    rows, total = await _get_service().list_jobs(
         current_user.tenant_id,
         current_user.user_id,
         document_id,
@@ -215,7 +229,7 @@ async def list_document_jobs(request: Request, document_id: int, limit: int = 20
 @router.get("/jobs/{job_id}")
 async def get_job(request: Request, job_id: int):
     current_user = request.state.current_user
-    job = _get_service().get_job(current_user.tenant_id, current_user.user_id, job_id)
+    job = await _get_service().get_job(current_user.tenant_id, current_user.user_id, job_id)
     if not job:
         raise NotFoundException("job does not exist")
     return ApiResponse.success(data=job)
@@ -224,7 +238,7 @@ async def get_job(request: Request, job_id: int):
 @router.get("/jobs/{job_id}/sse")
 async def job_sse(request: Request, job_id: int):
     current_user = request.state.current_user
-    job = _get_service().get_job(current_user.tenant_id, current_user.user_id, job_id)
+    job = await _get_service().get_job(current_user.tenant_id, current_user.user_id, job_id)
     if not job:
         raise NotFoundException("job does not exist")
 
@@ -237,38 +251,29 @@ async def job_sse(request: Request, job_id: int):
             last_event_id_int = None
 
     initial_event = None
-    if last_event_id_int is None or last_event_id_int < int(job.get("progress_seq") or 0):
-        payload = {
-            "job_id": job["job_id"],
-            "status": job["status"],
-            "progress": job["progress"],
-            "total_chunks": job["total_chunks"],
-            "processed_chunks": job["processed_chunks"],
-            "progress_seq": job["progress_seq"],
-        }
-        initial_event = {
-            "event": "progress",
-            "id": str(job["progress_seq"]),
-            "data": json.dumps(payload, ensure_ascii=False),
-        }
+    # Progress writes are coalesced, so a job running in this process may be ahead of its row.
+    live_event = job_event_hub.latest(job_id)
+    if live_event is not None and int(live_event["id"]) > int(job.get("progress_seq") or 0):
+        if last_event_id_int is None or last_event_id_int < int(live_event["id"]):
+            initial_event = live_event
+    elif last_event_id_int is None or last_event_id_int < int(job.get("progress_seq") or 0):
+        initial_event = job_progress_event(job)
+
+    async def _fetch_job():
+        return await _get_service().get_job(current_user.tenant_id, current_user.user_id, job_id)
 
     async def event_stream():
-        if job["status"] in {"success", "error", "canceled"}:
-            done_payload = {
-                "job_id": job["job_id"],
-                "status": job["status"],
-                "progress": job["progress"],
-                "processed_chunks": job["processed_chunks"],
-                "total_chunks": job["total_chunks"],
-            }
-            yield {
-                "event": "done",
-                "id": str(job.get("progress_seq") or 0),
-                "data": json.dumps(done_payload, ensure_ascii=False),
-            }
+        if job["status"] in TERMINAL_JOB_STATUSES:
+            yield job_done_event(job)
             return
 
-        async for event in job_event_hub.subscribe(job_id, initial_event=initial_event):
+        # Runs leased by another process never publish here; the hub polls the row for them.
+        async for event in job_event_hub.subscribe(
+            job_id,
+            initial_event=initial_event,
+            last_seq=last_event_id_int or 0,
+            fetch=_fetch_job,
+        ):
             yield event
 
     return EventSourceResponse(
@@ -288,20 +293,30 @@ async def list_chunks(
     request: Request,
     document_id: int,
     keyword: str | None = None,
+    status: str | None = None,
+    cursor: str | None = None,
     limit: int = 20,
     offset: int = 0,
 ):
     current_user = request.state.current_user
     limit, offset = _pagination(limit, offset)
-    rows, total = await _get_service().list_chunks(
+    rows, total, next_cursor = await _get_service().list_chunks(
         user_id=current_user.user_id,
         tenant_id=current_user.tenant_id,
         document_id=document_id,
         limit=limit,
         offset=offset,
         keyword=keyword,
+        status=status,
+        cursor=cursor,
+    )
+    return ApiResponse.success(
+        data=rows,
+        limit=limit,
+        offset=offset,
+        total=total,
+        next_cursor=next_cursor,
     )
-    return ApiResponse.success(data=rows, limit=limit, offset=offset, total=total)
 
 
 @router.patch("/chunks/{chunk_id}")
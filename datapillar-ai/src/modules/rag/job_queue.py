@@ -0,0 +1,265 @@
+# @author Sunny
+# @date 2026-01-28
+
+"""
+RAG ingestion job queue
+
+Jobs are persisted in knowledge_document_job and leased by workers with
+SELECT ... FOR UPDATE SKIP LOCKED, so they survive restarts and can be processed
+by the API process (mode=inprocess) or by separate workers (mode=external,
+python -m src.modules.rag.worker).
+
+Guarantees:
+- At most `workers` jobs run per process, at most `per_tenant_limit` per tenant
+- A running job keeps its lease alive through heartbeats; a crashed worker's job
+  is re-leased once the lease expires
+- Jobs re-leased more than max_attempts times are failed instead of retried
+- A job whose handler raises is failed right away (not left running until its
+  lease expires)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+import socket
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from src.infrastructure.repository.rag import JobRepository
+from src.modules.rag.sse import JobEventHub, job_event_hub
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[dict[str, Any]], Awaitable[None]]
+
+
+class IngestionJobQueue:
+    """Worker pool that leases and runs persisted ingestion jobs."""
+
+    def __init__(
+        self,
+        *,
+        handler: JobHandler,
+        store: Any = JobRepository,
+        hub: JobEventHub = job_event_hub,
+        workers: int = 4,
+        per_tenant_limit: int = 2,
+        lease_seconds: float = 60.0,
+        poll_interval_seconds: float = 2.0,
+        max_attempts: int = 3,
+        worker_id: str | None = None,
+    ) -> None:
+        self._handler = handler
+        self._store = store
+        self._hub = hub
+        self._workers = workers
+        self._per_tenant_limit = per_tenant_limit
+        self._lease_seconds = lease_seconds
+        self._heartbeat_interval = lease_seconds / 3
+        self._poll_interval = poll_interval_seconds
+        self._max_attempts = max_attempts
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        self._slots = asyncio.Semaphore(workers)
+        self._wakeup = asyncio.Event()
+        self._running: dict[int, asyncio.Task[None]] = {}
+        self._loop_task: asyncio.Task[None] | None = None
+        self._stopping = False
+        self._completed = 0
+        self._failed = 0
+
+    @property
+    def running_jobs(self) -> list[int]:
+        return list(self._running)
+
+    def notify(self) -> None:
+        """Wake the lease loop (a job was just enqueued)."""
+        self._wakeup.set()
+
+    async def start(self) -> None:
+        if self._loop_task is not None:
+            return
+        self._stopping = False
+        self._loop_task = asyncio.create_task(self._lease_loop())
+        logger.info(
+            "Ingestion job queue started: worker=%s workers=%s per_tenant=%s",
+            self.worker_id,
+            self._workers,
+            self._per_tenant_limit,
+        )
+
+    async def stop(self) -> None:
+        """Stop leasing, cancel in-flight jobs and hand their leases back."""
+        self._stopping = True
+        self._wakeup.set()
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._loop_task
+            self._loop_task = None
+
+        running = dict(self._running)
+        for task in running.values():
+            task.cancel()
+        if running:
+            await asyncio.gather(*running.values(), return_exceptions=True)
+        for job_id in running:
+            try:
+                await asyncio.to_thread(self._store.release, job_id, self.worker_id)
+            except Exception as exc:
+                logger.warning("Failed to release job %s: %s", job_id, exc)
+        logger.info("Ingestion job queue stopped: worker=%s", self.worker_id)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "worker_id": self.worker_id,
+            "running": len(self._running),
+            "completed": self._completed,
+            "failed": self._failed,
+        }
+
+    # ==================== Internal ====================
+
+    async def _lease_loop(self) -> None:
+        while not self._stopping:
+            await self._slots.acquire()
+            try:
+                job = await asyncio.to_thread(
+                    self._store.lease_next,
+                    self.worker_id,
+                    self._lease_seconds,
+                    per_tenant_limit=self._per_tenant_limit,
+                )
+            except Exception as exc:
+                self._slots.release()
+                logger.error("Lease ingestion job failed: %s", exc)
+                await self._wait()
+                continue
+
+            if job is None:
+                self._slots.release()
+                await self._wait()
+                continue
+
+            job_id = int(job["job_id"])
+            if int(job.get("attempts") or 0) > self._max_attempts:
+                self._slots.release()
+                logger.error("Ingestion job %s exceeded %s attempts", job_id, self._max_attempts)
+                await asyncio.to_thread(
+                    self._store.mark_error,
+                    job_id,
+                    int(job["tenant_id"]),
+                    f"exceeded max attempts ({self._max_attempts})",
+                    worker_id=self.worker_id,
+                )
+                continue
+
+            self._running[job_id] = asyncio.create_task(self._execute(job_id, job))
+
+    async def _wait(self) -> None:
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self._wakeup.wait(), timeout=self._poll_interval)
+        self._wakeup.clear()
+
+    async def _execute(self, job_id: int, job: dict[str, Any]) -> None:
+        self._hub.open(job_id)
+        work = asyncio.create_task(self._handler(job))
+        heartbeat = asyncio.create_task(self._heartbeat(job_id, work))
+        try:
+            await work
+            self._completed += 1
+        except asyncio.CancelledError:
+            work.cancel()
+            raise
+        except Exception as exc:
+            self._failed += 1
+            logger.error("Ingestion job %s failed: %s", job_id, exc, exc_info=True)
+            # Settle the row now instead of leaving it running until the lease expires,
+            # past the last sequence this process published for it.
+            latest = self._hub.latest(job_id)
+            try:
+                await asyncio.to_thread(
+                    self._store.fail,
+                    job_id,
+                    self.worker_id,
+                    str(exc),
+                    progress_seq=int(latest["id"]) + 1 if latest is not None else None,
+                )
+            except Exception as store_exc:
+                logger.warning("Failed to mark job %s as failed: %s", job_id, store_exc)
+        finally:
+            heartbeat.cancel()
+            # The run is over here (settled, crashed or lease lost):drop its live progress
+            # and end its SSE streams,a reconnect reads the row.
+            await self._hub.close(job_id)
+            self._running.pop(job_id, None)
+            self._slots.release()
+            # A slot is free; lease the next job right away.
+            self._wakeup.set()
+
+    async def _heartbeat(self, job_id: int, work: asyncio.Task[None]) -> None:
+        while not work.done():
+            await asyncio.sleep(self._heartbeat_interval)
+            try:
+                alive = await asyncio.to_thread(
+                    self._store.heartbeat,
+                    job_id,
+                    self.worker_id,
+                    self._lease_seconds,
+                )
+            except Exception as exc:
+                logger.warning("Heartbeat for job %s failed: %s", job_id, exc)
+                continue
+            if not alive:
+                logger.warning("Lease lost for job %s; cancelling local run", job_id)
+                work.cancel()
+                return
+
+
+_queue: IngestionJobQueue | None = None
+
+
+def build_ingestion_queue(handler: JobHandler) -> IngestionJobQueue:
+    from src.shared.config.runtime import get_knowledge_wiki_config
+
+    cfg = get_knowledge_wiki_config()["job_queue"]
+    return IngestionJobQueue(
+        handler=handler,
+        workers=int(cfg["workers"]),
+        per_tenant_limit=int(cfg["per_tenant_limit"]),
+        lease_seconds=float(cfg["lease_seconds"]),
+        poll_interval_seconds=float(cfg["poll_interval_seconds"]),
+        max_attempts=int(cfg["max_attempts"]),
+    )
+
+
+async def start_ingestion_queue() -> IngestionJobQueue | None:
+    """Start the in-process worker pool (no-op when workers run externally)."""
+    global _queue
+    from src.modules.rag.service import KnowledgeWikiService
+    from src.shared.config.runtime import get_knowledge_wiki_config
+
+    if get_knowledge_wiki_config()["job_queue"]["mode"] != "inprocess":
+        logger.info("Ingestion job queue runs in external workers")
+        return None
+    if _queue is None:
+        _queue = build_ingestion_queue(KnowledgeWikiService().run_job)
+        await _queue.start()
+    return _queue
+
+
+async def stop_ingestion_queue() -> None:
+    global _queue
+    if _queue is not None:
+        await _queue.stop()
+        _queue = None
+
+
+def notify_ingestion_queue() -> None:
+    """Wake the in-process worker pool after enqueueing a job."""
+    if _queue is not None:
+        _queue.notify()
@@ -0,0 +1,175 @@
+# @author Sunny
+# @date 2026-01-28
+
+"""
+RAG job progress tracker
+
+Keeps a running job's progress in memory, publishes every step to the SSE hub
+straight from that state, and coalesces MySQL writes: at most one UPDATE per
+flush_interval_ms or flush_steps steps, executed off the event loop. Only one
+flush is in flight at a time; steps arriving meanwhile are folded into the next one.
+
+progress_seq is tracked in memory and written as an absolute value (terminal
+updates included), so the row never drifts from what subscribers have seen and
+Last-Event-ID stays comparable.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+from src.infrastructure.repository.rag import JobRepository
+from src.modules.rag.sse import JobEventHub, job_event_hub
+
+logger = logging.getLogger(__name__)
+
+
+class JobProgressTracker:
+    """In-memory progress accumulator for one running job."""
+
+    def __init__(
+        self,
+        job: dict[str, Any],
+        *,
+        hub: JobEventHub = job_event_hub,
+        store: Any = JobRepository,
+        flush_interval_ms: int = 1000,
+        flush_steps: int = 10,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.job_id = int(job["job_id"])
+        self.tenant_id = int(job["tenant_id"])
+        self.status = str(job.get("status") or "running")
+        self.progress = int(job.get("progress") or 0)
+        self.total_chunks = int(job.get("total_chunks") or 0)
+        self.processed_chunks = int(job.get("processed_chunks") or 0)
+        self.progress_seq = int(job.get("progress_seq") or 0)
+        # Lease holder:its writes are dropped once another worker re-leased the job.
+        self.worker_id = str(job["lease_owner"])
+
+        self._hub = hub
+        self._store = store
+        self._flush_interval = flush_interval_ms / 1000
+        self._flush_steps = flush_steps
+        self._clock = clock
+        self._pending_steps = 0
+        self._last_flush = clock()
+        self._flush_task: asyncio.Task[None] | None = None
+        self.flushes = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "progress": self.progress,
+            "total_chunks": self.total_chunks,
+            "processed_chunks": self.processed_chunks,
+            "progress_seq": self.progress_seq,
+        }
+
+    def progress_event(self) -> dict[str, Any]:
+        return {
+            "event": "progress",
+            "id": str(self.progress_seq),
+            "data": json.dumps(self.snapshot(), ensure_ascii=False),
+        }
+
+    async def publish(self) -> None:
+        await self._hub.publish(self.job_id, self.progress_event())
+
+    async def update(self, processed: int, total: int) -> None:
+        """Record one progress step, publish it and flush if a threshold is reached."""
+        self.processed_chunks = processed
+        self.total_chunks = total
+        self.progress = int(processed * 100 / total) if total else 0
+        self.progress_seq += 1
+        self._pending_steps += 1
+        await self.publish()
+
+        due = (
+            self._pending_steps >= self._flush_steps
+            or self._clock() - self._last_flush >= self._flush_interval
+        )
+        if due and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._flush())
+
+    async def succeed(self, *, processed_chunks: int, total_chunks: int) -> None:
+        await self.aclose()
+        self.progress_seq += 1
+        await asyncio.to_thread(
+            self._store.mark_success,
+            self.job_id,
+            self.tenant_id,
+            processed_chunks=processed_chunks,
+            total_chunks=total_chunks,
+            worker_id=self.worker_id,
+            progress_seq=self.progress_seq,
+        )
+        self.status = "success"
+        self.progress = 100
+        self.processed_chunks = processed_chunks
+        self.total_chunks = total_chunks
+        await self._publish_done()
+
+    async def fail(self, message: str) -> None:
+        await self.aclose()
+        self.progress_seq += 1
+        await asyncio.to_thread(
+            self._store.mark_error,
+            self.job_id,
+            self.tenant_id,
+            message,
+            worker_id=self.worker_id,
+            progress_seq=self.progress_seq,
+        )
+        self.status = "error"
+        await self._publish_done(message)
+
+    async def aclose(self) -> None:
+        """Wait for the in-flight flush and write any remaining steps."""
+        if self._flush_task is not None:
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        if self._pending_steps:
+            await self._flush()
+
+    async def _flush(self) -> None:
+        steps = self._pending_steps
+        self._pending_steps = 0
+        self._last_flush = self._clock()
+        try:
+            await asyncio.to_thread(
+                self._store.update_progress,
+                self.job_id,
+                self.tenant_id,
+                processed_chunks=self.processed_chunks,
+                total_chunks=self.total_chunks,
+                progress=self.progress,
+                worker_id=self.worker_id,
+                progress_seq=self.progress_seq,
+            )
+            self.flushes += 1
+        except Exception as exc:
+            # Progress is advisory; the next flush or the terminal update catches up.
+            self._pending_steps += steps
+            logger.warning("Flush progress of job %s failed: %s", self.job_id, exc)
+
+    async def _publish_done(self, message: str | None = None) -> None:
+        payload = self.snapshot()
+        payload.pop("progress_seq")
+        if message is not None:
+            payload["message"] = message
+        await self._hub.publish(
+            self.job_id,
+            {
+                "event": "done",
+                "id": str(self.progress_seq),
+                "data": json.dumps(payload, ensure_ascii=False),
+            },
+        )
+        await self._hub.close(self.job_id)
@@ -11,6 +11,8 @@ import logging
 import os
 import time
 import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator
 from typing import Any
 
 from datapillar_oneagentic.knowledge import (
@@ -33,7 +35,8 @@ from src.infrastructure.keystore.crypto_service import (
 from src.infrastructure.repository.rag import DocumentRepository, JobRepository, NamespaceRepository
 from src.infrastructure.repository.system.ai_model import Model as AiModelRepository
 from src.infrastructure.repository.system.tenant import Tenant as TenantRepository
-from src.modules.rag.sse import job_event_hub
+from src.modules.rag.job_queue import notify_ingestion_queue
+from src.modules.rag.progress import JobProgressTracker
 from src.modules.rag.storage import StorageManager
 from src.shared.config.runtime import get_knowledge_wiki_config
 from src.shared.context import get_current_tenant_code, get_current_tenant_id
@@ -55,8 +58,10 @@ class KnowledgeWikiService:
         self._vector_store_cfg = VectorStoreConfig(**cfg["vector_store"])
         self._embedding_batch_size = int(cfg["embedding_batch_size"])
         self._progress_step = int(cfg["progress_step"])
+        self._progress_flush_interval_ms = int(cfg["progress_flush_interval_ms"])
+        self._progress_flush_steps = int(cfg["progress_flush_steps"])
 
-    def list_namespaces(
+    async def list_namespaces(
         self,
         tenant_id: int,
         user_id: int,
@@ -64,9 +69,11 @@ class KnowledgeWikiService:
         limit: int,
         offset: int,
     ) -> tuple[list[dict], int]:
-        return NamespaceRepository.list_by_user(tenant_id, user_id, limit=limit, offset=offset)
+        return await NamespaceRepository.alist_by_user(
+            tenant_id, user_id, limit=limit, offset=offset
+        )
 
-    def create_namespace(self, tenant_id: int, user_id: int, payload: dict[str, Any]) -> int:
+    async def create_namespace(self, tenant_id: int, user_id: int, payload: dict[str, Any]) -> int:
         payload = {
             "tenant_id": tenant_id,
             "namespace": payload["namespace"],
@@ -74,21 +81,21 @@ class KnowledgeWikiService:
             "created_by": user_id,
             "status": 1,
         }
-        return NamespaceRepository.create(payload)
+        return await NamespaceRepository.acreate(payload)
 
-    def update_namespace(
+    async def update_namespace(
         self,
         tenant_id: int,
         user_id: int,
         namespace_id: int,
         fields: dict[str, Any],
     ) -> int:
-        return NamespaceRepository.update(namespace_id, tenant_id, user_id, fields)
+        return await NamespaceRepository.aupdate(namespace_id, tenant_id, user_id, fields)
 
-    def delete_namespace(self, tenant_id: int, user_id: int, namespace_id: int) -> int:
-        return NamespaceRepository.soft_delete(namespace_id, tenant_id, user_id)
+    async def delete_namespace(self, tenant_id: int, user_id: int, namespace_id: int) -> int:
+        return await NamespaceRepository.asoft_delete(namespace_id, tenant_id, user_id)
 
-    def list_documents(
+    async def list_documents(
         self,
         tenant_id: int,
         user_id: int,
@@ -99,7 +106,7 @@ class KnowledgeWikiService:
         limit: int,
         offset: int,
     ) -> tuple[list[dict[str, Any]], int]:
-        rows, total = DocumentRepository.list_by_namespace(
+        rows, total = await DocumentRepository.alist_by_namespace(
             namespace_id,
             tenant_id,
             user_id,
@@ -110,18 +117,20 @@ class KnowledgeWikiService:
         )
         return [self._normalize_document(row) for row in rows], total
 
-    def get_document(self, tenant_id: int, user_id: int, document_id: int) -> dict[str, Any] | None:
-        doc = DocumentRepository.get(document_id, tenant_id, user_id)
+    async def get_document(
+        self, tenant_id: int, user_id: int, document_id: int
+    ) -> dict[str, Any] | None:
+        doc = await DocumentRepository.aget(document_id, tenant_id, user_id)
         return self._normalize_document(doc) if doc else None
 
-    def update_document(
+    async def update_document(
         self,
         tenant_id: int,
         user_id: int,
         document_id: int,
         fields: dict[str, Any],
     ) -> int:
-        return DocumentRepository.update(document_id, tenant_id, user_id, fields)
+        return await DocumentRepository.aupdate(document_id, tenant_id, user_id, fields)
 
     async def upload_document(
         self,
@@ -130,23 +139,23 @@ class KnowledgeWikiService:
         user_id: int,
         namespace_id: int,
         filename: str,
-        content: bytes,
+        chunks: AsyncIterator[bytes],
         title: str | None,
     ) -> dict[str, Any]:
-        namespace = NamespaceRepository.get(namespace_id, tenant_id, user_id)
+        namespace = await NamespaceRepository.aget(namespace_id, tenant_id, user_id)
         if not namespace:
             raise NotFoundException("namespace does not exist")
         doc_uid = _normalize_doc_uid(_generate_doc_uid())
 
-        storage_result = await self._storage.save(
+        storage_result = await self._storage.save_stream(
             namespace_id=namespace_id,
             filename=filename,
-            content=content,
+            chunks=chunks,
         )
         resolved_title = title or filename
         file_type = _infer_file_type(filename)
 
-        document_id = DocumentRepository.create(
+        document_id = await DocumentRepository.acreate(
             {
                 "tenant_id": tenant_id,
                 "namespace_id": namespace_id,
@@ -173,6 +182,8 @@ class KnowledgeWikiService:
         return {
             "document_id": document_id,
             "status": "processing",
+            "size_bytes": storage_result.size_bytes,
+            "checksum": storage_result.checksum,
         }
 
     async def start_chunk_job(
@@ -184,14 +195,14 @@ class KnowledgeWikiService:
         chunk_mode: str | None,
         chunk_config_json: dict[str, Any] | None,
     ) -> dict[str, Any]:
-        document = DocumentRepository.get(document_id, tenant_id, user_id)
+        document = await DocumentRepository.aget(document_id, tenant_id, user_id)
         if not document:
             raise NotFoundException("document does not exist")
 
         embedding_model_id = document.get("embedding_model_id")
         if not embedding_model_id:
             raise BadRequestException("embedding_model_id cannot be empty")
-        self._ensure_namespace_embedding(
+        await self._ensure_namespace_embedding(
             int(document["namespace_id"]),
             tenant_id,
             int(embedding_model_id),
@@ -199,7 +210,7 @@ class KnowledgeWikiService:
         _normalize_doc_uid(document.get("doc_uid"))
 
         resolved_chunk = self._resolve_chunk_config(chunk_mode, chunk_config_json)
-        DocumentRepository.update(
+        await DocumentRepository.aupdate(
             document_id,
             tenant_id,
             user_id,
@@ -211,34 +222,25 @@ class KnowledgeWikiService:
             },
         )
 
-        job_id = self._create_job(
+        job_id = await self._create_job(
             int(document["namespace_id"]),
             document_id,
             tenant_id,
             user_id,
             job_type="chunk",
+            payload={"chunk_config": resolved_chunk.model_dump()},
         )
-        asyncio.create_task(
-            self._run_chunk_job(
-                job_id=job_id,
-                namespace_id=int(document["namespace_id"]),
-                document_id=document_id,
-                user_id=user_id,
-                tenant_id=tenant_id,
-                chunk_mode=resolved_chunk.mode,
-                chunk_config=resolved_chunk,
-            )
-        )
+        notify_ingestion_queue()
         return {
             "job_id": job_id,
             "status": "queued",
             "sse_url": f"/api/ai/biz/knowledge/wiki/jobs/{job_id}/sse",
         }
 
-    def get_job(self, tenant_id: int, user_id: int, job_id: int) -> dict[str, Any] | None:
-        return JobRepository.get(job_id, tenant_id, user_id)
+    async def get_job(self, tenant_id: int, user_id: int, job_id: int) -> dict[str, Any] | None:
+        return await JobRepository.aget(job_id, tenant_id, user_id)
 
-    def list_jobs(
+    async def list_jobs(
         self,
         tenant_id: int,
         user_id: int,
@@ -247,7 +249,7 @@ class KnowledgeWikiService:
         limit: int,
         offset: int,
     ) -> tuple[list[dict[str, Any]], int]:
-        return JobRepository.list_by_document(
+        return await JobRepository.alist_by_document(
             document_id,
             tenant_id,
             user_id,
@@ -264,31 +266,76 @@ class KnowledgeWikiService:
         limit: int,
         offset: int,
         keyword: str | None,
-    ) -> tuple[list[dict[str, Any]], int]:
-        document = DocumentRepository.get(document_id, tenant_id, user_id)
+        status: str | None = None,
+        cursor: str | None = None,
+    ) -> tuple[list[dict[str, Any]], int, str | None]:
+        document = await DocumentRepository.aget(document_id, tenant_id, user_id)
         if not document:
             raise NotFoundException("document does not exist")
         doc_uid = _normalize_doc_uid(document.get("doc_uid"))
+        keyword = keyword or None
+        filters: dict[str, Any] = {"doc_id": doc_uid}
+        if status:
+            filters["status"] = status
 
-        namespace_value = self._get_namespace_value(
+        namespace_value = await self._get_namespace_value(
             int(document["namespace_id"]), tenant_id, user_id
         )
-        embedding_model = self._get_embedding_model(int(document["embedding_model_id"]), tenant_id)
-        service = self._build_service(namespace=namespace_value, model=embedding_model)
-        rows = await service.list_chunks(
-            filters={"doc_id": doc_uid},
-            limit=None,
-            namespace=namespace_value,
+        embedding_model = await self._get_embedding_model(
+            int(document["embedding_model_id"]), tenant_id
         )
-        await service.close()
+        service = self._build_service(namespace=namespace_value, model=embedding_model)
+        try:
+            # Offset paging (no cursor) is kept for older clients; it still reads only
+            # offset + limit rows from the store.
+            skip = 0 if cursor else offset
+            page = await service.list_chunk_page(
+                filters=filters,
+                keyword=keyword,
+                cursor=cursor,
+                limit=skip + limit,
+                namespace=namespace_value,
+            )
+            if status is None and keyword is None:
+                total = int(document.get("chunk_count") or 0)
+            else:
+                total = await self._count_chunks(
+                    service,
+                    document=document,
+                    filters=filters,
+                    keyword=keyword,
+                    namespace=namespace_value,
+                )
+        finally:
+            await service.close()
 
-        items = rows
-        if keyword:
-            items = [item for item in items if keyword in (item.content or "")]
+        items = page.items[skip:]
+        return [self._chunk_to_dict(item) for item in items], total, page.next_cursor
 
-        total = len(items)
-        sliced = items[offset : offset + limit]
-        return [self._chunk_to_dict(item) for item in sliced], total
+    async def _count_chunks(
+        self,
+        service: KnowledgeService,
+        *,
+        document: dict[str, Any],
+        filters: dict[str, Any],
+        keyword: str | None,
+        namespace: str,
+    ) -> int:
+        # Re-chunking changes chunk_count/last_chunked_at, which retires stale entries.
+        key = (
+            int(document["document_id"]),
+            document.get("chunk_count"),
+            str(document.get("last_chunked_at") or ""),
+            filters.get("status"),
+            keyword,
+        )
+        total = _chunk_count_cache.get(key)
+        if total is None:
+            total = await service.count_chunks(
+                filters=filters, keyword=keyword, namespace=namespace
+            )
+            _chunk_count_cache.put(key, total)
+        return total
 
     async def edit_chunk(
         self,
@@ -301,27 +348,19 @@ class KnowledgeWikiService:
         doc_uid = _parse_doc_uid(chunk_id)
         if not doc_uid:
             raise BadRequestException("chunk_id Format error")
-        document = DocumentRepository.get_by_doc_uid(doc_uid, tenant_id, user_id)
+        document = await DocumentRepository.aget_by_doc_uid(doc_uid, tenant_id, user_id)
         if not document:
             raise NotFoundException("document does not exist")
         namespace_id = int(document["namespace_id"])
-        job_id = self._create_job(
+        job_id = await self._create_job(
             namespace_id,
             int(document["document_id"]),
             tenant_id,
             user_id,
             job_type="reembed",
+            payload={"chunk_id": chunk_id, "content": content},
         )
-        asyncio.create_task(
-            self._run_chunk_edit_job(
-                job_id=job_id,
-                document=document,
-                chunk_id=chunk_id,
-                content=content,
-                tenant_id=tenant_id,
-                user_id=user_id,
-            )
-        )
+        notify_ingestion_queue()
         return {
             "job_id": job_id,
             "status": "queued",
@@ -332,18 +371,21 @@ class KnowledgeWikiService:
         doc_uid = _parse_doc_uid(chunk_id)
         if not doc_uid:
             raise BadRequestException("chunk_id Format error")
-        document = DocumentRepository.get_by_doc_uid(doc_uid, tenant_id, user_id)
+        document = await DocumentRepository.aget_by_doc_uid(doc_uid, tenant_id, user_id)
         if not document:
             raise NotFoundException("document does not exist")
-        namespace_value = self._get_namespace_value(
+        namespace_value = await self._get_namespace_value(
             int(document["namespace_id"]), tenant_id, user_id
         )
-        embedding_model = self._get_embedding_model(int(document["embedding_model_id"]), tenant_id)
+        embedding_model = await self._get_embedding_model(
+            int(document["embedding_model_id"]), tenant_id
+        )
         service = self._build_service(namespace=namespace_value, model=embedding_model)
         deleted = await service.delete_chunks(chunk_ids=[chunk_id], namespace=namespace_value)
         await service.close()
         if deleted:
-            DocumentRepository.update(
+            _chunk_count_cache.invalidate(int(document["document_id"]))
+            await DocumentRepository.aupdate(
                 int(document["document_id"]),
                 tenant_id,
                 user_id,
@@ -355,10 +397,10 @@ class KnowledgeWikiService:
         self, *, user_id: int, tenant_id: int, payload: dict[str, Any]
     ) -> dict[str, Any]:
         namespace_id = int(payload["namespace_id"])
-        self._ensure_namespace_owner(tenant_id, user_id, namespace_id)
-        ai_model_id = self._resolve_ns_embedding_model(namespace_id, tenant_id)
-        embedding_model = self._get_embedding_model(ai_model_id, tenant_id)
-        namespace_value = self._get_namespace_value(namespace_id, tenant_id, user_id)
+        await self._ensure_namespace_owner(tenant_id, user_id, namespace_id)
+        ai_model_id = await self._resolve_ns_embedding_model(namespace_id, tenant_id)
+        embedding_model = await self._get_embedding_model(ai_model_id, tenant_id)
+        namespace_value = await self._get_namespace_value(namespace_id, tenant_id, user_id)
         service = self._build_service(namespace=namespace_value, model=embedding_model)
 
         default_retrieve = KnowledgeRetrieveConfig()
@@ -376,7 +418,7 @@ class KnowledgeWikiService:
         else:
             retrieve_override["rerank"] = {"mode": "off"}
 
-        doc_uids = self._resolve_scope_doc_uids(
+        doc_uids = await self._resolve_scope_doc_uids(
             user_id=user_id,
             tenant_id=tenant_id,
             namespace_id=namespace_id,
@@ -418,53 +460,124 @@ class KnowledgeWikiService:
         return {"hits": hits, "latency_ms": latency_ms}
 
     async def delete_document(self, *, user_id: int, tenant_id: int, document_id: int) -> int:
-        document = DocumentRepository.get(document_id, tenant_id, user_id)
+        document = await DocumentRepository.aget(document_id, tenant_id, user_id)
         if not document:
             raise NotFoundException("document does not exist")
         if document.get("doc_uid"):
-            namespace_value = self._get_namespace_value(
+            namespace_value = await self._get_namespace_value(
                 int(document["namespace_id"]),
                 tenant_id,
                 user_id,
             )
-            embedding_model = self._get_embedding_model(
+            embedding_model = await self._get_embedding_model(
                 int(document["embedding_model_id"]), tenant_id
             )
             service = self._build_service(namespace=namespace_value, model=embedding_model)
             await service.delete_document(doc_id=document["doc_uid"], namespace=namespace_value)
             await service.close()
-        return DocumentRepository.soft_delete(document_id, tenant_id, user_id)
+        return await DocumentRepository.asoft_delete(document_id, tenant_id, user_id)
+
+    async def run_job(self, job: dict[str, Any]) -> None:
+        """Run a job leased from the ingestion queue."""
+        tenant_id = int(job["tenant_id"])
+        user_id = int(job["created_by"])
+        payload = job.get("payload_json") or {}
+        if isinstance(payload, str):
+            payload = json.loads(payload)
+        # The leased row carries the current progress, so no re-read is needed.
+        tracker = JobProgressTracker(
+            job,
+            flush_interval_ms=self._progress_flush_interval_ms,
+            flush_steps=self._progress_flush_steps,
+        )
+
+        if job["job_type"] == "chunk":
+            chunk_config = await self._job_chunk_config(
+                payload, int(job["document_id"]), tenant_id, user_id
+            )
+            if chunk_config is None:
+                await tracker.fail("document not found")
+                return
+            await self._run_chunk_job(
+                tracker=tracker,
+                namespace_id=int(job["namespace_id"]),
+                document_id=int(job["document_id"]),
+                user_id=user_id,
+                tenant_id=tenant_id,
+                chunk_mode=chunk_config.mode,
+                chunk_config=chunk_config,
+                resumed=int(job.get("attempts") or 1) > 1,
+            )
+        elif job["job_type"] == "reembed":
+            document = await DocumentRepository.aget(int(job["document_id"]), tenant_id, user_id)
+            if not document:
+                await tracker.fail("document not found")
+                return
+            if "chunk_id" not in payload:
+                # Queued before jobs carried a payload; the edit cannot be reconstructed.
+                await tracker.fail("job payload missing, submit the chunk edit again")
+                return
+            await self._run_chunk_edit_job(
+                tracker=tracker,
+                document=document,
+                chunk_id=payload["chunk_id"],
+                content=payload["content"],
+                tenant_id=tenant_id,
+                user_id=user_id,
+            )
+        else:
+            await tracker.fail(f"unknown job type: {job['job_type']}")
+
+    async def _job_chunk_config(
+        self,
+        payload: dict[str, Any],
+        document_id: int,
+        tenant_id: int,
+        user_id: int,
+    ) -> KnowledgeChunkConfig | None:
+        if "chunk_config" in payload:
+            return KnowledgeChunkConfig.model_validate(payload["chunk_config"])
+        # Jobs queued before payload_json existed: start_chunk_job stored the resolved
+        # config on the document, use that.
+        document = await DocumentRepository.aget(document_id, tenant_id, user_id)
+        if not document:
+            return None
+        chunk_config_json = document.get("chunk_config_json")
+        if isinstance(chunk_config_json, str):
+            chunk_config_json = json.loads(chunk_config_json)
+        return self._resolve_chunk_config(document.get("chunk_mode"), chunk_config_json)
 
     async def _run_chunk_job(
         self,
         *,
-        job_id: int,
+        tracker: JobProgressTracker,
         namespace_id: int,
         document_id: int,
         user_id: int,
         tenant_id: int,
         chunk_mode: str,
         chunk_config: KnowledgeChunkConfig,
+        resumed: bool = False,
     ) -> None:
-        JobRepository.mark_running(job_id, tenant_id)
-        job_snapshot = JobRepository.get(job_id, tenant_id, user_id)
-        if job_snapshot:
-            await job_event_hub.publish(job_id, _build_progress_event(job_snapshot))
+        # The queue lease already marked the job running.
+        await tracker.publish()
 
-        document = DocumentRepository.get(document_id, tenant_id, user_id)
+        document = await DocumentRepository.aget(document_id, tenant_id, user_id)
         if not document:
-            JobRepository.mark_error(job_id, tenant_id, "document not found")
-            await job_event_hub.publish(
-                job_id, _build_done_event(job_id, "error", "document not found", 0, 0, 0)
-            )
-            await job_event_hub.close(job_id)
+            await tracker.fail("document not found")
+            return
+
+        if resumed and document.get("status") == "indexed":
+            # The previous worker finished the document but died before closing the job.
+            total_chunks = int(document.get("chunk_count") or 0)
+            await tracker.succeed(processed_chunks=total_chunks, total_chunks=total_chunks)
             return
 
         try:
-            embedding_model = self._get_embedding_model(
+            embedding_model = await self._get_embedding_model(
                 int(document["embedding_model_id"]), tenant_id
             )
-            namespace_value = self._get_namespace_value(
+            namespace_value = await self._get_namespace_value(
                 int(document["namespace_id"]),
                 tenant_id,
                 user_id,
@@ -485,19 +598,6 @@ class KnowledgeWikiService:
                     source_uri=document["storage_uri"],
                 )
 
-                async def _on_progress(processed: int, total: int) -> None:
-                    progress = int(processed * 100 / total) if total else 0
-                    JobRepository.update_progress(
-                        job_id,
-                        tenant_id,
-                        processed_chunks=processed,
-                        total_chunks=total,
-                        progress=progress,
-                    )
-                    job_snapshot = JobRepository.get(job_id, tenant_id, user_id)
-                    if job_snapshot:
-                        await job_event_hub.publish(job_id, _build_progress_event(job_snapshot))
-
                 previews = await service.chunk(
                     KnowledgeChunkRequest(
                         sources=[source],
@@ -505,7 +605,7 @@ class KnowledgeWikiService:
                         progress_step=self._progress_step,
                     ),
                     namespace=namespace_value,
-                    progress_cb=_on_progress,
+                    progress_cb=tracker.update,
                 )
             finally:
                 await service.close()
@@ -516,7 +616,7 @@ class KnowledgeWikiService:
 
             total_chunks = len(preview.chunks)
 
-            DocumentRepository.update(
+            await DocumentRepository.aupdate(
                 document_id,
                 tenant_id,
                 user_id,
@@ -530,56 +630,35 @@ class KnowledgeWikiService:
                     "last_chunked_at": _now_time_str(),
                 },
             )
-            JobRepository.mark_success(
-                job_id,
-                tenant_id,
-                processed_chunks=total_chunks,
-                total_chunks=total_chunks,
-            )
-            job_snapshot = JobRepository.get(job_id, tenant_id, user_id)
-            if job_snapshot:
-                await job_event_hub.publish(job_id, _done_event_from_job(job_snapshot))
-            await job_event_hub.close(job_id)
+            await tracker.succeed(processed_chunks=total_chunks, total_chunks=total_chunks)
 
         except Exception as exc:
             logger.error("Chunk job failed: %s", exc, exc_info=True)
-            JobRepository.mark_error(job_id, tenant_id, str(exc))
-            DocumentRepository.update(
+            await DocumentRepository.aupdate(
                 document_id,
                 tenant_id,
                 user_id,
                 {"status": "error", "error_message": str(exc)},
             )
-            job_snapshot = JobRepository.get(job_id, tenant_id, user_id)
-            if job_snapshot:
-                await job_event_hub.publish(job_id, _done_event_from_job(job_snapshot))
-            else:
-                await job_event_hub.publish(
-                    job_id,
-                    _build_done_event(job_id, "error", str(exc), 0, 0, 0),
-                )
-            await job_event_hub.close(job_id)
+            await tracker.fail(str(exc))
 
     async def _run_chunk_edit_job(
         self,
         *,
-        job_id: int,
+        tracker: JobProgressTracker,
         document: dict[str, Any],
         chunk_id: str,
         content: str,
         tenant_id: int,
         user_id: int,
     ) -> None:
-        JobRepository.mark_running(job_id, tenant_id)
-        job_snapshot = JobRepository.get(job_id, tenant_id, user_id)
-        if job_snapshot:
-            await job_event_hub.publish(job_id, _build_progress_event(job_snapshot))
+        await tracker.publish()
 
         try:
-            embedding_model = self._get_embedding_model(
+            embedding_model = await self._get_embedding_model(
                 int(document["embedding_model_id"]), tenant_id
             )
-            namespace_value = self._get_namespace_value(
+            namespace_value = await self._get_namespace_value(
                 int(document["namespace_id"]),
                 tenant_id,
                 user_id,
@@ -593,23 +672,11 @@ class KnowledgeWikiService:
             finally:
                 await service.close()
 
-            JobRepository.mark_success(job_id, tenant_id, processed_chunks=1, total_chunks=1)
-            job_snapshot = JobRepository.get(job_id, tenant_id, user_id)
-            if job_snapshot:
-                await job_event_hub.publish(job_id, _done_event_from_job(job_snapshot))
-            await job_event_hub.close(job_id)
+            _chunk_count_cache.invalidate(int(document["document_id"]))
+            await tracker.succeed(processed_chunks=1, total_chunks=1)
         except Exception as exc:
             logger.error("Chunk edit failed: %s", exc, exc_info=True)
-            JobRepository.mark_error(job_id, tenant_id, str(exc))
-            job_snapshot = JobRepository.get(job_id, tenant_id, user_id)
-            if job_snapshot:
-                await job_event_hub.publish(job_id, _done_event_from_job(job_snapshot))
-            else:
-                await job_event_hub.publish(
-                    job_id,
-                    _build_done_event(job_id, "error", str(exc), 0, 0, 0),
-                )
-            await job_event_hub.close(job_id)
+            await tracker.fail(str(exc))
 
     def _resolve_chunk_config(
         self,
@@ -624,13 +691,13 @@ class KnowledgeWikiService:
             config.mode = chunk_mode
         return config
 
-    def _get_embedding_model(
+    async def _get_embedding_model(
         self,
         ai_model_id: int,
         tenant_id: int,
         tenant_code: str | None = None,
     ) -> dict[str, Any]:
-        model = AiModelRepository.get_model(ai_model_id, tenant_id)
+        model = await asyncio.to_thread(AiModelRepository.get_model, ai_model_id, tenant_id)
         if not model:
             raise BadRequestException("embedding model does not exist")
         if model.get("model_type") != "embeddings":
@@ -644,9 +711,9 @@ class KnowledgeWikiService:
             raise BadRequestException("embedding model api_key Invalid encryption format")
         if not model.get("embedding_dimension"):
             raise BadRequestException("embedding_dimension Not configured")
-        resolved_tenant_code = self._resolve_tenant_code(tenant_id, tenant_code)
+        resolved_tenant_code = await self._resolve_tenant_code(tenant_id, tenant_code)
         try:
-            decrypted_key = local_crypto_service.decrypt_key(
+            decrypted_key = await local_crypto_service.decrypt_key_async(
                 tenant_code=resolved_tenant_code,
                 ciphertext=encrypted_key,
             )
@@ -658,7 +725,7 @@ class KnowledgeWikiService:
         normalized["api_key"] = decrypted_key
         return normalized
 
-    def _resolve_tenant_code(self, tenant_id: int, tenant_code: str | None) -> str:
+    async def _resolve_tenant_code(self, tenant_id: int, tenant_code: str | None) -> str:
         normalized_input = str(tenant_code or "").strip()
         if normalized_input:
             return normalized_input
@@ -668,7 +735,7 @@ class KnowledgeWikiService:
         if scope_tenant_code and scope_tenant_id == tenant_id:
             return scope_tenant_code
 
-        resolved = TenantRepository.get_code(tenant_id)
+        resolved = await asyncio.to_thread(TenantRepository.get_code, tenant_id)
         if resolved:
             return resolved
         raise BadRequestException("tenant_code does not exist")
@@ -716,34 +783,40 @@ class KnowledgeWikiService:
         normalized.pop("embedding_dimension", None)
         return normalized
 
-    def _ensure_namespace_owner(self, tenant_id: int, user_id: int, namespace_id: int) -> None:
-        namespace = NamespaceRepository.get(namespace_id, tenant_id, user_id)
+    async def _ensure_namespace_owner(
+        self, tenant_id: int, user_id: int, namespace_id: int
+    ) -> None:
+        namespace = await NamespaceRepository.aget(namespace_id, tenant_id, user_id)
         if not namespace:
             raise NotFoundException("namespace does not exist")
 
-    def _get_namespace_value(self, namespace_id: int, tenant_id: int, user_id: int) -> str:
-        namespace = NamespaceRepository.get(namespace_id, tenant_id, user_id)
+    async def _get_namespace_value(self, namespace_id: int, tenant_id: int, user_id: int) -> str:
+        namespace = await NamespaceRepository.aget(namespace_id, tenant_id, user_id)
         if not namespace:
             raise NotFoundException("namespace does not exist")
         return namespace["namespace"]
 
-    def _ensure_namespace_embedding(
+    async def _ensure_namespace_embedding(
         self,
         namespace_id: int,
         tenant_id: int,
         embedding_model_id: int,
     ) -> None:
-        model_ids = DocumentRepository.list_namespace_embedding_models(namespace_id, tenant_id)
+        model_ids = await DocumentRepository.alist_namespace_embedding_models(
+            namespace_id, tenant_id
+        )
         if model_ids and embedding_model_id not in model_ids:
             raise ConflictException("namespace embedding_model_id conflict")
 
-    def _resolve_ns_embedding_model(self, namespace_id: int, tenant_id: int) -> int:
-        model_ids = DocumentRepository.list_namespace_embedding_models(namespace_id, tenant_id)
+    async def _resolve_ns_embedding_model(self, namespace_id: int, tenant_id: int) -> int:
+        model_ids = await DocumentRepository.alist_namespace_embedding_models(
+            namespace_id, tenant_id
+        )
         if not model_ids:
             raise BadRequestException("namespace Not configured embedding_model")
         return model_ids[0]
 
-    def _resolve_scope_doc_uids(
+    async def _resolve_scope_doc_uids(
         self,
         *,
         user_id: int,
@@ -763,7 +836,7 @@ class KnowledgeWikiService:
         doc_uids: list[str] = []
         for item in doc_ids:
             if isinstance(item, int) or (isinstance(item, str) and item.isdigit()):
-                document = DocumentRepository.get(int(item), tenant_id, user_id)
+                document = await DocumentRepository.aget(int(item), tenant_id, user_id)
                 if (
                     document
                     and int(document["namespace_id"]) == namespace_id
@@ -771,7 +844,7 @@ class KnowledgeWikiService:
                 ):
                     doc_uids.append(document["doc_uid"])
             elif isinstance(item, str):
-                document = DocumentRepository.get_by_doc_uid(item, tenant_id, user_id)
+                document = await DocumentRepository.aget_by_doc_uid(item, tenant_id, user_id)
                 if (
                     document
                     and int(document["namespace_id"]) == namespace_id
@@ -791,20 +864,22 @@ class KnowledgeWikiService:
             "embedding_status": "synced",
         }
 
-    def _create_job(
+    async def _create_job(
         self,
         namespace_id: int,
         document_id: int,
         tenant_id: int,
         user_id: int,
         job_type: str,
+        payload: dict[str, Any],
     ) -> int:
-        return JobRepository.create(
+        return await JobRepository.acreate(
             {
                 "tenant_id": tenant_id,
                 "namespace_id": namespace_id,
                 "document_id": document_id,
                 "job_type": job_type,
+                "payload_json": json.dumps(payload, ensure_ascii=False),
                 "status": "queued",
                 "progress": 0,
                 "progress_seq": 0,
@@ -818,6 +893,39 @@ class KnowledgeWikiService:
         )
 
 
+class _ChunkCountCache:
+    """Small TTL cache for filtered chunk totals (keyword/status counts scan the store)."""
+
+    def __init__(self, *, max_entries: int = 1024, ttl_seconds: float = 60.0) -> None:
+        self._entries: OrderedDict[tuple[Any, ...], tuple[float, int]] = OrderedDict()
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+
+    def get(self, key: tuple[Any, ...]) -> int | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, total = entry
+        if expires_at < time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return total
+
+    def put(self, key: tuple[Any, ...], total: int) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl, total)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, document_id: int) -> None:
+        for key in [key for key in self._entries if key[0] == document_id]:
+            self._entries.pop(key, None)
+
+
+_chunk_count_cache = _ChunkCountCache()
+
+
 def _infer_file_type(filename: str) -> str:
     ext = os.path.splitext(filename)[1].lstrip(".")
     return ext or "txt"
@@ -854,54 +962,5 @@ def _resolve_filename(document: dict[str, Any]) -> str:
     return f"{title}.{file_type}"
 
 
-def _build_progress_event(job: dict[str, Any]) -> dict[str, Any]:
-    payload = {
-        "job_id": job["job_id"],
-        "status": job["status"],
-        "progress": job["progress"],
-        "total_chunks": job["total_chunks"],
-        "processed_chunks": job["processed_chunks"],
-        "progress_seq": job["progress_seq"],
-    }
-    return {
-        "event": "progress",
-        "id": str(job["progress_seq"]),
-        "data": json.dumps(payload, ensure_ascii=False),
-    }
-
-
-def _build_done_event(
-    job_id: int, status: str, message: str, progress: int, processed: int, total: int
-):
-    payload = {
-        "job_id": job_id,
-        "status": status,
-        "progress": progress,
-        "processed_chunks": processed,
-        "total_chunks": total,
-        "message": message,
-    }
-    return {
-        "event": "done",
-        "id": str(int(time.time() * 1000)),
-        "data": json.dumps(payload, ensure_ascii=False),
-    }
-
-
-def _done_event_from_job(job: dict[str, Any]) -> dict[str, Any]:
-    payload = {
-        "job_id": job["job_id"],
-        "status": job["status"],
-        "progress": job["progress"],
-        "processed_chunks": job["processed_chunks"],
-        "total_chunks": job["total_chunks"],
-    }
-    return {
-        "event": "done",
-        "id": str(job["progress_seq"]),
-        "data": json.dumps(payload, ensure_ascii=False),
-    }
-
-
 def _now_time_str() -> str:
     return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
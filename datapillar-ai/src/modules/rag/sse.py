@@ -6,31 +6,135 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import AsyncGenerator
+import json
+import time
+from collections import OrderedDict
+from collections.abc import AsyncGenerator, Awaitable, Callable
 from typing import Any
 
+DEFAULT_LATEST_TTL_SECONDS = 3600.0
+DEFAULT_POLL_INTERVAL_SECONDS = 1.0
+TERMINAL_JOB_STATUSES = frozenset({"success", "error", "canceled"})
+
+JobFetcher = Callable[[], Awaitable[dict[str, Any] | None]]
+
+
+def job_progress_event(job: dict[str, Any]) -> dict[str, Any]:
+    """Progress event built from a job row."""
+    payload = {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "progress": job["progress"],
+        "total_chunks": job["total_chunks"],
+        "processed_chunks": job["processed_chunks"],
+        "progress_seq": job["progress_seq"],
+    }
+    return {
+        "event": "progress",
+        "id": str(job["progress_seq"]),
+        "data": json.dumps(payload, ensure_ascii=False),
+    }
+
+
+def job_done_event(job: dict[str, Any]) -> dict[str, Any]:
+    """Done event built from a finished job row."""
+    payload = {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "progress": job["progress"],
+        "processed_chunks": job["processed_chunks"],
+        "total_chunks": job["total_chunks"],
+    }
+    return {
+        "event": "done",
+        "id": str(job.get("progress_seq") or 0),
+        "data": json.dumps(payload, ensure_ascii=False),
+    }
+
 
 class JobEventHub:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        *,
+        latest_ttl_seconds: float = DEFAULT_LATEST_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
         self._subscribers: dict[int, set[asyncio.Queue[dict[str, Any]]]] = {}
+        # job_id -> (published at, event), oldest first; jobs that never reach close()
+        # (crashed runs) age out after latest_ttl_seconds.
+        self._latest: OrderedDict[int, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._latest_ttl_seconds = latest_ttl_seconds
+        self._clock = clock
+        # Jobs with a run in this process, between open() and close().
+        self._live: set[int] = set()
+
+    def open(self, job_id: int) -> None:
+        """Mark a job as running in this process: its events arrive through publish()."""
+        self._live.add(job_id)
+
+    def is_live(self, job_id: int) -> bool:
+        return job_id in self._live
+
+    def latest(self, job_id: int) -> dict[str, Any] | None:
+        """Latest progress event published in this process (ahead of the DB row)."""
+        self._prune_latest()
+        entry = self._latest.get(job_id)
+        return entry[1] if entry is not None else None
 
     async def subscribe(
         self,
         job_id: int,
         *,
         initial_event: dict[str, Any] | None = None,
+        last_seq: int = 0,
+        fetch: JobFetcher | None = None,
+        poll_interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS,
     ) -> AsyncGenerator[dict[str, Any], None]:
+        """
+        Stream a job's events until it is done.
+
+        Without fetch only runs in this process are seen. With fetch, the job row is
+        polled whenever no run of the job is live here (leased by another process or
+        an external worker):newer progress is replayed from the row and a terminal
+        status ends the stream with done.
+        """
         queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
         self._subscribers.setdefault(job_id, set()).add(queue)
 
         try:
             if initial_event is not None:
+                last_seq = max(last_seq, int(initial_event["id"]))
                 yield initial_event
             while True:
-                payload = await queue.get()
+                if fetch is None:
+                    payload = await queue.get()
+                else:
+                    try:
+                        payload = await asyncio.wait_for(queue.get(), timeout=poll_interval_seconds)
+                    except TimeoutError:
+                        if job_id in self._live:
+                            continue
+                        job = await fetch()
+                        if job is None:
+                            break
+                        if job["status"] in TERMINAL_JOB_STATUSES:
+                            yield job_done_event(job)
+                            break
+                        if int(job.get("progress_seq") or 0) > last_seq:
+                            event = job_progress_event(job)
+                            last_seq = int(event["id"])
+                            yield event
+                        continue
                 if payload.get("_stop"):
-                    break
+                    if fetch is None:
+                        break
+                    # The local run ended without done (crash or lost lease):follow the row.
+                    continue
+                if payload.get("id") is not None:
+                    last_seq = max(last_seq, int(payload["id"]))
                 yield payload
+                if payload.get("event") == "done":
+                    break
         finally:
             subscribers = self._subscribers.get(job_id)
             if subscribers:
@@ -39,14 +143,28 @@ class JobEventHub:
                     self._subscribers.pop(job_id, None)
 
     async def publish(self, job_id: int, payload: dict[str, Any]) -> None:
+        if payload.get("event") == "progress":
+            self._latest[job_id] = (self._clock(), payload)
+            self._latest.move_to_end(job_id)
+            self._prune_latest()
         queues = list(self._subscribers.get(job_id, set()))
         for queue in queues:
             queue.put_nowait(payload)
 
     async def close(self, job_id: int) -> None:
+        self._live.discard(job_id)
+        self._latest.pop(job_id, None)
         queues = list(self._subscribers.get(job_id, set()))
         for queue in queues:
             queue.put_nowait({"_stop": True})
 
+    def _prune_latest(self) -> None:
+        deadline = self._clock() - self._latest_ttl_seconds
+        while self._latest:
+            published_at = next(iter(self._latest.values()))[0]
+            if published_at > deadline:
+                break
+            self._latest.popitem(last=False)
+
 
 job_event_hub = JobEventHub()
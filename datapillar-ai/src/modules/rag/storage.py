@@ -1,17 +1,35 @@
 # @author Sunny
 # @date 2026-01-28
 
-"""RAG knowledge Wiki File storage."""
+"""
+RAG knowledge Wiki File storage.
+
+Uploads are streamed: callers pass an async iterator of byte chunks, local files
+are written through a temporary ".part" file and S3 objects through multipart
+upload, so memory stays at one part regardless of file size. A sha256 checksum
+and the size are computed while streaming.
+
+Reads are streamed too (open_stream), with optional byte ranges (read_range)
+for consumers that only need part of an object.
+"""
 
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import hashlib
 import os
 import uuid
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from typing import Any
 from urllib.parse import urlparse
 
+DEFAULT_READ_CHUNK_SIZE = 1024 * 1024
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+# S3 rejects multipart parts below 5 MiB (except the last one).
+_MIN_PART_SIZE = 5 * 1024 * 1024
+
 
 @dataclass
 class StorageResult:
@@ -19,6 +37,7 @@ class StorageResult:
     storage_type: str
     storage_key: str
     size_bytes: int
+    checksum: str | None = None
 
 
 class StorageManager:
@@ -32,6 +51,7 @@ class StorageManager:
         self._local_dir = config.get("local_dir")
         self._s3_cfg = config.get("s3")
         self._s3_client = None
+        self._part_size = DEFAULT_PART_SIZE
 
         if self._storage_type == "local":
             if not isinstance(self._local_dir, str) or not self._local_dir.strip():
@@ -44,44 +64,119 @@ class StorageManager:
             bucket = self._s3_cfg.get("bucket")
             if not isinstance(bucket, str) or not bucket.strip():
                 raise ValueError("knowledge_wiki.storage.s3.bucket Missing")
+            part_size_mb = self._s3_cfg.get("part_size_mb")
+            if part_size_mb:
+                self._part_size = max(int(part_size_mb) * 1024 * 1024, _MIN_PART_SIZE)
             self._init_s3_client()
             return
 
         raise ValueError(f"Unsupported knowledge base storage type: {self._storage_type}")
 
     async def save(self, *, namespace_id: int, filename: str, content: bytes) -> StorageResult:
+        return await self.save_stream(
+            namespace_id=namespace_id,
+            filename=filename,
+            chunks=_single_chunk(content),
+        )
+
+    async def save_stream(
+        self,
+        *,
+        namespace_id: int,
+        filename: str,
+        chunks: AsyncIterator[bytes],
+    ) -> StorageResult:
+        key = f"{namespace_id}/{uuid.uuid4().hex}_{_sanitize_filename(filename)}"
         if self._storage_type == "s3":
-            return await asyncio.to_thread(self._save_s3, namespace_id, filename, content)
-        return await asyncio.to_thread(self._save_local, namespace_id, filename, content)
+            return await self._save_s3_stream(key, chunks)
+        return await self._save_local_stream(key, chunks)
 
     async def read(self, storage_uri: str) -> bytes:
+        return b"".join([chunk async for chunk in self.open_stream(storage_uri)])
+
+    async def read_range(self, storage_uri: str, start: int, end: int) -> bytes:
+        """Read bytes [start, end) of a stored object."""
+        if start < 0 or end < start:
+            raise ValueError("Invalid byte range")
+        if end == start:
+            return b""
+        return b"".join(
+            [chunk async for chunk in self.open_stream(storage_uri, start=start, end=end)]
+        )
+
+    async def open_stream(
+        self,
+        storage_uri: str,
+        *,
+        start: int = 0,
+        end: int | None = None,
+        chunk_size: int = DEFAULT_READ_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Iterate over a stored object (optionally bytes [start, end)) chunk by chunk."""
         if storage_uri.startswith("s3://"):
-            return await asyncio.to_thread(self._read_s3, storage_uri)
+            body = await asyncio.to_thread(self._open_s3, storage_uri, start, end)
+            try:
+                while chunk := await asyncio.to_thread(body.read, chunk_size):
+                    yield chunk
+            finally:
+                body.close()
+            return
         if storage_uri.startswith("file://"):
-            return await asyncio.to_thread(self._read_local, storage_uri)
+            handle = await asyncio.to_thread(self._open_local, storage_uri, start)
+            remaining = None if end is None else end - start
+            try:
+                while remaining is None or remaining > 0:
+                    size = chunk_size if remaining is None else min(chunk_size, remaining)
+                    chunk = await asyncio.to_thread(handle.read, size)
+                    if not chunk:
+                        break
+                    if remaining is not None:
+                        remaining -= len(chunk)
+                    yield chunk
+            finally:
+                handle.close()
+            return
         raise ValueError("Unsupported storage_uri")
 
-    def _save_local(self, namespace_id: int, filename: str, content: bytes) -> StorageResult:
-        safe_name = _sanitize_filename(filename)
-        key = f"{namespace_id}/{uuid.uuid4().hex}_{safe_name}"
+    # ==================== Local ====================
+
+    async def _save_local_stream(self, key: str, chunks: AsyncIterator[bytes]) -> StorageResult:
         path = os.path.abspath(os.path.join(self._local_dir, key))
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, "wb") as f:
-            f.write(content)
+        part_path = f"{path}.part"
+        await asyncio.to_thread(os.makedirs, os.path.dirname(path), exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        handle = await asyncio.to_thread(open, part_path, "wb")
+        try:
+            async for chunk in chunks:
+                digest.update(chunk)
+                size += len(chunk)
+                await asyncio.to_thread(handle.write, chunk)
+            await asyncio.to_thread(handle.close)
+            await asyncio.to_thread(os.replace, part_path, path)
+        except BaseException:
+            handle.close()
+            await asyncio.to_thread(_remove_quietly, part_path)
+            raise
         return StorageResult(
             storage_uri=f"file:///{path.lstrip('/')}",
             storage_type="local",
             storage_key=key,
-            size_bytes=len(content),
+            size_bytes=size,
+            checksum=digest.hexdigest(),
         )
 
-    def _read_local(self, storage_uri: str) -> bytes:
+    def _open_local(self, storage_uri: str, start: int):
         parsed = urlparse(storage_uri)
         path = os.path.abspath(parsed.path)
         if not os.path.exists(path):
             raise FileNotFoundError("Local file not found")
-        with open(path, "rb") as f:
-            return f.read()
+        handle = open(path, "rb")  # noqa: SIM115 - closed by open_stream
+        if start:
+            handle.seek(start)
+        return handle
+
+    # ==================== S3 ====================
 
     def _init_s3_client(self) -> None:
         import boto3
@@ -98,23 +193,87 @@ class StorageManager:
             region_name=region,
         )
 
-    def _save_s3(self, namespace_id: int, filename: str, content: bytes) -> StorageResult:
+    async def _save_s3_stream(self, key: str, chunks: AsyncIterator[bytes]) -> StorageResult:
         if not self._s3_client:
             raise ValueError("S3 client not configured")
         bucket = self._s3_cfg.get("bucket")
         if not bucket:
             raise ValueError("S3 bucket is required")
-        safe_name = _sanitize_filename(filename)
-        key = f"{namespace_id}/{uuid.uuid4().hex}_{safe_name}"
-        self._s3_client.put_object(Bucket=bucket, Key=key, Body=content)
+
+        digest = hashlib.sha256()
+        size = 0
+        buffer = bytearray()
+        upload_id: str | None = None
+        parts: list[dict[str, Any]] = []
+        try:
+            async for chunk in chunks:
+                digest.update(chunk)
+                size += len(chunk)
+                buffer += chunk
+                while len(buffer) >= self._part_size:
+                    if upload_id is None:
+                        upload_id = await asyncio.to_thread(self._create_multipart, bucket, key)
+                    part = bytes(buffer[: self._part_size])
+                    del buffer[: self._part_size]
+                    parts.append(
+                        await asyncio.to_thread(
+                            self._upload_part, bucket, key, upload_id, len(parts) + 1, part
+                        )
+                    )
+
+            if upload_id is None:
+                # Smaller than one part: a single PUT is cheaper than a multipart upload.
+                await asyncio.to_thread(
+                    self._s3_client.put_object, Bucket=bucket, Key=key, Body=bytes(buffer)
+                )
+            else:
+                if buffer:
+                    parts.append(
+                        await asyncio.to_thread(
+                            self._upload_part, bucket, key, upload_id, len(parts) + 1, bytes(buffer)
+                        )
+                    )
+                await asyncio.to_thread(
+                    self._s3_client.complete_multipart_upload,
+                    Bucket=bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    MultipartUpload={"Parts": parts},
+                )
+        except BaseException:
+            if upload_id is not None:
+                await asyncio.to_thread(
+                    self._s3_client.abort_multipart_upload,
+                    Bucket=bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                )
+            raise
         return StorageResult(
             storage_uri=f"s3://{bucket}/{key}",
             storage_type="s3",
             storage_key=key,
-            size_bytes=len(content),
+            size_bytes=size,
+            checksum=digest.hexdigest(),
+        )
+
+    def _create_multipart(self, bucket: str, key: str) -> str:
+        response = self._s3_client.create_multipart_upload(Bucket=bucket, Key=key)
+        return response["UploadId"]
+
+    def _upload_part(
+        self, bucket: str, key: str, upload_id: str, part_number: int, body: bytes
+    ) -> dict[str, Any]:
+        response = self._s3_client.upload_part(
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=body,
         )
+        return {"ETag": response["ETag"], "PartNumber": part_number}
 
-    def _read_s3(self, storage_uri: str) -> bytes:
+    def _open_s3(self, storage_uri: str, start: int, end: int | None):
         if not self._s3_client:
             raise ValueError("S3 client not configured")
         parsed = urlparse(storage_uri)
@@ -122,11 +281,24 @@ class StorageManager:
         key = parsed.path.lstrip("/")
         if not bucket or not key:
             raise ValueError("Invalid s3 uri")
-        response = self._s3_client.get_object(Bucket=bucket, Key=key)
+        params: dict[str, Any] = {"Bucket": bucket, "Key": key}
+        if start or end is not None:
+            # HTTP ranges are inclusive.
+            params["Range"] = f"bytes={start}-{'' if end is None else end - 1}"
+        response = self._s3_client.get_object(**params)
         body = response.get("Body")
         if not body:
             raise ValueError("S3 object body is empty")
-        return body.read()
+        return body
+
+
+async def _single_chunk(content: bytes) -> AsyncIterator[bytes]:
+    yield content
+
+
+def _remove_quietly(path: str) -> None:
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(path)
 
 
 def _sanitize_filename(name: str) -> str:
@@ -0,0 +1,52 @@
+# @author Sunny
+# @date 2026-01-28
+
+"""
+RAG ingestion worker entrance
+
+Runs the ingestion job queue outside the API process
+(knowledge_wiki.job_queue.mode = external):
+
+    python -m src.modules.rag.worker
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import signal
+
+from src.infrastructure.database import MySQLClient
+from src.modules.rag.job_queue import build_ingestion_queue
+from src.modules.rag.service import KnowledgeWikiService
+from src.shared.config import settings
+from src.shared.config.logging import setup_logging
+from src.shared.config.nacos_client import bootstrap_nacos
+
+logger = logging.getLogger(__name__)
+
+
+async def run_worker() -> None:
+    runtime = await bootstrap_nacos(settings)
+    queue = build_ingestion_queue(KnowledgeWikiService().run_job)
+    stop_event = asyncio.Event()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(sig, stop_event.set)
+
+    try:
+        MySQLClient.get_engine()
+        await queue.start()
+        await stop_event.wait()
+    finally:
+        await queue.stop()
+        MySQLClient.close()
+        await runtime.shutdown()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    asyncio.run(run_worker())
@@ -1,22 +1,29 @@
 # @author Sunny
 # @date 2026-01-27
 
-"""Global authentication middleware."""
+"""Global authentication middleware.
+
+Pure ASGI(no BaseHTTPMiddleware):the request runs in the caller's task and the
+response is sent straight through,so SSE streams are not wrapped or buffered.
+
+Gzip request bodies are inflated incrementally while the app reads them,bounded by
+max_decompressed_bytes(413 beyond that,gzip bombs stop at the limit).
+"""
 
 from __future__ import annotations
 
-import gzip
 import logging
-from collections.abc import Callable
-from typing import Any
+import zlib
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.shared.auth.user import CurrentUser
 from src.shared.config.runtime import get_runtime_config
 from src.shared.context import reset_request_scope, set_request_scope
 from src.shared.exception import ServiceUnavailableException, UnauthorizedException
+from src.shared.web.code import Code
 
 logger = logging.getLogger(__name__)
 
@@ -30,8 +37,77 @@ HEADER_EMAIL = "X-User-Email"
 HEADER_ROLES = "X-User-Roles"
 HEADER_TRACE_ID = "X-Trace-Id"
 
+DEFAULT_MAX_DECOMPRESSED_BYTES = 32 * 1024 * 1024
+_INFLATE_STEP_BYTES = 1024 * 1024
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+class GzipRequestReceive:
+    """receive() wrapper that inflates a gzip body chunk by chunk.
+
+    A body that is not gzip at all(the first chunk cannot be inflated) is passed on
+    unchanged,like the previous buffered decoder did.
+    """
 
-class AuthMiddleware(BaseHTTPMiddleware):
+    def __init__(self, receive: Receive, *, max_size: int) -> None:
+        self._receive = receive
+        self._max_size = max_size
+        self._decompressor = zlib.decompressobj(_GZIP_WBITS)
+        self._size = 0
+        self._started = False
+        self._passthrough = False
+
+    async def __call__(self) -> Message:
+        message = await self._receive()
+        if message["type"] != "http.request" or self._passthrough:
+            return message
+        more_body = message.get("more_body", False)
+        body = self._inflate(message.get("body", b""), final=not more_body)
+        return {"type": "http.request", "body": body, "more_body": more_body}
+
+    def _inflate(self, data: bytes, *, final: bool) -> bytes:
+        chunks: list[bytes] = []
+        try:
+            while data:
+                # max_length bounds the output of one call:a tiny chunk cannot expand past
+                # the limit(or by more than one step) before it is checked.
+                step = min(self._max_size - self._size + 1, _INFLATE_STEP_BYTES)
+                chunk = self._decompressor.decompress(data, step)
+                self._account(chunk)
+                chunks.append(chunk)
+                if self._decompressor.eof:
+                    # Concatenated gzip members:start over on what follows the trailer.
+                    data = self._decompressor.unused_data
+                    if data:
+                        self._decompressor = zlib.decompressobj(_GZIP_WBITS)
+                else:
+                    data = self._decompressor.unconsumed_tail
+                self._started = True
+            if final:
+                tail = self._decompressor.flush()
+                self._account(tail)
+                chunks.append(tail)
+                if not self._decompressor.eof:
+                    raise zlib.error("truncated gzip stream")
+        except zlib.error as exc:
+            if not self._started and not chunks:
+                logger.warning("Gzip decompression failed,passing body through:%s", exc)
+                self._passthrough = True
+                return data
+            logger.warning("Gzip decompression failed:%s", exc)
+            raise HTTPException(
+                status_code=Code.BAD_REQUEST, detail="Invalid gzip request body"
+            ) from exc
+        return b"".join(chunks)
+
+    def _account(self, chunk: bytes) -> None:
+        self._size += len(chunk)
+        if self._size > self._max_size:
+            logger.warning("Gzip request body exceeds %s bytes after decompression", self._max_size)
+            raise HTTPException(status_code=Code.PAYLOAD_TOO_LARGE, detail="Request body too large")
+
+
+class AuthMiddleware:
     """Unified request entry middleware:
     Gzip decode + trusted identity authentication."""
 
@@ -43,25 +119,54 @@ class AuthMiddleware(BaseHTTPMiddleware):
         "/api/ai/openapi.json",
     }
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        await self._maybe_decode_gzip_request(request)
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        max_decompressed_bytes: int = DEFAULT_MAX_DECOMPRESSED_BYTES,
+    ) -> None:
+        self.app = app
+        self.max_decompressed_bytes = max_decompressed_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if headers.get("content-encoding", "").lower() == "gzip":
+            scope = self._strip_encoding_headers(scope)
+            receive = GzipRequestReceive(receive, max_size=self.max_decompressed_bytes)
 
-        path = request.url.path
+        path = scope["path"]
         if path in self.WHITELIST_PATHS or path.startswith("/docs") or path.startswith("/redoc"):
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
+
+        current_user = self._authenticate(headers, path)
+        scope.setdefault("state", {})["current_user"] = current_user
 
+        token = set_request_scope(
+            current_user.tenant_id, current_user.user_id, current_user.tenant_code
+        )
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            reset_request_scope(token)
+
+    def _authenticate(self, headers: Headers, path: str) -> CurrentUser:
         if not self._is_trusted_identity_enabled():
             raise ServiceUnavailableException("Authentication configuration is not available")
 
-        issuer = self._normalize(request.headers.get(HEADER_ISSUER))
-        subject = self._normalize(request.headers.get(HEADER_SUBJECT))
-        tenant_code = self._normalize(request.headers.get(HEADER_TENANT_CODE))
-        username = self._normalize(request.headers.get(HEADER_USERNAME)) or subject
-        email = self._normalize(request.headers.get(HEADER_EMAIL))
-        trace_id = self._normalize(request.headers.get(HEADER_TRACE_ID))
-        user_id = self._parse_positive_int(request.headers.get(HEADER_USER_ID))
-        tenant_id = self._parse_positive_int(request.headers.get(HEADER_TENANT_ID))
-        roles = self._parse_roles(request.headers.get(HEADER_ROLES))
+        issuer = self._normalize(headers.get(HEADER_ISSUER))
+        subject = self._normalize(headers.get(HEADER_SUBJECT))
+        tenant_code = self._normalize(headers.get(HEADER_TENANT_CODE))
+        username = self._normalize(headers.get(HEADER_USERNAME)) or subject
+        email = self._normalize(headers.get(HEADER_EMAIL))
+        trace_id = self._normalize(headers.get(HEADER_TRACE_ID))
+        user_id = self._parse_positive_int(headers.get(HEADER_USER_ID))
+        tenant_id = self._parse_positive_int(headers.get(HEADER_TENANT_ID))
+        roles = self._parse_roles(headers.get(HEADER_ROLES))
 
         if issuer is None or subject is None:
             logger.warning("[Auth] Missing trusted principal headers:path=%s", path)
@@ -83,7 +188,6 @@ class AuthMiddleware(BaseHTTPMiddleware):
             email=email,
             roles=tuple(roles),
         )
-        request.state.current_user = current_user
         logger.info(
             "[Auth] trusted_identity_resolved iss=%s sub=%s preferred_username=%s tenant_code=%s trace_id=%s",
             issuer,
@@ -92,50 +196,17 @@ class AuthMiddleware(BaseHTTPMiddleware):
             tenant_code,
             trace_id or "",
         )
+        return current_user
 
-        token = set_request_scope(tenant_id, user_id, tenant_code)
-        try:
-            return await call_next(request)
-        finally:
-            reset_request_scope(token)
-
-    async def _maybe_decode_gzip_request(self, request: Request) -> None:
-        content_encoding = request.headers.get("content-encoding", "").lower()
-        if content_encoding != "gzip":
-            return
-
-        compressed_body = await request.body()
-        try:
-            decompressed_body = gzip.decompress(compressed_body)
-        except Exception as exc:
-            logger.warning("Gzip decompression failed:%s", exc)
-            decompressed_body = compressed_body
-
-        request.scope["headers"] = [
+    @staticmethod
+    def _strip_encoding_headers(scope: Scope) -> Scope:
+        # The inflated length is unknown up front:drop content-length with the encoding.
+        headers: list[tuple[bytes, bytes]] = [
             (key, value)
-            for key, value in request.scope.get("headers", [])
+            for key, value in scope.get("headers", [])
             if key.lower() not in (b"content-encoding", b"content-length")
         ]
-        request.scope["headers"].append((b"content-length", str(len(decompressed_body)).encode()))
-        if hasattr(request, "_headers"):
-            delattr(request, "_headers")
-        request._body = decompressed_body  # type: ignore[attr-defined]
-        if hasattr(request, "_json"):
-            delattr(request, "_json")
-        request._receive = self._build_replay_receive(decompressed_body)  # type: ignore[attr-defined]
-
-    @staticmethod
-    def _build_replay_receive(body: bytes) -> Callable[[], Any]:
-        body_sent = False
-
-        async def replay_receive() -> dict[str, Any]:
-            nonlocal body_sent
-            if not body_sent:
-                body_sent = True
-                return {"type": "http.request", "body": body, "more_body": False}
-            return {"type": "http.disconnect"}
-
-        return replay_receive
+        return {**scope, "headers": headers}
 
     def _is_trusted_identity_enabled(self) -> bool:
         try:
@@ -6,6 +6,8 @@ Nacos Configuration loading and service registration
 
 constraint:- Nacos As the only configuration source,Don't be a local cover-up
 - Only pull configuration during startup phase(Hot update is not performed by default)
+- With NACOS_CONFIG_WATCH a changed config is applied and the reload hooks run
+  (add_config_reload_hook),so caches derived from it can be dropped
 """
 
 from __future__ import annotations
@@ -38,7 +40,9 @@ from src.shared.config.runtime import (
 logger = logging.getLogger(__name__)
 
 ConfigChangeListener = Callable[[str, str, str, str], Awaitable[None]]
+ConfigReloadHook = Callable[[], None]
 _nacos_runtime_cache: NacosRuntime | None = None
+_config_reload_hooks: list[ConfigReloadHook] = []
 
 
 @dataclass(frozen=True)
@@ -284,6 +288,7 @@ async def start_config_watch(
             )
             data = parse_nacos_config_content(content, changed_data_id, changed_group)
             apply_nacos_config(settings, data)
+            run_config_reload_hooks()
             logger.info(
                 "Nacos Configure monitoring to take effect:dataId=%s,group=%s,tenant=%s",
                 changed_data_id,
@@ -298,6 +303,25 @@ async def start_config_watch(
     return _listener
 
 
+def add_config_reload_hook(hook: ConfigReloadHook) -> None:
+    """Register a callback run after a watched config change has been applied"""
+    if hook not in _config_reload_hooks:
+        _config_reload_hooks.append(hook)
+
+
+def remove_config_reload_hook(hook: ConfigReloadHook) -> None:
+    if hook in _config_reload_hooks:
+        _config_reload_hooks.remove(hook)
+
+
+def run_config_reload_hooks() -> None:
+    for hook in list(_config_reload_hooks):
+        try:
+            hook()
+        except Exception as exc:
+            logger.error("Nacos Config reload hook failed:%s", exc, exc_info=True)
+
+
 def _resolve_change_pair(
     second: str,
     third: str,
@@ -58,11 +58,33 @@ class KnowledgeWikiStorageRuntimeConfig(BaseModel):
         return self
 
 
+class KnowledgeWikiJobQueueRuntimeConfig(BaseModel):
+    mode: str = "inprocess"
+    workers: int = Field(default=4, ge=1)
+    per_tenant_limit: int = Field(default=2, ge=1)
+    lease_seconds: float = Field(default=60.0, gt=0)
+    poll_interval_seconds: float = Field(default=2.0, gt=0)
+    max_attempts: int = Field(default=3, ge=1)
+
+    @field_validator("mode")
+    @classmethod
+    def _validate_mode(cls, value: str) -> str:
+        normalized = value.strip().lower()
+        if normalized not in {"inprocess", "external"}:
+            raise ValueError("knowledge_wiki.job_queue.mode Only supports inprocess or external")
+        return normalized
+
+
 class KnowledgeWikiRuntimeConfig(BaseModel):
     storage: KnowledgeWikiStorageRuntimeConfig
     vector_store: dict[str, Any]
     embedding_batch_size: int = Field(ge=1)
     progress_step: int = Field(ge=1)
+    progress_flush_interval_ms: int = Field(default=1000, ge=0)
+    progress_flush_steps: int = Field(default=10, ge=1)
+    job_queue: KnowledgeWikiJobQueueRuntimeConfig = Field(
+        default_factory=KnowledgeWikiJobQueueRuntimeConfig
+    )
 
     @field_validator("vector_store")
     @classmethod
@@ -72,6 +94,22 @@ class KnowledgeWikiRuntimeConfig(BaseModel):
         return value
 
 
+class LlmUsageRuntimeConfig(BaseModel):
+    write_behind: bool = True
+    buffer: str = "memory"
+    flush_interval_seconds: float = Field(default=5.0, gt=0)
+    max_batch_rows: int = Field(default=500, ge=1, le=5000)
+    max_pending_rows: int = Field(default=50_000, ge=1)
+
+    @field_validator("buffer")
+    @classmethod
+    def _validate_buffer(cls, value: str) -> str:
+        normalized = value.strip().lower()
+        if normalized not in {"memory", "redis"}:
+            raise ValueError("llm_usage.buffer Only supports memory or redis")
+        return normalized
+
+
 class KeyStorageRuntimeConfig(BaseModel):
     type: str
     local_path: str | None = None
@@ -122,10 +160,14 @@ class RuntimeConfigContract(BaseModel):
     mysql_database: str
     mysql_username: str
     mysql_password: str
+    mysql_pool_size: int = Field(default=10, ge=1, le=512)
+    mysql_max_overflow: int = Field(default=20, ge=0, le=512)
     neo4j_uri: str
     neo4j_database: str
     neo4j_username: str
     neo4j_password: str
+    neo4j_write_batch_size: int = Field(default=5000, ge=1, le=100000)
+    lineage_cache_max_staleness_seconds: float = Field(default=300.0, ge=0)
     redis_host: str
     redis_port: int = Field(ge=1, le=65535)
     redis_db: int = Field(ge=0)
@@ -141,6 +183,7 @@ class RuntimeConfigContract(BaseModel):
     agent: dict[str, Any]
     sql_summary: SQLSummaryRuntimeConfig
     knowledge_wiki: KnowledgeWikiRuntimeConfig
+    llm_usage: LlmUsageRuntimeConfig = Field(default_factory=LlmUsageRuntimeConfig)
     security: SecurityRuntimeConfig
 
     @field_validator(
@@ -237,6 +280,10 @@ def get_llm_config() -> dict[str, Any]:
     return deepcopy(get_runtime_config().llm)
 
 
+def get_llm_usage_config() -> dict[str, Any]:
+    return get_runtime_config().llm_usage.model_dump()
+
+
 def get_agent_config() -> dict[str, Any]:
     return deepcopy(get_runtime_config().agent)
 
@@ -247,3 +294,16 @@ def get_key_storage_config() -> dict[str, Any]:
 
 def get_default_tenant_id() -> int:
     return int(get_runtime_config().security.default_tenant_id)
+
+
+def get_mysql_pool_config() -> tuple[int, int]:
+    config = get_runtime_config()
+    return int(config.mysql_pool_size), int(config.mysql_max_overflow)
+
+
+def get_neo4j_write_batch_size() -> int:
+    return int(get_runtime_config().neo4j_write_batch_size)
+
+
+def get_lineage_cache_max_staleness_seconds() -> float:
+    return float(get_runtime_config().lineage_cache_max_staleness_seconds)
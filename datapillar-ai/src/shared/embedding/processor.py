@@ -6,24 +6,44 @@ Embedding batch processor(share)
 
 After the metadata is written,the nodes that need to be vectorized are put into the queue.,
 Bulk consumption,call embedding API,write back Neo4j
+
+Backlog:
+- durable by default:tasks go to a Redis stream(RedisStreamEventQueue)and are acked only
+  after their vectors are written,so a deploy or crash after a large metadata sync resumes
+  where it stopped instead of leaving nodes without vectors
+- delivery is at-least-once;writes carry the task version(enqueue time)and
+  write_embeddings_batch never replaces a newer vector with an older one
+- provider calls are sized by AdaptiveBatchSizer:grow while calls finish under the target
+  latency,halve on slow or failed calls,and never exceed the estimated token budget
 """
 
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
-from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass, field
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass, field
 from datetime import UTC, datetime
 from typing import Any
 
+from src.infrastructure.database import RedisClient
 from src.infrastructure.llm.embeddings import UnifiedEmbedder
 from src.infrastructure.repository.neo4j_uow import neo4j_async_session
 from src.shared.config.runtime import get_default_tenant_id
-from src.shared.utils.event_queue import AsyncEventQueue, QueueConfig
+from src.shared.utils.event_queue import (
+    AsyncEventQueue,
+    RedisStreamEventQueue,
+    StreamQueueConfig,
+)
+from src.shared.utils.tokens import estimate_tokens
 
 logger = logging.getLogger(__name__)
 
+EMBEDDING_STREAM = "datapillar:embedding:backlog"
+EMBEDDING_CONSUMER_GROUP = "embedding-processor"
+
 
 @dataclass
 class EmbeddingTask:
@@ -33,6 +53,66 @@ class EmbeddingTask:
     node_id: str
     node_label: str
     text: str
+    # Enqueue time(ms):a redelivered older task never overwrites a newer vector
+    version: int = field(default_factory=lambda: time.time_ns() // 1_000_000)
+
+
+def encode_task(task: EmbeddingTask) -> str:
+    return json.dumps(asdict(task), ensure_ascii=False, separators=(",", ":"))
+
+
+def decode_task(data: str) -> EmbeddingTask:
+    return EmbeddingTask(**json.loads(data))
+
+
+class AdaptiveBatchSizer:
+    """
+    Batch size for embedding provider calls
+
+    Additive increase(+25%)while calls finish under half the target latency,
+    halve when a call is slower than the target or fails.Chunks also stay under
+    max_tokens estimated tokens,the provider's per-request token limit.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_size: int = 32,
+        min_size: int = 1,
+        max_size: int = 256,
+        max_tokens: int = 100_000,
+        target_latency_seconds: float = 2.0,
+    ) -> None:
+        self.min_size = max(1, min_size)
+        self.max_size = max(self.min_size, max_size)
+        self.max_tokens = max_tokens
+        self.target_latency_seconds = target_latency_seconds
+        self._size = min(max(initial_size, self.min_size), self.max_size)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def record(self, size: int, latency_seconds: float, *, ok: bool = True) -> None:
+        """Feed back one provider call"""
+        if not ok or latency_seconds > self.target_latency_seconds:
+            self._size = max(self.min_size, self._size // 2)
+        elif latency_seconds < self.target_latency_seconds / 2 and size >= self._size:
+            self._size = min(self.max_size, self._size + max(1, self._size // 4))
+
+    def chunks(self, tasks: list[EmbeddingTask]) -> Iterator[list[EmbeddingTask]]:
+        """Split tasks into provider calls of at most size tasks / max_tokens tokens"""
+        chunk: list[EmbeddingTask] = []
+        tokens = 0
+        for task in tasks:
+            task_tokens = estimate_tokens(task.text)
+            if chunk and (len(chunk) >= self._size or tokens + task_tokens > self.max_tokens):
+                yield chunk
+                chunk, tokens = [], 0
+            chunk.append(task)
+            tokens += task_tokens
+        if chunk:
+            yield chunk
 
 
 @dataclass
@@ -41,6 +121,8 @@ class ProcessorStats:
 
     total_embedded: int = 0
     total_failed: int = 0
+    provider_calls: int = 0
+    provider_seconds: float = 0.0
     start_time: datetime = field(default_factory=lambda: datetime.now(UTC))
     last_batch_time: datetime | None = None
 
@@ -49,61 +131,79 @@ class ProcessorStats:
         return {
             "total_embedded": self.total_embedded,
             "total_failed": self.total_failed,
+            "provider_calls": self.provider_calls,
+            "avg_provider_latency_seconds": (
+                round(self.provider_seconds / self.provider_calls, 3)
+                if self.provider_calls
+                else None
+            ),
             "uptime_seconds": round(uptime, 2),
             "last_batch_time": self.last_batch_time.isoformat() if self.last_batch_time else None,
         }
 
 
+async def _redis_client() -> Any:
+    return (await RedisClient.get_instance()).client
+
+
 class EmbeddingProcessor:
     """
     Embedding batch processor
 
-    Processing flow:1.receive embedding Task enqueue
-    2.batch call embedding API(Triggered when the quantity reaches the threshold or timeout)
-    3.Batch writeback Neo4j
+    Processing flow:1.receive embedding Task enqueue(Redis stream by default)
+    2.batch call embedding API(adaptive size,up to max_concurrency calls in flight)
+    3.Batch writeback Neo4j,then ack the batch
     """
 
-    def __init__(self, *, metadata_repo: Any):
+    def __init__(
+        self,
+        *,
+        metadata_repo: Any,
+        queue: AsyncEventQueue | RedisStreamEventQueue | None = None,
+        sizer: AdaptiveBatchSizer | None = None,
+        max_concurrency: int = 4,
+        embedder_factory: Callable[[int], Any] | None = None,
+        session_factory: Callable[[], Any] = neo4j_async_session,
+    ):
         self._metadata_repo = metadata_repo
-        self._embedder_cache: dict[int, UnifiedEmbedder] = {}
-        self._executor = ThreadPoolExecutor(max_workers=4)
+        self._embedder_cache: dict[int, Any] = {}
+        self._embedder_factory = embedder_factory or UnifiedEmbedder
+        self._session_factory = session_factory
+        self._sizer = sizer or AdaptiveBatchSizer()
+        self._call_slots = asyncio.Semaphore(max(1, max_concurrency))
         self._stats = ProcessorStats()
 
-        # from embedder Get batch size
-        batch_size = 20
-        try:
-            embedder = self._get_embedder(get_default_tenant_id())
-            batch_size = embedder.batch_size
-        except Exception as exc:
-            logger.debug(
-                "embedding_processor_get_batch_size_failed",
-                extra={"data": {"error": str(exc)}},
-            )
-
-        # Initialize queue
-        queue_config = QueueConfig(
-            max_size=10000,
-            batch_size=batch_size,
-            flush_interval_seconds=3.0,
+        # One queue batch is one ack unit;it is split into provider calls by the sizer
+        self._queue = queue if queue is not None else RedisStreamEventQueue(
+            stream=EMBEDDING_STREAM,
+            group=EMBEDDING_CONSUMER_GROUP,
+            encode=encode_task,
+            decode=decode_task,
+            client_factory=_redis_client,
+            config=StreamQueueConfig(
+                batch_size=self._sizer.max_size * max(1, max_concurrency),
+                flush_interval_seconds=3.0,
+            ),
         )
-        self._queue = AsyncEventQueue(config=queue_config)
         self._queue.set_processor(self._process_batch)
 
         logger.info(
             "embedding_processor_initialized",
             extra={
                 "data": {
-                    "batch_size": batch_size,
-                    "flush_interval": queue_config.flush_interval_seconds,
+                    "queue": type(self._queue).__name__,
+                    "batch_size": self._sizer.size,
+                    "max_batch_size": self._sizer.max_size,
+                    "flush_interval": self._queue.config.flush_interval_seconds,
                 }
             },
         )
 
-    def _get_embedder(self, tenant_id: int) -> UnifiedEmbedder:
+    def _get_embedder(self, tenant_id: int) -> Any:
         """Lazy loading Embedder(Cache by tenant)"""
         embedder = self._embedder_cache.get(tenant_id)
         if embedder is None:
-            embedder = UnifiedEmbedder(tenant_id)
+            embedder = self._embedder_factory(tenant_id)
             self._embedder_cache[tenant_id] = embedder
         return embedder
 
@@ -113,9 +213,8 @@ class EmbeddingProcessor:
         logger.info("embedding_processor_started")
 
     async def stop(self, timeout: float = 30.0) -> None:
-        """stop processor"""
+        """stop processor(unacked tasks stay in the backlog)"""
         await self._queue.stop(timeout=timeout)
-        self._executor.shutdown(wait=False)
         logger.info(
             "embedding_processor_stopped",
             extra={"data": {"stats": self._stats.to_dict()}},
@@ -158,15 +257,20 @@ class EmbeddingProcessor:
 
         Returns:Successfully added quantity
         """
-        success_count = 0
         resolved_tenant_id = tenant_id or get_default_tenant_id()
-        for node_id, node_label, text in items:
-            task = EmbeddingTask(
+        tasks = [
+            EmbeddingTask(
                 tenant_id=resolved_tenant_id,
                 node_id=node_id,
                 node_label=node_label,
                 text=text,
             )
+            for node_id, node_label, text in items
+        ]
+        if isinstance(self._queue, RedisStreamEventQueue):
+            return await self._queue.put_many(tasks)
+        success_count = 0
+        for task in tasks:
             if await self._queue.put(task):
                 success_count += 1
         return success_count
@@ -175,6 +279,7 @@ class EmbeddingProcessor:
     def stats(self) -> dict[str, Any]:
         """Get statistics"""
         result = self._stats.to_dict()
+        result["batch_size"] = self._sizer.size
         queue_stats = self._queue.stats
         result["queue"] = {
             "current_size": queue_stats.current_size,
@@ -185,7 +290,7 @@ class EmbeddingProcessor:
         return result
 
     async def _process_batch(self, tasks: list[EmbeddingTask]) -> None:
-        """Batch processing embedding Task"""
+        """Batch processing embedding Task(raises so the queue keeps the batch for redelivery)"""
         if not tasks:
             return
 
@@ -195,25 +300,29 @@ class EmbeddingProcessor:
         )
 
         try:
-            loop = asyncio.get_event_loop()
-
             # Group processing by tenant,Avoid mixing models and keys between different tenants
             tasks_by_tenant: dict[int, list[EmbeddingTask]] = {}
-            for task in tasks:
+            for task in self._latest_per_node(tasks):
                 tasks_by_tenant.setdefault(task.tenant_id, []).append(task)
 
             for tenant_id, group in tasks_by_tenant.items():
-                texts = [task.text for task in group]
                 embedder = self._get_embedder(tenant_id)
-                embeddings = await loop.run_in_executor(self._executor, embedder.embed_batch, texts)
-                await self._write_embeddings(embedder, group, embeddings)
+                chunks = list(self._sizer.chunks(group))
+                embeddings = await asyncio.gather(
+                    *(self._embed_chunk(embedder, chunk) for chunk in chunks)
+                )
+                await self._write_embeddings(
+                    embedder,
+                    [task for chunk in chunks for task in chunk],
+                    [vector for vectors in embeddings for vector in vectors],
+                )
 
             self._stats.total_embedded += len(tasks)
             self._stats.last_batch_time = datetime.now(UTC)
 
             logger.info(
                 "embedding_batch_complete",
-                extra={"data": {"count": len(tasks)}},
+                extra={"data": {"count": len(tasks), "batch_size": self._sizer.size}},
             )
 
         except Exception as e:
@@ -224,9 +333,36 @@ class EmbeddingProcessor:
             )
             raise
 
+    @staticmethod
+    def _latest_per_node(tasks: list[EmbeddingTask]) -> list[EmbeddingTask]:
+        """Keep only the newest task per node within one batch"""
+        latest: dict[tuple[int, str, str], EmbeddingTask] = {}
+        for task in tasks:
+            key = (task.tenant_id, task.node_label, task.node_id)
+            current = latest.get(key)
+            if current is None or task.version >= current.version:
+                latest[key] = task
+        return list(latest.values())
+
+    async def _embed_chunk(self, embedder: Any, chunk: list[EmbeddingTask]) -> list[list[float]]:
+        async with self._call_slots:
+            start = time.perf_counter()
+            try:
+                vectors = await embedder.async_embed_batch([task.text for task in chunk])
+            except Exception:
+                self._sizer.record(len(chunk), time.perf_counter() - start, ok=False)
+                raise
+            latency = time.perf_counter() - start
+            self._sizer.record(len(chunk), latency)
+            self._stats.provider_calls += 1
+            self._stats.provider_seconds += latency
+        if len(vectors) != len(chunk):
+            raise ValueError(f"embedding count mismatch:{len(vectors)} != {len(chunk)}")
+        return vectors
+
     async def _write_embeddings(
         self,
-        embedder: UnifiedEmbedder,
+        embedder: Any,
         tasks: list[EmbeddingTask],
         embeddings: list[list[float]],
     ) -> None:
@@ -234,16 +370,15 @@ class EmbeddingProcessor:
         # record provider,Format:provider/model_name,Used to detect model changes
         embedding_provider = f"{embedder.provider}/{embedder.model_name}"
 
-        async with neo4j_async_session() as session:
+        async with self._session_factory() as session:
             # press label Group,use UNWIND Batch update
-            label_groups: dict[str, list[tuple[str, list[float]]]] = {}
-            for task, embedding in zip(tasks, embeddings, strict=False):
-                if task.node_label not in label_groups:
-                    label_groups[task.node_label] = []
-                label_groups[task.node_label].append((task.node_id, embedding))
-
-            for label, items in label_groups.items():
-                data = [{"id": node_id, "embedding": emb} for node_id, emb in items]
+            label_groups: dict[str, list[dict[str, Any]]] = {}
+            for task, embedding in zip(tasks, embeddings, strict=True):
+                label_groups.setdefault(task.node_label, []).append(
+                    {"id": task.node_id, "embedding": embedding, "version": task.version}
+                )
+
+            for label, data in label_groups.items():
                 await self._metadata_repo.write_embeddings_batch(
                     session,
                     node_label=label,
@@ -253,6 +388,10 @@ class EmbeddingProcessor:
 
             logger.debug(
                 "embeddings_written_to_neo4j",
-                provider=embedding_provider,
-                groups={label: len(items) for label, items in label_groups.items()},
+                extra={
+                    "data": {
+                        "provider": embedding_provider,
+                        "groups": {label: len(data) for label, data in label_groups.items()},
+                    }
+                },
             )
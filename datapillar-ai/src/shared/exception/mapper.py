@@ -37,6 +37,7 @@ _HTTP_TYPE_MAPPING: dict[int, str] = {
     Code.NOT_FOUND: "NOT_FOUND",
     Code.METHOD_NOT_ALLOWED: "METHOD_NOT_ALLOWED",
     Code.CONFLICT: "CONFLICT",
+    Code.PAYLOAD_TOO_LARGE: "PAYLOAD_TOO_LARGE",
     Code.TOO_MANY_REQUESTS: "TOO_MANY_REQUESTS",
     Code.BAD_GATEWAY: "BAD_GATEWAY",
     Code.SERVICE_UNAVAILABLE: "SERVICE_UNAVAILABLE",
@@ -10,6 +10,7 @@ from src.shared.utils.sql_lineage import (
     ColumnRef,
     LineageResult,
     SQLLineageAnalyzer,
+    SQLLineageCache,
     TableLineage,
     TableRef,
     TableRole,
@@ -17,6 +18,7 @@ from src.shared.utils.sql_lineage import (
 
 __all__ = [
     "SQLLineageAnalyzer",
+    "SQLLineageCache",
     "LineageResult",
     "TableRef",
     "ColumnRef",
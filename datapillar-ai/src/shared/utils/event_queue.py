@@ -9,16 +9,22 @@ provide：
 - Batch processing
 - Back pressure control
 - pause/restore
+- RedisStreamEventQueue：durable，at-least-once variant on Redis Streams
 """
 
 import asyncio
 import contextlib
 import logging
-from collections.abc import Callable
+import os
+import socket
+import time
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
+from redis.exceptions import RedisError, ResponseError
+
 logger = logging.getLogger(__name__)
 
 
@@ -42,6 +48,18 @@ class QueueConfig:
     flush_interval_seconds: float = 5.0
 
 
+@dataclass
+class StreamQueueConfig(QueueConfig):
+    """Durable queue configuration"""
+
+    max_size: int = 1_000_000
+    # Unacked events idle for this long are claimed and redelivered(crash/failed batch)
+    claim_idle_ms: int = 60_000
+    # Deliveries(the redelivering claim included) at which an event is dead-lettered
+    max_deliveries: int = 5
+    retry_delay_seconds: float = 1.0
+
+
 class AsyncEventQueue:
     """
     Asynchronous event queue
@@ -220,3 +238,293 @@ class AsyncEventQueue:
                 except Exception as e:
                     self._stats.total_failed += len(batch)
                     logger.error(f"Processing failed while draining: {e}")
+
+
+class RedisStreamEventQueue:
+    """
+    Durable event queue（Redis Streams + consumer group）
+
+    provide：
+    - persistence：events live in the stream until acked，so a restart or deploy loses nothing
+    - at-least-once：a batch is acked（XACK + XDEL）only after the processor returns；
+      this consumer's unacked events are re-read on start，any consumer's unacked events
+      are claimed again after claim_idle_ms，so processors must be idempotent
+    - dead letter：events delivered max_deliveries times move to <stream>:dead
+    - Back pressure：put is rejected once the stream holds max_size events
+    - pause/restore：same as AsyncEventQueue
+    """
+
+    def __init__(
+        self,
+        *,
+        stream: str,
+        group: str,
+        encode: Callable[[Any], str],
+        decode: Callable[[str], Any],
+        client_factory: Callable[[], Awaitable[Any]],
+        consumer: str | None = None,
+        config: StreamQueueConfig | None = None,
+    ):
+        self.config = config or StreamQueueConfig()
+        self.stream = stream
+        self.group = group
+        self.dead_letter_stream = f"{stream}:dead"
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self._encode = encode
+        self._decode = decode
+        self._client_factory = client_factory
+        self._redis: Any | None = None
+        self._stats = QueueStats()
+        self._running = False
+        self._paused = False
+        self._pause_event = asyncio.Event()
+        self._pause_event.set()
+        self._processor_task: asyncio.Task | None = None
+        self._processor: Callable[[list[Any]], Any] | None = None
+        # Start by re-reading our own pending entries(left over from a previous run)
+        self._pending_cursor: str | None = "0"
+        self._last_claim = 0.0
+
+    @property
+    def stats(self) -> QueueStats:
+        """Get queue statistics（current_size is the stream length seen by the last batch）"""
+        return self._stats
+
+    async def put(self, event: Any) -> bool:
+        """Add event to the stream"""
+        return await self.put_many([event]) == 1
+
+    async def put_many(self, events: list[Any]) -> int:
+        """
+        Add events to the stream in one pipeline
+
+        Returns:
+            Number of events added（0 when the stream is full or Redis is unavailable）
+        """
+        if not events:
+            return 0
+        try:
+            client = await self._client()
+            if self.config.max_size:
+                size = await client.xlen(self.stream)
+                if size + len(events) > self.config.max_size:
+                    logger.warning(f"Event stream {self.stream} is full({size})，discard events")
+                    return 0
+            pipe = client.pipeline(transaction=False)
+            for event in events:
+                pipe.xadd(self.stream, {"data": self._encode(event)})
+            await pipe.execute()
+        except RedisError as e:
+            logger.error(f"Add to event stream {self.stream} failed: {e}")
+            return 0
+        self._stats.total_received += len(events)
+        return len(events)
+
+    async def get_batch(self, max_size: int | None = None) -> list[tuple[str, Any]]:
+        """
+        Get a batch of (entry id,event)
+
+        Order：own pending entries（after start）→ stale entries（any consumer）→ new entries
+        """
+        client = await self._client()
+        batch_size = max_size or self.config.batch_size
+
+        if self._pending_cursor is not None:
+            response = await client.xreadgroup(
+                self.group,
+                self.consumer,
+                {self.stream: self._pending_cursor},
+                count=batch_size,
+            )
+            entries = response[0][1] if response else []
+            if entries:
+                self._pending_cursor = entries[-1][0]
+                return await self._decode_entries(client, entries)
+            self._pending_cursor = None
+
+        now = time.monotonic()
+        if now - self._last_claim >= self.config.claim_idle_ms / 2000:
+            self._last_claim = now
+            claimed = await client.xautoclaim(
+                self.stream,
+                self.group,
+                self.consumer,
+                min_idle_time=self.config.claim_idle_ms,
+                start_id="0-0",
+                count=batch_size,
+            )
+            entries = [entry for entry in claimed[1] if entry and entry[1]]
+            if entries:
+                entries = await self._dead_letter_exhausted(client, entries)
+                if entries:
+                    return await self._decode_entries(client, entries)
+
+        response = await client.xreadgroup(
+            self.group,
+            self.consumer,
+            {self.stream: ">"},
+            count=batch_size,
+            block=int(self.config.flush_interval_seconds * 1000),
+        )
+        entries = response[0][1] if response else []
+        return await self._decode_entries(client, entries)
+
+    async def ack(self, entry_ids: list[str]) -> None:
+        """Acknowledge processed entries and drop them from the stream"""
+        if not entry_ids:
+            return
+        client = await self._client()
+        pipe = client.pipeline(transaction=False)
+        pipe.xack(self.stream, self.group, *entry_ids)
+        pipe.xdel(self.stream, *entry_ids)
+        await pipe.execute()
+
+    async def pending_count(self) -> int:
+        """Events not yet acked（queued + in flight）"""
+        client = await self._client()
+        return int(await client.xlen(self.stream))
+
+    def set_processor(self, processor: Callable[[list[Any]], Any]) -> None:
+        """Set up batch processor"""
+        self._processor = processor
+
+    @property
+    def is_paused(self) -> bool:
+        """Is it in paused state?"""
+        return self._paused
+
+    def pause(self) -> None:
+        """Pause stream consumption（Events can still be added，but will not be processed）"""
+        if not self._paused:
+            self._paused = True
+            self._pause_event.clear()
+            logger.info("Event stream consumption has been paused")
+
+    def resume(self) -> None:
+        """Resume stream consumption"""
+        if self._paused:
+            self._paused = False
+            self._pause_event.set()
+            logger.info("Event stream consumption has resumed")
+
+    async def start(self) -> None:
+        """Start stream processing"""
+        if self._running:
+            return
+
+        self._running = True
+        if self._processor:
+            self._processor_task = asyncio.create_task(self._process_loop())
+            logger.info(f"Event stream handler started: {self.stream}/{self.consumer}")
+
+    async def stop(self, timeout: float = 30.0) -> None:
+        """
+        Stop stream processing
+
+        The in-flight batch gets up to timeout seconds；anything unacked stays in the stream
+        """
+        self._running = False
+
+        if self._processor_task:
+            with contextlib.suppress(TimeoutError, asyncio.CancelledError):
+                await asyncio.wait_for(asyncio.shield(self._processor_task), timeout=timeout)
+            self._processor_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._processor_task
+
+        logger.info("The event stream handler has stopped")
+
+    async def _client(self) -> Any:
+        if self._redis is None:
+            client = await self._client_factory()
+            try:
+                await client.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+            except ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+            self._redis = client
+        return self._redis
+
+    async def _decode_entries(
+        self, client: Any, entries: list[tuple[str, dict[str, Any]]]
+    ) -> list[tuple[str, Any]]:
+        batch: list[tuple[str, Any]] = []
+        for entry_id, fields in entries:
+            try:
+                batch.append((entry_id, self._decode(fields["data"])))
+            except Exception as e:
+                logger.error(f"Undecodable event {entry_id} in {self.stream}: {e}")
+                await self._move_to_dead_letter(client, entry_id, fields)
+        return batch
+
+    async def _dead_letter_exhausted(
+        self, client: Any, entries: list[tuple[str, dict[str, Any]]]
+    ) -> list[tuple[str, dict[str, Any]]]:
+        # One exact lookup per claimed id:a range query would also return entries of
+        # other consumers lying between them and cut the claimed ones off at count.
+        pipe = client.pipeline(transaction=False)
+        for entry_id, _ in entries:
+            pipe.xpending_range(
+                self.stream,
+                self.group,
+                min=entry_id,
+                max=entry_id,
+                count=1,
+                consumername=self.consumer,
+            )
+        deliveries = {
+            item["message_id"]: item["times_delivered"]
+            for pending in await pipe.execute()
+            for item in pending
+        }
+        remaining = []
+        for entry_id, fields in entries:
+            if deliveries.get(entry_id, 0) >= self.config.max_deliveries:
+                logger.error(
+                    f"Event {entry_id} failed {self.config.max_deliveries} deliveries，"
+                    f"moved to {self.dead_letter_stream}"
+                )
+                await self._move_to_dead_letter(client, entry_id, fields)
+            else:
+                remaining.append((entry_id, fields))
+        return remaining
+
+    async def _move_to_dead_letter(
+        self, client: Any, entry_id: str, fields: dict[str, Any]
+    ) -> None:
+        pipe = client.pipeline(transaction=True)
+        pipe.xadd(self.dead_letter_stream, {**fields, "source_id": entry_id})
+        pipe.xack(self.stream, self.group, entry_id)
+        pipe.xdel(self.stream, entry_id)
+        await pipe.execute()
+        self._stats.total_failed += 1
+
+    async def _process_loop(self) -> None:
+        """processing loop"""
+        while self._running:
+            try:
+                await self._pause_event.wait()
+
+                batch = await self.get_batch()
+                if not batch or not self._processor:
+                    continue
+                entry_ids = [entry_id for entry_id, _ in batch]
+                try:
+                    await self._processor([event for _, event in batch])
+                except Exception as e:
+                    # Left pending：claimed again after claim_idle_ms
+                    self._stats.total_failed += len(batch)
+                    logger.error(f"Batch processing failed，{len(batch)} events kept: {e}")
+                    continue
+                await self.ack(entry_ids)
+                self._stats.total_processed += len(batch)
+                self._stats.last_flush_time = datetime.now()
+                self._stats.current_size = int(await self._redis.xlen(self.stream))
+            except asyncio.CancelledError:
+                break
+            except RedisError as e:
+                logger.error(f"Event stream {self.stream} unavailable: {e}")
+                await asyncio.sleep(self.config.retry_delay_seconds)
+            except Exception as e:
+                logger.error(f"Handling loop exceptions: {e}")
+                await asyncio.sleep(self.config.retry_delay_seconds)
@@ -9,17 +9,48 @@ Based on sqlglot parse SQL,Extract table-level and column-level blood relationsh
 3.Identify temporary tables(in session Created and read in)
 4.Penetrate temporary table,Establish true bloodline
 5.Extract rank lineage
+
+performance:- Each SQL string is parsed once;table and column lineage read the same AST
+- Per-statement facts are cached by normalized-SQL hash(SQLLineageCache:in-memory LRU,
+  optional SQLite file),so unchanged job SQL is not re-parsed on every sync
+- analyze_sessions parses the distinct uncached statements of a bulk sync in a process pool;
+  aanalyze_session / aanalyze_sessions keep parsing off the event loop
 """
 
+import asyncio
+import hashlib
+import json
 import logging
+import multiprocessing
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
+from itertools import repeat
 
 import sqlglot
 from sqlglot import exp
 
 logger = logging.getLogger(__name__)
 
+# Part of every cache key:bump when the per-statement analysis or normalize_sql changes.
+_FACTS_VERSION = 2
+DEFAULT_CACHE_MAX_ENTRIES = 10_000
+# Below this many uncached statements a process pool costs more than it saves.
+DEFAULT_MIN_PARALLEL = 64
+
+# Comments are dropped in the same pass as whitespace:collapsing first would pull the line
+# after a "--" comment into it.
+_QUOTED_COMMENT_OR_SPACE = re.compile(
+    r"('(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|`[^`]*`)|(?:\s+|--[^\n]*|/\*.*?\*/)+",
+    re.S,
+)
+
 
 class TableRole(str, Enum):
     """table role"""
@@ -94,6 +125,196 @@ class LineageResult:
     column_lineages: list[ColumnLineage] = field(default_factory=list)
 
 
+# (catalog, schema, table)
+_TableKey = tuple[str | None, str | None, str]
+# (source table, source column, target table, target column, transformation)
+_ColumnFact = tuple[_TableKey, str, _TableKey, str, str | None]
+
+
+def normalize_sql(sql: str) -> str:
+    """Drop comments,collapse whitespace outside quotes,drop trailing semicolons(cache key only)"""
+    collapsed = _QUOTED_COMMENT_OR_SPACE.sub(lambda m: m.group(1) or " ", sql)
+    return collapsed.strip().rstrip(";").rstrip()
+
+
+def sql_cache_key(dialect: str, sql: str) -> str:
+    payload = f"{_FACTS_VERSION}\0{dialect}\0{normalize_sql(sql)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _table_key(ref: TableRef) -> _TableKey:
+    return (ref.catalog, ref.schema, ref.table)
+
+
+def _table_ref(key: Sequence[str | None]) -> TableRef:
+    catalog, schema, table = key
+    return TableRef(catalog=catalog, schema=schema, table=table or "")
+
+
+@dataclass(frozen=True)
+class StatementFacts:
+    """
+    What one SQL string reads,writes and maps column to column
+
+    Independent of the session it appears in,so it can be cached and shipped between
+    processes.in_graph is False when table extraction failed(left out of the dependency graph).
+    """
+
+    in_graph: bool = True
+    reads: tuple[_TableKey, ...] = ()
+    writes: tuple[_TableKey, ...] = ()
+    columns: tuple[_ColumnFact, ...] = ()
+
+    def to_json(self) -> str:
+        return json.dumps([self.in_graph, self.reads, self.writes, self.columns])
+
+    @classmethod
+    def from_json(cls, raw: str) -> "StatementFacts":
+        in_graph, reads, writes, columns = json.loads(raw)
+        return cls(
+            in_graph=in_graph,
+            reads=tuple(tuple(t) for t in reads),
+            writes=tuple(tuple(t) for t in writes),
+            columns=tuple((tuple(s), sc, tuple(t), tc, tr) for s, sc, t, tc, tr in columns),
+        )
+
+
+class SQLLineageCache:
+    """
+    Statement facts keyed by normalized-SQL hash
+
+    In-memory LRU of max_entries;with path,entries are also kept in a SQLite file so
+    they survive restarts and are shared by processes on the same host.Thread-safe.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+        *,
+        path: str | None = None,
+    ) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, StatementFacts] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        if path:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS sql_lineage_facts"
+                " (key TEXT PRIMARY KEY, facts TEXT NOT NULL)"
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, StatementFacts]:
+        found: dict[str, StatementFacts] = {}
+        missing: list[str] = []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                facts = self._entries.get(key)
+                if facts is None:
+                    missing.append(key)
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = facts
+            self._hits += len(found)
+            from_disk = self._load(missing) if missing and self._db is not None else {}
+            self._remember(from_disk)
+            self._disk_hits += len(from_disk)
+            self._misses += len(missing) - len(from_disk)
+        found.update(from_disk)
+        return found
+
+    def get(self, key: str) -> StatementFacts | None:
+        return self.get_many([key]).get(key)
+
+    def put_many(self, entries: dict[str, StatementFacts]) -> None:
+        if not entries:
+            return
+        with self._lock:
+            self._remember(entries)
+            if self._db is not None:
+                self._db.execute("BEGIN")
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO sql_lineage_facts (key, facts) VALUES (?, ?)",
+                    [(key, facts.to_json()) for key, facts in entries.items()],
+                )
+                self._db.execute("COMMIT")
+
+    def put(self, key: str, facts: StatementFacts) -> None:
+        self.put_many({key: facts})
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM sql_lineage_facts")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+            }
+
+    def _load(self, keys: list[str]) -> dict[str, StatementFacts]:
+        loaded: dict[str, StatementFacts] = {}
+        if self._db is None:
+            return loaded
+        for offset in range(0, len(keys), 500):
+            chunk = keys[offset : offset + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._db.execute(
+                f"SELECT key, facts FROM sql_lineage_facts WHERE key IN ({placeholders})",
+                chunk,
+            ).fetchall()
+            for key, raw in rows:
+                loaded[key] = StatementFacts.from_json(raw)
+        return loaded
+
+    def _remember(self, entries: dict[str, StatementFacts]) -> None:
+        for key, facts in entries.items():
+            self._entries[key] = facts
+            self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+_default_cache: SQLLineageCache | None = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_sql_lineage_cache() -> SQLLineageCache:
+    """Process-wide in-memory cache used by analyzers created without an explicit cache"""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = SQLLineageCache()
+    return _default_cache
+
+
+def _facts_worker(dialect: str, sqls: list[str]) -> list[StatementFacts]:
+    """Process pool entry point(module level so it pickles)"""
+    analyzer = SQLLineageAnalyzer(dialect, use_cache=False)
+    return [analyzer._statement_facts(sql) for sql in sqls]
+
+
 class SQLLineageAnalyzer:
     """
     SQL ancestry analyzer
@@ -103,13 +324,24 @@ class SQLLineageAnalyzer:
     - intermediate node(both read and write)→ temporary table
     """
 
-    def __init__(self, dialect: str = "hive") -> None:
+    def __init__(
+        self,
+        dialect: str = "hive",
+        *,
+        cache: SQLLineageCache | None = None,
+        use_cache: bool = True,
+    ) -> None:
         """
         Initialize analyzer
 
         Args:dialect:SQL dialect(hive,spark,mysql,postgres Wait)
+        cache:statement facts cache(default:the process-wide in-memory cache)
+        use_cache:False parses every statement again
         """
         self.dialect = dialect
+        self.cache: SQLLineageCache | None = None
+        if use_cache:
+            self.cache = cache if cache is not None else get_default_sql_lineage_cache()
 
     def analyze_sql(self, sql: str) -> LineageResult:
         """
@@ -134,24 +366,160 @@ class SQLLineageAnalyzer:
 
         Returns:LineageResult:Bloodline results
         """
+        return self.analyze_sessions([sqls], max_workers=1)[0]
+
+    def analyze_sessions(
+        self,
+        sessions: Sequence[Sequence[str]],
+        *,
+        max_workers: int | None = None,
+        min_parallel: int = DEFAULT_MIN_PARALLEL,
+        executor: Executor | None = None,
+    ) -> list[LineageResult]:
+        """
+        Analyze many sessions(bulk sync)
+
+        Every distinct statement is parsed at most once across all sessions.When at least
+        min_parallel of them are not cached they are parsed in a process pool(executor,or a
+        temporary spawn pool of max_workers);max_workers=1 parses in this thread.
+
+        Returns:one LineageResult per session,in order
+        """
+        keys = [[sql_cache_key(self.dialect, sql) for sql in sqls] for sqls in sessions]
+        facts: dict[str, StatementFacts] = {}
+        if self.cache is not None:
+            facts = self.cache.get_many(key for session_keys in keys for key in session_keys)
+
+        pending: dict[str, str] = {}
+        for sqls, session_keys in zip(sessions, keys, strict=True):
+            for sql, key in zip(sqls, session_keys, strict=True):
+                if key not in facts:
+                    pending.setdefault(key, sql)
+        if pending:
+            computed = dict(
+                zip(
+                    pending,
+                    self._compute_facts(
+                        list(pending.values()),
+                        max_workers=max_workers,
+                        min_parallel=min_parallel,
+                        executor=executor,
+                    ),
+                    strict=True,
+                )
+            )
+            if self.cache is not None:
+                self.cache.put_many(computed)
+            facts.update(computed)
+
+        return [
+            self._assemble(sqls, [facts[key] for key in session_keys])
+            for sqls, session_keys in zip(sessions, keys, strict=True)
+        ]
+
+    async def aanalyze_session(self, sqls: list[str]) -> LineageResult:
+        """analyze_session off the event loop(answered inline when every statement is cached)"""
+        if self.cache is not None:
+            keys = [sql_cache_key(self.dialect, sql) for sql in sqls]
+            facts = self.cache.get_many(keys)
+            if len(facts) == len(set(keys)):
+                return self._assemble(sqls, [facts[key] for key in keys])
+        return await asyncio.to_thread(self.analyze_session, sqls)
+
+    async def aanalyze_sessions(
+        self,
+        sessions: Sequence[Sequence[str]],
+        **kwargs: object,
+    ) -> list[LineageResult]:
+        """analyze_sessions off the event loop"""
+        return await asyncio.to_thread(self.analyze_sessions, sessions, **kwargs)
+
+    def _compute_facts(
+        self,
+        sqls: list[str],
+        *,
+        max_workers: int | None,
+        min_parallel: int,
+        executor: Executor | None,
+    ) -> list[StatementFacts]:
+        if executor is None and (max_workers == 1 or len(sqls) < min_parallel):
+            return [self._statement_facts(sql) for sql in sqls]
+
+        workers = max_workers or getattr(executor, "_max_workers", None) or os.cpu_count() or 1
+        chunk_size = max(16, len(sqls) // (workers * 4))
+        chunks = [sqls[i : i + chunk_size] for i in range(0, len(sqls), chunk_size)]
+        if executor is not None:
+            results = list(executor.map(_facts_worker, repeat(self.dialect), chunks))
+        else:
+            # spawn:the app process holds driver/event-loop threads that fork would copy.
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as pool:
+                results = list(pool.map(_facts_worker, repeat(self.dialect), chunks))
+        return [facts for chunk in results for facts in chunk]
+
+    def _statement_facts(self, sql: str) -> StatementFacts:
+        """Parse one SQL string once and derive both table and column facts from the AST"""
+        try:
+            statements = sqlglot.parse(sql, dialect=self.dialect)
+        except Exception as e:
+            logger.warning(
+                "sql_parse_error",
+                extra={"data": {"sql": sql[:100], "error": str(e)}},
+            )
+            return StatementFacts()
+
+        try:
+            reads, writes = self._extract_tables(statements)
+        except Exception as e:
+            logger.warning(
+                "sql_parse_failed",
+                extra={"data": {"sql": sql[:100], "error": str(e)}},
+            )
+            table_facts: dict[str, object] = {"in_graph": False}
+        else:
+            table_facts = {
+                "reads": tuple(_table_key(t) for t in reads),
+                "writes": tuple(_table_key(t) for t in writes),
+            }
+
+        try:
+            columns = tuple(
+                (
+                    _table_key(lineage.source.table),
+                    lineage.source.column,
+                    _table_key(lineage.target.table),
+                    lineage.target.column,
+                    lineage.transformation,
+                )
+                for lineage in self._analyze_column_lineage(statements)
+            )
+        except Exception as e:
+            logger.debug(
+                "column_lineage_extract_failed",
+                extra={"data": {"sql": sql[:50], "error": str(e)}},
+            )
+            columns = ()
+
+        return StatementFacts(columns=columns, **table_facts)
+
+    def _assemble(self, sqls: Sequence[str], facts: Sequence[StatementFacts]) -> LineageResult:
+        """Session-level analysis over per-statement facts(no parsing)"""
         created_tables: set[TableRef] = set()
         read_tables: set[TableRef] = set()
         written_tables: set[TableRef] = set()
         sql_dependencies: list[tuple[set[TableRef], set[TableRef], str]] = []
 
-        for sql in sqls:
-            try:
-                reads, writes = self._extract_tables(sql)
-                read_tables.update(reads)
-                written_tables.update(writes)
-                created_tables.update(writes)
-                sql_dependencies.append((reads, writes, sql))
-            except Exception as e:
-                logger.warning(
-                    "sql_parse_failed",
-                    extra={"data": {"sql": sql[:100], "error": str(e)}},
-                )
+        for sql, statement in zip(sqls, facts, strict=True):
+            if not statement.in_graph:
                 continue
+            reads = {_table_ref(key) for key in statement.reads}
+            writes = {_table_ref(key) for key in statement.writes}
+            read_tables.update(reads)
+            written_tables.update(writes)
+            created_tables.update(writes)
+            sql_dependencies.append((reads, writes, sql))
 
         # temporary table = in session Created in And be read
         temp_tables = created_tables & read_tables
@@ -165,8 +533,16 @@ class SQLLineageAnalyzer:
         # Construct table-level lineage(Penetrate temporary table)
         table_lineages = self._build_table_lineages(sql_dependencies, sources, targets, temp_tables)
 
-        # Extract rank lineage
-        column_lineages = self._extract_column_lineages(sqls, sources, targets)
+        # Rank lineage(already extracted per statement)
+        column_lineages = [
+            ColumnLineage(
+                source=ColumnRef(table=_table_ref(source), column=source_column),
+                target=ColumnRef(table=_table_ref(target), column=target_column),
+                transformation=transformation,
+            )
+            for statement in facts
+            for source, source_column, target, target_column, transformation in statement.columns
+        ]
 
         return LineageResult(
             sources=sources,
@@ -176,26 +552,19 @@ class SQLLineageAnalyzer:
             column_lineages=column_lineages,
         )
 
-    def _extract_tables(self, sql: str) -> tuple[set[TableRef], set[TableRef]]:
+    def _extract_tables(
+        self, statements: Sequence[exp.Expression | None]
+    ) -> tuple[set[TableRef], set[TableRef]]:
         """
-        from SQL Extract read and written tables
+        from parsed SQL Extract read and written tables
 
-        Args:sql:SQL statement
+        Args:statements:sqlglot.parse output of one SQL string
 
         Returns:(Read table collection,The set of tables written to)
         """
         reads: set[TableRef] = set()
         writes: set[TableRef] = set()
 
-        try:
-            statements = sqlglot.parse(sql, dialect=self.dialect)
-        except Exception as e:
-            logger.warning(
-                "sql_parse_error",
-                extra={"data": {"sql": sql[:100], "error": str(e)}},
-            )
-            return reads, writes
-
         for statement in statements:
             if statement is None:
                 continue
@@ -319,61 +688,18 @@ class SQLLineageAnalyzer:
 
         return sources
 
-    def _extract_column_lineages(
-        self,
-        sqls: list[str],
-        sources: set[TableRef],
-        targets: set[TableRef],
-    ) -> list[ColumnLineage]:
-        """
-        Extract rank lineage
-
-        Args:sqls:SQL statement list
-        sources:Source table collection
-        targets:target table collection
-
-        Returns:Ranked lineage list
-        """
-        column_lineages: list[ColumnLineage] = []
-
-        # Build schema(Simplified version,only for lineage analysis)
-        schema: dict[str, dict[str, str]] = {}
-        for table in sources | targets:
-            # Simplified processing:Assume all column types are string
-            # In actual use,the true value should be obtained from metadata schema
-            schema[table.full_name] = {}
-
-        for sql in sqls:
-            try:
-                lineages = self._analyze_column_lineage(sql, schema)
-                column_lineages.extend(lineages)
-            except Exception as e:
-                logger.debug(
-                    "column_lineage_extract_failed",
-                    extra={"data": {"sql": sql[:50], "error": str(e)}},
-                )
-                continue
-
-        return column_lineages
-
     def _analyze_column_lineage(
-        self, sql: str, schema: dict[str, dict[str, str]]
+        self, statements: Sequence[exp.Expression | None]
     ) -> list[ColumnLineage]:
         """
-        Analyze a single line SQL s pedigree
+        Analyze the column lineage of parsed SQL
 
-        Args:sql:SQL statement
-        schema:Table structure information
+        Args:statements:sqlglot.parse output of one SQL string
 
         Returns:Ranked lineage list
         """
         lineages: list[ColumnLineage] = []
 
-        try:
-            statements = sqlglot.parse(sql, dialect=self.dialect)
-        except Exception:
-            return lineages
-
         for statement in statements:
             if statement is None:
                 continue
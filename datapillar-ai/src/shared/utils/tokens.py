@@ -0,0 +1,11 @@
+# @author Sunny
+# @date 2026-01-27
+
+"""
+Token estimates without a tokenizer(shared by embedding batching and tool output budgets)
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Upper-bound token estimate without a tokenizer(~1 token per 3 UTF-8 bytes)"""
+    return max(1, len(text.encode("utf-8")) // 3)
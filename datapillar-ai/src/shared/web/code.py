@@ -12,6 +12,7 @@ class Code:
     NOT_FOUND = 404
     METHOD_NOT_ALLOWED = 405
     CONFLICT = 409
+    PAYLOAD_TOO_LARGE = 413
     TOO_MANY_REQUESTS = 429
     INTERNAL_ERROR = 500
     BAD_GATEWAY = 502
@@ -25,6 +25,7 @@ class ApiResponse:
         limit: int | None = None,
         offset: int | None = None,
         total: int | None = None,
+        next_cursor: str | None = None,
     ) -> dict[str, Any]:
         payload: dict[str, Any] = {"code": cls.SUCCESS_CODE}
         if data is not None:
@@ -35,6 +36,8 @@ class ApiResponse:
             payload["offset"] = offset
         if total is not None:
             payload["total"] = total
+        if next_cursor is not None:
+            payload["next_cursor"] = next_cursor
         return payload
 
     @classmethod
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import gzip
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+import src.shared.auth.middleware as middleware_module
+from src.shared.auth.middleware import AuthMiddleware, GzipRequestReceive
+from src.shared.context import get_current_tenant_id
+from src.shared.exception import register_exception_handlers
+
+_HEADERS = {
+    "X-Principal-Iss": "gateway",
+    "X-Principal-Sub": "alice",
+    "X-Tenant-Id": "3",
+    "X-Tenant-Code": "acme",
+    "X-User-Id": "7",
+    "X-User-Roles": "admin, user",
+}
+
+
+@pytest.fixture(autouse=True)
+def _trusted_identity(monkeypatch: pytest.MonkeyPatch) -> None:
+    runtime = SimpleNamespace(
+        security=SimpleNamespace(trusted_identity=SimpleNamespace(enabled=True))
+    )
+    monkeypatch.setattr(middleware_module, "get_runtime_config", lambda: runtime)
+
+
+def _client(max_decompressed_bytes: int = 1024) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(AuthMiddleware, max_decompressed_bytes=max_decompressed_bytes)
+    register_exception_handlers(app)
+
+    @app.post("/api/ai/echo")
+    async def echo(request: Request, payload: dict[str, Any]) -> dict[str, Any]:
+        user = request.state.current_user
+        return {
+            "payload": payload,
+            "user": user.user_id,
+            "roles": list(user.roles),
+            "tenant": get_current_tenant_id(),
+            "encoding": request.headers.get("content-encoding"),
+        }
+
+    @app.get("/health")
+    async def health() -> dict[str, str]:
+        return {"status": "ok"}
+
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def _receive(*chunks: bytes):
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": index < len(chunks) - 1}
+        for index, chunk in enumerate(chunks)
+    ]
+
+    async def receive() -> dict[str, Any]:
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    return receive
+
+
+async def _read(receive: GzipRequestReceive) -> bytes:
+    body = b""
+    while True:
+        message = await receive()
+        body += message["body"]
+        if not message["more_body"]:
+            return body
+
+
+def test_trusted_headers_and_gzip_body_reach_the_endpoint() -> None:
+    body = gzip.compress(b'{"name": "orders"}')
+
+    response = _client().post(
+        "/api/ai/echo",
+        content=body,
+        headers={**_HEADERS, "Content-Encoding": "gzip", "Content-Type": "application/json"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "payload": {"name": "orders"},
+        "user": 7,
+        "roles": ["ADMIN", "USER"],
+        "tenant": 3,
+        "encoding": None,
+    }
+
+
+def test_missing_identity_is_rejected_and_whitelist_is_open() -> None:
+    client = _client()
+
+    assert client.get("/health").json() == {"status": "ok"}
+    response = client.post("/api/ai/echo", json={}, headers={"X-Principal-Iss": "gateway"})
+    assert response.status_code == 401
+    assert response.json()["message"] == "Missing trusted principal headers"
+
+
+def test_gzip_bomb_is_stopped_at_the_limit() -> None:
+    bomb = gzip.compress(b'{"a": "' + b"0" * 1_000_000 + b'"}')
+
+    response = _client(max_decompressed_bytes=64 * 1024).post(
+        "/api/ai/echo",
+        content=bomb,
+        headers={**_HEADERS, "Content-Encoding": "gzip", "Content-Type": "application/json"},
+    )
+
+    assert response.status_code == 413
+    assert response.json()["type"] == "PAYLOAD_TOO_LARGE"
+
+
+@pytest.mark.asyncio
+async def test_gzip_receive_inflates_chunked_and_multi_member_bodies() -> None:
+    payload = gzip.compress(b"hello ") + gzip.compress(b"world")
+    chunks = [payload[index : index + 7] for index in range(0, len(payload), 7)]
+
+    assert await _read(GzipRequestReceive(_receive(*chunks), max_size=1024)) == b"hello world"
+    # Not gzip at all:passed through unchanged.
+    assert await _read(GzipRequestReceive(_receive(b"plain"), max_size=1024)) == b"plain"
+
+    truncated = gzip.compress(b"hello world")[:-6]
+    with pytest.raises(middleware_module.HTTPException) as exc_info:
+        await _read(GzipRequestReceive(_receive(truncated), max_size=1024))
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_response_messages_are_forwarded_untouched() -> None:
+    events = [
+        {"type": "http.response.start", "status": 200, "headers": []},
+        {"type": "http.response.body", "body": b"data: 1\n\n", "more_body": True},
+        {"type": "http.response.body", "body": b"data: 2\n\n", "more_body": False},
+    ]
+    sent: list[dict[str, Any]] = []
+
+    async def app(_scope, _receive, send) -> None:
+        for event in events:
+            await send(event)
+
+    async def send(message: dict[str, Any]) -> None:
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "path": "/api/ai/etl/chat",
+        "headers": [(key.lower().encode(), value.encode()) for key, value in _HEADERS.items()],
+    }
+    await AuthMiddleware(app)(scope, _receive(b""), send)
+
+    assert all(left is right for left, right in zip(sent, events, strict=True))
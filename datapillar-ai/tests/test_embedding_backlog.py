@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any
+
+import pytest
+
+from src.shared.embedding.processor import (
+    AdaptiveBatchSizer,
+    EmbeddingProcessor,
+    EmbeddingTask,
+    decode_task,
+    encode_task,
+)
+from src.shared.utils.event_queue import RedisStreamEventQueue, StreamQueueConfig
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+class _FakeEmbedder:
+    provider = "fake"
+    model_name = "fake-embed"
+
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.calls: list[int] = []
+
+    async def async_embed_batch(self, texts: list[str]) -> list[list[float]]:
+        self.calls.append(len(texts))
+        if self.fail:
+            raise RuntimeError("provider down")
+        return [[float(len(text))] for text in texts]
+
+
+class _FakeRepo:
+    def __init__(self) -> None:
+        self.writes: dict[str, dict[str, Any]] = {}
+
+    async def write_embeddings_batch(self, _session, *, node_label, data, provider) -> None:
+        for item in data:
+            self.writes[item["id"]] = {"label": node_label, "provider": provider, **item}
+
+
+@asynccontextmanager
+async def _session():
+    yield None
+
+
+def _queue(redis: Any, consumer: str, **config: Any) -> RedisStreamEventQueue:
+    async def _client() -> Any:
+        return redis
+
+    return RedisStreamEventQueue(
+        stream="test:embedding",
+        group="embedding-processor",
+        encode=encode_task,
+        decode=decode_task,
+        client_factory=_client,
+        consumer=consumer,
+        config=StreamQueueConfig(batch_size=50, flush_interval_seconds=0.05, **config),
+    )
+
+
+def _processor(queue: RedisStreamEventQueue, embedder: _FakeEmbedder, repo: _FakeRepo):
+    return EmbeddingProcessor(
+        metadata_repo=repo,
+        queue=queue,
+        sizer=AdaptiveBatchSizer(initial_size=8),
+        embedder_factory=lambda _tenant_id: embedder,
+        session_factory=_session,
+    )
+
+
+async def _until(predicate, timeout: float = 3.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_backlog_survives_failed_run_and_restart() -> None:
+    redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    repo = _FakeRepo()
+    broken = _processor(_queue(redis, "pod-a"), _FakeEmbedder(fail=True), repo)
+    items = [(f"col-{i}", "Column", f"column {i}") for i in range(30)]
+
+    assert await broken.put_batch(items, tenant_id=1) == 30
+    await broken.start()
+    await _until(lambda: broken.stats["queue"]["total_failed"] == 30)
+    await broken.stop(timeout=1)
+    assert repo.writes == {}
+    assert await redis.xlen("test:embedding") == 30
+
+    # Same consumer after a restart:its pending entries are read first.
+    restarted = _processor(_queue(redis, "pod-a"), _FakeEmbedder(), repo)
+    await restarted.start()
+    await _until(lambda: len(repo.writes) == 30)
+    await restarted.stop(timeout=1)
+
+    assert await redis.xlen("test:embedding") == 0
+    assert repo.writes["col-3"]["embedding"] == [8.0]
+    assert repo.writes["col-3"]["provider"] == "fake/fake-embed"
+    assert isinstance(repo.writes["col-3"]["version"], int)
+
+
+@pytest.mark.asyncio
+async def test_stale_entries_of_dead_consumer_are_claimed() -> None:
+    redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    dead = _queue(redis, "pod-dead")
+    await dead.put_many([EmbeddingTask(1, "t1", "Table", "orders")])
+    assert len(await dead.get_batch()) == 1
+
+    repo = _FakeRepo()
+    survivor = _processor(_queue(redis, "pod-b", claim_idle_ms=0), _FakeEmbedder(), repo)
+    await survivor.start()
+    await _until(lambda: "t1" in repo.writes)
+    await survivor.stop(timeout=1)
+
+    assert await redis.xlen("test:embedding") == 0
+
+
+@pytest.mark.asyncio
+async def test_poison_event_moves_to_dead_letter() -> None:
+    redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    queue = _queue(redis, "pod-c", claim_idle_ms=0, max_deliveries=2)
+    await queue.put_many([EmbeddingTask(1, "t1", "Table", "orders")])
+    await redis.xadd("test:embedding", {"data": "not json"})
+
+    for _ in range(4):
+        await queue.get_batch()
+
+    assert await redis.xlen("test:embedding:dead") == 2
+    assert await redis.xlen("test:embedding") == 0
+
+
+@pytest.mark.asyncio
+async def test_dead_letter_counts_only_claimed_entries() -> None:
+    redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    dead = _queue(redis, "pod-dead")
+    await dead.put_many([EmbeddingTask(1, f"t{index}", "Table", "orders") for index in range(3)])
+    # pod-live holds the middle entry,pod-dead the two around it.
+    for consumer in ("pod-dead", "pod-live", "pod-dead"):
+        await redis.xreadgroup(
+            "embedding-processor", consumer, {"test:embedding": ">"}, count=1
+        )
+    await asyncio.sleep(0.3)
+    middle = (await redis.xrange("test:embedding"))[1][0]
+    await redis.xclaim("test:embedding", "embedding-processor", "pod-live", 0, [middle])
+
+    claimer = _queue(redis, "pod-b", claim_idle_ms=200, max_deliveries=2)
+    assert await claimer.get_batch() == []
+    assert await redis.xlen("test:embedding:dead") == 2
+    assert [entry_id for entry_id, _ in await redis.xrange("test:embedding")] == [middle]
+
+
+def test_sizer_adapts_to_latency_and_token_budget() -> None:
+    sizer = AdaptiveBatchSizer(initial_size=8, max_size=12, max_tokens=10, target_latency_seconds=1)
+
+    sizer.record(8, 0.1)
+    assert sizer.size == 10
+    sizer.record(10, 0.1)
+    sizer.record(12, 0.1)
+    assert sizer.size == 12
+    sizer.record(12, 1.5)
+    assert sizer.size == 6
+    sizer.record(6, 0.1, ok=False)
+    assert sizer.size == 3
+
+    tasks = [EmbeddingTask(1, str(i), "Column", "x" * 9) for i in range(5)]
+    # 3 tokens each:the 10-token budget allows 3 per call.
+    assert [len(chunk) for chunk in sizer.chunks(tasks)] == [3, 2]
+
+
+@pytest.mark.asyncio
+async def test_duplicate_node_in_one_batch_keeps_newest_text() -> None:
+    repo = _FakeRepo()
+    embedder = _FakeEmbedder()
+    queue = _queue(fakeredis.FakeAsyncRedis(decode_responses=True), "pod-d")
+    processor = _processor(queue, embedder, repo)
+
+    await processor._process_batch(
+        [
+            EmbeddingTask(1, "t1", "Table", "new text", version=2),
+            EmbeddingTask(1, "t1", "Table", "old", version=1),
+        ]
+    )
+
+    assert repo.writes["t1"]["embedding"] == [8.0]
+    assert embedder.calls == [1]
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+
+from src.modules.etl.run_log import MemoryRunStore, RedisRunStore, RunLog
+from src.modules.etl.sse_protocol import adapt_sse_stream
+
+fakeredis = pytest.importorskip("fakeredis")
+
+_AGENT = {"id": "analyst", "name": "Analyst"}
+
+
+def _events(count: int) -> list[dict[str, Any]]:
+    events = [{"event": "agent.start", "agent": _AGENT, "data": {}}]
+    for index in range(count - 2):
+        events.append(
+            {
+                "event": "tool.call",
+                "agent": _AGENT,
+                "data": {"tool": {"name": f"tool_{index}", "input": {"index": index}}},
+            }
+        )
+    events.append({"event": "agent.end", "agent": _AGENT, "data": {"deliverable": {}}})
+    return events
+
+
+class _Source:
+    """StreamManager.subscribe stand-in:counts how often the run is read"""
+
+    def __init__(self, events: list[dict[str, Any]], gate: asyncio.Event | None = None) -> None:
+        self.events = events
+        self.gate = gate
+        self.reads = 0
+
+    async def subscribe(self):
+        self.reads += 1
+        for seq, event in enumerate(self.events, start=1):
+            if self.gate is not None and seq == 2:
+                await self.gate.wait()
+            yield {"id": str(seq), "data": json.dumps(event)}
+
+
+async def _not_found(_key: str, _interrupt_id: str | None) -> bool:
+    return False
+
+
+async def _collect(run_log: RunLog, key: str, last_event_id: int | None = None) -> list[str]:
+    frames = run_log.stream(key, last_event_id=last_event_id)
+    return [frame["id"] async for frame in frames]
+
+
+def _redis_log(server: Any, node_id: str, abort_handler=_not_found) -> tuple[RunLog, Any]:
+    redis = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+
+    async def _client() -> Any:
+        return redis
+
+    run_log = RunLog(abort_handler=abort_handler, node_id=node_id, idle_seconds=0.05)
+    return run_log, _client
+
+
+@pytest.mark.asyncio
+async def test_frames_are_mapped_once_and_replayed_after_last_event_id() -> None:
+    run_log = RunLog(abort_handler=_not_found, store=MemoryRunStore(), idle_seconds=0.05)
+    gate = asyncio.Event()
+    source = _Source(_events(6), gate)
+
+    run_id = await run_log.start_run("etl_team_1:7:s1")
+    run_log.publish("etl_team_1:7:s1", adapt_sse_stream(source=source.subscribe(), run_id=run_id))
+    # Subscribers connected before the run produces anything get it live.
+    live = [asyncio.create_task(_collect(run_log, "etl_team_1:7:s1")) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    gate.set()
+
+    # agent.end leaves a deliverable:the done frame follows the events.
+    assert [await task for task in live] == [["1", "2", "3", "4", "5", "6", "7"]] * 3
+    assert await _collect(run_log, "etl_team_1:7:s1", last_event_id=4) == ["5", "6", "7"]
+    assert source.reads == 1
+    assert (await run_log.get_run("etl_team_1:7:s1")).finished
+
+    # A new run resets the log;clear closes it.
+    await run_log.start_run("etl_team_1:7:s1")
+    tail = asyncio.create_task(_collect(run_log, "etl_team_1:7:s1"))
+    await asyncio.sleep(0.01)
+    await run_log.clear("etl_team_1:7:s1")
+    assert await tail == []
+    assert await run_log.get_run("etl_team_1:7:s1") is None
+
+
+@pytest.mark.asyncio
+async def test_redis_log_is_resumed_on_another_node() -> None:
+    server = fakeredis.FakeServer()
+    owner, owner_client = _redis_log(server, "node-a")
+    other, other_client = _redis_log(server, "node-b")
+    await owner.start(client_factory=owner_client)
+    await other.start(client_factory=other_client)
+    assert isinstance(other.store, RedisRunStore)
+    gate = asyncio.Event()
+
+    run_id = await owner.start_run("etl_team_1:7:s1")
+    owner.publish(
+        "etl_team_1:7:s1",
+        adapt_sse_stream(source=_Source(_events(5), gate).subscribe(), run_id=run_id),
+    )
+    tail = asyncio.create_task(_collect(other, "etl_team_1:7:s1"))
+    await asyncio.sleep(0.1)
+    gate.set()
+
+    assert await tail == ["1", "2", "3", "4", "5", "6"]
+    assert await _collect(other, "etl_team_1:7:s1", last_event_id=3) == ["4", "5", "6"]
+    info = await other.get_run("etl_team_1:7:s1")
+    assert (info.run_id, info.owner, info.finished) == (run_id, "node-a", True)
+    frames = [frame async for frame in other.stream("etl_team_1:7:s1")]
+    assert json.loads(frames[0]["data"])["run_id"] == run_id
+
+    await owner.stop()
+    await other.stop()
+
+
+@pytest.mark.asyncio
+async def test_abort_is_relayed_to_the_owning_node() -> None:
+    server = fakeredis.FakeServer()
+    aborted: list[tuple[str, str | None]] = []
+
+    async def _abort(key: str, interrupt_id: str | None) -> bool:
+        aborted.append((key, interrupt_id))
+        return True
+
+    owner, owner_client = _redis_log(server, "node-a", _abort)
+    other, other_client = _redis_log(server, "node-b")
+    await owner.start(client_factory=owner_client)
+    await other.start(client_factory=other_client)
+    await asyncio.wait_for(owner.wait_subscribed(), timeout=5)
+
+    await owner.start_run("etl_team_1:7:s1")
+    assert await other.abort("etl_team_1:7:s1") is True
+    assert await other.abort("etl_team_1:7:s1", interrupt_id="iid-1") is True
+    assert aborted == [("etl_team_1:7:s1", None), ("etl_team_1:7:s1", "iid-1")]
+
+    # Without a run record the abort stays local;a gone owner cannot abort.
+    assert await other.abort("etl_team_1:7:other") is False
+    await owner.stop()
+    assert await other.abort("etl_team_1:7:s1") is False
+    await other.stop()
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+from datapillar_oneagentic.core.types import SessionKey
+
+import src.modules.etl.api as etl_api_module
+from src.modules.etl.model_runtime import EtlModelSelection
+from src.modules.etl.team_pool import EtlTeamPool, SessionBinding, TeamPoolKey
+from src.shared.exception import ConflictException
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _key(tenant_id: int, version: str = "v1") -> TeamPoolKey:
+    return TeamPoolKey(
+        tenant_id=tenant_id,
+        ai_model_id=1,
+        provider_model_id="glm-4.5",
+        config_version=version,
+    )
+
+
+def test_team_pool_lru_and_idle_eviction() -> None:
+    clock = _Clock()
+    pool = EtlTeamPool(max_teams=2, idle_ttl_seconds=60, clock=clock)
+    builds: list[int] = []
+
+    def _build(tenant_id: int):
+        builds.append(tenant_id)
+        return object()
+
+    team_a = pool.get_or_create(_key(1), lambda: _build(1))
+    assert pool.get_or_create(_key(1), lambda: _build(1)) is team_a
+    pool.get_or_create(_key(2), lambda: _build(2))
+    pool.get(_key(1))
+    pool.get_or_create(_key(3), lambda: _build(3))
+
+    # Tenant 2 was least recently used.
+    assert pool.get(_key(2)) is None
+    assert pool.get(_key(1)) is team_a
+    assert builds == [1, 2, 3]
+
+    clock.now = 30
+    pool.get(_key(3))
+    clock.now = 61
+    assert pool.evict_idle() == 1
+    assert pool.get(_key(1)) is None
+    assert pool.get(_key(3)) is not None
+    assert pool.stats()["evictions"] == 2
+
+
+class _Team:
+    def __init__(self) -> None:
+        self.closed = 0
+
+    async def close(self) -> None:
+        self.closed += 1
+
+
+@pytest.mark.asyncio
+async def test_team_pool_closes_evicted_teams_and_all_on_shutdown() -> None:
+    clock = _Clock()
+    pool = EtlTeamPool(max_teams=1, idle_ttl_seconds=60, clock=clock)
+    first, second = _Team(), _Team()
+
+    # Evicted on a worker thread:closed on the pool's loop.
+    await asyncio.to_thread(pool.get_or_create, _key(1), lambda: first)
+    await asyncio.to_thread(pool.get_or_create, _key(2), lambda: second)
+    await asyncio.sleep(0.01)
+    assert (first.closed, second.closed) == (1, 0)
+
+    await pool.aclose()
+    assert second.closed == 1
+    assert pool.stats()["teams"] == 0
+
+
+def test_team_pool_session_bindings_are_bounded() -> None:
+    pool = EtlTeamPool(max_sessions=2)
+    for index in range(3):
+        pool.bind_session(f"s{index}", SessionBinding(model=(1, "m"), pool_key=_key(1)))
+
+    assert pool.get_binding("s0") is None
+    assert pool.get_binding("s2") is not None
+    pool.unbind_session("s2")
+    assert pool.get_binding("s2") is None
+
+
+def test_resolve_session_team_shares_team_across_sessions(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    lookups: list[int] = []
+    created: list[str] = []
+
+    def _mock_resolve_etl_models(**kwargs) -> EtlModelSelection:
+        lookups.append(kwargs["user_id"])
+        return EtlModelSelection(
+            chat_model={"id": kwargs["ai_model_id"]},
+            embedding_model={"id": 9, "embedding_dimension": 8},
+        )
+
+    def _mock_create_etl_team(*, config, namespace, tenant_id):
+        created.append(namespace)
+        return object()
+
+    monkeypatch.setattr(etl_api_module, "resolve_etl_models", _mock_resolve_etl_models)
+    monkeypatch.setattr(etl_api_module, "build_etl_config_from_models", lambda **_: None)
+    monkeypatch.setattr(etl_api_module, "create_etl_team", _mock_create_etl_team)
+    monkeypatch.setattr(
+        EtlModelSelection, "config_version", property(lambda self: "v1"), raising=True
+    )
+
+    request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace()))
+
+    def _resolve(session_id: str, user_id: int, model: tuple[int, str]):
+        key = SessionKey(namespace="etl_team_1", session_id=f"{user_id}:{session_id}")
+        return etl_api_module._resolve_session_team(
+            request=request,
+            tenant_id=1,
+            tenant_code="t1",
+            user_id=user_id,
+            key=key,
+            requested_model=model,
+        )
+
+    team_a = _resolve("s1", 7, (1, "glm-4.5"))
+    team_b = _resolve("s2", 8, (1, "glm-4.5"))
+    assert team_a is team_b
+    assert created == ["etl_team_1"]
+    # Every new session is still authorized for its user.
+    assert lookups == [7, 8]
+
+    # A bound session reuses its team without a lookup.
+    assert _resolve("s1", 7, (1, "glm-4.5")) is team_a
+    assert lookups == [7, 8]
+
+    with pytest.raises(ConflictException):
+        _resolve("s1", 7, (2, "glm-4.5"))
+
+
+@pytest.mark.asyncio
+async def test_bound_team_is_resolved_off_the_event_loop(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    threads: list[int] = []
+
+    def _mock_resolve_session_team(**kwargs):
+        threads.append(threading.get_ident())
+        return "team"
+
+    monkeypatch.setattr(etl_api_module, "_resolve_session_team", _mock_resolve_session_team)
+    request = SimpleNamespace(
+        app=SimpleNamespace(state=SimpleNamespace()),
+        state=SimpleNamespace(
+            current_user=SimpleNamespace(tenant_id=1, tenant_code="t1", user_id=7)
+        ),
+    )
+    key = SessionKey(namespace="etl_team_1", session_id="7:s1")
+    assert await etl_api_module._aget_bound_team(request, key) is None
+
+    etl_api_module._get_team_pool(request).bind_session(
+        str(key), SessionBinding(model=(1, "glm-4.5"), pool_key=_key(1))
+    )
+    assert await etl_api_module._aget_bound_team(request, key) == "team"
+    assert threads and threads[0] != threading.get_ident()
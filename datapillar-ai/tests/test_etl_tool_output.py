@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import pytest
+from datapillar_oneagentic.log import bind_log_context
+
+from src.modules.etl.tools import cache as cache_module
+from src.modules.etl.tools import table as table_module
+from src.modules.etl.tools.cache import ToolResultCache
+from src.modules.etl.tools.output import encode_tool_result, tool_error
+from src.shared.context import reset_request_scope, set_request_scope
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _columns(count: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "name": f"column_{i}",
+            "dataType": "varchar",
+            "description": f"description of column {i}",
+            "nullable": True,
+            "valueDomain": None,
+            "node_id": f"internal-{i}",
+        }
+        for i in range(count)
+    ]
+
+
+def test_tables_are_projected_and_sent_with_one_header() -> None:
+    text = encode_tool_result(
+        {"path": "hive.ods.t_order", "columns": _columns(2), "score": 0.123456},
+        tables={"columns": ("name", "dataType")},
+    )
+
+    assert json.loads(text) == {
+        "path": "hive.ods.t_order",
+        "columns": {
+            "fields": ["name", "dataType"],
+            "rows": [["column_0", "varchar"], ["column_1", "varchar"]],
+        },
+        "score": 0.123456,
+    }
+    assert " " not in text.replace("description of", "")
+
+
+def test_budget_drops_rows_round_robin_and_reports_totals() -> None:
+    edges = [{"source_table": f"s{i}", "target_table": f"t{i}"} for i in range(200)]
+    text = encode_tool_result(
+        {"path": "p", "columns": _columns(200), "edges": edges},
+        tables={"columns": ("name", "description"), "edges": ("source_table", "target_table")},
+        budget=300,
+    )
+
+    data = json.loads(text)
+    assert len(text.encode()) // 3 <= 300
+    assert data["truncated"] == {"columns": 200, "edges": 200}
+    kept_columns = len(data["columns"]["rows"])
+    kept_edges = len(data["edges"]["rows"])
+    assert kept_columns > 0 and kept_edges > 0
+    assert "truncated" not in json.loads(
+        encode_tool_result({"columns": _columns(2)}, tables={"columns": ("name",)}, budget=300)
+    )
+
+
+@pytest.mark.asyncio
+async def test_session_cache_reuses_results_but_not_errors_or_other_sessions() -> None:
+    clock = _Clock()
+    cache = ToolResultCache(ttl_seconds=60, clock=clock)
+    calls: list[str] = []
+
+    async def _compute() -> str:
+        calls.append("ok")
+        return '{"ok":1}'
+
+    async def _fail() -> str:
+        calls.append("error")
+        return tool_error("table not found")
+
+    assert await cache.run("get_table_detail", {"path": "a"}, _compute) == '{"ok":1}'
+    assert cache.stats()["uncached"] == 1
+
+    with bind_log_context(namespace="etl_team_1", session_id="7:s1"):
+        await cache.run("get_table_detail", {"path": "a"}, _compute)
+        await cache.run("get_table_detail", {"path": "a"}, _compute)
+        await cache.run("get_table_detail", {"path": "b"}, _fail)
+        await cache.run("get_table_detail", {"path": "b"}, _fail)
+    with bind_log_context(namespace="etl_team_1", session_id="7:s2"):
+        await cache.run("get_table_detail", {"path": "a"}, _compute)
+
+    assert calls == ["ok", "ok", "error", "error", "ok"]
+    assert cache.stats()["hits"] == 1
+
+    clock.now += 61
+    with bind_log_context(namespace="etl_team_1", session_id="7:s1"):
+        await cache.run("get_table_detail", {"path": "a"}, _compute)
+    assert calls[-1] == "ok" and len(calls) == 6
+
+    cache.clear_session("etl_team_1", "7:s1")
+    assert cache.stats()["sessions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_table_detail_is_async_compact_and_cached(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(cache_module, "tool_result_cache", ToolResultCache())
+    lookups: list[tuple[str, str, str]] = []
+
+    def _detail(catalog: str, schema: str, table: str, **_: Any) -> dict[str, Any]:
+        lookups.append((catalog, schema, table))
+        return {"description": "orders", "columns": _columns(3)}
+
+    monkeypatch.setattr(table_module.Neo4jTableSearch, "get_table_detail", _detail)
+    token = set_request_scope(1, 7, "acme")
+    try:
+        with bind_log_context(namespace="etl_team_1", session_id="7:s1"):
+            first = await table_module.get_table_detail.ainvoke({"path": "hive.ods.t_order"})
+            second = await table_module.get_table_detail.ainvoke({"path": "hive.ods.t_order"})
+    finally:
+        reset_request_scope(token)
+
+    assert first == second
+    assert lookups == [("hive", "ods", "t_order")]
+    data = json.loads(first)
+    assert data["columns"]["fields"] == list(table_module._COLUMN_FIELDS)
+    assert data["columns"]["rows"][0] == [
+        "column_0",
+        "varchar",
+        "description of column 0",
+        True,
+        None,
+    ]
+
+
+def test_async_tools_keep_a_sync_invoke() -> None:
+    assert json.loads(table_module.get_table_detail.invoke({"path": "bad"})) == {
+        "error": "Path format error,should be catalog.schema.table"
+    }
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import pytest
+from datapillar_oneagentic.core.types import SessionKey
+from datapillar_oneagentic.providers.llm import UsageLedger
+
+import src.modules.etl.usage_sink as usage_sink_module
+from src.modules.etl.usage_sink import EtlUsageSink
+
+
+@pytest.mark.asyncio
+async def test_ledger_flush_writes_one_usage_row_per_entry(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    records: list[dict[str, Any]] = []
+    monkeypatch.setattr(
+        usage_sink_module.LlmUsage,
+        "upsert_usage",
+        staticmethod(lambda *, record: records.append(record)),
+    )
+    ledger = UsageLedger(sink=EtlUsageSink(tenant_id=3, provider="openai"))
+    key = SessionKey(namespace="etl_team_3", session_id="7:s1")
+    ledger.record(key=key, agent_id="analyst", model="gpt-4o", input_tokens=10, output_tokens=2)
+    ledger.record(key=key, agent_id="analyst", model="gpt-4o", input_tokens=5, output_tokens=1)
+    await ledger.flush()
+    ledger.record(key=key, agent_id="analyst", model="gpt-4o", input_tokens=4, output_tokens=4)
+    await ledger.aclose()
+
+    assert len(records) == 2
+    first = records[0]
+    assert first["tenant_id"] == 3
+    assert first["user_id"] == 7
+    assert first["session_id"] == "s1"
+    assert (first["module"], first["agent_id"], first["provider"]) == ("etl", "analyst", "openai")
+    assert first["prompt_tokens"] == 15
+    assert first["completion_tokens"] == 3
+    assert first["total_tokens"] == 18
+    assert json.loads(first["raw_usage_json"])["calls"] == 2
+    # Each flush is a delta, so rows of the same session never replace each other.
+    assert records[0]["run_id"] != records[1]["run_id"]
+    assert records[1]["total_tokens"] == 8
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import asyncio
+import re
+from contextlib import asynccontextmanager
+from typing import Any
+
+import pytest
+
+from src.infrastructure.llm.embeddings import QueryEmbeddingMemo, UnifiedEmbedder
+from src.infrastructure.repository.knowledge import Neo4jMetricSearch, search_hybrid
+from src.infrastructure.repository.knowledge.search_hybrid import LegHit, fuse_linear
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _FakeEmbeddings:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    async def aembed_query(self, text: str) -> list[float]:
+        self.calls.append(text)
+        await asyncio.sleep(0.01)
+        return [float(len(text)), 1.0]
+
+    def embed_query(self, text: str) -> list[float]:
+        self.calls.append(text)
+        return [float(len(text)), 1.0]
+
+
+class _FakeResult:
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        self._rows = rows
+
+    async def data(self) -> list[dict[str, Any]]:
+        return self._rows
+
+
+class _FakeGraph:
+    """Answers the leg and hydrate queries of search_hybrid and tracks leg concurrency"""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.legs: list[tuple[str, str]] = []
+
+    async def run(self, query: str, params: dict[str, Any]) -> _FakeResult:
+        if "UNWIND $hits" in query:
+            metric_type = re.search(r"'(\w+Metric)' AS type", query).group(1)
+            return _FakeResult(
+                [
+                    {
+                        "type": metric_type,
+                        "code": hit["element_id"],
+                        "name": hit["element_id"],
+                        "description": None,
+                        "score": hit["score"],
+                    }
+                    for hit in params["hits"]
+                ]
+            )
+
+        kind = "vector" if "db.index.vector" in query else "fulltext"
+        index_name = params["index_name"]
+        self.legs.append((kind, index_name))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.in_flight -= 1
+        prefix = index_name.split("_")[0]
+        if kind == "vector":
+            scores = {f"{prefix}-a": 0.9, f"{prefix}-b": 0.45}
+        else:
+            scores = {f"{prefix}-b": 4.0, f"{prefix}-c": 2.0}
+        return _FakeResult([{"element_id": eid, "score": score} for eid, score in scores.items()])
+
+
+@pytest.fixture
+def fake_embeddings(monkeypatch: pytest.MonkeyPatch) -> _FakeEmbeddings:
+    embeddings = _FakeEmbeddings()
+    embedder = object.__new__(UnifiedEmbedder)
+    embedder._initialized = True
+    embedder._tenant_id = 1
+    embedder._embeddings = embeddings
+    embedder.query_memo = QueryEmbeddingMemo()
+    monkeypatch.setattr(UnifiedEmbedder, "_instances", {1: embedder})
+    return embeddings
+
+
+@pytest.fixture
+def fake_graph(monkeypatch: pytest.MonkeyPatch) -> _FakeGraph:
+    graph = _FakeGraph()
+
+    @asynccontextmanager
+    async def _session(**_: Any):
+        yield graph
+
+    monkeypatch.setattr(search_hybrid, "neo4j_async_session", _session)
+    return graph
+
+
+def test_fuse_linear_matches_graphrag_linear_ranker() -> None:
+    vector = [LegHit("a", 0.9), LegHit("b", 0.45)]
+    fulltext = [LegHit("b", 4.0), LegHit("c", 2.0)]
+
+    fused = fuse_linear(vector, fulltext, top_k=3, alpha=0.6)
+
+    # a: 0.6 * 1.0; b: 0.6 * 0.5 + 0.4 * 1.0; c: 0.4 * 0.5
+    assert [hit.element_id for hit in fused] == ["b", "a", "c"]
+    assert [round(hit.score, 3) for hit in fused] == [0.7, 0.6, 0.2]
+    assert fuse_linear(vector, [], top_k=1) == [LegHit("a", pytest.approx(0.6))]
+
+
+def test_query_memo_expires_and_evicts() -> None:
+    clock = _Clock()
+    memo = QueryEmbeddingMemo(max_size=2, ttl_seconds=10, clock=clock)
+    memo.put("a", [1.0])
+    memo.put("b", [2.0])
+    assert memo.get("a") == [1.0]
+    memo.put("c", [3.0])
+
+    # "b" was least recently used.
+    assert memo.get("b") is None
+    clock.now = 11
+    assert memo.get("a") is None
+    assert len(memo) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_query_embeddings_share_one_call(fake_embeddings) -> None:
+    embedder = UnifiedEmbedder(1)
+
+    vectors = await asyncio.gather(*(embedder.async_embed_query("order amount") for _ in range(10)))
+
+    assert fake_embeddings.calls == ["order amount"]
+    assert all(vector == vectors[0] for vector in vectors)
+    # The sync path (neo4j-graphrag retrievers) reads the same memo.
+    assert embedder.embed_query("order amount") == vectors[0]
+    assert fake_embeddings.calls == ["order amount"]
+
+
+@pytest.mark.asyncio
+async def test_asearch_metrics_embeds_once_and_runs_legs_concurrently(
+    fake_embeddings, fake_graph
+) -> None:
+    results = await Neo4jMetricSearch.asearch_metrics(
+        "gmv", top_k=3, min_score=0.5, tenant_id=1, user_id=7
+    )
+
+    assert fake_embeddings.calls == ["gmv"]
+    assert len(fake_graph.legs) == 6
+    assert fake_graph.max_in_flight == 6
+    assert [r["score"] for r in results] == [0.7, 0.7, 0.7]
+    assert {r["type"] for r in results} == {"AtomicMetric", "DerivedMetric", "CompositeMetric"}
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_many_isolates_failing_index(
+    fake_embeddings, fake_graph, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    original = search_hybrid.fulltext_leg
+
+    async def _fulltext_leg(index_name: str, query: str, top_k: int):
+        if index_name.startswith("derived"):
+            raise RuntimeError("index offline")
+        return await original(index_name, query, top_k)
+
+    monkeypatch.setattr(search_hybrid, "fulltext_leg", _fulltext_leg)
+
+    results = await Neo4jMetricSearch.asearch_metrics("gmv", top_k=9, min_score=0, tenant_id=1)
+
+    assert {r["type"] for r in results} == {"AtomicMetric", "CompositeMetric"}
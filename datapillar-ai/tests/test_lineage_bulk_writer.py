@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from src.infrastructure.repository.knowledge import sync_lineage, writeback
+from src.infrastructure.repository.knowledge.sync_lineage import (
+    LineageBulkWriter,
+    ensure_merge_key_indexes,
+)
+from src.infrastructure.repository.knowledge.writeback import Neo4jKGWritebackRepository
+
+
+class _FakeResult:
+    def __init__(self, rows: list[dict[str, Any]] | None = None) -> None:
+        self._rows = rows or []
+        self.consumed = False
+
+    async def data(self) -> list[dict[str, Any]]:
+        return self._rows
+
+    async def consume(self) -> None:
+        self.consumed = True
+
+
+class _FakeSession:
+    """Records every statement;SHOW INDEXES reports the given (label,property) keys"""
+
+    def __init__(self, indexed: list[tuple[str, str]] | None = None) -> None:
+        self.indexed = indexed or []
+        self.calls: list[tuple[str, dict[str, Any]]] = []
+        self.committed = False
+        self.rolled_back = False
+
+    async def run(self, query: str, params: dict[str, Any] | None = None) -> _FakeResult:
+        self.calls.append((query, dict(params or {})))
+        if "SHOW INDEXES" in query:
+            return _FakeResult(
+                [
+                    {"labelsOrTypes": [label], "properties": [prop], "state": "ONLINE"}
+                    for label, prop in self.indexed
+                ]
+            )
+        return _FakeResult()
+
+    def writes(self) -> list[tuple[str, dict[str, Any]]]:
+        return [call for call in self.calls if "UNWIND $rows" in call[0]]
+
+    async def begin_transaction(self) -> _FakeSession:
+        return self
+
+    async def commit(self) -> None:
+        self.committed = True
+
+    async def rollback(self) -> None:
+        self.rolled_back = True
+
+    async def __aenter__(self) -> _FakeSession:
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+
+@pytest.fixture(autouse=True)
+def _fresh_index_check(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sync_lineage, "_checked_merge_keys", set())
+    monkeypatch.setattr(sync_lineage, "get_neo4j_write_batch_size", lambda: 5000)
+    monkeypatch.setattr(writeback, "get_neo4j_write_batch_size", lambda: 5000)
+
+
+@pytest.mark.asyncio
+async def test_bulk_writer_batches_by_type_and_dedupes() -> None:
+    session = _FakeSession(indexed=list(sync_lineage.LINEAGE_MERGE_KEYS))
+    writer = LineageBulkWriter(session, batch_size=4, tenant_id=9)
+    writer.add_sql_outputs("sql-1", ["t-2"])
+    for i in range(10):
+        writer.add_column_lineage(f"src-{i}", f"dst-{i}", transform_type="DIRECT")
+    writer.add_column_lineage("src-0", "dst-0", transform_type="DIRECT")
+    writer.add_table_columns("t-1", ["c-1", "c-2"])
+
+    stats = await writer.flush()
+
+    writes = session.writes()
+    assert [len(params["rows"]) for _, params in writes] == [2, 1, 4, 4, 2]
+    assert "HAS_COLUMN" in writes[0][0]
+    assert all("DERIVES_FROM" in query for query, _ in writes[2:])
+    assert {params["tenantId"] for _, params in writes} == {9}
+    assert stats.rows == 13
+    assert stats.batches == 5
+    assert stats.rows_by_type == {"table_column": 2, "sql_output": 1, "column_lineage": 10}
+    assert writer.pending == 0
+
+
+def test_bulk_writer_rejects_rows_without_keys() -> None:
+    writer = LineageBulkWriter(_FakeSession(), tenant_id=1)
+
+    with pytest.raises(ValueError, match="missing key"):
+        writer.add_column_lineage("src", "")
+    with pytest.raises(ValueError, match="Not supported"):
+        writer.add("unknown", {})
+
+
+@pytest.mark.asyncio
+async def test_missing_merge_key_index_is_created_once() -> None:
+    session = _FakeSession(indexed=[("Table", "id"), ("Column", "id")])
+
+    missing = await ensure_merge_key_indexes(session, [("Table", "id"), ("SQL", "id")])
+    again = await ensure_merge_key_indexes(session, [("Table", "id"), ("SQL", "id")])
+
+    assert missing == [("SQL", "id")]
+    assert again == []
+    created = [query for query, _ in session.calls if query.startswith("CREATE INDEX")]
+    assert created == ["CREATE INDEX kg_sql_id_idx IF NOT EXISTS FOR (n:SQL) ON (n.id)"]
+
+
+@pytest.mark.asyncio
+async def test_persist_kg_updates_sends_one_batch_per_type(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    session = _FakeSession(indexed=list(writeback.WRITEBACK_MERGE_KEYS))
+
+    class _Driver:
+        def session(self, **_: Any) -> _FakeSession:
+            return session
+
+    async def _get_driver() -> _Driver:
+        return _Driver()
+
+    monkeypatch.setattr(writeback.AsyncNeo4jClient, "get_driver", _get_driver)
+    monkeypatch.setattr(writeback, "settings", SimpleNamespace(neo4j_database="neo4j"))
+    updates = [
+        {"type": "lineage", "source_table": f"s{i}", "target_table": f"t{i}"} for i in range(50)
+    ]
+    updates += [{"type": "join", "left": "a", "right": "b", "on": ["id"]}, {"type": "bogus"}]
+
+    saved = await Neo4jKGWritebackRepository.persist_kg_updates(updates, "u1", "sess-1")
+
+    writes = session.writes()
+    assert saved == 51
+    assert [len(params["rows"]) for _, params in writes] == [50, 1]
+    assert writes[0][1]["rows"][0] == {"source_table": "s0", "target_table": "t0", "confidence": 0.5}
+    assert {params["user_id"] for _, params in writes} == {"u1"}
+    assert session.committed and not session.rolled_back
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+import pytest
+
+from src.infrastructure.repository.knowledge import lineage_cache
+from src.infrastructure.repository.knowledge.lineage_cache import LineageCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _FakeGraph:
+    """Edge rows keyed by sql id;answers full and dirty-id loads like the Neo4j loader"""
+
+    def __init__(self) -> None:
+        self.sql: dict[str, dict[str, Any]] = {}
+        self.calls: list[tuple[Any, Any]] = []
+
+    def add_sql(
+        self,
+        sql_id: str,
+        sources: Sequence[str],
+        targets: Sequence[str],
+        created_by: str | None = "OPENLINEAGE",
+    ) -> None:
+        self.sql[sql_id] = {"sources": list(sources), "targets": list(targets), "by": created_by}
+
+    def __call__(
+        self,
+        tenant_id: int | None,
+        sql_ids: Sequence[str] | None,
+        table_ids: Sequence[str] | None,
+    ) -> list[dict[str, Any]]:
+        self.calls.append((sql_ids, table_ids))
+        rows = []
+        for sql_id, sql in self.sql.items():
+            tables = set(sql["sources"]) | set(sql["targets"])
+            if sql_ids is not None and sql_id not in sql_ids and not tables & set(table_ids):
+                continue
+            for source in sql["sources"]:
+                for target in sql["targets"]:
+                    rows.append(
+                        {
+                            "source_id": source,
+                            "source_table": f"dw.{source}",
+                            "target_id": target,
+                            "target_table": f"dw.{target}",
+                            "sql_id": sql_id,
+                            "created_by": sql["by"],
+                        }
+                    )
+        return rows
+
+
+@pytest.fixture
+def chain() -> _FakeGraph:
+    # ods -> dwd -> dws -> ads,plus report reading dwd
+    graph = _FakeGraph()
+    graph.add_sql("s1", ["ods"], ["dwd"])
+    graph.add_sql("s2", ["dwd"], ["dws"])
+    graph.add_sql("s3", ["dws"], ["ads"])
+    graph.add_sql("s4", ["dwd"], ["report"])
+    return graph
+
+
+def test_depth_limited_impact_is_served_from_one_load(chain: _FakeGraph) -> None:
+    cache = LineageCache(loader=chain)
+
+    direct = cache.impact(1, None, "dwd", "both")
+    downstream = cache.impact(1, None, "ods", "downstream", max_depth=2)
+    full = cache.impact(1, None, "ods", "downstream", max_depth=None)
+
+    assert direct.upstream == {"dw.ods": 1}
+    assert direct.downstream == {"dw.dws": 1, "dw.report": 1}
+    assert [e["sql_id"] for e in direct.edges] == ["s2", "s4", "s1"]
+    assert downstream.downstream == {"dw.dwd": 1, "dw.dws": 2, "dw.report": 2}
+    assert {e["sql_id"] for e in downstream.edges} == {"s1", "s2", "s4"}
+    assert full.downstream["dw.ads"] == 3
+    assert cache.reachable(1, None, "ads", "upstream") == {"dw.ods", "dw.dwd", "dw.dws"}
+    assert chain.calls == [(None, None)]
+    assert cache.stats()["hits"] == 3
+    assert cache.stats()["misses"] == 1
+
+
+def test_table_lineage_keeps_hops_per_direction(monkeypatch: pytest.MonkeyPatch) -> None:
+    from src.infrastructure.repository.knowledge import search_table
+
+    # ods -> dwd -> dws -> ods:in a cycle every table is both upstream and downstream.
+    graph = _FakeGraph()
+    graph.add_sql("s1", ["ods"], ["dwd"])
+    graph.add_sql("s2", ["dwd"], ["dws"])
+    graph.add_sql("s3", ["dws"], ["ods"])
+    cache = LineageCache(loader=graph)
+    monkeypatch.setattr(search_table, "get_lineage_cache", lambda: cache)
+
+    lineage = search_table.Neo4jTableSearch.get_table_lineage(
+        "dw", "dwd", tenant_id=1, max_depth=None
+    )
+
+    assert lineage["hops"] == {
+        "upstream": {"dw.ods": 1, "dw.dws": 2, "dw.dwd": 3},
+        "downstream": {"dw.dws": 1, "dw.ods": 2, "dw.dwd": 3},
+    }
+
+
+def test_dirty_sql_is_refetched_and_closures_updated(chain: _FakeGraph) -> None:
+    clock = _Clock()
+    cache = LineageCache(loader=chain, clock=clock, settle_seconds=1)
+    assert cache.reachable(1, None, "ods", "downstream") == {
+        "dw.dwd",
+        "dw.dws",
+        "dw.ads",
+        "dw.report",
+    }
+
+    # s2 now writes to a new table instead of dws.
+    chain.add_sql("s2", ["dwd"], ["dws_v2"])
+    cache.mark_dirty(1, sql_ids=["s2"])
+    clock.now += 5
+
+    assert cache.reachable(1, None, "ods", "downstream") == {"dw.dwd", "dw.dws_v2", "dw.report"}
+    assert cache.reachable(1, None, "ads", "upstream") == {"dw.dws"}
+    assert chain.calls == [(None, None), (["s2"], [])]
+    stats = cache.stats()
+    assert stats["refreshes"] == 1
+    assert stats["pending_dirty"] == 0
+
+
+def test_deleted_table_drops_its_edges(chain: _FakeGraph) -> None:
+    clock = _Clock()
+    cache = LineageCache(loader=chain, clock=clock, settle_seconds=0)
+    cache.impact(1, None, "dwd", "both")
+
+    del chain.sql["s4"]
+    cache.mark_dirty(1, table_ids=["report"])
+    clock.now += 1
+
+    assert cache.impact(1, None, "dwd", "downstream").downstream == {"dw.dws": 1}
+
+
+def test_recent_mark_stays_pending_until_settled(chain: _FakeGraph) -> None:
+    clock = _Clock()
+    cache = LineageCache(loader=chain, clock=clock, settle_seconds=2)
+    cache.impact(1, None, "dwd", "both")
+
+    cache.mark_dirty(1, sql_ids=["s9"])
+    cache.impact(1, None, "dwd", "both")
+    # Written after the first refresh read,e.g. the writer's transaction committed late.
+    chain.add_sql("s9", ["ads"], ["mart"])
+    clock.now += 3
+    impact = cache.impact(1, None, "ads", "downstream")
+
+    assert impact.downstream == {"dw.mart": 1}
+    assert cache.stats()["pending_dirty"] == 0
+
+
+def test_private_sql_is_only_visible_to_its_creator(chain: _FakeGraph) -> None:
+    chain.add_sql("p1", ["ads"], ["sandbox"], created_by="42")
+    cache = LineageCache(loader=chain)
+
+    assert cache.impact(1, 7, "ads", "downstream").downstream == {}
+    assert cache.impact(1, 42, "ads", "downstream").downstream == {"dw.sandbox": 1}
+    assert cache.impact(1, None, "ads", "downstream").downstream == {"dw.sandbox": 1}
+
+
+def test_snapshot_reloads_after_max_staleness(chain: _FakeGraph) -> None:
+    clock = _Clock()
+    cache = LineageCache(loader=chain, clock=clock, max_staleness_seconds=60)
+    cache.impact(1, None, "dwd", "both")
+    clock.now += 30
+    assert cache.stats()["oldest_snapshot_age_seconds"] == 30
+
+    clock.now += 31
+    cache.impact(1, None, "dwd", "both")
+
+    stats = cache.stats()
+    assert stats["stale_reloads"] == 1
+    assert stats["hit_rate"] == 0
+    assert chain.calls == [(None, None), (None, None)]
+
+
+def test_writer_hook_is_noop_without_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(lineage_cache, "_lineage_cache", None)
+
+    lineage_cache.mark_lineage_dirty(1, sql_ids=["s1"])
+    lineage_cache.invalidate_lineage(1)
@@ -12,9 +12,9 @@ from src.shared.config.exceptions import ConfigurationError
 
 @pytest.fixture(autouse=True)
 def _clear_config_cache():
-    config_module.get_datapillar_config.cache_clear()
+    config_module.tenant_config_cache.clear()
     yield
-    config_module.get_datapillar_config.cache_clear()
+    config_module.tenant_config_cache.clear()
 
 
 def _mock_models(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -35,6 +35,7 @@ def _mock_models(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(
         config_module.Model, "get_embedding_default", lambda _tenant_id: embedding_model
     )
+    monkeypatch.setattr(config_module.Model, "get_config_version", lambda _tenant_id: "2:v1")
 
 
 def test_get_datapillar_config_merges_settings(monkeypatch: pytest.MonkeyPatch):
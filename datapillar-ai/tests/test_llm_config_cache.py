@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any
+
+import pytest
+
+from src.infrastructure.llm.config_cache import ConfigInvalidationListener, TenantConfigCache
+from src.shared.config import nacos_client
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Source:
+    """ai_model stand-in:version stamp per tenant and a count of config builds."""
+
+    def __init__(self) -> None:
+        self.versions: dict[int, str] = {1: "v1", 2: "v1"}
+        self.builds: list[tuple[int, str]] = []
+        self.version_reads = 0
+        self.fail = False
+
+    def build(self, tenant_id: int, _tenant_code: str | None) -> Any:
+        if self.fail:
+            raise RuntimeError("mysql down")
+        version = self.versions[tenant_id]
+        self.builds.append((tenant_id, version))
+        return {"tenant": tenant_id, "version": version}
+
+    def version_of(self, tenant_id: int) -> str | None:
+        self.version_reads += 1
+        return self.versions[tenant_id]
+
+
+def _cache(source: _Source, clock: _Clock, **kwargs: Any) -> TenantConfigCache:
+    return TenantConfigCache(
+        build=source.build,
+        version_of=source.version_of,
+        fresh_seconds=30,
+        max_stale_seconds=300,
+        clock=clock,
+        **kwargs,
+    )
+
+
+def _drain(cache: TenantConfigCache) -> None:
+    """Wait for background refreshes;the executor is recreated on the next one."""
+    executor, cache._executor = cache._executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+def test_stale_entries_are_served_while_revalidating() -> None:
+    source, clock = _Source(), _Clock()
+    cache = _cache(source, clock)
+
+    first = cache.get(1)
+    assert cache.get(1) is first
+
+    # Stale,same version:served immediately,checked in the background,not rebuilt.
+    clock.now += 31
+    assert cache.get(1) is first
+    _drain(cache)
+    assert source.builds == [(1, "v1")]
+    assert cache.get(1) is first
+
+    # Stale,new version:the old config is served once more,then replaced.
+    clock.now += 31
+    source.versions[1] = "v2"
+    assert cache.get(1) is first
+    _drain(cache)
+    second = cache.get(1)
+    assert second.config == {"tenant": 1, "version": "v2"}
+    assert second.revision > first.revision
+
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["stale_hits"] == 2
+    assert stats["revalidations"] == 1
+    assert stats["rebuilds"] == 2
+    cache.close()
+
+
+def test_expired_entry_revalidates_inline_and_errors_keep_stale_config() -> None:
+    source, clock = _Source(), _Clock()
+    cache = _cache(source, clock)
+    first = cache.get(1)
+
+    clock.now += 31
+    source.versions[1] = "v2"
+    source.fail = True
+    assert cache.get(1) is first
+    _drain(cache)
+    assert cache.stats()["refresh_errors"] == 1
+
+    clock.now += 300
+    with pytest.raises(RuntimeError):
+        cache.get(1)
+    source.fail = False
+    assert cache.get(1).config["version"] == "v2"
+    cache.close()
+
+
+def test_invalidate_drops_tenants_and_discards_inflight_builds() -> None:
+    source, clock = _Source(), _Clock()
+    cache = _cache(source, clock)
+    cache.get(1)
+    cache.get(2)
+
+    cache.invalidate(1)
+    assert cache.stats()["tenants"] == 1
+    cache.get(1)
+    assert source.builds.count((1, "v1")) == 2
+
+    building = threading.Event()
+    release = threading.Event()
+    original = source.build
+
+    def _slow_build(tenant_id: int, tenant_code: str | None) -> Any:
+        building.set()
+        release.wait(timeout=5)
+        return original(tenant_id, tenant_code)
+
+    cache.invalidate()
+    cache._build = _slow_build
+    worker = threading.Thread(target=cache.get, args=(2,))
+    worker.start()
+    building.wait(timeout=5)
+    cache.invalidate(2)
+    release.set()
+    worker.join(timeout=5)
+
+    assert cache.stats()["tenants"] == 0
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_listener_applies_published_invalidations() -> None:
+    redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    received: list[int | None] = []
+    got_message = asyncio.Event()
+
+    def _on_invalidate(tenant_id: int | None) -> None:
+        received.append(tenant_id)
+        if len(received) > 1:
+            got_message.set()
+
+    async def _client() -> Any:
+        return redis
+
+    listener = ConfigInvalidationListener(client_factory=_client, on_invalidate=_on_invalidate)
+    await listener.start()
+    await asyncio.wait_for(listener.wait_subscribed(), timeout=5)
+
+    await redis.publish("datapillar:ai_model:invalidate", "42")
+    await asyncio.wait_for(got_message.wait(), timeout=5)
+    listener.handle("*")
+    listener.handle("not-a-tenant")
+    await listener.stop()
+
+    # Subscribing invalidates everything first(messages may have been missed).
+    assert received == [None, 42, None]
+
+
+def test_nacos_reload_runs_hooks(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(nacos_client, "_config_reload_hooks", [])
+    calls: list[str] = []
+
+    def _failing() -> None:
+        raise RuntimeError("boom")
+
+    nacos_client.add_config_reload_hook(_failing)
+    nacos_client.add_config_reload_hook(lambda: calls.append("reloaded"))
+    nacos_client.run_config_reload_hooks()
+
+    assert calls == ["reloaded"]
+    nacos_client.remove_config_reload_hook(_failing)
+    assert len(nacos_client._config_reload_hooks) == 1
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from datapillar_oneagentic.messages import Message
+
+import src.modules.llm.service as playground_service_module
+from src.infrastructure.llm.provider_pool import (
+    LLMProviderPool,
+    ProviderPoolKey,
+    provider_config_hash,
+)
+from src.modules.llm.schemas import PlaygroundChatRequest
+from src.modules.llm.service import LlmPlaygroundService
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _FakeLlm:
+    async def astream(self, _messages):
+        yield Message.assistant("hi")
+
+
+class _FakeProvider:
+    def __call__(self, **_kwargs: Any) -> _FakeLlm:
+        return _FakeLlm()
+
+
+def _model(**fields: Any) -> dict[str, Any]:
+    return {
+        "provider_code": "glm",
+        "provider_model_id": "glm-4.5",
+        "api_key": "ENCv1:one",
+        "base_url": "https://open.bigmodel.cn/api/paas/v4",
+        "updated_at": "2026-02-19 10:00:00",
+        **fields,
+    }
+
+
+def _payload(thinking: bool = False) -> PlaygroundChatRequest:
+    return PlaygroundChatRequest.model_validate(
+        {"aiModelId": 88, "message": "hello", "modelConfig": {"thinkingEnabled": thinking}}
+    )
+
+
+@pytest.fixture
+def playground(monkeypatch: pytest.MonkeyPatch) -> dict[str, Any]:
+    state: dict[str, Any] = {"model": _model(), "decrypts": 0, "builds": []}
+    pool = LLMProviderPool()
+    service = LlmPlaygroundService(provider_pool=pool)
+
+    async def _decrypt_key(**_kwargs: Any) -> str:
+        state["decrypts"] += 1
+        return "plain-key"
+
+    def _build_llm_provider(**kwargs: Any) -> _FakeProvider:
+        state["builds"].append(kwargs["thinking_enabled"])
+        return _FakeProvider()
+
+    monkeypatch.setattr(
+        playground_service_module.Model,
+        "get_active_chat_model",
+        lambda **_kwargs: state["model"],
+    )
+    monkeypatch.setattr(service, "_decrypt_key", _decrypt_key)
+    monkeypatch.setattr(service, "_build_llm_provider", _build_llm_provider)
+    state.update(pool=pool, service=service)
+    return state
+
+
+async def _chat(service: LlmPlaygroundService, thinking: bool = False) -> str:
+    chunks = []
+    async for delta in service.stream_chat(
+        tenant_id=1, tenant_code="tenant-1", payload=_payload(thinking)
+    ):
+        chunks.append(delta.text_delta)
+    return "".join(chunks)
+
+
+@pytest.mark.asyncio
+async def test_requests_share_one_provider_per_model_config(playground: dict[str, Any]) -> None:
+    service = playground["service"]
+
+    assert await _chat(service) == "hi"
+    await _chat(service, thinking=True)
+    await _chat(service)
+    await _chat(service, thinking=True)
+
+    assert playground["decrypts"] == 2
+    assert playground["builds"] == [False, True]
+    stats = playground["pool"].stats()
+    assert stats["providers"] == 2
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
+    assert stats["hit_rate"] == 0.5
+    assert stats["first_token"]["hit"]["count"] == 2
+    assert stats["first_token"]["miss"]["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_key_rotation_replaces_the_pooled_provider(playground: dict[str, Any]) -> None:
+    service = playground["service"]
+    await _chat(service)
+    await _chat(service, thinking=True)
+
+    playground["model"] = _model(api_key="ENCv1:two")
+    await _chat(service)
+    await _chat(service)
+
+    assert playground["decrypts"] == 3
+    stats = playground["pool"].stats()
+    assert stats["providers"] == 1
+    assert stats["evictions"] == 2
+
+
+@pytest.mark.asyncio
+async def test_ttl_expiry_and_invalidate() -> None:
+    clock = _Clock()
+    pool = LLMProviderPool(ttl_seconds=60, clock=clock)
+    key = ProviderPoolKey(tenant_id=1, ai_model_id=88, config_hash=provider_config_hash(_model()))
+    built: list[object] = []
+
+    async def _build() -> Any:
+        built.append(object())
+        return built[-1]
+
+    first, pooled = await pool.acquire(key, _build)
+    assert pooled is False
+    assert (await pool.acquire(key, _build)) == (first, True)
+
+    clock.now += 61
+    second, pooled = await pool.acquire(key, _build)
+    assert pooled is False
+    assert second is not first
+
+    assert pool.invalidate(tenant_id=2) == 0
+    assert pool.invalidate(tenant_id=1, ai_model_id=88) == 1
+    assert (await pool.acquire(key, _build))[1] is False
+    assert len(built) == 3
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import json
+from contextlib import contextmanager
+from typing import Any
+
+import pytest
+
+import src.infrastructure.repository.system.ai_model as ai_model_module
+from src.infrastructure.repository.system.ai_model import LlmUsage
+from src.infrastructure.repository.system.usage_writer import (
+    RedisUsageBuffer,
+    UsageWriteBehind,
+)
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+def _record(run: int, tokens: int, tenant_id: int = 1) -> dict[str, Any]:
+    return {
+        "tenant_id": tenant_id,
+        "user_id": 7,
+        "session_id": "s1",
+        "module": "etl",
+        "agent_id": "analyst",
+        "provider": "openai",
+        "model_name": "gpt-4o",
+        "run_id": f"run-{run}",
+        "parent_run_id": None,
+        "prompt_tokens": tokens,
+        "completion_tokens": 1,
+        "total_tokens": tokens + 1,
+        "estimated": 0,
+        "prompt_cost_usd": 0.0,
+        "completion_cost_usd": 0.0,
+        "total_cost_usd": 0.0,
+        "raw_usage_json": None,
+    }
+
+
+class _FakeEngine:
+    def __init__(self) -> None:
+        self.statements: list[tuple[str, dict[str, Any]]] = []
+
+    @contextmanager
+    def begin(self):
+        yield self
+
+    def execute(self, query: Any, params: dict[str, Any]) -> None:
+        self.statements.append((str(query), params))
+
+
+class _Table:
+    """ai_llm_usage stand-in:rows by run_id,batches can be made to fail"""
+
+    def __init__(self) -> None:
+        self.rows: dict[str, dict[str, Any]] = {}
+        self.batches = 0
+        self.fail = 0
+
+    def write(self, records: list[dict[str, Any]]) -> None:
+        if self.fail:
+            self.fail -= 1
+            raise RuntimeError("db down")
+        self.batches += 1
+        for record in records:
+            self.rows[record["run_id"]] = record
+
+
+def test_upsert_usage_is_buffered_and_written_as_multi_row_upserts(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine = _FakeEngine()
+    monkeypatch.setattr(ai_model_module.MySQLClient, "get_engine", lambda: engine)
+    writer = UsageWriteBehind(
+        write_batch=LlmUsage.upsert_usage_batch,
+        flush_interval_seconds=3600,
+        max_batch_rows=500,
+    )
+    monkeypatch.setattr(ai_model_module, "llm_usage_writer", writer)
+
+    # Not started:written per call as before.
+    LlmUsage.upsert_usage(record=_record(0, 10))
+    assert len(engine.statements) == 1
+
+    writer.start()
+    for call in range(1000):
+        LlmUsage.upsert_usage(record=_record(call % 100, call))
+    writer.close()
+
+    statements = engine.statements[1:]
+    assert writer.stats()["submitted"] == 1000
+    assert len(statements) == 1  # 100 runs,flushed at close
+    assert all("ON DUPLICATE KEY UPDATE" in sql for sql, _ in statements)
+    rows = {
+        params[f"run_id_{index}"]: params[f"prompt_tokens_{index}"]
+        for _, params in statements
+        for index in range(len(params) // len(ai_model_module._USAGE_COLUMNS))
+    }
+    # The last record of each run wins.
+    assert rows["run-0"] == 900
+    assert rows["run-99"] == 999
+
+
+def test_failed_flush_keeps_rows_and_newer_records_win() -> None:
+    table = _Table()
+    writer = UsageWriteBehind(write_batch=table.write, max_batch_rows=2, max_pending_rows=100)
+    for run in range(3):
+        writer.submit(_record(run, 1))
+
+    table.fail = 1
+    assert writer.flush() == 0
+    writer.submit(_record(0, 5))
+    assert writer.stats()["pending"] == 3
+
+    assert writer.flush() == 3
+    assert table.batches == 2
+    assert table.rows["run-0"]["prompt_tokens"] == 5
+    assert writer.stats()["failures"] == 1
+
+    # Over max_pending_rows the caller writes inline,errors reach it.
+    writer.configure(max_pending_rows=2)
+    writer.submit(_record(10, 1))
+    table.fail = 1
+    with pytest.raises(RuntimeError):
+        writer.submit(_record(11, 1))
+    assert writer.stats()["pending"] == 2
+
+
+def test_redis_buffer_is_shared_by_workers_and_recovered() -> None:
+    server = fakeredis.FakeServer()
+    table = _Table()
+
+    def _writer(worker_id: str) -> UsageWriteBehind:
+        client = fakeredis.FakeRedis(server=server, decode_responses=True)
+        return UsageWriteBehind(
+            write_batch=table.write,
+            buffer=RedisUsageBuffer(client, worker_id=worker_id),
+            max_batch_rows=500,
+        )
+
+    first, second = _writer("a"), _writer("b")
+    for call in range(300):
+        (first if call % 2 else second).submit(_record(call % 50, call))
+
+    assert second.flush() == 50
+    assert first.flush() == 0
+    assert table.batches == 1
+    assert table.rows["run-49"]["prompt_tokens"] == 299
+
+    # A worker that died between draining and writing(no heartbeat):its rows are folded back.
+    client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    client.hset(
+        "datapillar:llm_usage:pending:flushing:dead",
+        "1:run-70",
+        json.dumps(_record(70, 3)),
+    )
+    first.start()
+    first.close()
+    assert table.rows["run-70"]["prompt_tokens"] == 3
+    assert client.keys("datapillar:llm_usage:pending") == []
+    assert client.keys("datapillar:llm_usage:pending:flushing:*") == []
+
+
+def test_redis_buffer_recovers_only_workers_whose_heartbeat_expired() -> None:
+    server = fakeredis.FakeServer()
+    table = _Table()
+    client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    live = RedisUsageBuffer(client, worker_id="live")
+    live.put("1:run-1", _record(1, 1))
+    assert set(live.drain()) == {"1:run-1"}  # mid-flush,heartbeat alive
+
+    writer = UsageWriteBehind(
+        write_batch=table.write,
+        buffer=RedisUsageBuffer(
+            fakeredis.FakeRedis(server=server, decode_responses=True), worker_id="other"
+        ),
+    )
+    writer.start()
+    writer.close()
+    assert table.rows == {}
+    assert client.exists("datapillar:llm_usage:pending:flushing:live")
+
+    client.delete("datapillar:llm_usage:pending:alive:live")
+    writer.start()
+    writer.close()
+    assert table.rows["run-1"]["prompt_tokens"] == 1
+
+
+def test_submit_writes_directly_when_the_buffer_is_down() -> None:
+    server = fakeredis.FakeServer()
+    table = _Table()
+    writer = UsageWriteBehind(
+        write_batch=table.write,
+        buffer=RedisUsageBuffer(fakeredis.FakeRedis(server=server, decode_responses=True)),
+    )
+
+    server.connected = False
+    writer.submit(_record(1, 4))
+    assert table.rows["run-1"]["prompt_tokens"] == 4
+
+    server.connected = True
+    assert writer.stats()["direct_writes"] == 1
+    assert writer.stats()["pending"] == 0
@@ -69,17 +69,117 @@ def test_decrypt_key_async_rejects_invalid_prefix() -> None:
         service.decrypt_key(tenant_code="tenant-acme", ciphertext="plain-value")
 
 
-def test_decrypt_key_supports_running_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+@pytest.mark.asyncio
+async def test_decrypt_key_supports_running_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    storage = _RotatingStorage(private_key)
+    monkeypatch.setattr(crypto_module, "get_key_storage", lambda: storage)
+    service = LocalCryptoService()
+
+    value = service.decrypt_key(
+        tenant_code="tenant-3",
+        ciphertext=_build_ciphertext(private_key, "sk-sync"),
+    )
+
+    assert value == "sk-sync"
+    assert service._executor is None
+
+
+def _pem(private_key: rsa.RSAPrivateKey) -> bytes:
+    return private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+
+
+class _RotatingStorage:
+    def __init__(self, private_key: rsa.RSAPrivateKey) -> None:
+        self.pem = _pem(private_key)
+        self.loads = 0
+
+    def load_private_key(self, tenant_code: str) -> bytes:
+        self.loads += 1
+        return self.pem
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_key_and_secret_are_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    storage = _RotatingStorage(private_key)
+    monkeypatch.setattr(crypto_module, "get_key_storage", lambda: storage)
+    first, second = _build_ciphertext(private_key, "sk-a"), _build_ciphertext(private_key, "sk-b")
     service = LocalCryptoService()
 
-    async def _mock_decrypt(*, tenant_code: str, ciphertext: str) -> str:
-        return f"{tenant_code}:{ciphertext}"
+    assert await service.decrypt_key_async(tenant_code="t1", ciphertext=first) == "sk-a"
+    assert await service.decrypt_key_async(tenant_code="t1", ciphertext=first) == "sk-a"
+    assert service.decrypt_key(tenant_code="t1", ciphertext=second) == "sk-b"
+    # Same ciphertext under another tenant is a different secret.
+    assert service.decrypt_key(tenant_code="t2", ciphertext=first) == "sk-a"
+
+    stats = service.stats()
+    assert storage.loads == 2
+    assert stats["key_parses"] == 2
+    assert stats["secret_hits"] == 1
+    assert stats["secret_misses"] == 3
+    assert stats["secrets"] == 3
+    service.close()
 
-    monkeypatch.setattr(service, "decrypt_key_async", _mock_decrypt)
 
-    value = service.decrypt_key(tenant_code="tenant-3", ciphertext="ENCv1:abc")
+def test_expired_and_evicted_secrets_are_zeroized(monkeypatch: pytest.MonkeyPatch) -> None:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    monkeypatch.setattr(crypto_module, "get_key_storage", lambda: _RotatingStorage(private_key))
+    clock = _Clock()
+    service = LocalCryptoService(secret_ttl_seconds=10, max_secrets=2, clock=clock)
+    ciphertexts = [_build_ciphertext(private_key, f"sk-{i}") for i in range(3)]
+
+    service.decrypt_key(tenant_code="t1", ciphertext=ciphertexts[0])
+    buffers = [entry.value for entry in service._secrets.values()]
+    service.decrypt_key(tenant_code="t1", ciphertext=ciphertexts[1])
+    service.decrypt_key(tenant_code="t1", ciphertext=ciphertexts[2])
+    buffers.extend(entry.value for entry in service._secrets.values())
+
+    assert buffers[0] == bytearray(4)
+    assert service.stats()["secrets"] == 2
+
+    clock.now += 11
+    assert service.decrypt_key(tenant_code="t1", ciphertext=ciphertexts[2]) == "sk-2"
+    assert buffers[1] == bytearray(4)
+    assert service.stats()["secret_hits"] == 0
+
+
+def test_rotated_key_is_picked_up(monkeypatch: pytest.MonkeyPatch) -> None:
+    old_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    new_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    storage = _RotatingStorage(old_key)
+    monkeypatch.setattr(crypto_module, "get_key_storage", lambda: storage)
+    clock = _Clock()
+    service = LocalCryptoService(key_recheck_seconds=60, clock=clock)
+    old_ciphertext = _build_ciphertext(old_key, "sk-old")
+    assert service.decrypt_key(tenant_code="t1", ciphertext=old_ciphertext) == "sk-old"
+
+    storage.pem = _pem(new_key)
+    # A ciphertext from the new key forces a re-check before the interval elapses.
+    new_ciphertext = _build_ciphertext(new_key, "sk-new")
+    assert service.decrypt_key(tenant_code="t1", ciphertext=new_ciphertext) == "sk-new"
+    assert service.stats()["rotations"] == 1
+    # Secrets decrypted with the rotated key are dropped with it.
+    assert service.stats()["secrets"] == 1
+
+    with pytest.raises(BadRequestException, match="invalid encryption format"):
+        service.decrypt_key(tenant_code="t1", ciphertext=old_ciphertext)
 
-    assert value == "tenant-3:ENCv1:abc"
+    service.invalidate("t1")
+    assert service.stats()["tenants"] == 0
+    assert service.stats()["secrets"] == 0
 
 
 def test_is_encrypted_ciphertext() -> None:
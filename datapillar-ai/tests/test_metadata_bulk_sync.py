@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from src.infrastructure.repository.knowledge import sync_lineage, sync_metadata
+from src.infrastructure.repository.knowledge.sync_metadata import MetadataBulkSync
+
+
+class _FakeResult:
+    def __init__(self, rows: list[dict[str, Any]] | None = None) -> None:
+        self._rows = rows or []
+
+    async def data(self) -> list[dict[str, Any]]:
+        return self._rows
+
+    async def consume(self) -> None:
+        return None
+
+
+class _FakeGraph:
+    """Session stand-in that keeps the hashes written by the bulk MERGE per node id"""
+
+    def __init__(self) -> None:
+        self.nodes: dict[str, dict[str, Any]] = {}
+        self.calls: list[tuple[str, dict[str, Any]]] = []
+
+    async def run(self, query: str, params: dict[str, Any] | None = None) -> _FakeResult:
+        params = dict(params or {})
+        self.calls.append((query, params))
+        if "UNWIND $ids" in query:
+            ids = [node_id for node_id in params["ids"] if node_id in self.nodes]
+            return _FakeResult([{"id": node_id, **self.nodes[node_id]} for node_id in ids])
+        if "UNWIND $rows" in query:
+            for row in params["rows"]:
+                node = self.nodes.setdefault(row["id"], {})
+                node.update(contentHash=row["contentHash"], **row["props"])
+        if "UNWIND $hashes" in query:
+            for row in params["hashes"]:
+                self.nodes[row["id"]]["textHash"] = row["textHash"]
+        return _FakeResult()
+
+    def writes(self) -> list[dict[str, Any]]:
+        return [params for query, params in self.calls if "UNWIND $rows" in query]
+
+    def reads(self) -> list[dict[str, Any]]:
+        return [params for query, params in self.calls if "UNWIND $ids" in query]
+
+
+class _FakeProcessor:
+    def __init__(self, *, accept: bool = True) -> None:
+        self.items: list[tuple[str, str, str]] = []
+        self.tenant_ids: list[int | None] = []
+        self.accept = accept
+
+    async def put_batch(
+        self, items: list[tuple[str, str, str]], *, tenant_id: int | None = None
+    ) -> int:
+        self.tenant_ids.append(tenant_id)
+        if not self.accept:
+            return 0
+        self.items.extend(items)
+        return len(items)
+
+
+@pytest.fixture(autouse=True)
+def _batch_size(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sync_metadata, "get_neo4j_write_batch_size", lambda: 5000)
+
+
+def _add_columns(sync: MetadataBulkSync, count: int, *, renamed: set[int] = frozenset()) -> None:
+    for i in range(count):
+        sync.add_column(
+            id=f"col-{i}",
+            name=f"renamed_{i}" if i in renamed else f"column_{i}",
+            data_type="BIGINT",
+            description=None if i % 2 else f"column {i}",
+            nullable=True,
+        )
+
+
+@pytest.mark.asyncio
+async def test_first_sync_writes_every_node_and_embeds_it() -> None:
+    graph, processor = _FakeGraph(), _FakeProcessor()
+    sync = MetadataBulkSync(
+        graph, batch_size=4, tenant_id=9, embedding_processor=processor, ensure_indexes=False
+    )
+    sync.add_catalog(id="cat-1", name="hive", metalake="lake")
+    sync.add_table(id="tbl-1", name="orders")
+    _add_columns(sync, 10)
+
+    stats = await sync.flush()
+
+    assert stats.received == 12
+    assert stats.written == 12
+    assert stats.written_by_label == {"Catalog": 1, "Table": 1, "Column": 10}
+    # Catalog,Table,Column:one read each plus 3 column reads of 4 ids.
+    assert stats.reads == 5
+    # 5 node writes,then 5 textHash writes once the embeddings are queued.
+    assert stats.batches == 10
+    assert stats.embedded == 12
+    assert processor.tenant_ids == [9, 9, 9]
+    assert ("col-0", "Column", "column_0:column 0") in processor.items
+    assert ("col-1", "Column", "column_1") in processor.items
+    # Null properties are not sent,so they can never erase stored values.
+    column_write = graph.writes()[-1]["rows"][-1]
+    assert "description" not in column_write["props"]
+    assert all(params["tenantId"] == 9 for params in graph.writes())
+    assert sync.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_resync_writes_only_changed_nodes_and_embeds_only_changed_text() -> None:
+    graph = _FakeGraph()
+    first = MetadataBulkSync(
+        graph, tenant_id=9, embedding_processor=_FakeProcessor(), ensure_indexes=False
+    )
+    _add_columns(first, 100)
+    await first.flush()
+    graph.calls.clear()
+
+    processor = _FakeProcessor()
+    sync = MetadataBulkSync(graph, tenant_id=9, embedding_processor=processor, ensure_indexes=False)
+    _add_columns(sync, 100, renamed={3, 7})
+    sync.add_column(
+        id="col-50", name="column_50", data_type="VARCHAR", description="column 50", nullable=True
+    )
+
+    stats = await sync.flush()
+
+    assert stats.unchanged == 97
+    assert stats.written == 3
+    assert [row["id"] for row in graph.writes()[0]["rows"]] == ["col-3", "col-7", "col-50"]
+    # col-50 only changed type:rewritten but its embedding text is the same.
+    assert [item[0] for item in processor.items] == ["col-3", "col-7"]
+    # One read,one node write,one textHash write.
+    assert stats.round_trips == 3
+
+    unchanged = MetadataBulkSync(graph, tenant_id=9, ensure_indexes=False)
+    _add_columns(unchanged, 100, renamed={3, 7})
+    unchanged.add_column(
+        id="col-50", name="column_50", data_type="VARCHAR", description="column 50", nullable=True
+    )
+    stats = await unchanged.flush()
+    assert stats.written == 0
+    assert stats.batches == 0
+
+
+@pytest.mark.asyncio
+async def test_text_hash_is_kept_until_the_embedding_is_queued() -> None:
+    graph = _FakeGraph()
+    # No processor,then a processor whose queue rejects the batch:nothing is queued.
+    for processor in (None, _FakeProcessor(accept=False)):
+        sync = MetadataBulkSync(
+            graph, tenant_id=9, embedding_processor=processor, ensure_indexes=False
+        )
+        _add_columns(sync, 3)
+        await sync.flush()
+        assert all("textHash" not in node for node in graph.nodes.values())
+
+    processor = _FakeProcessor()
+    sync = MetadataBulkSync(graph, tenant_id=9, embedding_processor=processor, ensure_indexes=False)
+    _add_columns(sync, 3)
+    stats = await sync.flush()
+
+    # Content is unchanged,but every node is still offered for embedding.
+    assert stats.written == 0
+    assert [item[0] for item in processor.items] == ["col-0", "col-1", "col-2"]
+    assert all("textHash" in node for node in graph.nodes.values())
+
+
+@pytest.mark.asyncio
+async def test_rejects_unknown_labels_and_properties_and_checks_indexes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(sync_lineage, "_checked_merge_keys", set())
+    graph = _FakeGraph()
+    sync = MetadataBulkSync(graph, tenant_id=9)
+
+    with pytest.raises(ValueError):
+        sync.add("Metric", {"id": "m-1"})
+    with pytest.raises(ValueError):
+        sync.add("Column", {"id": "c-1", "embedding": [0.1]})
+    with pytest.raises(ValueError):
+        sync.add("Column", {"name": "no id"})
+
+    sync.add_schema(id="sch-1", name="dw")
+    await sync.flush()
+    assert "SHOW INDEXES" in graph.calls[0][0]
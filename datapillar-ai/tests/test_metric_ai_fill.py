@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+import pytest
+
+from src.modules.governance.metric import service as metric_service
+from src.modules.governance.metric.schemas import AIFillOutput, AIFillRequest
+from src.modules.governance.metric.service import (
+    NO_TABLE_CONTEXT,
+    ContextBundleCache,
+    MetricAIService,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _FakeLLM:
+    def __init__(self, success: bool) -> None:
+        self.success = success
+        self.prompts: list[str] = []
+
+    def __call__(self, **_kwargs: Any) -> _FakeLLM:
+        return self
+
+    async def ainvoke(self, messages: Any) -> AIFillOutput:
+        self.prompts.append(str(list(messages)[0].content))
+        return AIFillOutput(success=self.success, message="ok")
+
+
+def _request(user_input: str = "order  amount") -> AIFillRequest:
+    return AIFillRequest.model_validate(
+        {
+            "userInput": user_input,
+            "context": {
+                "metricType": "ATOMIC",
+                "payload": {"refCatalog": "hive", "refSchema": "dw", "refTable": "orders"},
+                "formOptions": {"dataTypes": ["DECIMAL"]},
+            },
+        }
+    )
+
+
+@pytest.fixture
+def sources(monkeypatch: pytest.MonkeyPatch) -> dict[str, Any]:
+    state: dict[str, Any] = {"calls": 0, "table_delay": 0.2, "llm": _FakeLLM(success=False)}
+
+    async def _semantic(**_kwargs: Any) -> dict[str, list]:
+        state["calls"] += 1
+        await asyncio.sleep(0.2)
+        return {"word_roots": [{"code": "amt", "name": "amount"}]}
+
+    async def _tables(**_kwargs: Any) -> list[dict]:
+        await asyncio.sleep(0.2)
+        return [{"type": "Table", "path": "hive.dw.orders", "score": 0.9}]
+
+    def _table_detail(*_args: Any, **_kwargs: Any) -> dict:
+        # Blocking call:it must run off the event loop.
+        time.sleep(state["table_delay"])
+        return {"table": "orders", "description": "order facts", "columns": []}
+
+    monkeypatch.setattr(
+        metric_service.Neo4jSemanticSearch, "asearch_semantic_assets", staticmethod(_semantic)
+    )
+    monkeypatch.setattr(metric_service.Neo4jTableSearch, "asearch_tables", staticmethod(_tables))
+    monkeypatch.setattr(
+        metric_service.Neo4jTableSearch, "get_table_detail", staticmethod(_table_detail)
+    )
+    monkeypatch.setattr(metric_service, "_get_llm_provider", lambda _tenant_id: state["llm"])
+    return state
+
+
+@pytest.mark.asyncio
+async def test_context_sources_are_gathered_concurrently(sources: dict[str, Any]) -> None:
+    service = MetricAIService()
+
+    start = time.perf_counter()
+    response = await service.fill(_request(), tenant_id=1, user_id=7)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.5
+    timings = response.metadata["timingsMs"]
+    assert set(timings) == {
+        "semantic_assets",
+        "table_context",
+        "metric_context",
+        "recommendations",
+        "context",
+        "llm",
+        "total",
+    }
+    assert response.metadata["degradedSources"] == []
+    assert response.metadata["contextCached"] is False
+    assert response.recommendations[0]["fullPath"] == "hive.dw.orders"
+    assert "order facts" in sources["llm"].prompts[0]
+
+
+@pytest.mark.asyncio
+async def test_timed_out_source_degrades_and_is_not_cached(sources: dict[str, Any]) -> None:
+    sources["table_delay"] = 0.3
+    service = MetricAIService(source_timeouts={"table_context": 0.05})
+
+    response = await service.fill(_request(), tenant_id=1, user_id=7)
+
+    assert response.metadata["degradedSources"] == ["table_context"]
+    assert NO_TABLE_CONTEXT in sources["llm"].prompts[0]
+    assert "amt(amount)" in sources["llm"].prompts[0]
+
+    await service.fill(_request(), tenant_id=1, user_id=7)
+    assert sources["calls"] == 2
+
+
+@pytest.mark.asyncio
+async def test_context_bundle_is_cached_by_normalized_input(sources: dict[str, Any]) -> None:
+    clock = _Clock()
+    service = MetricAIService(context_cache=ContextBundleCache(ttl_seconds=30, clock=clock))
+
+    await service.fill(_request("order  amount"), tenant_id=1, user_id=7)
+    cached = await service.fill(_request(" Order amount "), tenant_id=1, user_id=7)
+    other_user = await service.fill(_request("order amount"), tenant_id=1, user_id=8)
+
+    assert cached.metadata["contextCached"] is True
+    assert "semantic_assets" not in cached.metadata["timingsMs"]
+    assert cached.recommendations[0]["fullPath"] == "hive.dw.orders"
+    assert other_user.metadata["contextCached"] is False
+    assert sources["calls"] == 2
+
+    clock.now += 31
+    expired = await service.fill(_request("order amount"), tenant_id=1, user_id=7)
+    assert expired.metadata["contextCached"] is False
+    assert sources["calls"] == 3
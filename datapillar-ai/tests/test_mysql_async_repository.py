@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.infrastructure.database.mysql import MySQLClient
+from src.infrastructure.repository.rag import DocumentRepository, JobRepository, NamespaceRepository
+
+_SCHEMA = [
+    """
+    CREATE TABLE knowledge_namespace (
+      namespace_id INTEGER PRIMARY KEY AUTOINCREMENT,
+      tenant_id INTEGER NOT NULL,
+      namespace TEXT NOT NULL,
+      description TEXT NULL,
+      status INTEGER NOT NULL DEFAULT 1,
+      created_by INTEGER NOT NULL,
+      is_deleted INTEGER NOT NULL DEFAULT 0,
+      created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+      updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE knowledge_document (
+      document_id INTEGER PRIMARY KEY AUTOINCREMENT,
+      tenant_id INTEGER NOT NULL,
+      namespace_id INTEGER NOT NULL,
+      doc_uid TEXT NULL,
+      title TEXT NOT NULL,
+      file_type TEXT NULL,
+      size_bytes INTEGER NULL,
+      storage_uri TEXT NULL,
+      storage_type TEXT NULL,
+      storage_key TEXT NULL,
+      status TEXT NOT NULL,
+      chunk_count INTEGER NOT NULL DEFAULT 0,
+      token_count INTEGER NOT NULL DEFAULT 0,
+      error_message TEXT NULL,
+      embedding_model_id INTEGER NULL,
+      embedding_dimension INTEGER NULL,
+      chunk_mode TEXT NULL,
+      chunk_config_json TEXT NULL,
+      last_chunked_at TEXT NULL,
+      created_by INTEGER NOT NULL,
+      is_deleted INTEGER NOT NULL DEFAULT 0,
+      created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+      updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE knowledge_document_job (
+      job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+      tenant_id INTEGER NOT NULL,
+      namespace_id INTEGER NOT NULL,
+      document_id INTEGER NOT NULL,
+      job_type TEXT NOT NULL,
+      payload_json TEXT NULL,
+      status TEXT NOT NULL,
+      progress INTEGER NOT NULL DEFAULT 0,
+      progress_seq INTEGER NOT NULL DEFAULT 0,
+      total_chunks INTEGER NOT NULL DEFAULT 0,
+      processed_chunks INTEGER NOT NULL DEFAULT 0,
+      error_message TEXT NULL,
+      started_at TEXT NULL,
+      finished_at TEXT NULL,
+      created_by INTEGER NOT NULL,
+      created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+      updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+]
+
+
+def _document(namespace_id: int, title: str, **fields) -> dict:
+    return {
+        "tenant_id": 1,
+        "namespace_id": namespace_id,
+        "doc_uid": f"doc_{title}",
+        "title": title,
+        "file_type": "md",
+        "size_bytes": 10,
+        "storage_uri": f"local://{title}",
+        "storage_type": "local",
+        "storage_key": title,
+        "status": "processing",
+        "chunk_count": 0,
+        "token_count": 0,
+        "error_message": None,
+        "embedding_model_id": None,
+        "embedding_dimension": None,
+        "chunk_mode": None,
+        "chunk_config_json": None,
+        "last_chunked_at": None,
+        "created_by": 7,
+        **fields,
+    }
+
+
+@pytest_asyncio.fixture
+async def sqlite_engine(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'rag.db'}", pool_size=2, max_overflow=0
+    )
+    async with engine.begin() as conn:
+        for ddl in _SCHEMA:
+            await conn.execute(text(ddl))
+    monkeypatch.setattr(MySQLClient, "_async_engine", None)
+    monkeypatch.setattr(MySQLClient, "_metrics", {})
+    MySQLClient.use_async_engine(engine)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_namespace_async_round_trip(sqlite_engine) -> None:
+    namespace_id = await NamespaceRepository.acreate(
+        {"tenant_id": 1, "namespace": "wiki", "description": None, "created_by": 7, "status": 1}
+    )
+    await DocumentRepository.acreate(_document(namespace_id, "a"))
+
+    rows, total = await NamespaceRepository.alist_by_user(1, 7, limit=10, offset=0)
+    assert total == 1
+    assert rows[0]["namespace"] == "wiki"
+    assert rows[0]["doc_count"] == 1
+    assert await NamespaceRepository.aget(namespace_id, 1, 8) is None
+
+    assert await NamespaceRepository.aupdate(namespace_id, 1, 7, {"unknown": "x"}) == 0
+    assert await NamespaceRepository.aupdate(namespace_id, 1, 7, {"description": "docs"}) == 1
+    assert (await NamespaceRepository.aget(namespace_id, 1, 7))["description"] == "docs"
+
+    assert await NamespaceRepository.asoft_delete(namespace_id, 1, 7) == 1
+    assert await NamespaceRepository.aget(namespace_id, 1, 7) is None
+
+
+@pytest.mark.asyncio
+async def test_document_and_job_async_queries(sqlite_engine) -> None:
+    first = await DocumentRepository.acreate(_document(1, "orders", embedding_model_id=3))
+    await DocumentRepository.acreate(_document(1, "users", status="indexed"))
+
+    rows, total = await DocumentRepository.alist_by_namespace(
+        1, 1, 7, status="processing", keyword="ord", limit=10, offset=0
+    )
+    assert total == 1
+    assert rows[0]["document_id"] == first
+    assert "storage_uri" not in rows[0]
+    assert (await DocumentRepository.aget_by_doc_uid("doc_orders", 1, 7))["document_id"] == first
+    assert await DocumentRepository.alist_namespace_embedding_models(1, 1) == [3]
+
+    assert await DocumentRepository.aupdate(first, 1, 7, {"status": "indexed"}) == 1
+    assert (await DocumentRepository.aget(first, 1, 7))["status"] == "indexed"
+
+    job_id = await JobRepository.acreate(
+        {
+            "tenant_id": 1,
+            "namespace_id": 1,
+            "document_id": first,
+            "job_type": "chunk",
+            "status": "queued",
+            "progress": 0,
+            "progress_seq": 0,
+            "total_chunks": 0,
+            "processed_chunks": 0,
+            "error_message": None,
+            "started_at": None,
+            "finished_at": None,
+            "created_by": 7,
+        }
+    )
+    assert (await JobRepository.aget(job_id, 1, 7))["status"] == "queued"
+    jobs, job_total = await JobRepository.alist_by_document(first, 1, 7, limit=5, offset=0)
+    assert job_total == 1
+    assert jobs[0]["job_id"] == job_id
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_track_checkouts_and_peak(sqlite_engine) -> None:
+    namespace_id = await NamespaceRepository.acreate(
+        {"tenant_id": 1, "namespace": "wiki", "description": None, "created_by": 7, "status": 1}
+    )
+
+    results = await asyncio.gather(
+        *(NamespaceRepository.aget(namespace_id, 1, 7) for _ in range(20))
+    )
+
+    assert all(row["namespace"] == "wiki" for row in results)
+    stats = MySQLClient.pool_stats()["async"]
+    assert stats["pool_size"] == 2
+    assert stats["checkouts"] == 21
+    assert stats["peak_checked_out"] == 2
+    assert stats["checked_out"] == 0
+    assert stats["timeouts"] == 0
+    assert stats["acquire_ms_max"] >= stats["acquire_ms_avg"] > 0
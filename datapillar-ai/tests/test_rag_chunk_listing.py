@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from datapillar_oneagentic.knowledge import KnowledgeChunk, KnowledgeChunkPage
+
+import src.modules.rag.service as rag_service_module
+from src.modules.rag.service import KnowledgeWikiService
+
+
+class _StubKnowledgeService:
+    def __init__(self, chunk_ids: list[str]) -> None:
+        self._chunk_ids = sorted(chunk_ids)
+        self.page_calls: list[dict[str, Any]] = []
+        self.count_calls = 0
+
+    async def list_chunk_page(self, *, filters, keyword, cursor, limit, namespace):
+        self.page_calls.append({"filters": filters, "cursor": cursor, "limit": limit})
+        ids = [cid for cid in self._chunk_ids if cursor is None or cid > cursor]
+        window = ids[: limit + 1]
+        items = [
+            KnowledgeChunk(chunk_id=cid, doc_id="doc_a", source_id="s", content=cid)
+            for cid in window[:limit]
+        ]
+        next_cursor = items[-1].chunk_id if len(window) > limit else None
+        return KnowledgeChunkPage(items=items, next_cursor=next_cursor)
+
+    async def count_chunks(self, *, filters, keyword, namespace) -> int:
+        self.count_calls += 1
+        return 3
+
+    async def close(self) -> None:
+        return None
+
+
+@pytest.fixture
+def wiki_service(monkeypatch: pytest.MonkeyPatch):
+    document = {
+        "document_id": 11,
+        "namespace_id": 1,
+        "embedding_model_id": 2,
+        "doc_uid": "doc_a",
+        "chunk_count": 5,
+        "last_chunked_at": "2026-01-28 00:00:00",
+    }
+    stub = _StubKnowledgeService([f"doc_a:{index}" for index in range(5)])
+
+    async def _get_document(*_args: Any) -> dict[str, Any]:
+        return document
+
+    async def _get_namespace_value(*_args: Any) -> str:
+        return "ns"
+
+    async def _get_embedding_model(*_args: Any) -> dict[str, Any]:
+        return {}
+
+    monkeypatch.setattr(rag_service_module.DocumentRepository, "aget", staticmethod(_get_document))
+    monkeypatch.setattr(
+        rag_service_module, "_chunk_count_cache", rag_service_module._ChunkCountCache()
+    )
+
+    service = KnowledgeWikiService.__new__(KnowledgeWikiService)
+    monkeypatch.setattr(service, "_get_namespace_value", _get_namespace_value)
+    monkeypatch.setattr(service, "_get_embedding_model", _get_embedding_model)
+    monkeypatch.setattr(service, "_build_service", lambda **_: stub)
+    return service, stub
+
+
+@pytest.mark.asyncio
+async def test_list_chunks_walks_cursor_pages_without_counting(wiki_service) -> None:
+    service, stub = wiki_service
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        rows, total, cursor = await service.list_chunks(
+            user_id=1,
+            tenant_id=1,
+            document_id=11,
+            limit=2,
+            offset=0,
+            keyword=None,
+            cursor=cursor,
+        )
+        seen.extend(row["chunk_id"] for row in rows)
+        assert total == 5
+        if cursor is None:
+            break
+
+    assert seen == [f"doc_a:{index}" for index in range(5)]
+    assert all(call["limit"] == 2 for call in stub.page_calls)
+    # The unfiltered total comes from knowledge_document.chunk_count.
+    assert stub.count_calls == 0
+
+
+@pytest.mark.asyncio
+async def test_list_chunks_offset_and_cached_filtered_total(wiki_service) -> None:
+    service, stub = wiki_service
+
+    for _ in range(2):
+        rows, total, next_cursor = await service.list_chunks(
+            user_id=1,
+            tenant_id=1,
+            document_id=11,
+            limit=2,
+            offset=2,
+            keyword="doc",
+            status="published",
+        )
+        assert [row["chunk_id"] for row in rows] == ["doc_a:2", "doc_a:3"]
+        assert next_cursor == "doc_a:3"
+        assert total == 3
+
+    assert stub.page_calls[-1]["limit"] == 4
+    assert stub.page_calls[-1]["filters"] == {"doc_id": "doc_a", "status": "published"}
+    assert stub.count_calls == 1
+
+    rag_service_module._chunk_count_cache.invalidate(11)
+    await service.list_chunks(
+        user_id=1,
+        tenant_id=1,
+        document_id=11,
+        limit=2,
+        offset=0,
+        keyword="doc",
+        status="published",
+    )
+    assert stub.count_calls == 2
@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from typing import Any
+
+import pytest
+
+from src.modules.rag.job_queue import IngestionJobQueue
+from src.modules.rag.sse import JobEventHub
+
+
+class _MemoryJobStore:
+    """In-memory stand-in for JobRepository's leasing methods."""
+
+    def __init__(self) -> None:
+        self.jobs: dict[int, dict[str, Any]] = {}
+        self.errors: dict[int, str] = {}
+        self.error_seqs: dict[int, int | None] = {}
+        self._lock = threading.Lock()
+
+    def add(self, tenant_id: int, *, attempts: int = 0) -> int:
+        job_id = len(self.jobs) + 1
+        self.jobs[job_id] = {
+            "job_id": job_id,
+            "tenant_id": tenant_id,
+            "status": "queued",
+            "attempts": attempts,
+            "lease_owner": None,
+            "lease_expires_at": None,
+            "progress": 0,
+            "total_chunks": 0,
+            "processed_chunks": 0,
+            "progress_seq": 0,
+        }
+        return job_id
+
+    def lease_next(self, worker_id, lease_seconds, *, per_tenant_limit, scan_limit=32):
+        with self._lock:
+            now = time.monotonic()
+            running: dict[int, int] = {}
+            candidates = []
+            for job in self.jobs.values():
+                live = job["status"] == "running" and job["lease_expires_at"] >= now
+                if live:
+                    running[job["tenant_id"]] = running.get(job["tenant_id"], 0) + 1
+                elif job["status"] in {"queued", "running"}:
+                    candidates.append(job)
+            eligible = [
+                job for job in candidates if running.get(job["tenant_id"], 0) < per_tenant_limit
+            ][:scan_limit]
+            if not eligible:
+                return None
+            job = min(eligible, key=lambda j: (running.get(j["tenant_id"], 0), j["job_id"]))
+            job.update(
+                status="running",
+                lease_owner=worker_id,
+                lease_expires_at=now + lease_seconds,
+                attempts=job["attempts"] + 1,
+            )
+            return dict(job)
+
+    def heartbeat(self, job_id, worker_id, lease_seconds) -> bool:
+        with self._lock:
+            job = self.jobs[job_id]
+            if job["status"] != "running" or job["lease_owner"] != worker_id:
+                return False
+            job["lease_expires_at"] = time.monotonic() + lease_seconds
+            return True
+
+    def release(self, job_id, worker_id) -> None:
+        with self._lock:
+            job = self.jobs[job_id]
+            if job["status"] == "running" and job["lease_owner"] == worker_id:
+                job.update(status="queued", lease_owner=None, lease_expires_at=None)
+
+    def finish(self, job_id: int) -> None:
+        with self._lock:
+            self.jobs[job_id].update(status="success", lease_owner=None)
+
+    def fail(self, job_id, worker_id, message, *, progress_seq=None) -> None:
+        with self._lock:
+            job = self.jobs[job_id]
+            if job["status"] == "running" and job["lease_owner"] == worker_id:
+                job.update(status="error", lease_owner=None, lease_expires_at=None)
+                self.errors[job_id] = message
+                self.error_seqs[job_id] = progress_seq
+
+    def mark_error(self, job_id, tenant_id, message, *, worker_id) -> None:
+        with self._lock:
+            job = self.jobs[job_id]
+            if job["lease_owner"] == worker_id:
+                job.update(status="error", lease_owner=None)
+                self.errors[job_id] = message
+
+
+async def _wait_until(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_job_queue_caps_concurrency_per_process_and_tenant() -> None:
+    store = _MemoryJobStore()
+    for _ in range(8):
+        store.add(tenant_id=1)
+    late_jobs = {store.add(tenant_id=2), store.add(tenant_id=2)}
+
+    running: dict[int, int] = {}
+    peaks = {"total": 0, 1: 0, 2: 0}
+    order: list[int] = []
+
+    async def _handler(job: dict[str, Any]) -> None:
+        tenant_id = job["tenant_id"]
+        order.append(job["job_id"])
+        running[tenant_id] = running.get(tenant_id, 0) + 1
+        peaks["total"] = max(peaks["total"], sum(running.values()))
+        peaks[tenant_id] = max(peaks[tenant_id], running[tenant_id])
+        await asyncio.sleep(0.02)
+        running[tenant_id] -= 1
+        store.finish(job["job_id"])
+
+    queue = IngestionJobQueue(
+        handler=_handler,
+        store=store,
+        workers=3,
+        per_tenant_limit=2,
+        poll_interval_seconds=0.01,
+    )
+    await queue.start()
+    await _wait_until(lambda: all(job["status"] == "success" for job in store.jobs.values()))
+    await queue.stop()
+
+    assert peaks["total"] <= 3
+    assert peaks[1] <= 2
+    # Tenant 2 was queued behind tenant 1's backlog but is served within the first wave.
+    assert late_jobs & set(order[:3])
+
+
+@pytest.mark.asyncio
+async def test_job_queue_stop_releases_leases() -> None:
+    store = _MemoryJobStore()
+    job_id = store.add(tenant_id=1)
+    started = asyncio.Event()
+
+    async def _handler(job: dict[str, Any]) -> None:
+        started.set()
+        await asyncio.sleep(60)
+
+    queue = IngestionJobQueue(handler=_handler, store=store, poll_interval_seconds=0.01)
+    await queue.start()
+    await asyncio.wait_for(started.wait(), timeout=5)
+    await queue.stop()
+
+    assert store.jobs[job_id]["status"] == "queued"
+    assert store.jobs[job_id]["lease_owner"] is None
+
+
+@pytest.mark.asyncio
+async def test_job_queue_resumes_expired_lease_and_caps_attempts() -> None:
+    store = _MemoryJobStore()
+    job_id = store.add(tenant_id=1)
+    exhausted_id = store.add(tenant_id=2, attempts=3)
+    # A crashed worker left this job running with an expired lease.
+    store.jobs[job_id].update(
+        status="running",
+        lease_owner="dead-worker",
+        lease_expires_at=time.monotonic() - 1,
+        attempts=1,
+    )
+    seen: list[dict[str, Any]] = []
+
+    async def _handler(job: dict[str, Any]) -> None:
+        seen.append(job)
+        store.finish(job["job_id"])
+
+    queue = IngestionJobQueue(
+        handler=_handler,
+        store=store,
+        max_attempts=3,
+        poll_interval_seconds=0.01,
+    )
+    await queue.start()
+    await _wait_until(lambda: store.jobs[exhausted_id]["status"] == "error" and seen)
+    await queue.stop()
+
+    assert [job["job_id"] for job in seen] == [job_id]
+    assert seen[0]["attempts"] == 2
+    assert "max attempts" in store.errors[exhausted_id]
+
+
+@pytest.mark.asyncio
+async def test_job_queue_cancels_work_when_lease_is_lost() -> None:
+    store = _MemoryJobStore()
+    job_id = store.add(tenant_id=1)
+    cancelled = asyncio.Event()
+
+    async def _handler(job: dict[str, Any]) -> None:
+        # Another worker takes the job over.
+        store.jobs[job_id]["lease_owner"] = "other-worker"
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    queue = IngestionJobQueue(
+        handler=_handler,
+        store=store,
+        lease_seconds=0.06,
+        poll_interval_seconds=0.01,
+    )
+    await queue.start()
+    await asyncio.wait_for(cancelled.wait(), timeout=5)
+    await _wait_until(lambda: not queue.running_jobs)
+    await queue.stop()
+
+    assert store.jobs[job_id]["lease_owner"] == "other-worker"
+
+
+@pytest.mark.asyncio
+async def test_job_queue_fails_job_when_handler_raises() -> None:
+    store = _MemoryJobStore()
+    job_id = store.add(tenant_id=1)
+
+    hub = JobEventHub()
+
+    async def _handler(job: dict[str, Any]) -> None:
+        await hub.publish(job["job_id"], {"event": "progress", "id": "4", "data": "{}"})
+        raise RuntimeError("parser crashed")
+
+    queue = IngestionJobQueue(handler=_handler, store=store, hub=hub, poll_interval_seconds=0.01)
+    await queue.start()
+    await _wait_until(lambda: store.jobs[job_id]["status"] == "error")
+    await queue.stop()
+
+    assert store.errors[job_id] == "parser crashed"
+    assert store.error_seqs[job_id] == 5
+    assert hub.latest(job_id) is None
+    assert queue.stats()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_job_stream_follows_job_leased_by_another_queue() -> None:
+    store = _MemoryJobStore()
+    job_id = store.add(1)
+    finish = asyncio.Event()
+
+    async def _handler(job: dict[str, Any]) -> None:
+        store.jobs[job_id].update(progress=50, processed_chunks=5, total_chunks=10, progress_seq=2)
+        await finish.wait()
+        store.jobs[job_id].update(progress=100, processed_chunks=10, progress_seq=3)
+        store.finish(job_id)
+
+    # The worker publishes to its own hub; the API process only sees the row.
+    worker = IngestionJobQueue(
+        handler=_handler, store=store, hub=JobEventHub(), poll_interval_seconds=0.01
+    )
+    api_hub = JobEventHub()
+
+    async def _fetch() -> dict[str, Any]:
+        return dict(store.jobs[job_id])
+
+    async def _follow() -> list[dict[str, Any]]:
+        events = []
+        async for event in api_hub.subscribe(job_id, fetch=_fetch, poll_interval_seconds=0.01):
+            events.append(event)
+            if event["event"] == "progress":
+                finish.set()
+        return events
+
+    await worker.start()
+    events = await asyncio.wait_for(_follow(), timeout=5)
+    await worker.stop()
+
+    assert [(event["event"], event["id"]) for event in events] == [("progress", "2"), ("done", "3")]
+    assert json.loads(events[0]["data"])["progress"] == 50
+    assert json.loads(events[1]["data"])["status"] == "success"
+
+
+@pytest.mark.asyncio
+async def test_legacy_chunk_job_without_payload_uses_document_config(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import src.modules.rag.service as rag_service_module
+    from src.modules.rag.service import KnowledgeWikiService
+
+    document = {
+        "document_id": 11,
+        "chunk_mode": "parent_child",
+        "chunk_config_json": '{"general": {"max_tokens": 300, "overlap": 30}}',
+    }
+
+    async def _get_document(*_args: Any) -> dict[str, Any]:
+        return document
+
+    monkeypatch.setattr(rag_service_module.DocumentRepository, "aget", staticmethod(_get_document))
+    runs: list[dict[str, Any]] = []
+
+    async def _run_chunk_job(**kwargs: Any) -> None:
+        runs.append(kwargs)
+
+    service = KnowledgeWikiService.__new__(KnowledgeWikiService)
+    service._progress_flush_interval_ms = 1000
+    service._progress_flush_steps = 10
+    monkeypatch.setattr(service, "_run_chunk_job", _run_chunk_job)
+
+    await service.run_job(
+        {
+            "job_id": 3,
+            "tenant_id": 1,
+            "namespace_id": 1,
+            "document_id": 11,
+            "created_by": 7,
+            "job_type": "chunk",
+            "payload_json": None,
+            "status": "running",
+            "progress": 0,
+            "progress_seq": 1,
+            "lease_owner": "w1",
+            "total_chunks": 0,
+            "processed_chunks": 0,
+            "attempts": 1,
+        }
+    )
+
+    assert runs[0]["chunk_mode"] == "parent_child"
+    assert runs[0]["chunk_config"].general.max_tokens == 300
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from typing import Any
+
+import pytest
+
+from src.modules.rag.progress import JobProgressTracker
+from src.modules.rag.sse import JobEventHub
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _RecordingJobStore:
+    def __init__(self) -> None:
+        self.updates: list[dict[str, Any]] = []
+        self.finished: list[tuple[str, Any]] = []
+        self.threads: set[int] = set()
+
+    def update_progress(self, job_id, tenant_id, **fields) -> None:
+        self.threads.add(threading.get_ident())
+        self.updates.append(fields)
+
+    def mark_success(self, job_id, tenant_id, **fields) -> None:
+        self.finished.append(("success", fields))
+
+    def mark_error(self, job_id, tenant_id, message, *, worker_id, progress_seq=None) -> None:
+        self.finished.append(("error", (message, progress_seq)))
+
+
+def _job() -> dict[str, Any]:
+    return {
+        "job_id": 7,
+        "tenant_id": 1,
+        "status": "running",
+        "progress": 0,
+        "total_chunks": 0,
+        "processed_chunks": 0,
+        "progress_seq": 3,
+        "lease_owner": "w1",
+    }
+
+
+async def _collect(hub: JobEventHub, job_id: int, events: list[dict[str, Any]]) -> None:
+    async for event in hub.subscribe(job_id):
+        events.append(event)
+
+
+@pytest.mark.asyncio
+async def test_progress_tracker_coalesces_writes_and_publishes_every_step() -> None:
+    hub = JobEventHub()
+    store = _RecordingJobStore()
+    clock = _Clock()
+    events: list[dict[str, Any]] = []
+    subscriber = asyncio.create_task(_collect(hub, 7, events))
+    await asyncio.sleep(0)
+
+    tracker = JobProgressTracker(
+        _job(), hub=hub, store=store, flush_interval_ms=1000, flush_steps=10, clock=clock
+    )
+    for processed in range(1, 26):
+        await tracker.update(processed, 25)
+        if tracker._flush_task is not None:
+            await tracker._flush_task
+    assert hub.latest(7)["id"] == "28"
+
+    await tracker.succeed(processed_chunks=25, total_chunks=25)
+    await asyncio.wait_for(subscriber, timeout=5)
+
+    # 25 steps -> flushes at step 10 and 20 plus the remainder on close.
+    assert [update["progress_seq"] for update in store.updates] == [13, 23, 28]
+    assert store.updates[-1]["processed_chunks"] == 25
+    assert threading.get_ident() not in store.threads
+    # The terminal row carries the sequence of the done event.
+    assert store.finished == [
+        (
+            "success",
+            {
+                "processed_chunks": 25,
+                "total_chunks": 25,
+                "worker_id": "w1",
+                "progress_seq": 29,
+            },
+        )
+    ]
+
+    progress_events = [event for event in events if event["event"] == "progress"]
+    assert len(progress_events) == 25
+    assert [int(event["id"]) for event in progress_events] == list(range(4, 29))
+    done = events[-1]
+    assert done["event"] == "done" and done["id"] == "29"
+    assert json.loads(done["data"])["status"] == "success"
+    assert hub.latest(7) is None
+
+
+@pytest.mark.asyncio
+async def test_progress_tracker_flushes_on_interval() -> None:
+    store = _RecordingJobStore()
+    clock = _Clock()
+    tracker = JobProgressTracker(
+        _job(),
+        hub=JobEventHub(),
+        store=store,
+        flush_interval_ms=500,
+        flush_steps=100,
+        clock=clock,
+    )
+    await tracker.update(1, 10)
+    await tracker.update(2, 10)
+    clock.now = 0.6
+    await tracker.update(3, 10)
+    await tracker.aclose()
+
+    assert [update["processed_chunks"] for update in store.updates] == [3]
+
+
+@pytest.mark.asyncio
+async def test_progress_tracker_failure_publishes_message() -> None:
+    hub = JobEventHub()
+    store = _RecordingJobStore()
+    events: list[dict[str, Any]] = []
+    subscriber = asyncio.create_task(_collect(hub, 7, events))
+    await asyncio.sleep(0)
+
+    tracker = JobProgressTracker(_job(), hub=hub, store=store)
+    await tracker.update(1, 4)
+    await tracker.fail("boom")
+    await asyncio.wait_for(subscriber, timeout=5)
+
+    assert store.finished == [("error", ("boom", 5))]
+    assert events[-1]["id"] == "5"
+    assert json.loads(events[-1]["data"]) == {
+        "job_id": 7,
+        "status": "error",
+        "progress": 25,
+        "total_chunks": 4,
+        "processed_chunks": 1,
+        "message": "boom",
+    }
+
+
+@pytest.mark.asyncio
+async def test_event_hub_drops_latest_progress_of_abandoned_jobs() -> None:
+    clock = _Clock()
+    hub = JobEventHub(latest_ttl_seconds=60, clock=clock)
+    await hub.publish(1, {"event": "progress", "id": "1", "data": "{}"})
+    clock.now = 30
+    await hub.publish(2, {"event": "progress", "id": "1", "data": "{}"})
+
+    # Job 1 never closed (its run crashed):it ages out,job 2 is still live.
+    clock.now = 61
+    await hub.publish(2, {"event": "progress", "id": "2", "data": "{}"})
+    assert hub.latest(1) is None
+    assert hub.latest(2)["id"] == "2"
+    assert len(hub._latest) == 1
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from collections.abc import AsyncIterator
+
+import pytest
+
+from src.modules.rag.storage import StorageManager
+
+_MIB = 1024 * 1024
+
+
+async def _iter_chunks(payload: bytes, size: int) -> AsyncIterator[bytes]:
+    for start in range(0, len(payload), size):
+        yield payload[start : start + size]
+
+
+async def _failing_chunks() -> AsyncIterator[bytes]:
+    yield b"x" * (6 * _MIB)
+    raise RuntimeError("client disconnected")
+
+
+@pytest.mark.asyncio
+async def test_local_stream_roundtrip_with_checksum_and_ranges(tmp_path) -> None:
+    storage = StorageManager({"type": "local", "local_dir": str(tmp_path)})
+    payload = os.urandom(3 * _MIB + 123)
+
+    result = await storage.save_stream(
+        namespace_id=1,
+        filename="report.pdf",
+        chunks=_iter_chunks(payload, 256 * 1024),
+    )
+
+    assert result.size_bytes == len(payload)
+    assert result.checksum == hashlib.sha256(payload).hexdigest()
+    assert await storage.read(result.storage_uri) == payload
+    assert await storage.read_range(result.storage_uri, 10, 1_000_010) == payload[10:1_000_010]
+    chunks = [
+        chunk async for chunk in storage.open_stream(result.storage_uri, chunk_size=_MIB)
+    ]
+    assert [len(chunk) for chunk in chunks] == [_MIB, _MIB, _MIB, 123]
+
+
+@pytest.mark.asyncio
+async def test_local_stream_failure_leaves_no_partial_file(tmp_path) -> None:
+    storage = StorageManager({"type": "local", "local_dir": str(tmp_path)})
+
+    with pytest.raises(RuntimeError, match="client disconnected"):
+        await storage.save_stream(namespace_id=1, filename="a.txt", chunks=_failing_chunks())
+
+    assert not list((tmp_path / "1").iterdir())
+
+
+@pytest.fixture
+def s3_storage(monkeypatch: pytest.MonkeyPatch):
+    moto = pytest.importorskip("moto")
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with moto.mock_aws():
+        storage = StorageManager(
+            {
+                "type": "s3",
+                "s3": {"bucket": "wiki", "region": "us-east-1", "part_size_mb": 5},
+            }
+        )
+        storage._s3_client.create_bucket(Bucket="wiki")
+        yield storage
+
+
+@pytest.mark.asyncio
+async def test_s3_multipart_upload_and_ranged_read(s3_storage) -> None:
+    payload = os.urandom(11 * _MIB)
+
+    result = await s3_storage.save_stream(
+        namespace_id=1,
+        filename="big.pdf",
+        chunks=_iter_chunks(payload, _MIB),
+    )
+
+    assert result.storage_uri.startswith("s3://wiki/1/")
+    assert result.size_bytes == len(payload)
+    assert result.checksum == hashlib.sha256(payload).hexdigest()
+    head = s3_storage._s3_client.head_object(Bucket="wiki", Key=result.storage_key)
+    # Three parts (5 + 5 + 1 MiB) were uploaded.
+    assert head["ETag"].strip('"').endswith("-3")
+    assert await s3_storage.read_range(result.storage_uri, _MIB, 2 * _MIB) == payload[_MIB : 2 * _MIB]
+    assert await s3_storage.read(result.storage_uri) == payload
+
+
+@pytest.mark.asyncio
+async def test_s3_small_upload_uses_single_put(s3_storage) -> None:
+    result = await s3_storage.save(namespace_id=2, filename="a.txt", content=b"hello")
+
+    head = s3_storage._s3_client.head_object(Bucket="wiki", Key=result.storage_key)
+    assert "-" not in head["ETag"]
+    assert await s3_storage.read(result.storage_uri) == b"hello"
+
+
+@pytest.mark.asyncio
+async def test_s3_failed_stream_aborts_multipart_upload(s3_storage) -> None:
+    with pytest.raises(RuntimeError, match="client disconnected"):
+        await s3_storage.save_stream(namespace_id=1, filename="a.txt", chunks=_failing_chunks())
+
+    uploads = s3_storage._s3_client.list_multipart_uploads(Bucket="wiki")
+    assert not uploads.get("Uploads")
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import pytest
+import sqlglot
+
+from src.shared.utils import sql_lineage
+from src.shared.utils.sql_lineage import (
+    LineageResult,
+    SQLLineageAnalyzer,
+    SQLLineageCache,
+    normalize_sql,
+    sql_cache_key,
+)
+
+_SESSION = [
+    "CREATE TABLE tmp.order_agg AS SELECT o.user_id, SUM(o.amount) AS total "
+    "FROM ods.orders o GROUP BY o.user_id",
+    "INSERT OVERWRITE TABLE dw.user_value SELECT a.user_id, "
+    "CASE WHEN a.total > 100 THEN 'high' ELSE 'low' END AS level FROM tmp.order_agg a",
+]
+
+
+def _summary(result: LineageResult) -> tuple:
+    return (
+        sorted(t.full_name for t in result.sources),
+        sorted(t.full_name for t in result.targets),
+        sorted(t.full_name for t in result.temp_tables),
+        sorted((edge.source.full_name, edge.target.full_name) for edge in result.table_lineages),
+        [
+            (c.source.full_name, c.target.full_name, c.transformation)
+            for c in result.column_lineages
+        ],
+    )
+
+
+@pytest.fixture
+def parse_calls(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    calls: list[str] = []
+    parse = sqlglot.parse
+
+    def _parse(sql: str, **kwargs):
+        calls.append(sql)
+        return parse(sql, **kwargs)
+
+    monkeypatch.setattr(sql_lineage.sqlglot, "parse", _parse)
+    return calls
+
+
+def test_each_statement_is_parsed_once_and_then_cached(parse_calls: list[str]) -> None:
+    analyzer = SQLLineageAnalyzer(cache=SQLLineageCache())
+
+    first = analyzer.analyze_session(_SESSION)
+    second = analyzer.analyze_session([" \n".join(sql.split(" ")) + ";" for sql in _SESSION])
+
+    assert parse_calls == _SESSION
+    assert _summary(first) == _summary(second)
+    assert _summary(first)[:4] == (
+        ["ods.orders"],
+        ["dw.user_value"],
+        ["tmp.order_agg"],
+        [("ods.orders", "dw.user_value")],
+    )
+    assert ("a.total", "dw.user_value.level", "CONDITIONAL") in _summary(first)[4]
+    assert analyzer.cache.stats() == {"entries": 2, "hits": 2, "disk_hits": 0, "misses": 2}
+
+
+def test_normalization_keeps_quoted_whitespace() -> None:
+    assert normalize_sql("select  a,\n\tb  from t ;") == "select a, b from t"
+    assert normalize_sql("-- load\nselect a /* col */ from t") == "select a from t"
+    assert normalize_sql("-- load select a from t") == ""
+    assert normalize_sql("select '--x', \"/*y*/\" from t") == "select '--x', \"/*y*/\" from t"
+    assert sql_cache_key("hive", "select 'a  b'") != sql_cache_key("hive", "select 'a b'")
+    assert sql_cache_key("hive", "select 1") != sql_cache_key("spark", "select 1")
+
+
+def test_disk_store_survives_a_new_cache(tmp_path, parse_calls: list[str]) -> None:
+    path = str(tmp_path / "lineage" / "facts.db")
+    writer = SQLLineageCache(path=path)
+    expected = _summary(SQLLineageAnalyzer(cache=writer).analyze_session(_SESSION))
+    writer.close()
+
+    reader = SQLLineageCache(path=path)
+    result = SQLLineageAnalyzer(cache=reader).analyze_session(_SESSION)
+
+    assert _summary(result) == expected
+    assert len(parse_calls) == 2
+    assert reader.stats()["disk_hits"] == 2
+    reader.close()
+
+
+def test_process_pool_batch_matches_serial_analysis() -> None:
+    sessions = [
+        _SESSION,
+        _SESSION[:1],
+        ["select from where ((", "INSERT INTO dw.t SELECT x FROM s.y"],
+    ]
+    serial = SQLLineageAnalyzer(use_cache=False).analyze_sessions(sessions, max_workers=1)
+
+    cache = SQLLineageCache()
+    pooled = SQLLineageAnalyzer(cache=cache).analyze_sessions(
+        sessions, max_workers=2, min_parallel=1
+    )
+
+    assert [_summary(r) for r in pooled] == [_summary(r) for r in serial]
+    # Four distinct statements,each parsed once in the pool.
+    assert cache.stats()["misses"] == 4
+    assert len(cache) == 4
+
+
+@pytest.mark.asyncio
+async def test_async_session_is_answered_from_cache(parse_calls: list[str]) -> None:
+    analyzer = SQLLineageAnalyzer(cache=SQLLineageCache())
+
+    cold = await analyzer.aanalyze_session(_SESSION)
+    warm = await analyzer.aanalyze_session(_SESSION)
+
+    assert _summary(cold) == _summary(warm)
+    assert len(parse_calls) == 2
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+# @author Sunny
+# @date 2026-01-27
+"""
+Circuit breaker outage simulation.
+
+N workers (each with its own CircuitBreakerRegistry, like separate processes)
+call a provider that goes down for a while. A failed call costs a full
+timeout. Compares the memory backend (per-process state) with the redis
+backend (shared state, one HALF_OPEN probe cluster-wide).
+
+Reported per backend:
+- wasted timeout-seconds: total time workers spent waiting on failing calls
+- failed calls / rejected calls / probes sent while the provider was down
+
+The redis backend uses fakeredis (pip install "fakeredis[lua]") unless
+--redis-url is given.
+
+Usage:
+    python benchmarks/bench_circuit_breaker.py [--workers 32] [--redis-url redis://...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass
+
+from datapillar_oneagentic.exception import CircuitBreakerRegistry, CircuitState
+from datapillar_oneagentic.providers.llm.config import CircuitBreakerConfig
+
+
+@dataclass
+class _Stats:
+    ok: int = 0
+    failed: int = 0
+    rejected: int = 0
+    probes: int = 0
+    wasted_seconds: float = 0.0
+
+
+class _Provider:
+    def __init__(self, *, outage_start: float, outage_end: float, timeout: float) -> None:
+        self._outage_start = outage_start
+        self._outage_end = outage_end
+        self._timeout = timeout
+
+    def is_down(self, now: float) -> bool:
+        return self._outage_start <= now < self._outage_end
+
+    async def call(self, started: float) -> bool:
+        if self.is_down(time.monotonic() - started):
+            await asyncio.sleep(self._timeout)
+            return False
+        await asyncio.sleep(self._timeout / 20)
+        return True
+
+
+async def _worker(registry, provider: _Provider, stats: _Stats, *, started, duration, pause):
+    breaker = registry.get("llm:bench:model")
+    while time.monotonic() - started < duration:
+        was_half_open = breaker.state != CircuitState.CLOSED
+        if not await breaker.allow_request():
+            stats.rejected += 1
+            await asyncio.sleep(pause)
+            continue
+        if was_half_open:
+            stats.probes += 1
+        call_started = time.monotonic()
+        if await provider.call(started):
+            stats.ok += 1
+            await breaker.record_success(time.monotonic() - call_started)
+        else:
+            stats.failed += 1
+            stats.wasted_seconds += time.monotonic() - call_started
+            await breaker.record_failure()
+        await asyncio.sleep(pause)
+
+
+async def _simulate(backend: str, args, redis_factory) -> _Stats:
+    config = CircuitBreakerConfig(
+        failure_threshold=3,
+        recovery_seconds=1,
+        backend=backend,
+        key_prefix=f"bench_cb:{time.time_ns()}:",
+    )
+    provider = _Provider(outage_start=0.5, outage_end=args.duration - 1.0, timeout=args.timeout)
+    stats = _Stats()
+    started = time.monotonic()
+    registries = [
+        CircuitBreakerRegistry(
+            config, redis_client=redis_factory() if backend == "redis" else None
+        )
+        for _ in range(args.workers)
+    ]
+    await asyncio.gather(
+        *(
+            _worker(
+                registry,
+                provider,
+                stats,
+                started=started,
+                duration=args.duration,
+                pause=args.pause,
+            )
+            for registry in registries
+        )
+    )
+    return stats
+
+
+def _redis_factory(redis_url: str | None):
+    if redis_url:
+        import redis.asyncio as redis_asyncio
+
+        return lambda: redis_asyncio.from_url(redis_url)
+    import fakeredis
+
+    server = fakeredis.FakeServer()
+    return lambda: fakeredis.FakeAsyncRedis(server=server)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=6.0, help="Simulation seconds")
+    parser.add_argument("--timeout", type=float, default=0.2, help="Failed call cost (s)")
+    parser.add_argument("--pause", type=float, default=0.02, help="Pause between requests (s)")
+    parser.add_argument("--redis-url", default=None)
+    args = parser.parse_args()
+
+    factory = _redis_factory(args.redis_url)
+    print(
+        f"workers={args.workers} duration={args.duration}s timeout={args.timeout}s "
+        f"outage=[0.5s, {args.duration - 1.0}s)"
+    )
+    print(f"{'backend':<8}{'wasted_s':>10}{'failed':>8}{'rejected':>10}{'probes':>8}{'ok':>8}")
+    for backend in ("memory", "redis"):
+        stats = await _simulate(backend, args, factory)
+        print(
+            f"{backend:<8}{stats.wasted_seconds:>10.2f}{stats.failed:>8}"
+            f"{stats.rejected:>10}{stats.probes:>8}{stats.ok:>8}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
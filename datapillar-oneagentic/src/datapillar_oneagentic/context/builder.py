@@ -12,11 +12,19 @@ Responsibilities:
 Hard constraints:
 - Only keys ending with _context are injectable
 - Ordering is enforced inside the Composer
+
+Prompt caching:
+- Context blocks are ordered from most to least stable, so the system prompt and
+  stable blocks form an unchanged prefix across steps (provider prompt-cache hits)
+- ContextCollector caches each section per session, keyed by the section inputs;
+  only changed sections are rebuilt
 """
 
 from __future__ import annotations
 
 import logging
+import time
+from collections import OrderedDict
 from enum import Enum
 from typing import Any, Mapping, TYPE_CHECKING
 
@@ -42,13 +50,16 @@ EXPERIENCE_CONTEXT_KEY = "experience_context"
 TODO_CONTEXT_KEY = "todo_context"
 COMPRESSION_CONTEXT_KEY = "compression_context"
 
+# Most stable first: todo changes on almost every step, so it goes last.
 CONTEXT_ORDER = (
     FRAMEWORK_CONTEXT_KEY,
     EXPERIENCE_CONTEXT_KEY,
-    TODO_CONTEXT_KEY,
     COMPRESSION_CONTEXT_KEY,
+    TODO_CONTEXT_KEY,
 )
 
+_MISSING = object()
+
 class ContextScenario(str, Enum):
     AGENT = "agent"
     MAPREDUCE_WORKER = "mapreduce_worker"
@@ -102,8 +113,63 @@ class ContextComposer:
                 messages.append(Message.system(text, metadata={"context_key": key}))
 
 
+class _SectionCache:
+    """Per-session section cache: (session_id, section) -> (version, value)."""
+
+    def __init__(self, *, max_sessions: int, ttl_seconds: float | None) -> None:
+        self._max_sessions = max_sessions
+        self._ttl_seconds = ttl_seconds
+        self._sessions: OrderedDict[str, dict[str, tuple[Any, float, str | None]]] = OrderedDict()
+        self.hits: dict[str, int] = {}
+        self.misses: dict[str, int] = {}
+
+    def get(self, session_id: str, section: str, version: Any) -> Any:
+        """Return the cached value, or _MISSING if absent, stale or expired."""
+        sections = self._sessions.get(session_id)
+        item = sections.get(section) if sections is not None else None
+        if item is not None:
+            cached_version, stored_at, value = item
+            expired = (
+                self._ttl_seconds is not None
+                and time.monotonic() - stored_at > self._ttl_seconds
+            )
+            if cached_version == version and not expired:
+                self._sessions.move_to_end(session_id)
+                self.hits[section] = self.hits.get(section, 0) + 1
+                return value
+        self.misses[section] = self.misses.get(section, 0) + 1
+        return _MISSING
+
+    def put(self, session_id: str, section: str, version: Any, value: str | None) -> None:
+        sections = self._sessions.get(session_id)
+        if sections is None:
+            sections = {}
+            self._sessions[session_id] = sections
+            while len(self._sessions) > self._max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(session_id)
+        sections[section] = (version, time.monotonic(), value)
+
+    def invalidate(self, session_id: str | None = None) -> None:
+        if session_id is None:
+            self._sessions.clear()
+        else:
+            self._sessions.pop(session_id, None)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
 class ContextCollector:
-    """Collect _context blocks at runtime (no rendering)."""
+    """
+    Collect _context blocks at runtime (no rendering).
+
+    Sections are cached per session and rebuilt only when their inputs change:
+    - framework: tool/todo flags
+    - todo: todo items + assigned task
+    - experience: query + experience cache version (bounded by TTL)
+    """
 
     def __init__(
         self,
@@ -112,11 +178,29 @@ class ContextCollector:
         experience_retriever: "ExperienceRetriever | None" = None,
         experience_learner: "ExperienceLearner | None" = None,
         share_agent_context: bool = True,
+        cache_max_sessions: int = 1024,
+        cache_ttl_seconds: float | None = 300.0,
     ) -> None:
         self._knowledge_service = knowledge_service
         self._experience_retriever = experience_retriever
         self._experience_learner = experience_learner
         self._share_agent_context = share_agent_context
+        self._sections = _SectionCache(
+            max_sessions=cache_max_sessions,
+            ttl_seconds=cache_ttl_seconds,
+        )
+
+    def invalidate(self, session_id: str | None = None) -> None:
+        """Drop cached sections of a session (all sessions if None)."""
+        self._sections.invalidate(session_id)
+
+    def stats(self) -> dict[str, Any]:
+        """Section cache hit/miss counters."""
+        return {
+            "sessions": len(self._sections),
+            "hits": dict(self._sections.hits),
+            "misses": dict(self._sections.misses),
+        }
 
     async def collect(
         self,
@@ -136,19 +220,29 @@ class ContextCollector:
 
         todo_prompt = None
         if TODO_CONTEXT_KEY in allowed:
-            todo_prompt = self._build_todo_prompt(
-                todo_data=_as_dict(state.get("todo")),
-                assigned_task=_as_str(state.get("assigned_task")),
-            )
+            todo_data = _as_dict(state.get("todo"))
+            assigned_task = _as_str(state.get("assigned_task"))
+            version = (_todo_version(todo_data), assigned_task)
+            todo_prompt = self._sections.get(session_id, TODO_CONTEXT_KEY, version)
+            if todo_prompt is _MISSING:
+                todo_prompt = self._build_todo_prompt(
+                    todo_data=todo_data,
+                    assigned_task=assigned_task,
+                )
+                self._sections.put(session_id, TODO_CONTEXT_KEY, version, todo_prompt)
             if todo_prompt:
                 contexts[TODO_CONTEXT_KEY] = todo_prompt
 
         if FRAMEWORK_CONTEXT_KEY in allowed:
-            framework_context = self._build_framework_context(
-                has_knowledge_tool=has_knowledge_tool,
-                include_todo_instruction=TODO_CONTEXT_KEY in allowed,
-                has_todo_prompt=bool(todo_prompt),
-            )
+            version = (has_knowledge_tool, TODO_CONTEXT_KEY in allowed, bool(todo_prompt))
+            framework_context = self._sections.get(session_id, FRAMEWORK_CONTEXT_KEY, version)
+            if framework_context is _MISSING:
+                framework_context = self._build_framework_context(
+                    has_knowledge_tool=has_knowledge_tool,
+                    include_todo_instruction=TODO_CONTEXT_KEY in allowed,
+                    has_todo_prompt=bool(todo_prompt),
+                )
+                self._sections.put(session_id, FRAMEWORK_CONTEXT_KEY, version, framework_context)
             if framework_context:
                 contexts[FRAMEWORK_CONTEXT_KEY] = framework_context
 
@@ -158,7 +252,10 @@ class ContextCollector:
                 contexts[COMPRESSION_CONTEXT_KEY] = compression_value
 
         if EXPERIENCE_CONTEXT_KEY in allowed:
-            experience_context = await self._build_experience_context(query=query)
+            experience_context = await self._build_experience_context(
+                query=query,
+                session_id=session_id,
+            )
             if experience_context:
                 contexts[EXPERIENCE_CONTEXT_KEY] = experience_context
 
@@ -237,9 +334,13 @@ class ContextCollector:
             )
         return None
 
-    async def _build_experience_context(self, *, query: str) -> str | None:
+    async def _build_experience_context(self, *, query: str, session_id: str) -> str | None:
         if not self._experience_retriever or not query:
             return None
+        version = (query, self._experience_retriever.cache_version)
+        cached = self._sections.get(session_id, EXPERIENCE_CONTEXT_KEY, version)
+        if cached is not _MISSING:
+            return cached
         try:
             context = await self._experience_retriever.build_context(query)
         except Exception as exc:
@@ -247,6 +348,7 @@ class ContextCollector:
             return None
         if context:
             logger.info("Similar experience found; context injected")
+        self._sections.put(session_id, EXPERIENCE_CONTEXT_KEY, version, context or None)
         return context or None
 
 
@@ -416,6 +518,27 @@ class ContextBuilder:
         )
 
 
+def _todo_version(todo_data: dict | None) -> tuple | None:
+    """Fingerprint of the todo fields rendered by SessionTodoList.to_prompt()."""
+    if not todo_data:
+        return None
+    items = todo_data.get("items") or []
+    return (
+        todo_data.get("goal"),
+        tuple(
+            (
+                item.get("id"),
+                item.get("status"),
+                item.get("description"),
+                item.get("result"),
+            )
+            if isinstance(item, dict)
+            else repr(item)
+            for item in items
+        ),
+    )
+
+
 def _as_dict(value: Any) -> dict | None:
     return dict(value) if isinstance(value, dict) else None
 
@@ -18,6 +18,16 @@ class ContextConfig(BaseModel):
         ge=1,
         description="Minimum number of messages to keep during compaction",
     )
+    section_cache_max_sessions: int = Field(
+        default=1024,
+        ge=1,
+        description="Max sessions whose context sections are cached",
+    )
+    section_cache_ttl_seconds: float | None = Field(
+        default=300.0,
+        gt=0,
+        description="Context section cache TTL (None = no expiry)",
+    )
 
 
 class CheckpointerConfig(BaseModel):
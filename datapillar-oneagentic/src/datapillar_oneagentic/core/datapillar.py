@@ -64,10 +64,11 @@ from datapillar_oneagentic.context.compaction import CompactPolicy, get_compacto
 from datapillar_oneagentic.context.timeline.recorder import TimelineRecorder
 from datapillar_oneagentic.events import EventBus
 from datapillar_oneagentic.log import bind_log_context, setup_logging
-from datapillar_oneagentic.providers.llm import EmbeddingProvider, LLMProvider
+from datapillar_oneagentic.providers.llm import EmbeddingProvider, LLMProvider, UsageLedger
 
 if TYPE_CHECKING:
     from datapillar_oneagentic.knowledge import KnowledgeConfig
+    from datapillar_oneagentic.providers.llm import UsageSink, UsageTotals
 
 logger = logging.getLogger(__name__)
 
@@ -106,6 +107,7 @@ class Datapillar:
         a2a_agents: list | None = None,
         verbose: bool = False,
         knowledge: "KnowledgeConfig | None" = None,
+        usage_sink: "UsageSink | None" = None,
     ):
         """
         Create a team.
@@ -122,6 +124,7 @@ class Datapillar:
             a2a_agents: team-level A2A remote agent configs
             verbose: enable verbose logging (default False)
             knowledge: knowledge tool binding (store + retrieve defaults)
+            usage_sink: token usage persistence (optional, flushed in batches)
         """
         self._config = config
         self.namespace = namespace
@@ -183,6 +186,10 @@ class Datapillar:
         self._timeline_recorder = TimelineRecorder(self._event_bus)
         self._timeline_recorder.register()
 
+        # Team-level token usage ledger.
+        self._usage_ledger = UsageLedger(self._config.llm.usage, sink=usage_sink)
+        self._usage_ledger.attach(self._event_bus)
+
         # Team-level LLM provider and context compactor.
         self._llm_provider = LLMProvider(self._config.llm, event_bus=self._event_bus)
         compaction_policy = CompactPolicy(
@@ -201,10 +208,15 @@ class Datapillar:
         self._learning_store = None
         self._experience_learner = None
         self._experience_retriever = None
+        self._experience_cache = None
 
         if enable_learning:
             self._learning_embedding_provider = EmbeddingProvider(self._config.embedding)
-            from datapillar_oneagentic.experience import ExperienceLearner, ExperienceRetriever
+            from datapillar_oneagentic.experience import (
+                ExperienceCache,
+                ExperienceLearner,
+                ExperienceRetriever,
+            )
             from datapillar_oneagentic.storage import create_learning_store
 
             self._learning_store = create_learning_store(
@@ -212,14 +224,27 @@ class Datapillar:
                 vector_store_config=self._config.learning.vector_store,
                 embedding_config=self._config.embedding,
             )
+            learning_config = self._config.learning
+            self._experience_cache = (
+                ExperienceCache(
+                    namespace,
+                    max_embeddings=learning_config.cache_size,
+                    max_results=learning_config.cache_size,
+                    ttl_seconds=learning_config.cache_ttl_seconds,
+                )
+                if learning_config.cache_enabled
+                else None
+            )
             self._experience_learner = ExperienceLearner(
                 store=self._learning_store,
                 namespace=namespace,
                 embedding_provider=self._learning_embedding_provider,
+                cache=self._experience_cache,
             )
             self._experience_retriever = ExperienceRetriever(
                 store=self._learning_store,
                 embedding_provider=self._learning_embedding_provider,
+                cache=self._experience_cache,
             )
             logger.info(
                 "Experience learning enabled",
@@ -236,6 +261,8 @@ class Datapillar:
             experience_retriever=self._experience_retriever,
             experience_learner=self._experience_learner,
             share_agent_context=self.enable_share_context,
+            cache_max_sessions=self._config.context.section_cache_max_sessions,
+            cache_ttl_seconds=self._config.context.section_cache_ttl_seconds,
         )
 
         # Create node factory.
@@ -391,6 +418,7 @@ class Datapillar:
             experience_retriever=self._experience_retriever,
             process=self.process,
             event_bus=self._event_bus,
+            usage_ledger=self._usage_ledger,
         )
 
     async def stream(
@@ -468,6 +496,7 @@ class Datapillar:
         async with create_checkpointer(self.namespace, agent_config=self._config.agent) as checkpointer:
             orchestrator = self._build_orchestrator(checkpointer=checkpointer, store=None)
             await orchestrator.clear_session(session_id)
+        self._context_collector.invalidate(session_id)
 
     async def clear_session_store(self, session_id: str) -> None:
         """Clear session deliverables."""
@@ -497,6 +526,25 @@ class Datapillar:
             )
             return await orchestrator.get_session_stats(session_id)
 
+    def get_session_usage(self, session_id: str) -> UsageTotals:
+        """Get live token usage totals of a session (no storage round-trip)."""
+        key = SessionKey(namespace=self.namespace, session_id=session_id)
+        return self._usage_ledger.session_totals(key)
+
+    async def flush_usage(self) -> int:
+        """Flush pending token usage to the sink; returns entries written."""
+        return await self._usage_ledger.flush()
+
+    async def close(self) -> None:
+        """
+        Release team resources (call when the team is discarded or on shutdown).
+
+        Stops listening for LLM usage events, stops the usage flusher and
+        flushes the pending token usage to the sink.
+        """
+        self._usage_ledger.detach(self._event_bus)
+        await self._usage_ledger.aclose()
+
     async def get_session_todo(self, session_id: str) -> dict:
         """Get session todo snapshot."""
         from datapillar_oneagentic.storage import create_checkpointer, create_store
@@ -139,6 +139,7 @@ class LLMCallCompletedEvent(BaseEvent):
     input_tokens: int = 0
     output_tokens: int = 0
     cached_tokens: int = 0
+    reasoning_tokens: int = 0
     duration_ms: float = 0.0
 
 
@@ -14,6 +14,7 @@ from datapillar_oneagentic.exception.circuit_breaker import (
     CircuitBreakerError,
     CircuitBreakerRegistry,
     CircuitState,
+    RedisCircuitBreaker,
     with_circuit_breaker,
 )
 from datapillar_oneagentic.exception.connection_failed import ConnectionFailedException
@@ -57,5 +58,6 @@ __all__ = [
     "CircuitBreakerRegistry",
     "CircuitBreakerError",
     "CircuitState",
+    "RedisCircuitBreaker",
     "with_circuit_breaker",
 ]
@@ -5,17 +5,28 @@
 Circuit breaker.
 
 Prevents cascading failures by failing fast when a service repeatedly fails.
+
+Backends:
+- memory: per-process state (default)
+- redis: state shared across processes; the failure count and OPEN state are
+  visible to every worker, and only one HALF_OPEN probe runs cluster-wide
+
+Tripping:
+- consecutive failures reach failure_threshold
+- calls slower than slow_call_seconds count as failures (latency-based tripping)
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import threading
 import time
+import uuid
 from collections.abc import Awaitable, Callable
 from enum import Enum
 from functools import wraps
-from typing import TYPE_CHECKING, ParamSpec, TypeVar
+from typing import TYPE_CHECKING, Any, ParamSpec, TypeVar
 
 if TYPE_CHECKING:
     from datapillar_oneagentic.providers.llm.config import CircuitBreakerConfig
@@ -43,27 +54,39 @@ class CircuitBreakerError(Exception):
 
 
 class CircuitBreaker:
-    """Circuit breaker."""
+    """Circuit breaker (in-process state)."""
 
     def __init__(self, name: str, config: "CircuitBreakerConfig"):
         self.name = name
         self.failure_threshold = config.failure_threshold
         self.recovery_timeout = config.recovery_seconds
+        self.slow_call_seconds = config.slow_call_seconds
+        self.probe_timeout = config.probe_timeout_seconds
 
         self._state = CircuitState.CLOSED
         self._failure_count = 0
         self._last_failure_time: float | None = None
+        self._probe_started_at: float | None = None
         self._lock = asyncio.Lock()
 
     @property
     def state(self) -> CircuitState:
         return self._state
 
+    def is_slow(self, latency_seconds: float | None) -> bool:
+        """Return whether a call latency counts as a failure."""
+        return (
+            self.slow_call_seconds is not None
+            and latency_seconds is not None
+            and latency_seconds >= self.slow_call_seconds
+        )
+
     async def _check_state_transition(self) -> None:
         if self._state == CircuitState.OPEN and self._last_failure_time:
             elapsed = time.time() - self._last_failure_time
             if elapsed >= self.recovery_timeout:
                 self._state = CircuitState.HALF_OPEN
+                self._probe_started_at = None
                 logger.info(f"[CircuitBreaker:{self.name}] OPEN -> HALF_OPEN")
 
     async def allow_request(self) -> bool:
@@ -71,15 +94,37 @@ class CircuitBreaker:
             await self._check_state_transition()
             if self._state == CircuitState.CLOSED:
                 return True
-            return self._state != CircuitState.OPEN
-
-    async def record_success(self) -> None:
+            if self._state == CircuitState.OPEN:
+                return False
+            # HALF_OPEN: a single probe at a time; a lost probe expires.
+            now = time.time()
+            if self._probe_started_at is not None and (
+                now - self._probe_started_at < self.probe_timeout
+            ):
+                return False
+            self._probe_started_at = now
+            return True
+
+    async def record_success(self, latency_seconds: float | None = None) -> None:
+        if self.is_slow(latency_seconds):
+            logger.warning(
+                f"[CircuitBreaker:{self.name}] slow call counted as failure "
+                f"(latency={latency_seconds:.2f}s)"
+            )
+            await self.record_failure()
+            return
         async with self._lock:
             if self._state == CircuitState.HALF_OPEN:
                 self._state = CircuitState.CLOSED
+                self._probe_started_at = None
                 logger.info(f"[CircuitBreaker:{self.name}] HALF_OPEN -> CLOSED (recovered)")
             self._failure_count = 0
 
+    async def release_probe(self) -> None:
+        """Give back a HALF_OPEN probe lease for an outcome that does not count."""
+        async with self._lock:
+            self._probe_started_at = None
+
     async def record_failure(self) -> None:
         async with self._lock:
             self._failure_count += 1
@@ -87,6 +132,7 @@ class CircuitBreaker:
 
             if self._state == CircuitState.HALF_OPEN:
                 self._state = CircuitState.OPEN
+                self._probe_started_at = None
                 logger.warning(f"[CircuitBreaker:{self.name}] HALF_OPEN -> OPEN (probe failed)")
             elif self._failure_count >= self.failure_threshold:
                 self._state = CircuitState.OPEN
@@ -99,25 +145,236 @@ class CircuitBreaker:
         self._state = CircuitState.CLOSED
         self._failure_count = 0
         self._last_failure_time = None
+        self._probe_started_at = None
+
+
+# KEYS[1]=state hash, KEYS[2]=probe lease
+# ARGV: now, recovery_seconds, probe_ttl_ms, probe_token
+_ALLOW_SCRIPT = """
+local state = redis.call('HGET', KEYS[1], 'state') or 'closed'
+if state == 'closed' then
+  return {1, state}
+end
+if state == 'open' then
+  local opened_at = tonumber(redis.call('HGET', KEYS[1], 'opened_at') or '0')
+  if tonumber(ARGV[1]) - opened_at < tonumber(ARGV[2]) then
+    return {0, state}
+  end
+  state = 'half_open'
+  redis.call('HSET', KEYS[1], 'state', state)
+end
+if redis.call('SET', KEYS[2], ARGV[4], 'NX', 'PX', ARGV[3]) then
+  return {1, state}
+end
+return {0, state}
+"""
+
+# KEYS[1]=state hash, KEYS[2]=probe lease
+# ARGV: now, failure_threshold, key_ttl_seconds
+_FAILURE_SCRIPT = """
+local failures = redis.call('HINCRBY', KEYS[1], 'failures', 1)
+local state = redis.call('HGET', KEYS[1], 'state') or 'closed'
+local next_state = state
+if state == 'half_open' or failures >= tonumber(ARGV[2]) then
+  next_state = 'open'
+  redis.call('HSET', KEYS[1], 'state', next_state, 'opened_at', ARGV[1])
+  redis.call('DEL', KEYS[2])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return {failures, state, next_state}
+"""
+
+# KEYS[1]=state hash, KEYS[2]=probe lease
+# ARGV: key_ttl_seconds
+_SUCCESS_SCRIPT = """
+local state = redis.call('HGET', KEYS[1], 'state') or 'closed'
+local next_state = state
+if state == 'half_open' then
+  next_state = 'closed'
+  redis.call('HSET', KEYS[1], 'state', next_state)
+  redis.call('DEL', KEYS[2])
+end
+redis.call('HSET', KEYS[1], 'failures', 0)
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return {state, next_state}
+"""
+
+# KEYS[1]=probe lease
+# ARGV: probe_token
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# One Redis client (connection pool) per URL, shared by every registry.
+_redis_clients: dict[str, Any] = {}
+_redis_clients_lock = threading.Lock()
+
+
+def _shared_redis(url: str) -> Any:
+    with _redis_clients_lock:
+        client = _redis_clients.get(url)
+        if client is None:
+            try:
+                import redis.asyncio as redis_asyncio
+            except ImportError as err:
+                raise ImportError(
+                    "Redis circuit breaker requires extra dependencies:\n"
+                    "  pip install datapillar-oneagentic[redis]"
+                ) from err
+            client = redis_asyncio.from_url(url)
+            _redis_clients[url] = client
+        return client
+
+
+class RedisCircuitBreaker(CircuitBreaker):
+    """
+    Circuit breaker with state shared through Redis.
+
+    - Failure count and OPEN state live in one Redis hash per breaker name
+    - HALF_OPEN probes are leased with SET NX PX, so one probe runs cluster-wide
+    - Transitions run in Lua scripts (atomic across processes)
+    - Redis errors fall back to the in-process state machine
+
+    Requires redis package: pip install datapillar-oneagentic[redis]
+    """
+
+    def __init__(self, name: str, config: "CircuitBreakerConfig", *, client: Any) -> None:
+        super().__init__(name, config)
+        self._client = client
+        self._key = f"{config.key_prefix}{name}"
+        self._probe_key = f"{self._key}:probe"
+        self._probe_token = uuid.uuid4().hex
+        self._key_ttl = max(int(config.recovery_seconds) * 10, 3600)
+
+    async def allow_request(self) -> bool:
+        try:
+            allowed, state = await self._client.eval(
+                _ALLOW_SCRIPT,
+                2,
+                self._key,
+                self._probe_key,
+                time.time(),
+                self.recovery_timeout,
+                int(self.probe_timeout * 1000),
+                self._probe_token,
+            )
+        except Exception as exc:
+            logger.warning(f"[CircuitBreaker:{self.name}] redis unavailable, using local state: {exc}")
+            return await super().allow_request()
+        self._observe(state)
+        return bool(int(allowed))
+
+    async def record_success(self, latency_seconds: float | None = None) -> None:
+        if self.is_slow(latency_seconds):
+            logger.warning(
+                f"[CircuitBreaker:{self.name}] slow call counted as failure "
+                f"(latency={latency_seconds:.2f}s)"
+            )
+            await self.record_failure()
+            return
+        try:
+            previous, state = await self._client.eval(
+                _SUCCESS_SCRIPT, 2, self._key, self._probe_key, self._key_ttl
+            )
+        except Exception as exc:
+            logger.warning(f"[CircuitBreaker:{self.name}] redis unavailable, using local state: {exc}")
+            await super().record_success(latency_seconds)
+            return
+        self._failure_count = 0
+        self._log_transition(previous, state, reason="recovered")
+        self._observe(state)
+
+    async def release_probe(self) -> None:
+        try:
+            await self._client.eval(_RELEASE_SCRIPT, 1, self._probe_key, self._probe_token)
+        except Exception as exc:
+            logger.warning(f"[CircuitBreaker:{self.name}] redis unavailable, using local state: {exc}")
+            await super().release_probe()
+
+    async def record_failure(self) -> None:
+        try:
+            failures, previous, state = await self._client.eval(
+                _FAILURE_SCRIPT,
+                2,
+                self._key,
+                self._probe_key,
+                time.time(),
+                self.failure_threshold,
+                self._key_ttl,
+            )
+        except Exception as exc:
+            logger.warning(f"[CircuitBreaker:{self.name}] redis unavailable, using local state: {exc}")
+            await super().record_failure()
+            return
+        self._failure_count = int(failures)
+        self._last_failure_time = time.time()
+        self._log_transition(previous, state, reason=f"failures: {self._failure_count}")
+        self._observe(state)
+
+    async def sync(self) -> CircuitState:
+        """Refresh the cached state from Redis."""
+        state = await self._client.hget(self._key, "state")
+        self._observe(state or CircuitState.CLOSED.value)
+        return self._state
+
+    async def areset(self) -> None:
+        """Reset shared state."""
+        super().reset()
+        await self._client.delete(self._key, self._probe_key)
+
+    def _observe(self, state: Any) -> None:
+        if isinstance(state, bytes):
+            state = state.decode("utf-8")
+        self._state = CircuitState(state)
+
+    def _log_transition(self, previous: Any, state: Any, *, reason: str) -> None:
+        if isinstance(previous, bytes):
+            previous = previous.decode("utf-8")
+        if isinstance(state, bytes):
+            state = state.decode("utf-8")
+        if previous == state:
+            return
+        log = logger.info if state == CircuitState.CLOSED.value else logger.warning
+        log(
+            f"[CircuitBreaker:{self.name}] {previous.upper()} -> {state.upper()} "
+            f"(shared, {reason})"
+        )
 
 
 class CircuitBreakerRegistry:
     """Circuit breaker registry (team-scoped)."""
 
-    def __init__(self, config: "CircuitBreakerConfig") -> None:
+    def __init__(self, config: "CircuitBreakerConfig", *, redis_client: Any = None) -> None:
         self._config = config
         self._circuit_breakers: dict[str, CircuitBreaker] = {}
+        self._redis_client = redis_client
 
     def get(self, name: str) -> CircuitBreaker:
         if name in self._circuit_breakers:
             return self._circuit_breakers[name]
-        breaker = CircuitBreaker(name, self._config)
+        breaker = self._create(name)
         self._circuit_breakers[name] = breaker
         return breaker
 
     def reset(self) -> None:
         self._circuit_breakers.clear()
 
+    def _create(self, name: str) -> CircuitBreaker:
+        if self._config.backend != "redis":
+            return CircuitBreaker(name, self._config)
+        return RedisCircuitBreaker(name, self._config, client=self._get_redis())
+
+    def _get_redis(self) -> Any:
+        """Get Redis client (shared per redis_url)."""
+        if self._redis_client is None:
+            if not self._config.redis_url:
+                raise ValueError("redis circuit breaker backend requires redis_url")
+            self._redis_client = _shared_redis(self._config.redis_url)
+        return self._redis_client
+
 
 def with_circuit_breaker(name: str, registry: CircuitBreakerRegistry):
     """Circuit breaker decorator."""
@@ -130,15 +387,23 @@ def with_circuit_breaker(name: str, registry: CircuitBreakerRegistry):
             if not await cb.allow_request():
                 raise CircuitBreakerError(name)
 
+            started = time.monotonic()
+            settled = False
             try:
                 result = await func(*args, **kwargs)
-                await cb.record_success()
+                await cb.record_success(time.monotonic() - started)
+                settled = True
                 return result
             except CircuitBreakerError:
                 raise
             except Exception:
                 await cb.record_failure()
+                settled = True
                 raise
+            finally:
+                # Cancelled calls do not count, but must not hold the probe lease.
+                if not settled:
+                    await cb.release_probe()
 
         return wrapper
 
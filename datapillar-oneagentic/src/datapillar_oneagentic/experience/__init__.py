@@ -54,6 +54,7 @@ ExperienceRecord:
 ```
 """
 
+from datapillar_oneagentic.experience.cache import ExperienceCache
 from datapillar_oneagentic.experience.learner import (
     ExperienceLearner,
     ExperienceRecord,
@@ -69,4 +70,6 @@ __all__ = [
     "ExperienceLearner",
     # Retriever
     "ExperienceRetriever",
+    # Cache
+    "ExperienceCache",
 ]
@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+# @author Sunny
+# @date 2026-01-27
+"""
+Experience cache.
+
+Responsibilities:
+1. Memoize goal embeddings (identical goal = no embedding call)
+2. Cache top-k search results, invalidated when an experience is saved
+3. Maintain tool / agent co-occurrence counters incrementally, seeded from the store
+
+Design principles:
+- One cache per namespace (team isolation)
+- In-memory only, bounded LRU with optional TTL
+- Version counter: every save bumps the version and drops cached results
+- Counters are updated per record id, so re-saving a record replaces its contribution
+- Counters are seeded once from the store (newest max_records successful experiences)
+  and cover at most max_records records; the oldest contribution is evicted first
+
+Example:
+```python
+from datapillar_oneagentic.experience import (
+    ExperienceCache,
+    ExperienceLearner,
+    ExperienceRetriever,
+)
+
+cache = ExperienceCache(namespace="my_team")
+learner = ExperienceLearner(store=store, namespace="my_team", embedding_provider=ep, cache=cache)
+retriever = ExperienceRetriever(store=store, embedding_provider=ep, cache=cache)
+```
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from datapillar_oneagentic.experience.learner import ExperienceRecord
+    from datapillar_oneagentic.storage.learning_stores.base import ExperienceStore
+
+logger = logging.getLogger(__name__)
+
+_SUCCESS_OUTCOME = "success"
+
+
+@dataclass(frozen=True, slots=True)
+class _Contribution:
+    """Counter contribution of a single record."""
+
+    tools: tuple[str, ...]
+    agents: tuple[str, ...]
+
+
+class _LRU:
+    """Bounded LRU map with optional TTL."""
+
+    def __init__(self, max_size: int, ttl_seconds: float | None) -> None:
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._data: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Any) -> Any | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        stored_at, value = item
+        if self._ttl_seconds is not None and time.monotonic() - stored_at > self._ttl_seconds:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key: Any, value: Any) -> None:
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._max_size:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class ExperienceCache:
+    """
+    Per-namespace experience cache.
+
+    Shared by ExperienceLearner (writes) and ExperienceRetriever (reads).
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        *,
+        max_embeddings: int = 256,
+        max_results: int = 256,
+        ttl_seconds: float | None = 300.0,
+        max_records: int = 10_000,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            namespace: namespace the cache belongs to
+            max_embeddings: max memoized goal embeddings
+            max_results: max cached search results
+            ttl_seconds: result TTL (None = no expiry); bounds staleness across processes
+            max_records: max successful experiences folded into the tool counters
+        """
+        self._namespace = namespace
+        self._embeddings = _LRU(max_embeddings, None)
+        self._results = _LRU(max_results, ttl_seconds)
+        self._version = 0
+
+        self._max_records = max_records
+        self._contributions: OrderedDict[str, _Contribution] = OrderedDict()
+        self._tool_counts: Counter[str] = Counter()
+        self._agent_tool_counts: dict[str, Counter[str]] = {}
+        self._seeded = False
+        self._seed_lock = asyncio.Lock()
+
+        self._embedding_hits = 0
+        self._embedding_misses = 0
+        self._result_hits = 0
+        self._result_misses = 0
+
+    @property
+    def namespace(self) -> str:
+        """Namespace."""
+        return self._namespace
+
+    @property
+    def version(self) -> int:
+        """Version counter, bumped on every invalidation."""
+        return self._version
+
+    # ==================== Embedding memo ====================
+
+    def get_embedding(self, text: str) -> list[float] | None:
+        """Get a memoized embedding."""
+        vector = self._embeddings.get(text)
+        if vector is None:
+            self._embedding_misses += 1
+            return None
+        self._embedding_hits += 1
+        return list(vector)
+
+    def put_embedding(self, text: str, vector: list[float]) -> None:
+        """Memoize an embedding."""
+        self._embeddings.put(text, tuple(vector))
+
+    # ==================== Search results ====================
+
+    def get_results(
+        self,
+        goal: str,
+        k: int,
+        outcome: str | None,
+    ) -> list[ExperienceRecord] | None:
+        """Get cached search results (a fresh list, records are shared)."""
+        records = self._results.get((goal, k, outcome))
+        if records is None:
+            self._result_misses += 1
+            return None
+        self._result_hits += 1
+        return list(records)
+
+    def put_results(
+        self,
+        goal: str,
+        k: int,
+        outcome: str | None,
+        records: list[ExperienceRecord],
+    ) -> None:
+        """Cache search results and fold them into the counters."""
+        self._results.put((goal, k, outcome), tuple(records))
+        for record in records:
+            self.observe(record)
+
+    def invalidate(self) -> None:
+        """Drop cached search results (embeddings stay valid)."""
+        self._version += 1
+        self._results.clear()
+
+    # ==================== Counters ====================
+
+    def record_saved(self, record: ExperienceRecord) -> None:
+        """Framework internal: called after an experience is persisted."""
+        self.invalidate()
+        self.observe(record)
+
+    def observe(self, record: ExperienceRecord) -> None:
+        """
+        Fold a record into the tool/agent counters.
+
+        Only successful experiences are counted. A record already observed
+        replaces its previous contribution, so counts stay exact per record id.
+        """
+        previous = self._contributions.pop(record.id, None)
+        if previous is not None:
+            self._apply(previous, -1)
+        if record.outcome != _SUCCESS_OUTCOME:
+            return
+        contribution = _Contribution(
+            tools=tuple(dict.fromkeys(record.tools_used)),
+            agents=tuple(dict.fromkeys(record.agents_involved)),
+        )
+        self._contributions[record.id] = contribution
+        self._apply(contribution, 1)
+        while len(self._contributions) > self._max_records:
+            _, evicted = self._contributions.popitem(last=False)
+            self._apply(evicted, -1)
+
+    async def ensure_seeded(self, store: ExperienceStore) -> None:
+        """
+        Seed the counters from the store once (first use after a restart).
+
+        Records already observed in this process are newer than the store copy
+        and are kept.
+        """
+        if self._seeded:
+            return
+        async with self._seed_lock:
+            if self._seeded:
+                return
+            try:
+                records = await store.list_records(
+                    outcome=_SUCCESS_OUTCOME, limit=self._max_records
+                )
+            except (AttributeError, NotImplementedError):
+                records = []
+            except Exception as e:
+                logger.warning(f"Seeding experience counters failed: {e}")
+                return
+            # Oldest first, so the LRU evicts in age order.
+            for record in reversed(records):
+                if record.id not in self._contributions:
+                    self.observe(record)
+            self._seeded = True
+
+    def top_tools(self, limit: int | None = None) -> list[str]:
+        """Most used tools across observed successful experiences."""
+        return [tool for tool, _ in self._tool_counts.most_common(limit)]
+
+    def top_tools_for_agent(self, agent_id: str, limit: int | None = None) -> list[str]:
+        """Tools most often used in successful experiences involving an agent."""
+        counts = self._agent_tool_counts.get(agent_id)
+        if not counts:
+            return []
+        return [tool for tool, _ in counts.most_common(limit)]
+
+    def _apply(self, contribution: _Contribution, delta: int) -> None:
+        for tool in contribution.tools:
+            self._tool_counts[tool] += delta
+            if self._tool_counts[tool] <= 0:
+                del self._tool_counts[tool]
+        for agent_id in contribution.agents:
+            counts = self._agent_tool_counts.setdefault(agent_id, Counter())
+            for tool in contribution.tools:
+                counts[tool] += delta
+                if counts[tool] <= 0:
+                    del counts[tool]
+            if not counts:
+                del self._agent_tool_counts[agent_id]
+
+    # ==================== Stats ====================
+
+    def stats(self) -> dict[str, Any]:
+        """Get stats."""
+        return {
+            "namespace": self._namespace,
+            "version": self._version,
+            "embeddings": len(self._embeddings),
+            "results": len(self._results),
+            "embedding_hits": self._embedding_hits,
+            "embedding_misses": self._embedding_misses,
+            "result_hits": self._result_hits,
+            "result_misses": self._result_misses,
+            "observed_records": len(self._contributions),
+            "counters_seeded": self._seeded,
+        }
@@ -35,3 +35,20 @@ class LearningConfig(BaseModel):
         ge=1,
         description="Default number of retrieved experiences",
     )
+
+    cache_enabled: bool = Field(
+        default=True,
+        description="Cache goal embeddings, search results and tool statistics in memory",
+    )
+
+    cache_size: int = Field(
+        default=256,
+        ge=1,
+        description="Max cached embeddings / search results per namespace",
+    )
+
+    cache_ttl_seconds: float | None = Field(
+        default=300.0,
+        gt=0,
+        description="Search result TTL in seconds (None = until next save)",
+    )
@@ -45,6 +45,7 @@ from typing import TYPE_CHECKING, Any
 from datapillar_oneagentic.utils.time import now_ms
 
 if TYPE_CHECKING:
+    from datapillar_oneagentic.experience.cache import ExperienceCache
     from datapillar_oneagentic.storage.learning_stores.base import ExperienceStore
     from datapillar_oneagentic.providers.llm.embedding import EmbeddingProvider
 
@@ -202,6 +203,7 @@ class ExperienceLearner:
         store: ExperienceStore,
         namespace: str,
         embedding_provider: "EmbeddingProvider",
+        cache: "ExperienceCache | None" = None,
     ):
         """
         Initialize the learner.
@@ -210,10 +212,12 @@ class ExperienceLearner:
             store: experience store (ExperienceStore interface)
             namespace: namespace for isolating team experiences
             embedding_provider: embedding provider for vectorization
+            cache: experience cache to invalidate on save (optional)
         """
         self._store = store
         self._namespace = namespace
         self._embedding_provider = embedding_provider
+        self._cache = cache
         self._pending: dict[str, ExperienceRecord] = {}  # Temporary records.
 
     # ==================== Framework internal ====================
@@ -304,6 +308,8 @@ class ExperienceLearner:
 
         # Persist the ExperienceRecord.
         await self._store.add(record)
+        if self._cache is not None:
+            self._cache.record_saved(record)
         logger.info(f"Experience saved: {session_id}")
         return True
 
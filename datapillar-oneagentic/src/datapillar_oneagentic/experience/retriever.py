@@ -30,6 +30,7 @@ from typing import TYPE_CHECKING
 from datapillar_oneagentic.utils.prompt_format import format_markdown
 
 if TYPE_CHECKING:
+    from datapillar_oneagentic.experience.cache import ExperienceCache
     from datapillar_oneagentic.experience.learner import ExperienceRecord
     from datapillar_oneagentic.storage.learning_stores.base import ExperienceStore
     from datapillar_oneagentic.providers.llm.embedding import EmbeddingProvider
@@ -46,16 +47,28 @@ class ExperienceRetriever:
     2. Assemble context that can be injected into prompts
     """
 
-    def __init__(self, store: ExperienceStore, embedding_provider: "EmbeddingProvider"):
+    def __init__(
+        self,
+        store: ExperienceStore,
+        embedding_provider: "EmbeddingProvider",
+        cache: "ExperienceCache | None" = None,
+    ):
         """
         Initialize the retriever.
 
         Args:
             store: experience store (ExperienceStore interface)
             embedding_provider: embedding provider for vectorization
+            cache: experience cache shared with the learner (optional)
         """
         self._store = store
         self._embedding_provider = embedding_provider
+        self._cache = cache
+
+    @property
+    def cache_version(self) -> int | None:
+        """Experience cache version (None without a cache); changes when experiences are saved."""
+        return self._cache.version if self._cache is not None else None
 
     async def search(
         self,
@@ -74,15 +87,29 @@ class ExperienceRetriever:
         Returns:
             A list of experience records.
         """
-        # Embed the query text.
-        try:
-            query_vector = await self._embedding_provider.embed_text(goal)
-        except Exception as e:
-            logger.warning(f"Query embedding failed: {e}")
-            return []
+        cache = self._cache
+        if cache is not None:
+            cached = cache.get_results(goal, k, outcome)
+            if cached is not None:
+                return cached
+
+        # Embed the query text (memoized per goal when cached).
+        query_vector = cache.get_embedding(goal) if cache is not None else None
+        if query_vector is None:
+            try:
+                query_vector = await self._embedding_provider.embed_text(goal)
+            except Exception as e:
+                logger.warning(f"Query embedding failed: {e}")
+                return []
+            if cache is not None:
+                cache.put_embedding(goal, query_vector)
 
         # Call store.search directly and return ExperienceRecord list.
-        return await self._store.search(query_vector, k=k, outcome=outcome)
+        records = await self._store.search(query_vector, k=k, outcome=outcome)
+        if cache is not None:
+            cache.put_results(goal, k, outcome, records)
+            return list(records)
+        return records
 
     async def build_context(
         self,
@@ -138,6 +165,11 @@ class ExperienceRetriever:
         """
         Get commonly used tools.
 
+        Unlike get_top_tools this is goal-specific: it ranks the tools of the
+        experiences most similar to `goal`, which the global counters cannot answer.
+        With a cache the search result and goal embedding are cached, so a repeated
+        goal costs no embedding call or vector search.
+
         Args:
             goal: task goal
             k: number of experiences to inspect
@@ -154,3 +186,24 @@ class ExperienceRetriever:
 
         sorted_tools = sorted(tool_counts.keys(), key=lambda t: tool_counts[t], reverse=True)
         return sorted_tools
+
+    async def get_top_tools(self, *, agent_id: str | None = None, limit: int = 10) -> list[str]:
+        """
+        Get the most used tools from pre-computed statistics.
+
+        Counters are seeded from the store on first use and then kept up to date
+        by saves through the shared cache; no embedding or vector search is performed.
+
+        Args:
+            agent_id: restrict to experiences involving this agent (optional)
+            limit: number of tools to return
+
+        Returns:
+            A list of tools, sorted by usage frequency; empty without a cache.
+        """
+        if self._cache is None:
+            return []
+        await self._cache.ensure_seeded(self._store)
+        if agent_id:
+            return self._cache.top_tools_for_agent(agent_id, limit)
+        return self._cache.top_tools(limit)
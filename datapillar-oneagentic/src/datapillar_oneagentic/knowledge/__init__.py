@@ -17,6 +17,7 @@ __all__ = [
     "SourceSpan",
     "KnowledgeDocument",
     "KnowledgeChunk",
+    "KnowledgeChunkPage",
     "KnowledgeSearchHit",
     "KnowledgeRef",
     "KnowledgeRetrieveResult",
@@ -77,6 +78,7 @@ _EXPORTS: dict[str, str] = {
     "Attachment": "datapillar_oneagentic.knowledge.models",
     "Knowledge": "datapillar_oneagentic.knowledge.models",
     "KnowledgeChunk": "datapillar_oneagentic.knowledge.models",
+    "KnowledgeChunkPage": "datapillar_oneagentic.knowledge.models",
     "KnowledgeDocument": "datapillar_oneagentic.knowledge.models",
     "KnowledgeSearchHit": "datapillar_oneagentic.knowledge.models",
     "KnowledgeRef": "datapillar_oneagentic.knowledge.models",
@@ -213,6 +213,14 @@ class KnowledgeChunk:
     updated_at: int | None = None
 
 
+@dataclass
+class KnowledgeChunkPage:
+    """One keyset page of chunks; pass next_cursor back to fetch the following page."""
+
+    items: list[KnowledgeChunk] = field(default_factory=list)
+    next_cursor: str | None = None
+
+
 @dataclass
 class KnowledgeSearchHit:
     """Knowledge retrieval hit (with score)."""
@@ -19,6 +19,7 @@ from datapillar_oneagentic.knowledge.ingest.pipeline import KnowledgeIngestor
 from datapillar_oneagentic.knowledge.models import (
     Knowledge,
     KnowledgeChunk,
+    KnowledgeChunkPage,
     KnowledgeRef,
     KnowledgeSearchHit,
     KnowledgeRetrieve,
@@ -232,6 +233,48 @@ class KnowledgeService:
             ordered = []
         return ordered
 
+    async def list_chunk_page(
+        self,
+        *,
+        filters: dict[str, Any] | None = None,
+        keyword: str | None = None,
+        cursor: str | None = None,
+        limit: int = 50,
+        namespace: str,
+    ) -> KnowledgeChunkPage:
+        """
+        List chunks one keyset page at a time (ordered by chunk_id).
+
+        Paging and keyword matching are pushed down to the store, so the cost of a
+        page does not grow with the number of chunks that match.
+        """
+        if limit <= 0:
+            raise ValueError("limit must be > 0")
+
+        await self.initialize()
+        runtime = await self._get_runtime(namespace)
+
+        chunks = await runtime.store.query_chunk_page(
+            filters=filters,
+            after=cursor,
+            limit=limit + 1,
+            keyword=keyword,
+        )
+        items = chunks[:limit]
+        next_cursor = items[-1].chunk_id if len(chunks) > limit else None
+        return KnowledgeChunkPage(items=items, next_cursor=next_cursor)
+
+    async def count_chunks(
+        self,
+        *,
+        filters: dict[str, Any] | None = None,
+        keyword: str | None = None,
+        namespace: str,
+    ) -> int:
+        await self.initialize()
+        runtime = await self._get_runtime(namespace)
+        return await runtime.store.count_chunks(filters=filters, keyword=keyword)
+
     async def upsert_chunks(
         self,
         *,
@@ -16,7 +16,7 @@ Features:
 - Team-level LLMProvider / EmbeddingProvider
 - Built-in resilience (timeout + retry + circuit breaker)
 - Optional cache
-- Token usage tracking
+- Token usage tracking and batched usage ledger
 
 Example:
 ```python
@@ -58,6 +58,12 @@ from datapillar_oneagentic.providers.llm.llm_cache import (
     RedisLLMCache,
     create_llm_cache,
 )
+from datapillar_oneagentic.providers.llm.usage_ledger import (
+    UsageEntry,
+    UsageLedger,
+    UsageSink,
+    UsageTotals,
+)
 from datapillar_oneagentic.providers.llm.usage_tracker import (
     TokenUsage,
     extract_usage,
@@ -78,6 +84,10 @@ __all__ = [
     # Usage tracking
     "TokenUsage",
     "extract_usage",
+    "UsageLedger",
+    "UsageSink",
+    "UsageEntry",
+    "UsageTotals",
     # Cache
     "create_llm_cache",
     "InMemoryLLMCache",
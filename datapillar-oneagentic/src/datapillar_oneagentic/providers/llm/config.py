@@ -79,7 +79,13 @@ class RetryConfig(BaseModel):
 
 
 class CircuitBreakerConfig(BaseModel):
-    """Circuit breaker configuration."""
+    """
+    Circuit breaker configuration.
+
+    Supported backends:
+    - memory: per-process state (default)
+    - redis: state shared across processes, one HALF_OPEN probe cluster-wide
+    """
 
     failure_threshold: int = Field(
         default=5,
@@ -91,6 +97,68 @@ class CircuitBreakerConfig(BaseModel):
         gt=0,
         description="Recovery time in seconds",
     )
+    slow_call_seconds: float | None = Field(
+        default=None,
+        gt=0,
+        description="Calls slower than this count as failures (None = disabled)",
+    )
+    probe_timeout_seconds: float = Field(
+        default=30.0,
+        gt=0,
+        description="HALF_OPEN probe lease; another probe is allowed after it expires",
+    )
+    backend: str = Field(
+        default="memory",
+        description="State backend: memory or redis",
+    )
+
+    # Redis-specific configuration
+    redis_url: str | None = Field(default=None, description="Redis URL (required for redis backend)")
+    key_prefix: str = Field(default="circuit_breaker:", description="Redis key prefix")
+
+    @field_validator("backend")
+    @classmethod
+    def validate_backend(cls, v: str) -> str:
+        """Validate state backend."""
+        supported = ("memory", "redis")
+        if v.lower() not in supported:
+            raise ValueError(
+                f"Unsupported circuit breaker backend: '{v}'. Supported: {', '.join(supported)}"
+            )
+        return v.lower()
+
+
+class ModelPricing(BaseModel):
+    """Model price per 1M tokens (any currency, used as-is)."""
+
+    input: float = Field(default=0.0, ge=0, description="Input price per 1M tokens")
+    output: float = Field(default=0.0, ge=0, description="Output price per 1M tokens")
+    cached_input: float | None = Field(
+        default=None,
+        ge=0,
+        description="Cached input price per 1M tokens (None = same as input)",
+    )
+
+
+class UsageLedgerConfig(BaseModel):
+    """
+    Token usage ledger configuration.
+
+    Usage is aggregated in memory and flushed to the sink in batches,
+    whichever limit is reached first.
+    """
+
+    flush_interval_ms: int = Field(default=5000, gt=0, description="Max time between flushes")
+    max_batch_calls: int = Field(default=200, gt=0, description="Flush after this many calls")
+    max_sessions: int = Field(
+        default=10000,
+        gt=0,
+        description="Max sessions kept for live totals (least recently used evicted)",
+    )
+    pricing: dict[str, ModelPricing] = Field(
+        default_factory=dict,
+        description="Per-model pricing for cost accounting (keyed by model name)",
+    )
 
 
 class CacheBackend(str, Enum):
@@ -142,6 +210,7 @@ class LLMConfig(BaseModel):
     - Resilience (retry, circuit_breaker)
     - Rate limiting (rate_limit)
     - Cache (cache)
+    - Usage accounting (usage)
     """
 
     # Base configuration
@@ -183,6 +252,11 @@ class LLMConfig(BaseModel):
         default_factory=LLMCacheConfig, description="LLM response cache configuration"
     )
 
+    # Usage accounting
+    usage: UsageLedgerConfig = Field(
+        default_factory=UsageLedgerConfig, description="Token usage ledger configuration"
+    )
+
     @field_validator("provider")
     @classmethod
     def validate_provider(cls, v: str) -> str:
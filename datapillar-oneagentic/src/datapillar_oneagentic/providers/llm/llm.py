@@ -280,9 +280,16 @@ class ResilientChatModel:
                     ),
                 )
 
+            # A request admitted by the breaker (maybe the HALF_OPEN probe) is always settled:
+            # by its recorded outcome, or by releasing the probe for outcomes that do not count
+            # (non-retryable errors, cancellation).
+            admitted = False
+            settled = False
             try:
-                if self._circuit_breaker and not await self._circuit_breaker.allow_request():
-                    raise CircuitBreakerError("llm")
+                if self._circuit_breaker:
+                    if not await self._circuit_breaker.allow_request():
+                        raise CircuitBreakerError(self._circuit_breaker.name)
+                    admitted = True
 
                 result = await asyncio.wait_for(
                     self._llm.ainvoke(langchain_input, config, **kwargs),
@@ -292,7 +299,8 @@ class ResilientChatModel:
                 # {"raw": LangChain message, "parsed": ..., "parsing_error": ...}
                 # Parsing failures are logged by the parser only on final failure.
                 if self._circuit_breaker:
-                    await self._circuit_breaker.record_success()
+                    await self._circuit_breaker.record_success(time.time() - start_time)
+                    settled = True
                 normalized = _normalize_llm_result(result)
                 asyncio.create_task(self._track_usage_async(normalized, start_time=start_time))
                 return normalized
@@ -315,9 +323,14 @@ class ResilientChatModel:
 
                 if self._circuit_breaker:
                     await self._circuit_breaker.record_failure()
+                    settled = True
                 if attempt >= retries:
                     raise mapped_error from None
 
+            finally:
+                if admitted and not settled:
+                    await self._circuit_breaker.release_probe()
+
             delay = calculate_retry_delay(self._retry_config, attempt)
             logger.warning(
                 f"[Retry] Attempt {attempt + 1}/{retries} failed; "
@@ -343,6 +356,7 @@ class ResilientChatModel:
             input_tokens = usage.input_tokens if usage else 0
             output_tokens = usage.output_tokens if usage else 0
             cached_tokens = 0
+            reasoning_tokens = usage.reasoning_tokens if usage else 0
             if usage:
                 cached_tokens = usage.cached_tokens or 0
                 if cached_tokens == 0:
@@ -366,6 +380,7 @@ class ResilientChatModel:
                     input_tokens=input_tokens,
                     output_tokens=output_tokens,
                     cached_tokens=cached_tokens,
+                    reasoning_tokens=reasoning_tokens,
                     duration_ms=duration_ms,
                 ),
             )
@@ -569,6 +584,14 @@ class LLMFactory:
 # ==================== Provider ====================
 
 
+def _endpoint_name(config: LLMProviderConfig) -> str:
+    """Circuit breaker name per endpoint (provider + model + base_url)."""
+    name = f"llm:{config.provider}:{config.model_name}"
+    if config.base_url:
+        name = f"{name}@{config.base_url}"
+    return name
+
+
 class LLMProvider:
     """LLM provider (team-scoped)."""
 
@@ -672,7 +695,7 @@ class LLMProvider:
                 model_name=provider_config.model_name,
                 event_bus=self._event_bus,
                 rate_limit_manager=self._rate_limit_manager,
-                circuit_breaker=self._circuit_breakers.get("llm"),
+                circuit_breaker=self._circuit_breakers.get(_endpoint_name(provider_config)),
                 timeout_seconds=self._config.timeout_seconds,
                 retry_config=self._config.retry,
                 vendor_cache=vendor_policy,
@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+# @author Sunny
+# @date 2026-01-27
+"""
+LLM token usage ledger.
+
+Goals:
+- Aggregate tokens and cost per session, agent and model in memory
+- Persist through a pluggable sink in time- or size-bounded batches
+- Expose live per-session totals without any storage round-trip
+
+Design principles:
+- record() is O(1) and never awaits I/O (safe on the LLM call path)
+- Batches are keyed by (namespace, session_id, agent_id, model); repeated calls
+  in the same batch collapse into one entry
+- A failed sink write is merged back and retried with the next batch
+
+Example:
+```python
+from datapillar_oneagentic.providers.llm import UsageLedger, UsageSink
+
+class MySink(UsageSink):
+    async def write(self, entries):
+        await repo.bulk_upsert([entry.to_dict() for entry in entries])
+
+ledger = UsageLedger(config.llm.usage, sink=MySink())
+ledger.attach(event_bus)
+
+totals = ledger.session_totals(key)
+await ledger.aclose()  # Flush on shutdown
+```
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any
+
+from datapillar_oneagentic.core.types import SessionKey
+from datapillar_oneagentic.events import LLMCallCompletedEvent
+
+if TYPE_CHECKING:
+    from datapillar_oneagentic.events import EventBus
+    from datapillar_oneagentic.providers.llm.config import ModelPricing, UsageLedgerConfig
+
+logger = logging.getLogger(__name__)
+
+_TOKENS_PER_PRICE_UNIT = 1_000_000
+
+
+@dataclass(slots=True)
+class UsageTotals:
+    """Aggregated token usage."""
+
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    reasoning_tokens: int = 0
+    cost: float = 0.0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    @property
+    def cache_hit_rate(self) -> float:
+        """Share of input tokens served from the provider prompt cache."""
+        return self.cached_tokens / self.input_tokens if self.input_tokens else 0.0
+
+    def add(self, other: UsageTotals) -> None:
+        self.calls += other.calls
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.cached_tokens += other.cached_tokens
+        self.reasoning_tokens += other.reasoning_tokens
+        self.cost += other.cost
+
+    def copy(self) -> UsageTotals:
+        return UsageTotals(
+            calls=self.calls,
+            input_tokens=self.input_tokens,
+            output_tokens=self.output_tokens,
+            cached_tokens=self.cached_tokens,
+            reasoning_tokens=self.reasoning_tokens,
+            cost=self.cost,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["total_tokens"] = self.total_tokens
+        data["cache_hit_rate"] = round(self.cache_hit_rate, 4)
+        return data
+
+
+@dataclass(frozen=True, slots=True)
+class UsageEntry:
+    """One aggregated batch row: usage of an agent/model within a session."""
+
+    namespace: str
+    session_id: str
+    agent_id: str
+    model: str
+    totals: UsageTotals
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "namespace": self.namespace,
+            "session_id": self.session_id,
+            "agent_id": self.agent_id,
+            "model": self.model,
+            **self.totals.to_dict(),
+        }
+
+
+class UsageSink(ABC):
+    """Usage persistence interface."""
+
+    @abstractmethod
+    async def write(self, entries: list[UsageEntry]) -> None:
+        """
+        Persist a batch of aggregated entries.
+
+        Raise to signal failure; the batch is merged back and retried.
+        """
+        pass
+
+
+class UsageLedger:
+    """
+    In-memory usage ledger (team-scoped).
+
+    Tracks live per-session totals and flushes per-(session, agent, model)
+    deltas to the sink every flush_interval_ms or max_batch_calls calls.
+    """
+
+    def __init__(
+        self,
+        config: UsageLedgerConfig | None = None,
+        *,
+        sink: UsageSink | None = None,
+    ) -> None:
+        from datapillar_oneagentic.providers.llm.config import UsageLedgerConfig
+
+        self._config = config or UsageLedgerConfig()
+        self._sink = sink
+        self._sessions: OrderedDict[SessionKey, UsageTotals] = OrderedDict()
+        self._pending: dict[tuple[str, str, str, str], UsageTotals] = {}
+        self._pending_calls = 0
+        self._flusher: asyncio.Task | None = None
+        self._size_flush: asyncio.Task | None = None
+        self._flush_lock = asyncio.Lock()
+        self._closed = False
+
+    # ==================== Recording ====================
+
+    def attach(self, event_bus: EventBus) -> None:
+        """Record every LLMCallCompletedEvent emitted on the bus."""
+        event_bus.register(LLMCallCompletedEvent, self._on_llm_completed)
+
+    def detach(self, event_bus: EventBus) -> None:
+        event_bus.unregister(LLMCallCompletedEvent, self._on_llm_completed)
+
+    async def _on_llm_completed(self, _source: Any, event: LLMCallCompletedEvent) -> None:
+        if event.key is None:
+            return
+        self.record(
+            key=event.key,
+            agent_id=event.agent_id,
+            model=event.model,
+            input_tokens=event.input_tokens,
+            output_tokens=event.output_tokens,
+            cached_tokens=event.cached_tokens,
+            reasoning_tokens=event.reasoning_tokens,
+        )
+
+    def record(
+        self,
+        *,
+        key: SessionKey,
+        agent_id: str,
+        model: str,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        cached_tokens: int = 0,
+        reasoning_tokens: int = 0,
+    ) -> UsageTotals:
+        """Record one LLM call; returns the live session totals."""
+        delta = UsageTotals(
+            calls=1,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cached_tokens=cached_tokens,
+            reasoning_tokens=reasoning_tokens,
+        )
+        delta.cost = self._compute_cost(model, delta)
+
+        session = self._sessions.get(key)
+        if session is None:
+            session = UsageTotals()
+            self._sessions[key] = session
+            while len(self._sessions) > self._config.max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(key)
+        session.add(delta)
+
+        if self._sink is not None and not self._closed:
+            pending_key = (key.namespace, key.session_id, agent_id, model)
+            pending = self._pending.get(pending_key)
+            if pending is None:
+                self._pending[pending_key] = delta
+            else:
+                pending.add(delta)
+            self._pending_calls += 1
+            self._schedule_flush()
+        return session
+
+    def session_totals(self, key: SessionKey) -> UsageTotals:
+        """Live totals for a session (copy)."""
+        session = self._sessions.get(key)
+        return session.copy() if session is not None else UsageTotals()
+
+    def forget_session(self, key: SessionKey) -> None:
+        """Drop live totals for a session (pending deltas are still flushed)."""
+        self._sessions.pop(key, None)
+
+    def _compute_cost(self, model: str, delta: UsageTotals) -> float:
+        pricing: ModelPricing | None = self._config.pricing.get(model)
+        if pricing is None:
+            return 0.0
+        cached = min(delta.cached_tokens, delta.input_tokens)
+        uncached = delta.input_tokens - cached
+        cached_price = (
+            pricing.cached_input if pricing.cached_input is not None else pricing.input
+        )
+        return (
+            uncached * pricing.input + cached * cached_price + delta.output_tokens * pricing.output
+        ) / _TOKENS_PER_PRICE_UNIT
+
+    # ==================== Flushing ====================
+
+    @property
+    def pending_calls(self) -> int:
+        """Calls recorded but not yet flushed."""
+        return self._pending_calls
+
+    def _schedule_flush(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._pending_calls >= self._config.max_batch_calls and (
+            self._size_flush is None or self._size_flush.done()
+        ):
+            self._size_flush = loop.create_task(self.flush())
+        if self._flusher is None or self._flusher.done():
+            self._flusher = loop.create_task(self._flush_periodically())
+
+    async def _flush_periodically(self) -> None:
+        interval = self._config.flush_interval_ms / 1000
+        while not self._closed:
+            await asyncio.sleep(interval)
+            if not self._pending:
+                return
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Write pending entries to the sink; returns the number of entries written."""
+        if self._sink is None:
+            return 0
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch = self._pending
+            calls = self._pending_calls
+            self._pending = {}
+            self._pending_calls = 0
+            entries = [
+                UsageEntry(
+                    namespace=namespace,
+                    session_id=session_id,
+                    agent_id=agent_id,
+                    model=model,
+                    totals=totals,
+                )
+                for (namespace, session_id, agent_id, model), totals in batch.items()
+            ]
+            try:
+                await self._sink.write(entries)
+            except Exception as exc:
+                logger.warning(f"Usage flush failed; {len(entries)} entries kept for retry: {exc}")
+                for pending_key, totals in batch.items():
+                    existing = self._pending.get(pending_key)
+                    if existing is None:
+                        self._pending[pending_key] = totals
+                    else:
+                        existing.add(totals)
+                self._pending_calls += calls
+                return 0
+            return len(entries)
+
+    async def aclose(self) -> None:
+        """Stop the periodic flusher and flush what is pending."""
+        self._closed = True
+        if self._flusher is not None and not self._flusher.done():
+            self._flusher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flusher
+        self._flusher = None
+        if self._size_flush is not None and not self._size_flush.done():
+            await self._size_flush
+        await self.flush()
@@ -80,6 +80,7 @@ class Orchestrator:
         experience_retriever=None,
         process: Process = Process.SEQUENTIAL,
         event_bus: EventBus,
+        usage_ledger=None,
     ):
         """
         Create an orchestrator.
@@ -96,6 +97,7 @@ class Orchestrator:
             experience_retriever: ExperienceRetriever instance (optional)
             process: execution mode
             event_bus: EventBus instance
+            usage_ledger: UsageLedger instance (optional)
         """
         self.namespace = namespace
         self.name = name
@@ -113,6 +115,7 @@ class Orchestrator:
         self._experience_learner = experience_learner
         self._experience_retriever = experience_retriever
         self._event_bus = event_bus
+        self._usage_ledger = usage_ledger
 
         # Compile graph lazily.
         self._compiled_graph = None
@@ -978,7 +981,7 @@ class Orchestrator:
                 }
 
             sb = StateBuilder(state)
-            return {
+            stats = {
                 "session_id": session_id,
                 "namespace": self.namespace,
                 "exists": True,
@@ -986,6 +989,9 @@ class Orchestrator:
                 "deliverables_count": len(sb.deliverables.snapshot().keys),
                 "active_agent": sb.routing.snapshot().active_agent,
             }
+            if self._usage_ledger is not None:
+                stats["usage"] = self._usage_ledger.session_totals(key).to_dict()
+            return stats
 
         except Exception as e:
             logger.error(f"Failed to fetch session metrics: {e}")
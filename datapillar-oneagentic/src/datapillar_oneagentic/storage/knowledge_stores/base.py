@@ -113,6 +113,40 @@ class KnowledgeStore(ABC):
     ) -> list[KnowledgeChunk]:
         """Query chunks by filters."""
 
+    async def query_chunk_page(
+        self,
+        *,
+        filters: dict[str, Any] | None = None,
+        after: str | None = None,
+        limit: int,
+        keyword: str | None = None,
+    ) -> list[KnowledgeChunk]:
+        """
+        Keyset page of chunks ordered by chunk_id, starting after `after`.
+
+        The default implementation pages in memory over query_chunks; stores override
+        it to push paging and keyword matching down to the backend.
+        """
+        chunks = await self.query_chunks(filters=filters, limit=None)
+        if keyword:
+            chunks = [chunk for chunk in chunks if keyword in (chunk.content or "")]
+        chunks.sort(key=lambda chunk: chunk.chunk_id)
+        if after is not None:
+            chunks = [chunk for chunk in chunks if chunk.chunk_id > after]
+        return chunks[:limit]
+
+    async def count_chunks(
+        self,
+        *,
+        filters: dict[str, Any] | None = None,
+        keyword: str | None = None,
+    ) -> int:
+        """Count chunks matching filters and keyword."""
+        chunks = await self.query_chunks(filters=filters, limit=None)
+        if keyword:
+            chunks = [chunk for chunk in chunks if keyword in (chunk.content or "")]
+        return len(chunks)
+
     @abstractmethod
     async def delete_doc(self, doc_id: str) -> int:
         """Delete document metadata."""
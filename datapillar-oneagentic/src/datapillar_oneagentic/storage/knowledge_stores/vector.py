@@ -350,6 +350,40 @@ class VectorKnowledgeStore(KnowledgeStore):
         rows = await self._vector_store.query(_CHUNKS, filters=merged_filters, limit=limit)
         return [_row_to_chunk(row) for row in rows]
 
+    async def query_chunk_page(
+        self,
+        *,
+        filters: dict[str, Any] | None = None,
+        after: str | None = None,
+        limit: int,
+        keyword: str | None = None,
+    ) -> list[KnowledgeChunk]:
+        merged_filters = dict(filters or {})
+        merged_filters["namespace"] = self._namespace
+        # chunk_key is "<namespace>::<chunk_id>", so key order equals chunk_id order.
+        rows = await self._vector_store.query_page(
+            _CHUNKS,
+            filters=merged_filters,
+            after=self._build_key(after) if after is not None else None,
+            limit=limit,
+            keyword=keyword,
+        )
+        return [_row_to_chunk(row) for row in rows]
+
+    async def count_chunks(
+        self,
+        *,
+        filters: dict[str, Any] | None = None,
+        keyword: str | None = None,
+    ) -> int:
+        merged_filters = dict(filters or {})
+        merged_filters["namespace"] = self._namespace
+        return await self._vector_store.count_where(
+            _CHUNKS,
+            filters=merged_filters,
+            keyword=keyword,
+        )
+
     async def delete_doc(self, doc_id: str) -> int:
         key = self._build_key(doc_id)
         return await self._vector_store.delete(_DOCS, [key])
@@ -117,6 +117,26 @@ class ExperienceStore(ABC):
         """
         pass
 
+    async def list_records(
+        self,
+        outcome: str | None = None,
+        limit: int | None = None,
+    ) -> list[ExperienceRecord]:
+        """
+        List records, newest first (no vector search).
+
+        Used to seed the tool usage counters of ExperienceCache. Optional; stores
+        that cannot list records leave the counters to in-process observations.
+
+        Args:
+            outcome: Filter (success / failure / None=all)
+            limit: Max records (None = all)
+
+        Returns:
+            Experience records sorted by created_at, newest first
+        """
+        raise NotImplementedError
+
     # ==================== Stats ====================
 
     @abstractmethod
@@ -101,6 +101,19 @@ class VectorExperienceStore(ExperienceStore):
         )
         return [self._row_to_record(item.record) for item in results]
 
+    async def list_records(
+        self,
+        outcome: str | None = None,
+        limit: int | None = None,
+    ) -> list[ExperienceRecord]:
+        filters = {"namespace": self._namespace}
+        if outcome:
+            filters["outcome"] = outcome
+        rows = await self._vector_store.query(_EXPERIENCES, filters=filters)
+        records = [self._row_to_record(row) for row in rows]
+        records.sort(key=lambda record: record.created_at, reverse=True)
+        return records[:limit] if limit is not None else records
+
     async def count(self) -> int:
         rows = await self._vector_store.query(
             _EXPERIENCES,
@@ -153,6 +166,11 @@ def _loads_json(value: Any) -> list | dict:
     if isinstance(value, (list, dict)):
         return value
     if isinstance(value, str):
+        # Most rows carry empty collections; skip the decoder for them.
+        if value in ("", "[]"):
+            return []
+        if value == "{}":
+            return {}
         try:
             return json.loads(value)
         except json.JSONDecodeError:
@@ -147,3 +147,51 @@ class VectorStore(ABC):
     @abstractmethod
     async def count(self, collection: str) -> int:
         """Count records in a collection."""
+
+    async def query_page(
+        self,
+        collection: str,
+        *,
+        filters: dict[str, Any] | None = None,
+        after: str | None = None,
+        limit: int,
+        keyword: str | None = None,
+        keyword_field: str = "content",
+    ) -> list[dict[str, Any]]:
+        """
+        Keyset page ordered by primary key.
+
+        Returns up to `limit` records whose primary key sorts after `after` and whose
+        keyword_field contains `keyword`. This fallback filters in memory; stores with
+        native range and LIKE filters override it so a page never scans the collection.
+        """
+        primary_key = self.get_schema(collection).primary_key
+        rows = _match_keyword(await self.query(collection, filters=filters), keyword, keyword_field)
+        rows.sort(key=lambda row: _record_key(row, primary_key))
+        if after is not None:
+            rows = [row for row in rows if _record_key(row, primary_key) > after]
+        return rows[:limit]
+
+    async def count_where(
+        self,
+        collection: str,
+        *,
+        filters: dict[str, Any] | None = None,
+        keyword: str | None = None,
+        keyword_field: str = "content",
+    ) -> int:
+        """Count records matching filters and keyword."""
+        rows = await self.query(collection, filters=filters)
+        return len(_match_keyword(rows, keyword, keyword_field))
+
+
+def _record_key(record: dict[str, Any], primary_key: str) -> str:
+    return str(record.get(primary_key) or record.get("id") or "")
+
+
+def _match_keyword(
+    rows: list[dict[str, Any]], keyword: str | None, field: str
+) -> list[dict[str, Any]]:
+    if not keyword:
+        return list(rows)
+    return [row for row in rows if keyword in str(row.get(field) or "")]
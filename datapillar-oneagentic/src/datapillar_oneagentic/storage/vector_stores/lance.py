@@ -230,6 +230,26 @@ class LanceVectorStore(VectorStore):
         table = self._tables[collection]
         return await table.count_rows()
 
+    async def count_where(
+        self,
+        collection: str,
+        *,
+        filters: dict[str, Any] | None = None,
+        keyword: str | None = None,
+        keyword_field: str = "content",
+    ) -> int:
+        from lancedb.util import value_to_sql
+
+        schema = self.get_schema(collection)
+        await self.ensure_collection(schema)
+        table = self._tables[collection]
+
+        parts = [_build_lance_filter(filters)] if filters else []
+        if keyword:
+            escaped = keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            parts.append(f"{keyword_field} LIKE {value_to_sql(f'%{escaped}%')}")
+        return await table.count_rows(" AND ".join(parts) or None)
+
 
 def _build_lance_filter(filters: dict[str, Any]) -> str:
     from lancedb.util import value_to_sql
@@ -441,6 +441,64 @@ class MilvusVectorStore(VectorStore):
         stats = await self._client.get_collection_stats(name)
         return stats.get("row_count", 0)
 
+    async def query_page(
+        self,
+        collection: str,
+        *,
+        filters: dict[str, Any] | None = None,
+        after: str | None = None,
+        limit: int,
+        keyword: str | None = None,
+        keyword_field: str = "content",
+    ) -> list[dict[str, Any]]:
+        schema = self.get_schema(collection)
+        await self.ensure_collection(schema)
+        name = self._namespaced(collection)
+
+        # Milvus returns limited query results in primary-key order (the same
+        # contract QueryIterator relies on), so "pk > after" is a keyset page.
+        filter_expr = _build_milvus_page_filter(
+            filters,
+            primary_key=schema.primary_key,
+            after=after,
+            keyword=keyword,
+            keyword_field=keyword_field,
+        )
+        result = await self._client.query(
+            collection_name=name,
+            filter=filter_expr,
+            limit=limit,
+            output_fields=self._output_fields(schema),
+        )
+        rows = list(result or [])
+        rows.sort(key=lambda row: str(row.get(schema.primary_key) or ""))
+        return rows
+
+    async def count_where(
+        self,
+        collection: str,
+        *,
+        filters: dict[str, Any] | None = None,
+        keyword: str | None = None,
+        keyword_field: str = "content",
+    ) -> int:
+        schema = self.get_schema(collection)
+        await self.ensure_collection(schema)
+        name = self._namespaced(collection)
+
+        filter_expr = _build_milvus_page_filter(
+            filters,
+            primary_key=schema.primary_key,
+            keyword=keyword,
+            keyword_field=keyword_field,
+        )
+        result = await self._client.query(
+            collection_name=name,
+            filter=filter_expr,
+            output_fields=["count(*)"],
+        )
+        return int(result[0]["count(*)"]) if result else 0
+
     def _output_fields(self, schema: VectorCollectionSchema) -> list[str]:
         fields = [field.name for field in schema.fields]
         if schema.name in self._bm25_collections:
@@ -461,6 +519,23 @@ def _build_milvus_filter(filters: dict[str, Any]) -> str:
     return " and ".join(parts)
 
 
+def _build_milvus_page_filter(
+    filters: dict[str, Any] | None,
+    *,
+    primary_key: str,
+    after: str | None = None,
+    keyword: str | None = None,
+    keyword_field: str = "content",
+) -> str:
+    parts = [_build_milvus_filter(filters)] if filters else []
+    if after is not None:
+        parts.append(f"{primary_key} > {json.dumps(after, ensure_ascii=False)}")
+    if keyword:
+        escaped = keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        parts.append(f"{keyword_field} like {json.dumps(f'%{escaped}%', ensure_ascii=False)}")
+    return " and ".join(parts)
+
+
 def _is_collection_exists(exc: Exception) -> bool:
     message = str(exc).lower()
     return "already exists" in message or "already exist" in message or "collection exists" in message
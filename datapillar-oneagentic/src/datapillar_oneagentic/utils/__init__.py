@@ -8,12 +8,18 @@ Helper utilities.
 """
 
 from datapillar_oneagentic.utils.prompt_format import format_code_block, format_markdown
-from datapillar_oneagentic.utils.structured_output import parse_structured_output
+from datapillar_oneagentic.utils.structured_output import (
+    StreamingStructuredParser,
+    get_parse_stats,
+    parse_structured_output,
+)
 from datapillar_oneagentic.utils.time import now_ms
 
 __all__ = [
     "format_code_block",
     "format_markdown",
     "parse_structured_output",
+    "StreamingStructuredParser",
+    "get_parse_stats",
     "now_ms",
 ]
@@ -10,6 +10,11 @@ Progressive fallback strategy:
 3. Handle special formats (thinking tags, array-wrapped payloads)
 4. Pydantic validator tolerance
 
+Fast path:
+- Per-schema compiled parser (TypeAdapter, expected fields, field map) built once
+- Per-strategy hit counters (get_parse_stats) to see which fallbacks are used
+- StreamingStructuredParser validates as soon as a complete JSON object arrives
+
 Supported capability flags:
 - supports_function_calling: whether function calling is supported
 - supports_structured_output: whether structured output is supported
@@ -18,7 +23,11 @@ Supported capability flags:
 import json
 import logging
 import re
-from typing import Annotated, Any, TypeVar, get_args, get_origin
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Annotated, Any, Generic, TypeVar, get_args, get_origin
 
 import json_repair
 from pydantic import BaseModel, TypeAdapter, ValidationError
@@ -129,6 +138,73 @@ class ModelCapabilities:
         return caps.get("supports_structured_output", False)
 
 
+# ==================== Compiled schema ====================
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledSchema:
+    """Per-schema parsing artifacts, built once and reused for every response."""
+
+    schema: type[BaseModel]
+    adapter: TypeAdapter
+    expected_fields: str
+    field_map: dict[str, str]
+    string_fields: frozenset[str]
+    required_fields: tuple[str, ...]
+    single_text_field: str | None
+
+
+@lru_cache(maxsize=512)
+def compile_schema(schema: type[BaseModel]) -> CompiledSchema:
+    """Compile (and cache) the parsing artifacts of a schema."""
+    fields = schema.model_fields
+    string_fields = frozenset(
+        name for name, field in fields.items() if _is_string_annotation(field.annotation)
+    )
+    single_text_field = None
+    if len(fields) == 1:
+        only = next(iter(fields))
+        if only in string_fields:
+            single_text_field = only
+    return CompiledSchema(
+        schema=schema,
+        adapter=TypeAdapter(schema),
+        expected_fields=_build_expected_fields(schema),
+        field_map={_normalize_field_name(name): name for name in fields},
+        string_fields=string_fields,
+        required_fields=tuple(name for name, field in fields.items() if field.is_required()),
+        single_text_field=single_text_field,
+    )
+
+
+# ==================== Strategy stats ====================
+
+_stats_lock = threading.Lock()
+_strategy_hits: Counter[str] = Counter()
+
+
+def _record_strategy(name: str) -> None:
+    with _stats_lock:
+        _strategy_hits[name] += 1
+
+
+def get_parse_stats() -> dict[str, int]:
+    """
+    Get per-strategy hit counters.
+
+    Keys: model, dict, direct, repair, extract, extract_repair,
+    list_unwrap, markdown, text, stream, failed.
+    """
+    with _stats_lock:
+        return dict(_strategy_hits)
+
+
+def reset_parse_stats() -> None:
+    """Reset per-strategy hit counters."""
+    with _stats_lock:
+        _strategy_hits.clear()
+
+
 # ==================== JSON repair tools ====================
 
 
@@ -161,6 +237,11 @@ def repair_json_text(text: str) -> str:
         return text
 
 
+_THINK_RE = re.compile(r"<think>.*?</think>", flags=re.DOTALL)
+_THINKING_RE = re.compile(r"<thinking>.*?</thinking>", flags=re.DOTALL)
+_CODE_BLOCK_RE = re.compile(r"```(?:json)?\s*([\s\S]*?)\s*```")
+
+
 def extract_json(text: str) -> str:
     """
     Extract JSON from text.
@@ -174,11 +255,12 @@ def extract_json(text: str) -> str:
         return text
 
     # Strip thinking tags (e.g., Deepseek-R1 style).
-    text = re.sub(r"<think>.*?</think>", "", text, flags=re.DOTALL)
-    text = re.sub(r"<thinking>.*?</thinking>", "", text, flags=re.DOTALL)
+    if "<think" in text:
+        text = _THINK_RE.sub("", text)
+        text = _THINKING_RE.sub("", text)
 
     # Extract JSON from Markdown code blocks.
-    json_block_match = re.search(r"```(?:json)?\s*([\s\S]*?)\s*```", text)
+    json_block_match = _CODE_BLOCK_RE.search(text) if "```" in text else None
     if json_block_match:
         return json_block_match.group(1).strip()
 
@@ -239,6 +321,7 @@ def _build_expected_fields(schema: type[BaseModel]) -> str:
 
 
 def _build_error_message(schema: type[BaseModel], *, detail: str | None = None) -> str:
+    expected_fields = compile_schema(schema).expected_fields
     lines = [
         "Structured output parsing failed.",
         "Possible causes: schema fields do not match the prompt output, or the model did not emit strict JSON.",
@@ -246,7 +329,7 @@ def _build_error_message(schema: type[BaseModel], *, detail: str | None = None)
     if detail:
         lines.append(f"Error detail: {detail}")
     lines.append("Expected JSON fields:")
-    lines.append(_build_expected_fields(schema))
+    lines.append(expected_fields)
     lines.append(
         "Suggestion: ensure the SYSTEM_PROMPT explicitly requires JSON output and field names match the schema."
     )
@@ -301,6 +384,7 @@ def parse_structured_output(
         StructuredOutputInvalidException: raised on parsing failures.
     """
     if isinstance(text, schema):
+        _record_strategy("model")
         return text
 
     if isinstance(text, dict):
@@ -310,10 +394,13 @@ def parse_structured_output(
         if {"raw", "parsed", "parsing_error"} <= text.keys():
             raw_text = _extract_raw_text(raw)
             if isinstance(parsed, schema):
+                _record_strategy("model")
                 return parsed
             if isinstance(parsed, dict):
                 try:
-                    return schema.model_validate(normalize_jsonish(parsed))
+                    result = schema.model_validate(normalize_jsonish(parsed))
+                    _record_strategy("dict")
+                    return result
                 except ValidationError as e:
                     if not strict and raw_text:
                         try:
@@ -358,7 +445,9 @@ def parse_structured_output(
             )
 
         try:
-            return schema.model_validate(normalize_jsonish(text))
+            result = schema.model_validate(normalize_jsonish(text))
+            _record_strategy("dict")
+            return result
         except ValidationError as e:
             raise StructuredOutputInvalidException(
                 _build_error_message(schema, detail=f"Schema validation failed: {e}"),
@@ -378,26 +467,65 @@ def parse_structured_output(
             raw=text,
         )
 
+    compiled = compile_schema(schema)
+    if strict:
+        try:
+            result = compiled.adapter.validate_json(text)
+        except ValidationError as e:
+            _record_strategy("failed")
+            raise StructuredOutputInvalidException(
+                _build_error_message(schema, detail=f"Schema validation failed: {e}"),
+                cause=e,
+                raw=text,
+            ) from e
+        _record_strategy("direct")
+        return result
+
+    result, strategy, errors = _parse_text(text, compiled)
+    if result is not None:
+        _record_strategy(strategy)
+        if strategy == "markdown":
+            logger.warning(
+                "Structured output fallback to Markdown parsing; JSON format may be inconsistent."
+            )
+        elif strategy == "text":
+            logger.warning(
+                "Structured output fallback to single-field text; JSON format may be inconsistent."
+            )
+        return result
+
+    _record_strategy("failed")
+    error_summary = "; ".join(errors)
+    raise StructuredOutputInvalidException(
+        _build_error_message(schema, detail=f"All parsing attempts failed: {error_summary}"),
+        raw=text,
+    )
+
+
+def _parse_text(
+    text: str,
+    compiled: CompiledSchema,
+) -> tuple[BaseModel | None, str | None, list[str]]:
+    """
+    Run the fallback chain on a non-empty string.
+
+    Returns (model, strategy, errors); model is None when every strategy failed.
+    """
+    schema = compiled.schema
+    adapter = compiled.adapter
     errors: list[str] = []
-    adapter = TypeAdapter(schema)
 
     # Strategy 1: direct JSON parsing.
     try:
-        return adapter.validate_json(text)
+        return adapter.validate_json(text), "direct", errors
     except ValidationError as e:
         errors.append(f"Direct parsing failed: {e}")
-        if strict:
-            raise StructuredOutputInvalidException(
-                _build_error_message(schema, detail=f"Schema validation failed: {e}"),
-                cause=e,
-                raw=text,
-            ) from e
 
     # Strategy 2: repair malformed JSON via json_repair.
     repaired = repair_json_text(text)
     if repaired != text:
         try:
-            return adapter.validate_json(repaired)
+            return adapter.validate_json(repaired), "repair", errors
         except ValidationError as e:
             errors.append(f"Parsing failed after repair: {e}")
 
@@ -406,7 +534,7 @@ def parse_structured_output(
     repaired_extracted = None
     if extracted != text:
         try:
-            return adapter.validate_json(extracted)
+            return adapter.validate_json(extracted), "extract", errors
         except ValidationError as e:
             errors.append(f"Parsing failed after extraction: {e}")
 
@@ -414,7 +542,7 @@ def parse_structured_output(
         repaired_extracted = repair_json_text(extracted)
         if repaired_extracted != extracted:
             try:
-                return adapter.validate_json(repaired_extracted)
+                return adapter.validate_json(repaired_extracted), "extract_repair", errors
             except ValidationError as e:
                 errors.append(f"Parsing failed after extraction + repair: {e}")
 
@@ -423,61 +551,59 @@ def parse_structured_output(
     try:
         parsed = json.loads(final_text)
         if isinstance(parsed, dict):
-            return schema.model_validate(normalize_jsonish(parsed))
+            return schema.model_validate(normalize_jsonish(parsed)), "list_unwrap", errors
         if isinstance(parsed, list) and parsed:
             # Take the first dict element.
             first_dict = next((item for item in parsed if isinstance(item, dict)), None)
             if first_dict:
-                return schema.model_validate(normalize_jsonish(first_dict))
+                return (
+                    schema.model_validate(normalize_jsonish(first_dict)),
+                    "list_unwrap",
+                    errors,
+                )
     except (json.JSONDecodeError, ValidationError) as e:
         errors.append(f"List unwrap failed: {e}")
 
     # Strategy 5: Markdown fallback (match by field name).
-    markdown_parsed, markdown_error = _parse_markdown_fields(text, schema)
+    markdown_parsed, markdown_error = _parse_markdown_fields(text, compiled)
     if markdown_parsed is not None:
-        logger.warning(
-            "Structured output fallback to Markdown parsing; JSON format may be inconsistent."
-        )
-        return markdown_parsed
+        return markdown_parsed, "markdown", errors
     if markdown_error:
         errors.append(markdown_error)
 
     # Strategy 6: single-field text fallback (only for single-string schemas).
-    coerced, coercion_error = _coerce_text_field(text, schema)
+    coerced, coercion_error = _coerce_text_field(text, compiled)
     if coerced is not None:
-        logger.warning(
-            "Structured output fallback to single-field text; JSON format may be inconsistent."
-        )
-        return coerced
+        return coerced, "text", errors
     if coercion_error:
         errors.append(coercion_error)
 
-    error_summary = "; ".join(errors)
-    raise StructuredOutputInvalidException(
-        _build_error_message(schema, detail=f"All parsing attempts failed: {error_summary}"),
-        raw=text,
-    )
+    return None, None, errors
 
 
-def _coerce_text_field(text: str, schema: type[T]) -> tuple[T | None, str | None]:
-    fields = list(schema.model_fields.items())
-    if len(fields) != 1:
-        return None, None
-    field_name, field = fields[0]
-    if not _is_string_annotation(field.annotation):
+def _coerce_text_field(
+    text: str,
+    compiled: CompiledSchema,
+) -> tuple[BaseModel | None, str | None]:
+    field_name = compiled.single_text_field
+    if field_name is None:
         return None, None
     try:
-        return schema.model_validate({field_name: text.strip()}), None
+        return compiled.schema.model_validate({field_name: text.strip()}), None
     except ValidationError as exc:
         return None, f"Text fallback parsing failed: {exc}"
 
 
-def _parse_markdown_fields(text: str, schema: type[T]) -> tuple[T | None, str | None]:
+def _parse_markdown_fields(
+    text: str,
+    compiled: CompiledSchema,
+) -> tuple[BaseModel | None, str | None]:
     candidates = _extract_markdown_candidates(text)
     if not candidates:
         return None, None
 
-    field_map = {_normalize_field_name(name): name for name in schema.model_fields.keys()}
+    schema = compiled.schema
+    field_map = compiled.field_map
     result: dict[str, Any] = {}
     matched_fields: set[str] = set()
 
@@ -486,8 +612,7 @@ def _parse_markdown_fields(text: str, schema: type[T]) -> tuple[T | None, str |
         field_name = field_map.get(normalized_key)
         if not field_name:
             continue
-        field = schema.model_fields[field_name]
-        if _is_string_annotation(field.annotation):
+        if field_name in compiled.string_fields:
             parsed_value = value.strip()
         else:
             try:
@@ -500,11 +625,7 @@ def _parse_markdown_fields(text: str, schema: type[T]) -> tuple[T | None, str |
     if not matched_fields:
         return None, None
 
-    missing_fields = [
-        name
-        for name, field in schema.model_fields.items()
-        if field.is_required() and name not in result
-    ]
+    missing_fields = [name for name in compiled.required_fields if name not in result]
     if missing_fields:
         return None, f"Markdown fallback failed: missing required fields: {', '.join(missing_fields)}"
 
@@ -644,6 +765,16 @@ def parse_args(
     )
 
 
+_OUTPUT_INSTRUCTIONS = (
+    "## Important\n"
+    "Output strict JSON (single object). Do not output Markdown, code blocks, or explanatory text.\n"
+    "Tool calls are allowed, but the final output must be JSON.\n"
+    "Strictly follow the delivery schema.\n"
+    "## Forbidden\n"
+    "Do not output non-JSON content or add undefined fields."
+)
+
+
 def build_output_instructions(schema: type[BaseModel]) -> str:
     """
     Build a unified JSON-only output instruction block.
@@ -652,11 +783,153 @@ def build_output_instructions(schema: type[BaseModel]) -> str:
     - Enforce strict JSON output
     - Forbid Markdown/code blocks/explanations
     """
-    return (
-        "## Important\n"
-        "Output strict JSON (single object). Do not output Markdown, code blocks, or explanatory text.\n"
-        "Tool calls are allowed, but the final output must be JSON.\n"
-        "Strictly follow the delivery schema.\n"
-        "## Forbidden\n"
-        "Do not output non-JSON content or add undefined fields."
+    return _OUTPUT_INSTRUCTIONS
+
+
+# ==================== Streaming parser ====================
+
+
+_THINK_TAGS = (("<think>", "</think>"), ("<thinking>", "</thinking>"))
+
+
+def _think_tag_at(text: str, i: int) -> tuple[str, str] | None:
+    """(opening, closing) of the thinking tag that opens at i, if any."""
+    for tag in _THINK_TAGS:
+        if text.startswith(tag[0], i):
+            return tag
+    return None
+
+
+def _ends_in_think_tag(text: str, i: int) -> bool:
+    """Whether text[i:] may be a thinking tag cut by the chunk boundary."""
+    rest = text[i:]
+    return len(rest) < len(_THINK_TAGS[-1][0]) and any(
+        opening.startswith(rest) for opening, _ in _THINK_TAGS
     )
+
+
+class StreamingStructuredParser(Generic[T]):
+    """
+    Incremental structured output parser.
+
+    Feed LLM tokens as they arrive; each chunk is scanned once, from where the
+    previous one stopped, to track JSON object boundaries (string/escape aware).
+    Thinking spans (<think>...</think>) are skipped. As soon as a top-level
+    object closes it is validated with the compiled TypeAdapter, so a
+    well-formed response is available before the stream ends. finish() falls
+    back to the full parse_structured_output chain.
+
+    Example:
+    ```python
+    parser = StreamingStructuredParser(MyOutput)
+    async for chunk in llm.astream(messages):
+        result = parser.feed(chunk.content)
+        if result is not None:
+            break
+    output = parser.finish()
+    ```
+    """
+
+    def __init__(self, schema: type[T]) -> None:
+        self._compiled = compile_schema(schema)
+        self._chunks: list[str] = []
+        # Unscanned tail that may be the start of a thinking tag split across chunks.
+        self._carry = ""
+        # Text of the open top-level object, one slice per chunk.
+        self._object: list[str] = []
+        self._think_end: str | None = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._result: T | None = None
+
+    @property
+    def result(self) -> T | None:
+        """Validated result, if a complete object has been seen."""
+        return self._result
+
+    @property
+    def text(self) -> str:
+        """Text received so far."""
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
+
+    def feed(self, chunk: str) -> T | None:
+        """Consume a chunk; return the validated model once available."""
+        if self._result is not None:
+            return self._result
+        if not chunk:
+            return None
+        self._chunks.append(chunk)
+        self._scan(self._carry + chunk)
+        return self._result
+
+    def finish(self) -> T:
+        """Finish the stream and return the parsed model (full fallback chain)."""
+        if self._result is not None:
+            return self._result
+        result = parse_structured_output(self.text, self._compiled.schema)
+        self._result = result  # type: ignore[assignment]
+        return result  # type: ignore[return-value]
+
+    def _scan(self, text: str) -> None:
+        self._carry = ""
+        i = 0
+        end = len(text)
+        start = 0
+        while i < end:
+            if self._think_end is not None:
+                close = text.find(self._think_end, i)
+                if close < 0:
+                    self._carry = text[max(i, end - len(self._think_end) + 1) :]
+                    return
+                i = close + len(self._think_end)
+                self._think_end = None
+                continue
+            ch = text[i]
+            if self._depth == 0:
+                if ch == "<":
+                    tag = _think_tag_at(text, i)
+                    if tag is not None:
+                        self._think_end = tag[1]
+                        i += len(tag[0])
+                        continue
+                    if _ends_in_think_tag(text, i):
+                        # Decide with the next chunk.
+                        self._carry = text[i:]
+                        return
+                elif ch == "{":
+                    start = i
+                    self._depth = 1
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._object.append(text[start : i + 1])
+                    candidate = "".join(self._object)
+                    self._object = []
+                    if self._try_validate(candidate):
+                        return
+            i += 1
+        if self._depth > 0:
+            self._object.append(text[start:])
+
+    def _try_validate(self, candidate: str) -> bool:
+        try:
+            self._result = self._compiled.adapter.validate_json(candidate)
+        except ValidationError:
+            return False
+        _record_strategy("stream")
+        return True
+
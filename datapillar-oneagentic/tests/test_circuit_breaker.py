@@ -156,3 +156,127 @@ async def test_raise_error() -> None:
     # After opening, CircuitBreakerError should be raised.
     with pytest.raises(CircuitBreakerError):
         await failing_func()
+
+
+@pytest.mark.asyncio
+async def test_single_probe() -> None:
+    """HALF_OPEN should allow only one probe at a time."""
+    config = CircuitBreakerConfig(failure_threshold=1, recovery_seconds=1)
+    cb = CircuitBreaker("probe", config)
+    await cb.record_failure()
+    await asyncio.sleep(1.1)
+
+    assert await cb.allow_request() is True
+    assert await cb.allow_request() is False
+    assert cb.state == CircuitState.HALF_OPEN
+
+    await cb.record_success()
+    assert cb.state == CircuitState.CLOSED
+    assert await cb.allow_request() is True
+
+
+@pytest.mark.asyncio
+async def test_slow_call() -> None:
+    """Slow calls should count as failures."""
+    config = CircuitBreakerConfig(failure_threshold=2, recovery_seconds=1, slow_call_seconds=0.5)
+    cb = CircuitBreaker("slow", config)
+
+    await cb.record_success(0.1)
+    assert cb._failure_count == 0
+    await cb.record_success(0.6)
+    await cb.record_success(0.7)
+    assert cb.state == CircuitState.OPEN
+
+
+@pytest.mark.asyncio
+async def test_redis_shared() -> None:
+    """Redis backend should share state and probe leases across registries."""
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+
+    server = fakeredis.FakeServer()
+    config = CircuitBreakerConfig(
+        failure_threshold=2,
+        recovery_seconds=1,
+        backend="redis",
+        key_prefix="test_cb:",
+    )
+    worker_a = CircuitBreakerRegistry(
+        config, redis_client=fakeredis.FakeAsyncRedis(server=server)
+    ).get("llm:openai:gpt")
+    worker_b = CircuitBreakerRegistry(
+        config, redis_client=fakeredis.FakeAsyncRedis(server=server)
+    ).get("llm:openai:gpt")
+
+    await worker_a.record_failure()
+    await worker_b.record_failure()
+    assert worker_b.state == CircuitState.OPEN
+    assert await worker_a.allow_request() is False
+
+    await asyncio.sleep(1.1)
+    probes = [await worker_a.allow_request(), await worker_b.allow_request()]
+    assert probes == [True, False]
+
+    await worker_a.record_success()
+    assert await worker_b.allow_request() is True
+    assert await worker_b.sync() == CircuitState.CLOSED
+
+
+class _ContextExceededError(Exception):
+    def __init__(self):
+        super().__init__("context exceeded")
+        self.status_code = 400
+        self.code = "context_length_exceeded"
+
+
+class _FailingLLM:
+    def __init__(self, error: Exception | None = None, hang: bool = False):
+        self.error = error
+        self.hang = hang
+
+    async def ainvoke(self, *_args, **_kwargs):
+        if self.hang:
+            await asyncio.sleep(3600)
+        raise self.error
+
+
+@pytest.mark.asyncio
+async def test_half_open_probe_released_on_uncounted_outcome() -> None:
+    """A non-retryable error or a cancelled call must not hold the HALF_OPEN probe."""
+    from datapillar_oneagentic.exception import ContextLengthExceededException
+    from datapillar_oneagentic.messages import Message, Messages
+    from datapillar_oneagentic.providers.llm.llm import ResilientChatModel
+
+    config = CircuitBreakerConfig(
+        failure_threshold=1, recovery_seconds=1, probe_timeout_seconds=60
+    )
+    cb = CircuitBreaker("probe_release", config)
+    await cb.record_failure()
+    await asyncio.sleep(1.1)
+    messages = Messages([Message.user("hi")])
+
+    model = ResilientChatModel(_FailingLLM(_ContextExceededError()), circuit_breaker=cb)
+    with pytest.raises(ContextLengthExceededException):
+        await model.ainvoke(messages)
+    assert cb.state == CircuitState.HALF_OPEN
+
+    model = ResilientChatModel(_FailingLLM(hang=True), circuit_breaker=cb)
+    call = asyncio.create_task(model.ainvoke(messages))
+    await asyncio.sleep(0.05)
+    call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await call
+
+    # The probe lease is free again, the next call can probe.
+    assert await cb.allow_request() is True
+    assert await cb.allow_request() is False
+
+
+@pytest.mark.asyncio
+async def test_redis_client_shared_per_url() -> None:
+    """Registries with the same redis_url share one client."""
+    pytest.importorskip("redis")
+    config = CircuitBreakerConfig(backend="redis", redis_url="redis://cb-shared:6379/0")
+    first = CircuitBreakerRegistry(config).get("a")
+    second = CircuitBreakerRegistry(config).get("b")
+    assert first._client is second._client
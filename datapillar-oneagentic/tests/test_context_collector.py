@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import pytest
+
+from datapillar_oneagentic.context import ContextCollector, ContextComposer, ContextScenario
+from datapillar_oneagentic.messages import Messages
+
+
+class _StubRetriever:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.cache_version: int | None = 0
+
+    async def build_context(self, goal: str) -> str:
+        self.calls += 1
+        return f"experience for {goal}"
+
+
+def _todo(status: str) -> dict:
+    return {
+        "session_id": "s1",
+        "goal": "ship",
+        "items": [{"id": "t1", "description": "step one", "status": status}],
+        "next_item_id": 2,
+    }
+
+
+async def _collect(collector: ContextCollector, state: dict, *, session_id: str = "s1"):
+    return await collector.collect(
+        scenario=ContextScenario.AGENT,
+        state=state,
+        query="user input",
+        session_id=session_id,
+    )
+
+
+@pytest.mark.asyncio
+async def test_context_collector() -> None:
+    retriever = _StubRetriever()
+    collector = ContextCollector(experience_retriever=retriever)
+    state = {"todo": _todo("pending")}
+
+    first = await _collect(collector, state)
+    second = await _collect(collector, dict(state))
+
+    assert first == second
+    assert retriever.calls == 1
+    stats = collector.stats()
+    assert stats["hits"] == {"todo_context": 1, "framework_context": 1, "experience_context": 1}
+
+    # Only the changed todo section is rebuilt.
+    third = await _collect(collector, {"todo": _todo("completed")})
+    assert third["todo_context"] != first["todo_context"]
+    assert third["experience_context"] == first["experience_context"]
+    assert retriever.calls == 1
+
+    # A new experience version invalidates the experience section.
+    retriever.cache_version = 1
+    await _collect(collector, state)
+    assert retriever.calls == 2
+
+    # Sessions are isolated and can be dropped.
+    await _collect(collector, state, session_id="s2")
+    assert retriever.calls == 3
+    collector.invalidate("s1")
+    await _collect(collector, state)
+    assert retriever.calls == 4
+
+
+@pytest.mark.asyncio
+async def test_context_collector2() -> None:
+    collector = ContextCollector(cache_ttl_seconds=None)
+    state = {"todo": _todo("pending"), "compression_context": "summary"}
+    contexts = await _collect(collector, state)
+
+    messages = ContextComposer.compose_agent_messages(
+        system_prompt="system",
+        contexts=contexts,
+        checkpoint_messages=Messages(),
+    )
+    keys = [msg.metadata.get("context_key") for msg in messages]
+    # Volatile todo context goes last so the prefix stays stable.
+    assert keys == ["system_prompt", "framework_context", "compression_context", "todo_context"]
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import pytest
 
+from datapillar_oneagentic.experience.cache import ExperienceCache
 from datapillar_oneagentic.experience.learner import ExperienceLearner, ExperienceRecord
 from datapillar_oneagentic.experience.retriever import ExperienceRetriever
 
@@ -144,3 +145,164 @@ async def test_experience_retriever2() -> None:
 
     tools = await retriever.get_common_tools("goal", k=2)
     assert tools[0] == "tool_a"
+
+
+class _CountingEmbeddingProvider(_StubEmbeddingProvider):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    async def embed_text(self, text: str) -> list[float]:
+        self.calls += 1
+        return await super().embed_text(text)
+
+
+class _CountingExperienceStore(_StubExperienceStore):
+    def __init__(self, records_by_outcome=None) -> None:
+        super().__init__(records_by_outcome)
+        self.search_calls = 0
+
+    async def search(self, query_vector, k=5, outcome=None):
+        self.search_calls += 1
+        return await super().search(query_vector, k=k, outcome=outcome)
+
+
+@pytest.mark.asyncio
+async def test_experience_cache() -> None:
+    record = ExperienceRecord(
+        id="s1",
+        namespace="ns",
+        session_id="s1",
+        goal="goal 1",
+        outcome="success",
+        tools_used=["tool_a"],
+    )
+    store = _CountingExperienceStore({"success": [record]})
+    embedder = _CountingEmbeddingProvider()
+    cache = ExperienceCache("ns")
+    retriever = ExperienceRetriever(store=store, embedding_provider=embedder, cache=cache)
+
+    first = await retriever.search("goal", k=3, outcome="success")
+    second = await retriever.search("goal", k=3, outcome="success")
+    assert [r.id for r in first] == [r.id for r in second] == ["s1"]
+    assert store.search_calls == 1
+    assert embedder.calls == 1
+
+    # Different k reuses the memoized embedding but runs a new search.
+    await retriever.search("goal", k=5, outcome="success")
+    assert store.search_calls == 2
+    assert embedder.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_experience_cache2() -> None:
+    store = _CountingExperienceStore()
+    embedder = _CountingEmbeddingProvider()
+    cache = ExperienceCache("ns")
+    learner = ExperienceLearner(
+        store=store, namespace="ns", embedding_provider=embedder, cache=cache
+    )
+    retriever = ExperienceRetriever(store=store, embedding_provider=embedder, cache=cache)
+
+    await retriever.search("goal", k=3, outcome="success")
+    version = cache.version
+
+    learner.start_recording("s1", "goal 1")
+    learner.record_tool("s1", "tool_a")
+    learner.record_tool("s1", "tool_b")
+    learner.record_agent("s1", "agent_a")
+    learner.complete_recording("s1", "success")
+    assert await learner.save_experience("s1") is True
+    assert cache.version > version
+
+    # Save invalidates cached results.
+    await retriever.search("goal", k=3, outcome="success")
+    assert store.search_calls == 2
+
+    learner.start_recording("s2", "goal 2")
+    learner.record_tool("s2", "tool_b")
+    learner.record_agent("s2", "agent_b")
+    learner.complete_recording("s2", "success")
+    assert await learner.save_experience("s2") is True
+
+    assert (await retriever.get_top_tools())[0] == "tool_b"
+    assert await retriever.get_top_tools(agent_id="agent_a") == ["tool_a", "tool_b"]
+    assert await retriever.get_top_tools(agent_id="agent_b") == ["tool_b"]
+
+
+def test_experience_cache3() -> None:
+    cache = ExperienceCache("ns")
+    record = ExperienceRecord(
+        id="s1",
+        namespace="ns",
+        session_id="s1",
+        goal="goal",
+        outcome="success",
+        tools_used=["tool_a"],
+        agents_involved=["agent_a"],
+    )
+    cache.observe(record)
+    cache.observe(record)
+    assert cache.top_tools() == ["tool_a"]
+    assert cache._tool_counts["tool_a"] == 1
+
+    # Re-observing with a failure outcome removes the contribution.
+    record.outcome = "failure"
+    cache.observe(record)
+    assert cache.top_tools() == []
+    assert cache.top_tools_for_agent("agent_a") == []
+
+
+class _ListingExperienceStore(_StubExperienceStore):
+    def __init__(self, records: list[ExperienceRecord]) -> None:
+        super().__init__()
+        self.records = records
+        self.list_calls = 0
+
+    async def list_records(self, outcome=None, limit=None):
+        self.list_calls += 1
+        matching = [r for r in self.records if outcome is None or r.outcome == outcome]
+        matching.sort(key=lambda r: r.created_at, reverse=True)
+        return matching[:limit]
+
+
+def _record(record_id: str, tools: list[str], *, created_at: int, outcome: str = "success"):
+    return ExperienceRecord(
+        id=record_id,
+        namespace="ns",
+        session_id=record_id,
+        goal=record_id,
+        outcome=outcome,
+        tools_used=tools,
+        agents_involved=["agent_a"],
+        created_at=created_at,
+    )
+
+
+@pytest.mark.asyncio
+async def test_experience_cache_seeds_counters_and_caps_records() -> None:
+    # A restarted process: the counters start from what the store holds.
+    store = _ListingExperienceStore(
+        [
+            _record("s1", ["tool_a"], created_at=1),
+            _record("s2", ["tool_b"], created_at=2),
+            _record("s3", ["tool_b"], created_at=3),
+            _record("s4", ["tool_c"], created_at=4, outcome="failure"),
+        ]
+    )
+    cache = ExperienceCache("ns", max_records=2)
+    retriever = ExperienceRetriever(
+        store=store, embedding_provider=_StubEmbeddingProvider(), cache=cache
+    )
+
+    # Only the newest max_records successes are kept.
+    assert await retriever.get_top_tools() == ["tool_b"]
+    assert await retriever.get_top_tools(agent_id="agent_a") == ["tool_b"]
+    assert store.list_calls == 1
+    assert cache.stats()["observed_records"] == 2
+
+    # New saves push out the oldest contribution.
+    cache.record_saved(_record("s5", ["tool_a"], created_at=5))
+    assert sorted(await retriever.get_top_tools()) == ["tool_a", "tool_b"]
+    assert cache._tool_counts == {"tool_a": 1, "tool_b": 1}
+    assert store.list_calls == 1
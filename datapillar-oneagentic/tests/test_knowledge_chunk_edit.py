@@ -116,3 +116,44 @@ async def test_delete_parent_cascades() -> None:
         assert doc is None
 
         await service.close()
+
+
+@pytest.mark.asyncio
+async def test_list_chunk_page_walks_cursor() -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        service = _build_service(tmpdir)
+        chunk_config = KnowledgeChunkConfig(
+            mode="general",
+            general={"max_tokens": 5, "overlap": 0},
+        )
+        source = KnowledgeSource(
+            source="alpha beta gamma delta epsilon zeta",
+            chunk=chunk_config,
+            doc_uid="doc1",
+            name="demo",
+            source_type="doc",
+        )
+        await service.chunk(KnowledgeChunkRequest(sources=[source]), namespace="ns_chunk_edit")
+        expected = sorted(chunk.chunk_id for chunk in await service.list_chunks(namespace="ns_chunk_edit"))
+
+        seen: list[str] = []
+        cursor = None
+        while True:
+            page = await service.list_chunk_page(
+                filters={"doc_id": "doc1"},
+                cursor=cursor,
+                limit=2,
+                namespace="ns_chunk_edit",
+            )
+            seen.extend(chunk.chunk_id for chunk in page.items)
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+
+        assert seen == expected
+        total = await service.count_chunks(filters={"doc_id": "doc1"}, namespace="ns_chunk_edit")
+        assert total == len(expected)
+        matched = await service.count_chunks(keyword="gamma", namespace="ns_chunk_edit")
+        assert matched == 1
+
+        await service.close()
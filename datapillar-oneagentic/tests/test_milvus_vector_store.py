@@ -69,6 +69,8 @@ class _FakeAsyncMilvusClient:
         self.create_kwargs = None
         self.search_calls = 0
         self.search_kwargs = None
+        self.query_kwargs: list[dict] = []
+        self.query_result: list[dict] = []
 
     async def has_collection(self, _name: str) -> bool:
         self.has_collection_calls += 1
@@ -86,6 +88,11 @@ class _FakeAsyncMilvusClient:
         return [[{"id": "row1", "score": 0.9, "entity": {"chunk_id": "doc1:0"}}]]
 
 
+    async def query(self, **_kwargs):
+        self.query_kwargs.append(dict(_kwargs))
+        return list(self.query_result)
+
+
 def _install_fake_pymilvus(monkeypatch) -> None:
     fake_module = types.SimpleNamespace(
         DataType=_FakeDataType,
@@ -247,3 +254,61 @@ async def test_full_text_search_ok(monkeypatch) -> None:
     assert client.search_calls == 1
     assert results
     assert results[0].record["chunk_key"] == "row1"
+
+
+@pytest.mark.asyncio
+async def test_query_page_pushes_keyset_and_keyword_filters(monkeypatch) -> None:
+    _install_fake_pymilvus(monkeypatch)
+    client = _FakeAsyncMilvusClient(has_collection=True)
+    client.query_result = [{"chunk_key": "ns::doc1:3"}, {"chunk_key": "ns::doc1:2"}]
+    store = MilvusVectorStore(
+        uri="http://example.com",
+        token=None,
+        user=None,
+        password=None,
+        db_name=None,
+        namespace="datapillar",
+        dim=2,
+    )
+    store._client = client
+    store.register_schema(_build_bm25_schema())
+
+    rows = await store.query_page(
+        "knowledge_chunks",
+        filters={"namespace": "ns", "doc_id": "doc1"},
+        after="ns::doc1:1",
+        limit=21,
+        keyword="50%_off",
+    )
+
+    assert [row["chunk_key"] for row in rows] == ["ns::doc1:2", "ns::doc1:3"]
+    kwargs = client.query_kwargs[-1]
+    assert kwargs["limit"] == 21
+    assert kwargs["filter"] == (
+        'namespace == "ns" and doc_id == "doc1" and chunk_key > "ns::doc1:1" '
+        'and content like "%50\\\\%\\\\_off%"'
+    )
+
+
+@pytest.mark.asyncio
+async def test_count_where_uses_count_star(monkeypatch) -> None:
+    _install_fake_pymilvus(monkeypatch)
+    client = _FakeAsyncMilvusClient(has_collection=True)
+    client.query_result = [{"count(*)": 42}]
+    store = MilvusVectorStore(
+        uri="http://example.com",
+        token=None,
+        user=None,
+        password=None,
+        db_name=None,
+        namespace="datapillar",
+        dim=2,
+    )
+    store._client = client
+    store.register_schema(_build_bm25_schema())
+
+    total = await store.count_where("knowledge_chunks", filters={"status": "published"})
+
+    assert total == 42
+    assert client.query_kwargs[-1]["output_fields"] == ["count(*)"]
+    assert client.query_kwargs[-1]["filter"] == 'status == "published"'
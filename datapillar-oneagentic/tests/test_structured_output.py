@@ -12,10 +12,14 @@ from datapillar_oneagentic.exception import (
 )
 from datapillar_oneagentic.utils.structured_output import (
     ModelCapabilities,
+    StreamingStructuredParser,
+    compile_schema,
     extract_json,
+    get_parse_stats,
     parse_args,
     parse_structured_output,
     repair_json_text,
+    reset_parse_stats,
 )
 
 
@@ -117,6 +121,58 @@ def test_parse_structured9() -> None:
         parse_structured_output("   ", _Payload)
 
 
+def test_parse_stats() -> None:
+    reset_parse_stats()
+    parse_structured_output('{"foo": "bar"}', _Payload)
+    parse_structured_output('{"foo": "bar",}', _Payload)
+    parse_structured_output("- summary: ok\n- count: 2", _MarkdownPayload)
+    stats = get_parse_stats()
+    assert stats["direct"] == 1
+    assert stats["repair"] == 1
+    assert stats["markdown"] == 1
+
+
+def test_compile_schema() -> None:
+    compiled = compile_schema(_MarkdownPayload)
+    assert compile_schema(_MarkdownPayload) is compiled
+    assert compiled.required_fields == ("summary", "count")
+    assert "summary" in compiled.string_fields
+    assert compiled.single_text_field is None
+
+
+def test_streaming_parser() -> None:
+    parser = StreamingStructuredParser(_Payload)
+    chunks = ["<think>{not json}</think>", '{"foo": "a}', 'b\\"c", ', '"count": 7}', " trailing"]
+    results = [parser.feed(chunk) for chunk in chunks]
+    assert results[:3] == [None, None, None]
+    assert results[3] is not None
+    assert results[3].foo == 'a}b"c'
+    assert results[3].count == 7
+    assert parser.finish() is results[3]
+
+
+def test_streaming_parser2() -> None:
+    parser = StreamingStructuredParser(_Payload)
+    for chunk in ["```json\n", "{'foo': 'bar',", " 'count': 2,}", "\n```"]:
+        assert parser.feed(chunk) is None
+    model = parser.finish()
+    assert model.foo == "bar"
+    assert model.count == 2
+
+
+def test_streaming_parser3() -> None:
+    # Valid JSON inside a thinking span is not the answer, even with tags split across chunks.
+    text = '<think>draft: {"foo": "draft", "count": 0}</think>\n{"foo": "final", "count": 3}'
+    parser = StreamingStructuredParser(_Payload)
+    results = [parser.feed(ch) for ch in text]
+    assert all(result is None for result in results[:-1])
+    assert results[-1].foo == "final"
+    assert parser.text == text
+
+    parser = StreamingStructuredParser(_Payload)
+    assert parser.feed('<thinking>{"foo": "draft"}</thinking>{"foo": "x"}').foo == "x"
+
+
 def test_parse_args() -> None:
     model_from_dict = parse_args({"foo": "bar", "count": 5}, _Payload)
     model_from_text = parse_args('{"foo": "bar", "count": 6}', _Payload)
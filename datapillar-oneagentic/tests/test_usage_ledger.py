@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+
+from datapillar_oneagentic import AgentContext, Datapillar, DatapillarConfig, agent
+from datapillar_oneagentic.core.types import SessionKey
+from datapillar_oneagentic.events import EventBus
+from datapillar_oneagentic.events.types import LLMCallCompletedEvent
+from datapillar_oneagentic.providers.llm import UsageEntry, UsageLedger, UsageSink
+from datapillar_oneagentic.providers.llm.config import ModelPricing, UsageLedgerConfig
+
+
+class _MemorySink(UsageSink):
+    def __init__(self, *, fail_times: int = 0) -> None:
+        self.batches: list[list[UsageEntry]] = []
+        self._fail_times = fail_times
+
+    async def write(self, entries: list[UsageEntry]) -> None:
+        if self._fail_times > 0:
+            self._fail_times -= 1
+            raise RuntimeError("sink down")
+        self.batches.append(entries)
+
+
+class _Output(BaseModel):
+    text: str = "ok"
+
+
+def _key(session_id: str = "s1") -> SessionKey:
+    return SessionKey(namespace="ns", session_id=session_id)
+
+
+@pytest.mark.asyncio
+async def test_usage_ledger() -> None:
+    config = UsageLedgerConfig(
+        pricing={"gpt": ModelPricing(input=2.0, output=8.0, cached_input=0.5)},
+    )
+    sink = _MemorySink()
+    ledger = UsageLedger(config, sink=sink)
+    bus = EventBus()
+    ledger.attach(bus)
+
+    for _ in range(3):
+        await bus.emit(
+            "llm",
+            LLMCallCompletedEvent(
+                agent_id="a1",
+                key=_key(),
+                model="gpt",
+                input_tokens=1000,
+                output_tokens=100,
+                cached_tokens=400,
+                reasoning_tokens=10,
+            ),
+        )
+    ledger.record(key=_key(), agent_id="a2", model="other", input_tokens=50, output_tokens=5)
+
+    totals = ledger.session_totals(_key())
+    assert totals.calls == 4
+    assert totals.input_tokens == 3050
+    assert totals.output_tokens == 305
+    assert totals.cached_tokens == 1200
+    assert totals.reasoning_tokens == 30
+    assert totals.cost == pytest.approx(3 * (600 * 2.0 + 400 * 0.5 + 100 * 8.0) / 1_000_000)
+    assert ledger.session_totals(_key("unknown")).calls == 0
+
+    # Nothing is written until a flush; repeated calls collapse per (session, agent, model).
+    assert sink.batches == []
+    assert await ledger.flush() == 2
+    rows = {entry.agent_id: entry.to_dict() for entry in sink.batches[0]}
+    assert rows["a1"]["calls"] == 3
+    assert rows["a1"]["total_tokens"] == 3300
+    assert rows["a1"]["cache_hit_rate"] == 0.4
+    assert rows["a2"]["model"] == "other"
+    assert rows["a2"]["cost"] == 0.0
+    assert ledger.pending_calls == 0
+    await ledger.aclose()
+
+
+@pytest.mark.asyncio
+async def test_usage_ledger2() -> None:
+    config = UsageLedgerConfig(max_batch_calls=3, flush_interval_ms=60_000)
+    sink = _MemorySink()
+    ledger = UsageLedger(config, sink=sink)
+
+    for _ in range(3):
+        ledger.record(key=_key(), agent_id="a1", model="m", input_tokens=1)
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert len(sink.batches) == 1
+    assert sink.batches[0][0].totals.calls == 3
+    await ledger.aclose()
+
+
+@pytest.mark.asyncio
+async def test_usage_ledger3() -> None:
+    sink = _MemorySink(fail_times=1)
+    ledger = UsageLedger(UsageLedgerConfig(flush_interval_ms=60_000), sink=sink)
+
+    ledger.record(key=_key(), agent_id="a1", model="m", input_tokens=10)
+    assert await ledger.flush() == 0
+    assert ledger.pending_calls == 1
+
+    ledger.record(key=_key(), agent_id="a1", model="m", input_tokens=5)
+    await ledger.aclose()
+
+    assert len(sink.batches) == 1
+    entry = sink.batches[0][0]
+    assert entry.totals.calls == 2
+    assert entry.totals.input_tokens == 15
+
+    # Closed ledger keeps live totals but stops queueing writes.
+    ledger.record(key=_key(), agent_id="a1", model="m", input_tokens=1)
+    assert ledger.pending_calls == 0
+    assert ledger.session_totals(_key()).calls == 3
+
+
+def test_usage_ledger4() -> None:
+    ledger = UsageLedger(UsageLedgerConfig(max_sessions=2))
+
+    ledger.record(key=_key("s1"), agent_id="a", model="m")
+    ledger.record(key=_key("s2"), agent_id="a", model="m")
+    ledger.record(key=_key("s1"), agent_id="a", model="m")
+    ledger.record(key=_key("s3"), agent_id="a", model="m")
+
+    assert ledger.session_totals(_key("s1")).calls == 2
+    assert ledger.session_totals(_key("s2")).calls == 0
+    assert ledger.session_totals(_key("s3")).calls == 1
+    assert ledger.pending_calls == 0
+
+
+@pytest.mark.asyncio
+async def test_usage_ledger5() -> None:
+    @agent(id="solo", name="Solo", deliverable_schema=_Output)
+    class SoloAgent:
+        async def run(self, ctx: AgentContext) -> _Output:
+            return _Output()
+
+    sink = _MemorySink()
+    team = Datapillar(
+        config=DatapillarConfig(llm={"api_key": "stub", "model": "stub", "provider": "openai"}),
+        namespace="ns",
+        name="usage",
+        agents=[SoloAgent],
+        usage_sink=sink,
+    )
+    event = LLMCallCompletedEvent(agent_id="solo", key=_key(), model="m", input_tokens=7)
+    await team.event_bus.emit("llm", event)
+
+    # Closing the team flushes pending usage and stops listening.
+    await team.close()
+    assert [entry.totals.input_tokens for entry in sink.batches[0]] == [7]
+    await team.event_bus.emit("llm", event)
+    assert team.get_session_usage("s1").calls == 1
@@ -0,0 +1,11 @@
+CREATE INDEX kg_table_name_idx IF NOT EXISTS
+FOR (n:Table)
+ON (n.name);
+
+CREATE INDEX kg_column_name_idx IF NOT EXISTS
+FOR (n:Column)
+ON (n.name);
+
+CREATE INDEX kg_workflowsession_session_id_idx IF NOT EXISTS
+FOR (n:WorkflowSession)
+ON (n.session_id);
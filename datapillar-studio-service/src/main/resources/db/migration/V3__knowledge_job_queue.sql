@@ -0,0 +1,8 @@
+-- Flyway schema migration for the durable knowledge ingestion job queue
+
+ALTER TABLE knowledge_document_job
+  ADD COLUMN payload_json JSON NULL COMMENT 'Job parameters needed to (re)run the job' AFTER job_type,
+  ADD COLUMN attempts INT NOT NULL DEFAULT 0 COMMENT 'Lease count (1 = first run)' AFTER processed_chunks,
+  ADD COLUMN lease_owner VARCHAR(128) NULL COMMENT 'Worker holding the lease' AFTER attempts,
+  ADD COLUMN lease_expires_at DATETIME(3) NULL COMMENT 'Lease expiry; an expired running job is re-leased' AFTER lease_owner,
+  ADD KEY idx_job_queue (status, lease_expires_at, job_id);